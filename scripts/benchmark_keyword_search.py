@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+キーワード検索ベンチマークスクリプト
+
+パターンデータベースの全キーワードについて、合成したactログ内の最初の出現位置を求める処理時間を
+次の方式で比較します。
+
+- KeywordSearcher: ログを1回だけ小文字化し、キーワードごとに str.find で検索
+- パターンごと: パターンごとにキーワードを str.find で検索（重複したキーワードも検索し直す従来の方式）
+- Aho-Corasick: Pythonで1文字ずつ状態を遷移させるオートマトンによる1回の走査
+
+使用例:
+    python scripts/benchmark_keyword_search.py
+    python scripts/benchmark_keyword_search.py --sizes 1,5 --repeat 3
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from benchmark_log_extractor import generate_act_log
+from rich.console import Console
+from rich.table import Table
+
+# プロジェクトのsrcをPythonパスに追加（標準ライブラリインポート後に配置）
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# ローカルインポート（パス設定後）
+from ci_helper.ai.keyword_searcher import KeywordSearcher  # noqa: E402
+from ci_helper.ai.models import Pattern  # noqa: E402
+from ci_helper.ai.pattern_database import PatternDatabase  # noqa: E402
+
+console = Console()
+
+
+class AhoCorasick:
+    """比較用のAho-Corasickオートマトン（失敗リンクを遷移表に展開した決定性オートマトン）"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+        self.transitions: list[dict[str, int]] = [{}]
+        self.outputs: list[tuple[int, ...]] = [()]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions[state][char] = next_state
+                    self.transitions.append({})
+                    self.outputs.append(())
+                state = next_state
+            self.outputs[state] = (*self.outputs[state], index)
+
+        failure = [0] * len(self.transitions)
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = failure[state]
+            self.outputs[state] = (*self.outputs[state], *self.outputs[fallback])
+            for char, next_state in list(self.transitions[state].items()):
+                failure[next_state] = self.transitions[fallback].get(char, 0)
+                queue.append(next_state)
+            for char, next_state in self.transitions[fallback].items():
+                self.transitions[state].setdefault(char, next_state)
+
+        for transitions in self.transitions:
+            for char, next_state in list(transitions.items()):
+                upper = char.upper()
+                if upper != char and len(upper) == 1 and upper.lower() == char:
+                    transitions.setdefault(upper, next_state)
+
+    def first_positions(self, text: str) -> dict[str, int]:
+        """各キーワードの最初の出現位置を取得（全て見つかった時点で打ち切る）"""
+        positions: dict[str, int] = {}
+        state = 0
+        for position, char in enumerate(text):
+            state = self.transitions[state].get(char, 0)
+            for index in self.outputs[state]:
+                keyword = self.keywords[index]
+                if keyword not in positions:
+                    positions[keyword] = position - len(keyword) + 1
+                    if len(positions) == len(self.keywords):
+                        return positions
+        return positions
+
+
+def per_pattern_positions(text: str, patterns: list[Pattern]) -> dict[str, int]:
+    """パターンごとにキーワードを検索（従来の方式）"""
+    text_lower = text.lower()
+    positions: dict[str, int] = {}
+    for pattern in patterns:
+        for keyword in pattern.keywords:
+            keyword_lower = keyword.lower()
+            position = text_lower.find(keyword_lower)
+            if keyword_lower and position != -1:
+                positions[keyword_lower] = position
+    return positions
+
+
+def measure(func: Callable[[], dict[str, int]], repeat: int) -> tuple[float, dict[str, int]]:
+    """
+    検索処理の最短時間を計測
+
+    Args:
+        func: 計測対象の検索処理
+        repeat: 計測回数
+
+    Returns:
+        (最短の処理時間（秒）, 検索結果) のタプル
+    """
+    best = float("inf")
+    result: dict[str, int] = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description="キーワード検索のベンチマーク")
+    parser.add_argument("--sizes", default="1,5", help="合成ログのサイズ（MB、カンマ区切り）")
+    parser.add_argument("--repeat", type=int, default=3, help="各計測の繰り返し回数（最短時間を採用）")
+    parser.add_argument(
+        "--patterns",
+        type=Path,
+        default=project_root / "data" / "patterns",
+        help="キーワードを読み込むパターンデータベースのディレクトリ",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="合成ログの乱数シード")
+    args = parser.parse_args()
+
+    database = PatternDatabase(args.patterns)
+    asyncio.run(database.load_patterns())
+    patterns = database.get_all_patterns()
+    searcher = KeywordSearcher(keyword for pattern in patterns for keyword in pattern.keywords)
+    automaton = AhoCorasick(searcher.keywords)
+    console.print(f"[blue]{len(patterns)}個のパターン、{len(searcher.keywords)}個のキーワード[/blue]")
+
+    sizes = [float(size) for size in args.sizes.split(",") if size.strip()]
+
+    table = Table(title="キーワード検索ベンチマーク")
+    table.add_column("サイズ", justify="right")
+    table.add_column("検出数", justify="right")
+    table.add_column("KeywordSearcher", justify="right")
+    table.add_column("パターンごと", justify="right")
+    table.add_column("Aho-Corasick", justify="right")
+    mismatched = False
+
+    for size_mb in sizes:
+        console.print(f"[blue]{size_mb:g}MB の合成ログを生成中...[/blue]")
+        log_content = generate_act_log(int(size_mb * 1024 * 1024), seed=args.seed)
+
+        searcher_time, expected = measure(lambda log=log_content: searcher.first_positions(log), args.repeat)
+        per_pattern_time, per_pattern = measure(
+            lambda log=log_content: per_pattern_positions(log, patterns), args.repeat
+        )
+        automaton_time, automaton_result = measure(lambda log=log_content: automaton.first_positions(log), args.repeat)
+        if per_pattern != expected or automaton_result != expected:
+            mismatched = True
+
+        table.add_row(
+            f"{size_mb:g}MB",
+            str(len(expected)),
+            f"{searcher_time:.3f}s",
+            f"{per_pattern_time:.3f}s ({per_pattern_time / searcher_time:.1f}x)",
+            f"{automaton_time:.3f}s ({automaton_time / searcher_time:.1f}x)",
+        )
+
+    console.print(table)
+
+    if mismatched:
+        console.print("[red]❌ 方式によって検索結果が一致しません[/red]")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+LogExtractor ベンチマークスクリプト
+
+合成したactログ（既定では10MBと100MB）に対して、キーワード走査による
+1パス抽出とパターンごとの従来の抽出の処理時間を比較します。
+
+使用例:
+    python scripts/benchmark_log_extractor.py
+    python scripts/benchmark_log_extractor.py --sizes 1,10 --repeat 3
+    python scripts/benchmark_log_extractor.py --legacy-max-mb 100
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+# プロジェクトのsrcをPythonパスに追加（標準ライブラリインポート後に配置）
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# ローカルインポート（パス設定後）
+from ci_helper.core.log_extractor import LogExtractor  # noqa: E402
+
+console = Console()
+
+# 通常の出力行（失敗パターンにマッチしない）
+NORMAL_LINES = [
+    "[CI/build]   | Collecting package-{0}==1.{1}.0",
+    "[CI/build] ⭐ Run Main step {0}",
+    "[CI/test]   | tests/test_mod_{0}.py::test_case_{1} PASSED",
+    "[CI/test]   | Downloading https://files.example.com/pkg-{0}.whl ({1} kB)",
+    "[CI/build] 🐳  docker exec cmd=[bash -e /var/run/act/workflow/{0}] user= workdir=",
+    "[CI/lint]   | All checks passed! ({0} files in {1} ms)",
+]
+
+# 失敗を含む出力行
+FAILURE_LINES = [
+    "[CI/test]   | Error: Process failed with code {0}",
+    "FAILED tests/test_mod_{0}.py::test_case_{1} - assert {0} == 0",
+    "AssertionError: expected {0}",
+    "npm ERR! missing script: build{0}",
+    "[CI/test]   ❌  Failure - Main step {0}\nProcess completed with exit code {1}",
+    'Traceback (most recent call last):\n  File "app.py", line {0}, in <module>\n    main()\nValueError: bad {1}',
+    "Operation timed out after {0} seconds",
+    "E       assert {0} == {1}",
+]
+
+
+def generate_act_log(target_bytes: int, seed: int = 0, failure_rate: float = 0.002) -> str:
+    """
+    actの実行ログを模した合成ログを生成
+
+    Args:
+        target_bytes: 生成するログのおおよそのサイズ（バイト）
+        seed: 乱数シード
+        failure_rate: 失敗行を出力する確率
+
+    Returns:
+        合成ログ
+    """
+    rng = random.Random(seed)  # noqa: S311 - 再現可能な合成データ用
+    lines: list[str] = []
+    size = 0
+    while size < target_bytes:
+        template = rng.choice(FAILURE_LINES) if rng.random() < failure_rate else rng.choice(NORMAL_LINES)
+        line = template.format(rng.randint(1, 999), rng.randint(1, 999))
+        lines.append(line)
+        size += len(line.encode("utf-8")) + 1
+    return "\n".join(lines)
+
+
+def measure(extractor: LogExtractor, log_content: str, repeat: int) -> tuple[float, int]:
+    """
+    抽出処理の最短時間を計測
+
+    Args:
+        extractor: 計測対象の抽出器
+        log_content: ログ内容
+        repeat: 計測回数
+
+    Returns:
+        (最短の処理時間（秒）, 抽出された失敗数) のタプル
+    """
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(extractor.extract_failures(log_content))
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main() -> int:
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description="LogExtractor のベンチマーク")
+    parser.add_argument("--sizes", default="10,100", help="合成ログのサイズ（MB、カンマ区切り）")
+    parser.add_argument("--repeat", type=int, default=1, help="各計測の繰り返し回数（最短時間を採用）")
+    parser.add_argument(
+        "--legacy-max-mb",
+        type=float,
+        default=10,
+        help="従来の抽出を計測する最大サイズ（MB）。従来の方式はサイズの2乗に比例して遅くなります",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="合成ログの乱数シード")
+    args = parser.parse_args()
+
+    sizes = [float(size) for size in args.sizes.split(",") if size.strip()]
+
+    table = Table(title="LogExtractor ベンチマーク")
+    table.add_column("サイズ", justify="right")
+    table.add_column("失敗数", justify="right")
+    table.add_column("1パス抽出", justify="right")
+    table.add_column("従来の抽出", justify="right")
+    table.add_column("高速化", justify="right")
+
+    single_pass = LogExtractor(single_pass=True)
+    legacy = LogExtractor(single_pass=False)
+    mismatched = False
+
+    for size_mb in sizes:
+        console.print(f"[blue]{size_mb:g}MB の合成ログを生成中...[/blue]")
+        log_content = generate_act_log(int(size_mb * 1024 * 1024), seed=args.seed)
+
+        fast_time, fast_count = measure(single_pass, log_content, args.repeat)
+
+        if size_mb <= args.legacy_max_mb:
+            legacy_time, legacy_count = measure(legacy, log_content, args.repeat)
+            if legacy_count != fast_count:
+                mismatched = True
+            legacy_cell = f"{legacy_time:.2f}s"
+            speedup_cell = f"{legacy_time / fast_time:.1f}x" if fast_time > 0 else "-"
+        else:
+            legacy_cell = "スキップ"
+            speedup_cell = "-"
+
+        table.add_row(f"{size_mb:g}MB", str(fast_count), f"{fast_time:.2f}s", legacy_cell, speedup_cell)
+
+    console.print(table)
+
+    if mismatched:
+        console.print("[red]❌ 1パス抽出と従来の抽出で失敗数が一致しません[/red]")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
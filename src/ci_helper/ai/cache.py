@@ -3,39 +3,146 @@ AIレスポンスキャッシュ
 
 AI分析結果をキャッシュして、同じ内容の再分析時にコストと時間を節約します。
 ハッシュベースのキー生成、TTL管理、サイズ制限などの機能を提供します。
+
+キャッシュはキャッシュディレクトリ内の1つのSQLiteデータベースに保存します。
+作成時刻と最終アクセス時刻にインデックスを張り、期限切れ・LRUでの削除を
+全件走査せずに行います。WALモードで開くため、並列に実行された複数の
+``ci-run analyze`` プロセスから同時に読み書きできます。
 """
 
 from __future__ import annotations
 
 import hashlib
 import json
+import logging
+import sqlite3
 import time
+import weakref
+from collections.abc import Generator
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, TypedDict, cast
-
-import aiofiles  # type: ignore[import-untyped]
+from typing import Any, NotRequired, TypedDict, cast
 
 from .exceptions import CacheError
 from .models import AnalysisResult, AnalysisStatus
 
+logger = logging.getLogger(__name__)
+
+# データベースのスキーマバージョン（スキーマを変更した場合は更新する）
+CACHE_SCHEMA_VERSION = 1
+
+# キャッシュデータベースのファイル名（キャッシュディレクトリ直下に保存）
+CACHE_DB_FILENAME = "response_cache.db"
+
+# 旧形式（エントリごとのJSONファイル）のメタデータファイル名
+LEGACY_METADATA_FILENAME = "cache_metadata.json"
+
+# 最終アクセス時刻の更新をまとめて書き込むエントリ数
+ACCESS_FLUSH_BATCH_SIZE = 32
+
+# 他プロセスの書き込みが終わるまで待つ秒数
+_BUSY_TIMEOUT_SECONDS = 30.0
+
+# サイズ制限での削除時に一度に取得する古いエントリ数
+_EVICTION_BATCH_SIZE = 64
+
+# キャッシュ全体のサイズはトリガーで cache_info に集計し、SUM による全件走査を避ける
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_accessed REAL NOT NULL,
+    access_count INTEGER NOT NULL DEFAULT 0,
+    prompt_hash TEXT,
+    context_hash TEXT,
+    provider TEXT,
+    model TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_created ON entries (created);
+CREATE INDEX IF NOT EXISTS entries_last_accessed ON entries (last_accessed);
+CREATE INDEX IF NOT EXISTS entries_provider ON entries (provider);
+CREATE TABLE IF NOT EXISTS cache_info (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+INSERT OR IGNORE INTO cache_info (name, value) VALUES ('total_size', 0);
+CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN
+    UPDATE cache_info SET value = value + NEW.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE cache_info SET value = value - OLD.size + NEW.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN
+    UPDATE cache_info SET value = value - OLD.size WHERE name = 'total_size';
+END;
+"""
 
-class CacheEntry(TypedDict, total=False):
+_UPSERT_ENTRY = """
+INSERT INTO entries (
+    key, payload, size, created, last_accessed, access_count, prompt_hash, context_hash, provider, model
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    payload = excluded.payload,
+    size = excluded.size,
+    created = excluded.created,
+    last_accessed = excluded.last_accessed,
+    access_count = excluded.access_count,
+    prompt_hash = excluded.prompt_hash,
+    context_hash = excluded.context_hash,
+    provider = excluded.provider,
+    model = excluded.model
+"""
+
+
+class CacheEntry(TypedDict):
     created: float
     last_accessed: float
     access_count: int
-    size: int
-    prompt_hash: str
-    context_hash: str
-    provider: str
-    model: str
+    size: NotRequired[int]
+    prompt_hash: NotRequired[str]
+    context_hash: NotRequired[str]
+    provider: NotRequired[str]
+    model: NotRequired[str]
+
+
+def _flush_access_updates(connection: sqlite3.Connection, pending: dict[str, tuple[float, int]]) -> None:
+    """保留中の最終アクセス時刻とアクセス回数をまとめて書き込む
+
+    Args:
+        connection: キャッシュデータベースへの接続
+        pending: キャッシュキーから（最終アクセス時刻, 追加のアクセス回数）への辞書
+    """
+    if not pending:
+        return
+
+    updates = [(accessed, count, key) for key, (accessed, count) in pending.items()]
+    pending.clear()
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "UPDATE entries SET last_accessed = MAX(last_accessed, ?), access_count = access_count + ? "
+                "WHERE key = ?",
+                updates,
+            )
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+    except sqlite3.Error as e:
+        # アクセス時刻はLRUの目安にすぎないため、書き込めなくても処理は続ける
+        logger.debug("キャッシュのアクセス時刻の更新に失敗しました: %s", e)
 
 
-class CacheMetadata(TypedDict):
-    entries: dict[str, CacheEntry]
-    total_size: int
-    created: float
-    last_cleanup: float
+def _close_connection(connection: sqlite3.Connection, pending: dict[str, tuple[float, int]]) -> None:
+    """保留中の更新を書き込んでから接続を閉じる"""
+    try:
+        _flush_access_updates(connection, pending)
+    finally:
+        connection.close()
 
 
 class ResponseCache:
@@ -50,11 +157,17 @@ class ResponseCache:
     ):
         """レスポンスキャッシュを初期化
 
+        旧形式のキャッシュ（``cache_metadata.json`` とエントリごとのJSONファイル）が
+        残っている場合は、データベースへ移行してから削除します。
+
         Args:
             cache_dir: キャッシュディレクトリ
             max_size_mb: 最大キャッシュサイズ（MB）
             ttl_hours: キャッシュ有効期限（時間）
             cleanup_interval_hours: クリーンアップ実行間隔（時間）
+
+        Raises:
+            CacheError: キャッシュデータベースを開けない場合
         """
         self.cache_dir = cache_dir
         self.max_size_mb = max_size_mb
@@ -64,73 +177,121 @@ class ResponseCache:
         # キャッシュディレクトリを作成
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # メタデータファイル
-        self.metadata_file = self.cache_dir / "cache_metadata.json"
-        self.metadata: CacheMetadata = self._load_metadata()
+        # キャッシュデータベース
+        self.db_path = self.cache_dir / CACHE_DB_FILENAME
+        # キャッシュキーから（最終アクセス時刻, 追加のアクセス回数）への未書き込みの更新
+        self._pending_access: dict[str, tuple[float, int]] = {}
+
+        try:
+            self._connection = sqlite3.connect(
+                self.db_path,
+                timeout=_BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+            current_time = time.time()
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO cache_info (name, value) VALUES (?, ?)",
+                [("created", current_time), ("last_cleanup", current_time)],
+            )
+            self._migrate_legacy_cache()
+        except sqlite3.Error as e:
+            raise CacheError(f"キャッシュデータベースを開けませんでした: {e}", str(self.db_path)) from e
+
+        # インスタンスの破棄時・プロセス終了時に保留中の更新を書き込んで接続を閉じる
+        self._finalizer = weakref.finalize(self, _close_connection, self._connection, self._pending_access)
 
         # 最後のクリーンアップ時刻
         self.last_cleanup = time.time()
 
-    def _load_metadata(self) -> CacheMetadata:
-        """キャッシュメタデータを読み込み"""
-        if not self.metadata_file.exists():
-            return self._create_default_metadata()
+    @contextmanager
+    def _write_transaction(self) -> Generator[sqlite3.Connection]:
+        """開始時に書き込みロックを取得するトランザクション
 
+        ``BEGIN IMMEDIATE`` で開始するため、読み込み後に書き込みロックへ昇格する際の
+        他プロセスとのデッドロックが起きません。
+
+        Yields:
+            キャッシュデータベースへの接続
+        """
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
         try:
-            with open(self.metadata_file, encoding="utf-8") as f:
-                raw_metadata = json.load(f)
-        except Exception:
-            # メタデータファイルが破損している場合は新規作成
-            raw_metadata = None
+            yield connection
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
 
-        if isinstance(raw_metadata, dict):
-            parsed_metadata = cast(dict[str, Any], raw_metadata)
-            return self._normalize_metadata(parsed_metadata)
+    def _migrate_legacy_cache(self) -> None:
+        """旧形式のJSONファイルのキャッシュをデータベースへ移行
 
-        return self._create_default_metadata()
+        複数のプロセスが同時に移行しても同じエントリが重複しないよう、
+        既存のキーは上書きしません。
+        """
+        metadata_file = self.cache_dir / LEGACY_METADATA_FILENAME
+        if not metadata_file.exists():
+            return
 
-    async def _save_metadata(self) -> None:
-        """キャッシュメタデータを保存"""
         try:
-            async with aiofiles.open(self.metadata_file, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(self.metadata, indent=2, ensure_ascii=False))
-        except Exception as e:
-            raise CacheError(f"メタデータの保存に失敗しました: {e}")
-
-    def _create_default_metadata(self) -> CacheMetadata:
-        """空のメタデータを生成"""
-        current_time = time.time()
-        return {
-            "entries": {},
-            "total_size": 0,
-            "created": current_time,
-            "last_cleanup": current_time,
-        }
+            with open(metadata_file, encoding="utf-8") as f:
+                raw_metadata = cast(object, json.load(f))
+        except OSError, ValueError:
+            # メタデータファイルが破損している場合は移行せずに削除する
+            raw_metadata = None
 
-    def _normalize_metadata(self, raw_metadata: dict[str, Any]) -> CacheMetadata:
-        """JSONから読み込んだメタデータを正規化"""
-        entries_field = raw_metadata.get("entries", {})
-        entries: dict[str, CacheEntry] = {}
+        metadata = cast(dict[str, Any], raw_metadata) if isinstance(raw_metadata, dict) else {}
+        entries_field = metadata.get("entries")
+        entries_mapping = cast(dict[Any, Any], entries_field) if isinstance(entries_field, dict) else {}
+
+        rows: list[tuple[Any, ...]] = []
+        legacy_files: list[Path] = []
+        for key_obj, entry_obj in entries_mapping.items():
+            if not isinstance(key_obj, str) or not isinstance(entry_obj, dict):
+                continue
+            cache_file = self.cache_dir / f"{key_obj}.json"
+            legacy_files.append(cache_file)
+            try:
+                with open(cache_file, encoding="utf-8") as f:
+                    payload = json.dumps(json.load(f), ensure_ascii=False, separators=(",", ":"))
+            except OSError, ValueError:
+                continue
+
+            entry = self._normalize_entry(cast(dict[str, Any], entry_obj))
+            rows.append(
+                (
+                    key_obj,
+                    payload,
+                    len(payload.encode("utf-8")),
+                    entry["created"],
+                    entry["last_accessed"],
+                    entry["access_count"],
+                    entry.get("prompt_hash"),
+                    entry.get("context_hash"),
+                    entry.get("provider"),
+                    entry.get("model"),
+                )
+            )
 
-        if isinstance(entries_field, dict):
-            entries_mapping = cast(dict[Any, Any], entries_field)
-            for key_obj, entry_obj in entries_mapping.items():
-                if not isinstance(key_obj, str) or not isinstance(entry_obj, dict):
-                    continue
-                key: str = key_obj
-                entry_dict = cast(dict[str, Any], entry_obj)
-                entries[key] = self._normalize_entry(entry_dict)
+        with self._write_transaction() as connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO entries (key, payload, size, created, last_accessed, access_count, "
+                "prompt_hash, context_hash, provider, model) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._evict_to_size(connection)
 
-        created = float(raw_metadata.get("created", time.time()))
-        last_cleanup = float(raw_metadata.get("last_cleanup", created))
-        total_size = int(raw_metadata.get("total_size", 0))
+        for path in [*legacy_files, metadata_file]:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug("旧形式のキャッシュファイルを削除できませんでした: %s - %s", path, e)
 
-        return {
-            "entries": entries,
-            "total_size": total_size,
-            "created": created,
-            "last_cleanup": last_cleanup,
-        }
+        logger.info("旧形式のキャッシュ %d 件をデータベースへ移行しました", len(rows))
 
     def _normalize_entry(self, entry_data: dict[str, Any]) -> CacheEntry:
         """エントリーデータを CacheEntry に変換"""
@@ -185,6 +346,8 @@ class ResponseCache:
     async def get(self, cache_key: str) -> AnalysisResult | None:
         """キャッシュから結果を取得
 
+        最終アクセス時刻とアクセス回数の更新は保留しておき、まとめて書き込みます。
+
         Args:
             cache_key: キャッシュキー
 
@@ -194,90 +357,81 @@ class ResponseCache:
         # 定期クリーンアップをチェック
         await self._check_cleanup()
 
-        # メタデータから情報を取得
-        if cache_key not in self.metadata["entries"]:
+        try:
+            row = self._connection.execute(
+                "SELECT payload, created FROM entries WHERE key = ?", (cache_key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            raise CacheError(f"キャッシュの読み込みに失敗しました: {e}", str(self.db_path)) from e
+
+        if row is None:
             return None
 
-        entry = self.metadata["entries"][cache_key]
+        payload, created = row
+        current_time = time.time()
 
         # TTLチェック
-        if self._is_expired(entry):
-            await self._remove_entry(cache_key)
-            return None
-
-        # キャッシュファイルを読み込み
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        if not cache_file.exists():
-            # ファイルが存在しない場合はメタデータからも削除
+        if self._is_expired(created, current_time):
             await self._remove_entry(cache_key)
             return None
 
         try:
-            async with aiofiles.open(cache_file, encoding="utf-8") as f:
-                content = await f.read()
-                data = json.loads(content)
-
-                # AnalysisResultオブジェクトを復元
-                analysis_result = self._deserialize_analysis_result(data)
-                analysis_result.cache_hit = True
+            # AnalysisResultオブジェクトを復元
+            analysis_result = self._deserialize_analysis_result(json.loads(payload))
+        except Exception as e:
+            # 復元できないエントリは削除
+            await self._remove_entry(cache_key)
+            raise CacheError(f"キャッシュデータの読み込みに失敗しました: {e}", str(self.db_path)) from e
 
-                # アクセス時刻を更新
-                entry["last_accessed"] = time.time()
-                entry["access_count"] = entry.get("access_count", 0) + 1
-                await self._save_metadata()
+        analysis_result.cache_hit = True
 
-                return analysis_result
+        # アクセス時刻の更新を保留
+        _, access_count = self._pending_access.get(cache_key, (0.0, 0))
+        self._pending_access[cache_key] = (current_time, access_count + 1)
+        if len(self._pending_access) >= ACCESS_FLUSH_BATCH_SIZE:
+            self.flush_access_updates()
 
-        except Exception as e:
-            # ファイル読み込みエラーの場合はエントリを削除
-            await self._remove_entry(cache_key)
-            raise CacheError(f"キャッシュファイルの読み込みに失敗しました: {e}")
+        return analysis_result
 
     async def set(self, cache_key: str, result: AnalysisResult, prompt: str = "", context: str = "") -> None:
         """結果をキャッシュに保存
 
+        保存と同じトランザクション内で、サイズ制限を超えた分を最終アクセスの古い順に削除します。
+
         Args:
             cache_key: キャッシュキー
             result: 分析結果
             prompt: プロンプト（メタデータ用）
             context: コンテキスト（メタデータ用）
         """
-        # キャッシュサイズをチェック
-        await self._ensure_cache_size()
-
         # 分析結果をシリアライズ
         data = self._serialize_analysis_result(result)
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
 
-        # キャッシュファイルに保存
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        try:
-            async with aiofiles.open(cache_file, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(data, indent=2, ensure_ascii=False))
-
-            # ファイルサイズを取得
-            file_size = cache_file.stat().st_size
+        # 削除対象を正しく選べるよう、保留中のアクセス時刻を先に書き込む
+        self.flush_access_updates()
 
-            # メタデータを更新
-            current_time = time.time()
-            self.metadata["entries"][cache_key] = {
-                "created": current_time,
-                "last_accessed": current_time,
-                "access_count": 0,
-                "size": file_size,
-                "prompt_hash": hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16],
-                "context_hash": hashlib.sha256(context.encode("utf-8")).hexdigest()[:16],
-                "provider": result.provider,
-                "model": result.model,
-            }
-
-            self.metadata["total_size"] += file_size
-            await self._save_metadata()
-
-        except Exception as e:
-            # 保存に失敗した場合はファイルを削除
-            if cache_file.exists():
-                cache_file.unlink()
-            raise CacheError(f"キャッシュの保存に失敗しました: {e}")
+        current_time = time.time()
+        try:
+            with self._write_transaction() as connection:
+                connection.execute(
+                    _UPSERT_ENTRY,
+                    (
+                        cache_key,
+                        payload,
+                        len(payload.encode("utf-8")),
+                        current_time,
+                        current_time,
+                        0,
+                        hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16],
+                        hashlib.sha256(context.encode("utf-8")).hexdigest()[:16],
+                        result.provider,
+                        result.model,
+                    ),
+                )
+                self._evict_to_size(connection)
+        except sqlite3.Error as e:
+            raise CacheError(f"キャッシュの保存に失敗しました: {e}", str(self.db_path)) from e
 
     async def remove(self, cache_key: str) -> bool:
         """キャッシュエントリを削除
@@ -290,25 +444,33 @@ class ResponseCache:
         """
         return await self._remove_entry(cache_key)
 
+    async def remove_by_provider(self, provider: str) -> int:
+        """指定されたプロバイダーのキャッシュエントリを削除
+
+        Args:
+            provider: プロバイダー名
+
+        Returns:
+            削除されたエントリ数
+        """
+        try:
+            with self._write_transaction() as connection:
+                cursor = connection.execute("DELETE FROM entries WHERE provider = ?", (provider,))
+        except sqlite3.Error as e:
+            raise CacheError(f"キャッシュの削除に失敗しました: {e}", str(self.db_path)) from e
+        return cursor.rowcount
+
     async def clear(self) -> None:
         """全キャッシュを削除"""
+        current_time = time.time()
+        self._pending_access.clear()
         try:
-            # 全キャッシュファイルを削除
-            for cache_file in self.cache_dir.glob("*.json"):
-                if cache_file.name != "cache_metadata.json":
-                    cache_file.unlink()
-
-            # メタデータをリセット
-            self.metadata = {
-                "entries": {},
-                "total_size": 0,
-                "created": time.time(),
-                "last_cleanup": time.time(),
-            }
-            await self._save_metadata()
-
-        except Exception as e:
-            raise CacheError(f"キャッシュのクリアに失敗しました: {e}")
+            with self._write_transaction() as connection:
+                connection.execute("DELETE FROM entries")
+                self._set_info(connection, "created", current_time)
+                self._set_info(connection, "last_cleanup", current_time)
+        except sqlite3.Error as e:
+            raise CacheError(f"キャッシュのクリアに失敗しました: {e}", str(self.db_path)) from e
 
     async def get_stats(self) -> dict[str, Any]:
         """キャッシュ統計を取得
@@ -317,23 +479,23 @@ class ResponseCache:
             キャッシュ統計情報
         """
         await self._check_cleanup()
+        self.flush_access_updates()
 
-        total_entries = len(self.metadata["entries"])
-        total_size_mb = self.metadata["total_size"] / (1024 * 1024)
-
-        # アクセス統計
-        access_counts: list[int] = [entry.get("access_count", 0) for entry in self.metadata["entries"].values()]
-        avg_access = sum(access_counts) / len(access_counts) if access_counts else 0
-
-        # プロバイダー別統計
-        provider_stats: dict[str, int] = {}
-        for entry in self.metadata["entries"].values():
-            provider = entry.get("provider", "unknown")
-            provider_stats[provider] = provider_stats.get(provider, 0) + 1
-
-        # 古いエントリの数
-        current_time = time.time()
-        expired_count = sum(1 for entry in self.metadata["entries"].values() if self._is_expired(entry, current_time))
+        connection = self._connection
+        try:
+            total_entries, avg_access = connection.execute(
+                "SELECT COUNT(*), COALESCE(AVG(access_count), 0) FROM entries"
+            ).fetchone()
+            # プロバイダー別統計
+            provider_stats: dict[str, int] = dict(
+                connection.execute("SELECT COALESCE(provider, 'unknown'), COUNT(*) FROM entries GROUP BY 1").fetchall()
+            )
+            expired_count = self._count_expired(time.time())
+            total_size_mb = self._total_size() / (1024 * 1024)
+            created = self._get_info("created")
+            last_cleanup = self._get_info("last_cleanup")
+        except sqlite3.Error as e:
+            raise CacheError(f"キャッシュ統計の取得に失敗しました: {e}", str(self.db_path)) from e
 
         return {
             "total_entries": total_entries,
@@ -344,8 +506,8 @@ class ResponseCache:
             "provider_breakdown": provider_stats,
             "expired_entries": expired_count,
             "ttl_hours": self.ttl_hours,
-            "created": datetime.fromtimestamp(self.metadata["created"]).isoformat(),
-            "last_cleanup": datetime.fromtimestamp(self.metadata["last_cleanup"]).isoformat(),
+            "created": datetime.fromtimestamp(created).isoformat(),
+            "last_cleanup": datetime.fromtimestamp(last_cleanup).isoformat(),
         }
 
     async def cleanup_expired(self) -> int:
@@ -355,25 +517,18 @@ class ResponseCache:
             削除されたエントリ数
         """
         current_time = time.time()
-        expired_keys: list[str] = []
-
-        # 期限切れエントリを特定
-        for cache_key, entry in self.metadata["entries"].items():
-            if self._is_expired(entry, current_time):
-                expired_keys.append(cache_key)
-
-        # 期限切れエントリを削除
-        removed_count = 0
-        for cache_key in expired_keys:
-            if await self._remove_entry(cache_key):
-                removed_count += 1
+        try:
+            with self._write_transaction() as connection:
+                cursor = connection.execute(
+                    "DELETE FROM entries WHERE created < ?", (current_time - self.ttl_hours * 3600,)
+                )
+                # クリーンアップ時刻を更新
+                self._set_info(connection, "last_cleanup", current_time)
+        except sqlite3.Error as e:
+            raise CacheError(f"キャッシュのクリーンアップに失敗しました: {e}", str(self.db_path)) from e
 
-        # クリーンアップ時刻を更新
-        self.metadata["last_cleanup"] = current_time
         self.last_cleanup = current_time
-        await self._save_metadata()
-
-        return removed_count
+        return cursor.rowcount
 
     async def _check_cleanup(self) -> None:
         """定期クリーンアップをチェック"""
@@ -383,58 +538,93 @@ class ResponseCache:
 
     async def _ensure_cache_size(self) -> None:
         """キャッシュサイズ制限を確保"""
-        max_size_bytes = self.max_size_mb * 1024 * 1024
-
-        while self.metadata["total_size"] > max_size_bytes:
-            # 最も古いエントリを削除
-            oldest_key = self._find_oldest_entry()
-            if oldest_key:
-                await self._remove_entry(oldest_key)
-            else:
-                break
+        self.flush_access_updates()
+        try:
+            with self._write_transaction() as connection:
+                self._evict_to_size(connection)
+        except sqlite3.Error as e:
+            raise CacheError(f"キャッシュサイズの調整に失敗しました: {e}", str(self.db_path)) from e
 
-    def _find_oldest_entry(self) -> str | None:
-        """最も古いエントリを見つける"""
-        if not self.metadata["entries"]:
-            return None
+    def _evict_to_size(self, connection: sqlite3.Connection) -> int:
+        """サイズ制限を超えた分のエントリを最終アクセスの古い順に削除
 
-        oldest_key: str | None = None
-        oldest_time = float("inf")
+        最終アクセス時刻のインデックスを先頭から辿るため、全件走査は行いません。
 
-        for cache_key, entry in self.metadata["entries"].items():
-            last_accessed = entry.get("last_accessed", entry.get("created", 0))
-            if last_accessed < oldest_time:
-                oldest_time = last_accessed
-                oldest_key = cache_key
+        Args:
+            connection: 書き込みトランザクション中の接続
 
-        return oldest_key
+        Returns:
+            削除されたエントリ数
+        """
+        excess = self._total_size() - self.max_size_mb * 1024 * 1024
+        removed_count = 0
+
+        while excess > 0:
+            rows = connection.execute(
+                "SELECT key, size FROM entries ORDER BY last_accessed LIMIT ?", (_EVICTION_BATCH_SIZE,)
+            ).fetchall()
+            if not rows:
+                break
+
+            victims: list[tuple[str]] = []
+            for cache_key, size in rows:
+                if excess <= 0:
+                    break
+                victims.append((cache_key,))
+                excess -= size
+
+            connection.executemany("DELETE FROM entries WHERE key = ?", victims)
+            removed_count += len(victims)
+
+        return removed_count
 
     async def _remove_entry(self, cache_key: str) -> bool:
         """キャッシュエントリを削除"""
+        self._pending_access.pop(cache_key, None)
         try:
-            # メタデータから削除
-            if cache_key in self.metadata["entries"]:
-                entry = self.metadata["entries"][cache_key]
-                self.metadata["total_size"] -= entry.get("size", 0)
-                del self.metadata["entries"][cache_key]
-
-            # ファイルを削除
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            if cache_file.exists():
-                cache_file.unlink()
-
-            await self._save_metadata()
+            with self._write_transaction() as connection:
+                connection.execute("DELETE FROM entries WHERE key = ?", (cache_key,))
             return True
 
-        except Exception:
+        except sqlite3.Error:
             return False
 
-    def _is_expired(self, entry: CacheEntry, current_time: float | None = None) -> bool:
-        """エントリが期限切れかどうかをチェック"""
+    def flush_access_updates(self) -> None:
+        """保留中の最終アクセス時刻とアクセス回数をデータベースへ書き込む"""
+        _flush_access_updates(self._connection, self._pending_access)
+
+    def close(self) -> None:
+        """保留中の更新を書き込んでデータベースを閉じる"""
+        self._finalizer()
+
+    def _total_size(self) -> int:
+        """キャッシュ全体のサイズ（バイト）を取得"""
+        return int(self._get_info("total_size"))
+
+    def _count_expired(self, current_time: float) -> int:
+        """期限切れエントリ数を作成時刻のインデックスで数える"""
+        (expired_count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM entries WHERE created < ?", (current_time - self.ttl_hours * 3600,)
+        ).fetchone()
+        return expired_count
+
+    def _get_info(self, name: str) -> float:
+        """cache_info の値を取得（未設定の場合は現在時刻）"""
+        row = self._connection.execute("SELECT value FROM cache_info WHERE name = ?", (name,)).fetchone()
+        return row[0] if row is not None else time.time()
+
+    def _set_info(self, connection: sqlite3.Connection, name: str, value: float) -> None:
+        """cache_info の値を設定"""
+        connection.execute(
+            "INSERT INTO cache_info (name, value) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+            (name, value),
+        )
+
+    def _is_expired(self, created_time: float, current_time: float | None = None) -> bool:
+        """作成時刻からエントリが期限切れかどうかをチェック"""
         if current_time is None:
             current_time = time.time()
 
-        created_time = entry.get("created", 0)
         ttl_seconds = self.ttl_hours * 3600
 
         return (current_time - created_time) > ttl_seconds
@@ -583,16 +773,14 @@ class ResponseCache:
         Returns:
             キャッシュ統計
         """
-        total_entries = len(self.metadata["entries"])
-        total_size_bytes = self.metadata.get("total_size", 0)
-        total_size_mb = total_size_bytes / (1024 * 1024)
+        try:
+            (total_entries,) = self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+            total_size_mb = self._total_size() / (1024 * 1024)
 
-        # 期限切れエントリをカウント
-        current_time = time.time()
-        expired_count = 0
-        for entry in self.metadata["entries"].values():
-            if self._is_expired(entry, current_time):
-                expired_count += 1
+            # 期限切れエントリをカウント
+            expired_count = self._count_expired(time.time())
+        except sqlite3.Error as e:
+            raise CacheError(f"キャッシュ統計の取得に失敗しました: {e}", str(self.db_path)) from e
 
         return {
             "total_entries": total_entries,
@@ -0,0 +1,78 @@
+"""
+キャッシュキー用のログフィンガープリント
+
+同じ失敗を記録したログでも、タイムスタンプ・所要時間・コンテナID・一時パスなどの
+実行ごとに変わる値が異なると、ログ全体のハッシュは一致しません。
+ここではログから抽出した失敗を正規化した集合のハッシュを求め、
+実行ごとの差異を無視してキャッシュを再利用できるようにします。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from pathlib import PurePosixPath
+
+from ..core.log_compressor import normalize_line_for_deduplication
+from ..core.log_extractor import LogExtractor
+
+# キャッシュキーの生成方式（exact: ログ全体をそのまま使用, fingerprint: 正規化した失敗の集合を使用）
+CACHE_KEY_MODES = ("exact", "fingerprint")
+
+# 数値の正規化より前に置き換える、実行ごとに変わる値のパターン
+_VOLATILE_PATTERNS = (
+    # コンテナID・コミットハッシュなどの16進数ID
+    (re.compile(r"\b[0-9a-f]{12,64}\b"), "[ID]"),
+    # UUID
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "[ID]"),
+    # 所要時間（1.23s, 150ms, 2m30s など）
+    (re.compile(r"\b\d+(?:\.\d+)?(?:ms|us|µs|s|m|h)(?:\d+(?:\.\d+)?(?:ms|s))?\b"), "[DURATION]"),
+)
+
+
+def normalize_log_line(line: str) -> str:
+    """ログの1行から実行ごとに変わる値を取り除いて正規化
+
+    Args:
+        line: ログの行
+
+    Returns:
+        正規化された行
+    """
+    for pattern, replacement in _VOLATILE_PATTERNS:
+        line = pattern.sub(replacement, line)
+    return normalize_line_for_deduplication(line)
+
+
+def compute_log_fingerprint(log_content: str, extractor: LogExtractor | None = None) -> str:
+    """ログのフィンガープリントを計算
+
+    ログから抽出した失敗の種類・正規化したメッセージ・ファイル名の集合をハッシュ化します。
+    失敗が抽出できない場合は、正規化した全行をハッシュ化します。
+
+    Args:
+        log_content: ログ内容
+        extractor: 失敗の抽出に使用する抽出器（省略時は新規作成）
+
+    Returns:
+        SHA-256のフィンガープリント（16進数）
+    """
+    failures = (extractor or LogExtractor()).extract_failures(log_content)
+
+    if failures:
+        signatures = {
+            "\t".join(
+                (
+                    failure.type.value,
+                    normalize_log_line(failure.message),
+                    PurePosixPath(failure.file_path).name if failure.file_path else "",
+                )
+            )
+            for failure in failures
+        }
+        canonical = "failures\n" + "\n".join(sorted(signatures))
+    else:
+        normalized_lines = (normalize_log_line(line) for line in log_content.splitlines())
+        canonical = "log\n" + "\n".join(line for line in normalized_lines if line)
+
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
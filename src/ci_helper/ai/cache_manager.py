@@ -12,10 +12,11 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 # ResponseCacheは遅延インポートしてテストのパッチが正しく適用されるようにする
+from .cache_fingerprint import CACHE_KEY_MODES, compute_log_fingerprint
 from .models import AnalysisResult
 
 if TYPE_CHECKING:
-    from .cache import CacheEntry, ResponseCache
+    from .cache import ResponseCache
 
 ComputeFunc = Callable[[], Awaitable[AnalysisResult]]
 
@@ -29,6 +30,7 @@ class CacheManager:
         enabled: bool = True,
         max_size_mb: int = 100,
         ttl_hours: int = 24,
+        key_mode: str = "exact",
     ):
         """キャッシュマネージャーを初期化
 
@@ -37,11 +39,22 @@ class CacheManager:
             enabled: キャッシュ有効化フラグ
             max_size_mb: 最大キャッシュサイズ（MB）
             ttl_hours: キャッシュ有効期限（時間）
+            key_mode: キャッシュキーの生成方式（"exact" または "fingerprint"）
+
+        Raises:
+            ValueError: key_mode が不正な場合
         """
+        if key_mode not in CACHE_KEY_MODES:
+            msg = f"key_mode は {CACHE_KEY_MODES} のいずれかを指定してください: {key_mode}"
+            raise ValueError(msg)
+
         self.cache_dir = cache_dir
         self.enabled = enabled
         self.max_size_mb = max_size_mb
         self.ttl_hours = ttl_hours
+        self.key_mode = key_mode
+        # 直前に計算したフィンガープリント（取得と保存で同じログを2度正規化しないため）
+        self._last_fingerprint: tuple[str, str] | None = None
 
         self._cache: ResponseCache | None = None
         if self.enabled:
@@ -59,6 +72,24 @@ class CacheManager:
         """キャッシュインスタンスを取得"""
         return self._cache
 
+    def _cache_context(self, context: str) -> str:
+        """キャッシュキーに使用するコンテキストを取得
+
+        fingerprint モードでは、ログを正規化した失敗の集合のフィンガープリントに置き換えます。
+
+        Args:
+            context: コンテキスト（ログ内容）
+
+        Returns:
+            キャッシュキーに使用するコンテキスト
+        """
+        if self.key_mode != "fingerprint":
+            return context
+
+        if self._last_fingerprint is None or self._last_fingerprint[0] != context:
+            self._last_fingerprint = (context, compute_log_fingerprint(context))
+        return self._last_fingerprint[1]
+
     async def get_cached_result(
         self,
         prompt: str,
@@ -81,7 +112,7 @@ class CacheManager:
             return None
 
         try:
-            cache_key = self._cache.get_cache_key(prompt, context, model, provider)
+            cache_key = self._cache.get_cache_key(prompt, self._cache_context(context), model, provider)
             return await self._cache.get(cache_key)
         except Exception:
             # キャッシュエラーは無視して None を返す
@@ -111,8 +142,9 @@ class CacheManager:
             return False
 
         try:
-            cache_key = self._cache.get_cache_key(prompt, context, model, provider)
-            await self._cache.set(cache_key, result, prompt, context)
+            cache_context = self._cache_context(context)
+            cache_key = self._cache.get_cache_key(prompt, cache_context, model, provider)
+            await self._cache.set(cache_key, result, prompt, cache_context)
             return True
         except Exception:
             # キャッシュエラーは無視
@@ -215,19 +247,7 @@ class CacheManager:
             }
 
         try:
-            # メタデータから該当するエントリを特定
-            removed_count = 0
-            entries_to_remove: list[str] = []
-            metadata_entries: dict[str, CacheEntry] = self._cache.metadata["entries"]
-
-            for cache_key, entry in metadata_entries.items():
-                if entry.get("provider") == provider:
-                    entries_to_remove.append(cache_key)
-
-            # エントリを削除
-            for cache_key in entries_to_remove:
-                if await self._cache.remove(cache_key):
-                    removed_count += 1
+            removed_count = await self._cache.remove_by_provider(provider)
 
             return {
                 "success": True,
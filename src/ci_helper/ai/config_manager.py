@@ -189,6 +189,7 @@ class PatternRecognitionConfigManager:
             cache_enabled=ai_config_dict.get("cache_enabled", True),
             cache_ttl_hours=ai_config_dict.get("cache_ttl_hours", 24),
             cache_max_size_mb=ai_config_dict.get("cache_max_size_mb", 100),
+            cache_key_mode=ai_config_dict.get("cache_key_mode", "exact"),
             cost_limits=ai_config_dict.get("cost_limits", {}),
             prompt_templates=ai_config_dict.get("prompt_templates", {}),
             interactive_timeout=ai_config_dict.get("interactive_timeout", 300),
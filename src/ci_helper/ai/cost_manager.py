@@ -222,17 +222,7 @@ class CostManager:
         warnings: list[dict[str, Any]] = []
 
         # 各プロバイダーの制限をチェック
-        providers: set[str] = set()
-        records_raw = self.tracker.usage_data.get("records", [])
-        if isinstance(records_raw, list):
-            records_iter = cast(list[Any], records_raw)
-            for raw_record in records_iter:
-                if not isinstance(raw_record, dict):
-                    continue
-                record = cast(dict[str, Any], raw_record)
-                provider_name = record.get("provider")
-                if isinstance(provider_name, str):
-                    providers.add(provider_name)
+        providers = self.tracker.get_providers()
 
         for provider in providers:
             limit_status = self.tracker.check_limits(provider)
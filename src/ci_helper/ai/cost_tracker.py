@@ -3,34 +3,28 @@
 
 AI使用量の記録、コスト計算、使用制限の管理を行います。
 月間使用統計、プロバイダー別コスト、使用制限チェックなどの機能を提供します。
+
+使用レコードは日別・月別の集計とともに使用量ストア（SQLiteデータベース）に保存し、
+統計は集計から求めます。``usage_data`` は日付・プロバイダー・モデル別の使用量を保持する互換用のビューです。
 """
 
 from __future__ import annotations
 
 import json
+import sqlite3
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, TypedDict, cast
+from typing import Any, cast
 
 import aiofiles  # type: ignore[import-untyped]
 
 from .exceptions import ConfigurationError
 from .models import LimitStatus, UsageStats
+from .usage_store import UsageRecord, UsageRollup, UsageStore
 
-
-class UsageRecord(TypedDict):
-    """単一の使用レコード"""
-
-    timestamp: str
-    provider: str
-    model: str
-    input_tokens: int
-    output_tokens: int
-    total_tokens: int
-    cost: float
-    analysis_type: str
-    success: bool
+# usage_data のうち日付ではないキー
+_METADATA_KEYS = frozenset({"records", "created", "last_updated", "version"})
 
 
 class CostTracker:
@@ -44,43 +38,153 @@ class CostTracker:
     ):
         """コストトラッカーを初期化
 
+        使用データベースは ``storage_path`` の拡張子を ``.db`` にしたパスに作成します。
+        ``storage_path`` に旧形式のJSONファイルがある場合は、最初の1回だけデータベースに取り込みます。
+
         Args:
             storage_path: 使用データの保存パス
             cost_limits: コスト制限の辞書
-            auto_save: 自動保存を有効にするかどうか
+            auto_save: 自動保存を有効にするかどうか（無効の場合は ``save_usage_data()`` を呼び出すまで
+                データベースに書き込まない）
+
+        Raises:
+            ConfigurationError: 使用データベースを開けない場合
         """
         self.storage_path = storage_path
         self.cost_limits = cost_limits or {}
         self.auto_save = auto_save
 
-        # 使用データを読み込み
-        self.usage_data = self._load_usage_data()
-        self._ensure_records_list()
-
         # 保存パスのディレクトリを作成
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
 
-    def _load_usage_data(self) -> dict[str, Any]:
-        """使用データを読み込み"""
+        self.db_path = storage_path.with_suffix(".db")
+        try:
+            self.store = UsageStore(self.db_path, in_memory=not auto_save)
+            self._import_legacy_data()
+            created = self.store.get_info("created")
+            if created is None:
+                created = str(time.time())
+                self.store.set_info("created", created)
+        except sqlite3.Error as e:
+            raise ConfigurationError(f"使用データベースを開けませんでした: {e}", str(self.db_path)) from e
+
+        # 使用データを読み込み
+        self.usage_data = self._load_usage_data(float(created))
+
+    def _import_legacy_data(self) -> None:
+        """旧形式のJSONファイルの使用データをデータベースに取り込む"""
+        if self.store.get_info("legacy_imported") is not None:
+            return
         if not self.storage_path.exists():
-            return {
-                "records": [],
-                "created": time.time(),
-                "last_updated": time.time(),
-                "version": "1.0",
-            }
+            self.store.set_info("legacy_imported", "1")
+            return
 
         try:
             with open(self.storage_path, encoding="utf-8") as f:
-                return json.load(f)
+                legacy_data = json.load(f)
         except Exception:
-            # データファイルが破損している場合は新規作成
-            return {
-                "records": [],
-                "created": time.time(),
-                "last_updated": time.time(),
-                "version": "1.0",
-            }
+            # データファイルが破損している場合は取り込まない
+            legacy_data = {}
+        if not isinstance(legacy_data, dict):
+            legacy_data = {}
+        legacy_data = cast(dict[str, Any], legacy_data)
+
+        records: list[UsageRecord] = []
+        records_raw = legacy_data.get("records", [])
+        if isinstance(records_raw, list):
+            for record_any in cast(list[Any], records_raw):
+                if isinstance(record_any, dict):
+                    records.append(self._normalize_record(cast(dict[str, Any], record_any)))
+
+        # 日別の使用量のうち、レコードのない日は集計として取り込む
+        record_days = {record["timestamp"][:10] for record in records}
+        rollups = [
+            rollup
+            for date_str, date_data in legacy_data.items()
+            if date_str not in record_days
+            for rollup in self._rollups_from_tree(date_str, date_data)
+        ]
+        self.store.import_legacy(records, rollups)
+
+    def _load_usage_data(self, created: float) -> dict[str, Any]:
+        """使用データベースの日別集計から使用データを作成"""
+        usage_data: dict[str, Any] = {
+            "created": created,
+            "last_updated": time.time(),
+            "version": "2.0",
+        }
+        for rollup in self.store.daily_rollups():
+            self._add_to_tree(usage_data, rollup)
+        self._stored_days = set(self.store.days())
+        return usage_data
+
+    @staticmethod
+    def _add_to_tree(usage_data: dict[str, Any], rollup: UsageRollup) -> None:
+        """日付・プロバイダー・モデル別の使用量に集計を加算"""
+        model_data = (
+            usage_data.setdefault(rollup["day"], {})
+            .setdefault(rollup["provider"], {})
+            .setdefault(
+                rollup["model"],
+                {
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "cost": 0.0,
+                    "requests": 0,
+                    "analysis_type": rollup["analysis_type"],
+                    "success": rollup["successful_requests"] == rollup["requests"],
+                },
+            )
+        )
+        model_data["input_tokens"] += rollup["input_tokens"]
+        model_data["output_tokens"] += rollup["output_tokens"]
+        model_data["cost"] += rollup["cost"]
+        model_data["requests"] += rollup["requests"]
+
+    def _rollups_from_tree(self, date_str: str, date_data: Any) -> list[UsageRollup]:
+        """日付・プロバイダー・モデル別の使用量を集計に変換
+
+        Args:
+            date_str: 日付（YYYY-MM-DD）
+            date_data: プロバイダー・モデル別の使用量
+
+        Returns:
+            集計のリスト（日付の形式でない場合は空のリスト）
+        """
+        if date_str in _METADATA_KEYS or not isinstance(date_data, dict):
+            return []
+        try:
+            datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            # 日付形式でない場合はスキップ
+            return []
+
+        rollups: list[UsageRollup] = []
+        for provider, provider_data in cast(dict[str, Any], date_data).items():
+            if not isinstance(provider_data, dict):
+                continue
+            for model, model_data in cast(dict[str, Any], provider_data).items():
+                if not isinstance(model_data, dict):
+                    continue
+                model_data_dict = cast(dict[str, Any], model_data)
+                requests = max(1, int(model_data_dict.get("requests", 1)))
+                input_tokens = int(model_data_dict.get("input_tokens", 0))
+                output_tokens = int(model_data_dict.get("output_tokens", 0))
+                rollups.append(
+                    UsageRollup(
+                        day=date_str,
+                        provider=str(provider),
+                        model=str(model),
+                        analysis_type=str(model_data_dict.get("analysis_type", "analysis")),
+                        requests=requests,
+                        successful_requests=requests if model_data_dict.get("success", True) else 0,
+                        input_tokens=input_tokens,
+                        output_tokens=output_tokens,
+                        total_tokens=input_tokens + output_tokens,
+                        cost=float(model_data_dict.get("cost", 0.0)),
+                    )
+                )
+        return rollups
 
     def _normalize_record(self, record_data: dict[str, Any]) -> UsageRecord:
         """辞書データから UsageRecord を生成"""
@@ -105,37 +209,11 @@ class CostTracker:
             success=success,
         )
 
-    def _ensure_records_list(self) -> list[UsageRecord]:
-        """usage_data に型付きの records リストを確保"""
-        records_raw = self.usage_data.get("records", [])
-        normalized_records: list[UsageRecord] = []
-        if isinstance(records_raw, list):
-            records_list = cast(list[Any], records_raw)
-            for record_any in records_list:
-                if isinstance(record_any, dict):
-                    record_dict = cast(dict[str, Any], record_any)
-                    normalized_records.append(self._normalize_record(record_dict))
-        self.usage_data["records"] = normalized_records
-        return normalized_records
-
-    def _get_records(self) -> list[UsageRecord]:
-        """現在のレコード一覧を取得"""
-        records = self.usage_data.get("records")
-        if not isinstance(records, list):
-            return self._ensure_records_list()
-        return cast(list[UsageRecord], records)
-
     async def _save_usage_data(self) -> None:
         """使用データを保存"""
         if not self.auto_save:
             return
-
-        try:
-            self.usage_data["last_updated"] = time.time()
-            async with aiofiles.open(self.storage_path, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(self.usage_data, indent=2, ensure_ascii=False))
-        except Exception as e:
-            raise ConfigurationError(f"使用データの保存に失敗しました: {e}")
+        self.save_usage_data()
 
     def record_usage(
         self,
@@ -159,57 +237,48 @@ class CostTracker:
             analysis_type: 分析タイプ
             success: 成功したかどうか
             timestamp: タイムスタンプ（指定されない場合は現在時刻）
+
+        Raises:
+            ConfigurationError: 使用データベースへの記録に失敗した場合
         """
         if timestamp is None:
             timestamp = datetime.now()
 
-        # 日付文字列を生成
-        date_str = timestamp.strftime("%Y-%m-%d")
-
-        # 階層構造でデータを保存（テスト期待形式）
-        if date_str not in self.usage_data:
-            self.usage_data[date_str] = {}
-
-        if provider not in self.usage_data[date_str]:
-            self.usage_data[date_str][provider] = {}
-
-        if model not in self.usage_data[date_str][provider]:
-            self.usage_data[date_str][provider][model] = {
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "cost": 0.0,
-                "requests": 0,
-                "analysis_type": analysis_type,
-                "success": success,
-            }
-
-        # 累積データを更新
-        model_data = self.usage_data[date_str][provider][model]
-        model_data["input_tokens"] += input_tokens
-        model_data["output_tokens"] += output_tokens
-        model_data["cost"] += cost
-        model_data["requests"] += 1
-
-        # レコード形式でも保存（他のメソッドとの互換性のため）
-        if "records" not in self.usage_data:
-            self.usage_data["records"] = []
-
-        record_entry: UsageRecord = {
-            "timestamp": timestamp.isoformat(),
-            "provider": provider,
-            "model": model,
-            "input_tokens": input_tokens,
-            "output_tokens": output_tokens,
-            "total_tokens": input_tokens + output_tokens,
-            "cost": cost,
-            "analysis_type": analysis_type,
-            "success": success,
-        }
-        self._get_records().append(record_entry)
+        record = UsageRecord(
+            timestamp=timestamp.isoformat(),
+            provider=provider,
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+            cost=cost,
+            analysis_type=analysis_type,
+            success=success,
+        )
+        try:
+            self.store.add(record)
+        except sqlite3.Error as e:
+            raise ConfigurationError(f"使用データの保存に失敗しました: {e}", str(self.db_path)) from e
 
-        # 自動保存
-        if self.auto_save:
-            self.save_usage_data()
+        # 日付・プロバイダー・モデル別の使用量を更新
+        date_str = timestamp.strftime("%Y-%m-%d")
+        self._stored_days.add(date_str)
+        self._add_to_tree(
+            self.usage_data,
+            UsageRollup(
+                day=date_str,
+                provider=provider,
+                model=model,
+                analysis_type=analysis_type,
+                requests=1,
+                successful_requests=int(success),
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=input_tokens + output_tokens,
+                cost=cost,
+            ),
+        )
+        self.usage_data["last_updated"] = time.time()
 
     async def record_usage_async(
         self,
@@ -225,6 +294,14 @@ class CostTracker:
         """使用量を記録（非同期版）"""
         self.record_usage(provider, model, input_tokens, output_tokens, cost, analysis_type, success, timestamp)
 
+    def get_providers(self) -> list[str]:
+        """使用量が記録されているプロバイダー名の一覧を取得
+
+        Returns:
+            プロバイダー名のリスト
+        """
+        return self.store.providers()
+
     def get_monthly_usage(self, year: int, month: int) -> UsageStats:
         """月間使用統計を取得
 
@@ -235,60 +312,16 @@ class CostTracker:
         Returns:
             月間使用統計
         """
-        # 対象月の記録を抽出（レコード形式から）
-        monthly_records: list[UsageRecord] = []
-        record_dates: set[str] = set()
+        start_day = f"{year:04d}-{month:02d}-01"
+        end_day = f"{year + 1:04d}-01-01" if month == 12 else f"{year:04d}-{month + 1:02d}-01"
+        monthly_rollups = self.store.daily_rollups(start_day, end_day)
 
-        for record in self._get_records():
-            record_date = datetime.fromisoformat(record["timestamp"])
-            if record_date.year == year and record_date.month == month:
-                monthly_records.append(record)
-                record_dates.add(record_date.strftime("%Y-%m-%d"))
-
-        # 階層構造からも抽出（レコードにない日付のみ）
+        # usage_data に直接追加された日付の使用量も含める
         for date_str, date_data in self.usage_data.items():
-            if date_str in ["records", "created", "last_updated", "version"] or not isinstance(date_data, dict):
-                continue
+            if start_day <= date_str < end_day and date_str not in self._stored_days:
+                monthly_rollups.extend(self._rollups_from_tree(date_str, date_data))
 
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                if date_obj.year == year and date_obj.month == month and date_str not in record_dates:
-                    # 階層データをレコード形式に変換
-                    provider_map = cast(dict[str, Any], date_data)
-                    for provider, provider_data in provider_map.items():
-                        if not isinstance(provider_data, dict):
-                            continue
-                        provider_data_dict = cast(dict[str, Any], provider_data)
-                        for model, model_data in provider_data_dict.items():
-                            if not isinstance(model_data, dict):
-                                continue
-                            model_data_dict = cast(dict[str, Any], model_data)
-                            # 複数リクエストがある場合は分割
-                            requests = max(1, int(model_data_dict.get("requests", 1)))
-                            input_tokens_val = int(model_data_dict.get("input_tokens", 0))
-                            output_tokens_val = int(model_data_dict.get("output_tokens", 0))
-                            total_tokens_val = input_tokens_val + output_tokens_val
-                            cost_val = float(model_data_dict.get("cost", 0.0))
-                            for _ in range(requests):
-                                record = self._normalize_record(
-                                    {
-                                        "timestamp": f"{date_str}T12:00:00",
-                                        "provider": provider,
-                                        "model": model,
-                                        "input_tokens": input_tokens_val // requests,
-                                        "output_tokens": output_tokens_val // requests,
-                                        "total_tokens": total_tokens_val // requests,
-                                        "cost": cost_val / requests,
-                                        "analysis_type": model_data_dict.get("analysis_type", "analysis"),
-                                        "success": model_data_dict.get("success", True),
-                                    },
-                                )
-                                monthly_records.append(record)
-            except ValueError:
-                # 日付形式でない場合はスキップ
-                continue
-
-        return self._calculate_stats(monthly_records)
+        return self._calculate_stats(monthly_rollups)
 
     def get_usage_stats(self, days: int = 30) -> UsageStats:
         """指定期間の使用統計を取得
@@ -299,52 +332,52 @@ class CostTracker:
         Returns:
             使用統計
         """
-        # 対象期間の記録を抽出
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_records: list[UsageRecord] = []
+        return self._calculate_stats(self._recent_rollups(days))
 
-        for record in self._get_records():
-            record_date = datetime.fromisoformat(record["timestamp"])
-            if record_date >= cutoff_date:
-                recent_records.append(record)
+    def _recent_rollups(self, days: int) -> list[UsageRollup]:
+        """指定日数前の時刻以降の使用量を日別に集計
 
-        return self._calculate_stats(recent_records)
+        期間の最初の日は時刻で絞り込んだレコードから、それ以降の日は日別の集計から求めます。
+        """
+        cutoff_date = datetime.now() - timedelta(days=days)
+        next_day = (cutoff_date + timedelta(days=1)).strftime("%Y-%m-%d")
+        return self.store.record_rollups(cutoff_date.isoformat(), next_day) + self.store.daily_rollups(next_day)
 
-    def _calculate_stats(self, records: list[UsageRecord]) -> UsageStats:
-        """記録から統計を計算"""
-        if not records:
+    def _calculate_stats(self, rollups: list[UsageRollup]) -> UsageStats:
+        """集計から統計を計算"""
+        total_requests = sum(r["requests"] for r in rollups)
+        if total_requests == 0:
             return UsageStats()
 
-        total_requests = len(records)
-        successful_requests = sum(1 for r in records if r["success"])
+        successful_requests = sum(r["successful_requests"] for r in rollups)
         failed_requests = total_requests - successful_requests
 
-        total_tokens = sum(r["total_tokens"] for r in records)
-        total_input_tokens = sum(r["input_tokens"] for r in records)
-        total_output_tokens = sum(r["output_tokens"] for r in records)
-        total_cost = sum(r["cost"] for r in records)
+        total_tokens = sum(r["total_tokens"] for r in rollups)
+        total_input_tokens = sum(r["input_tokens"] for r in rollups)
+        total_output_tokens = sum(r["output_tokens"] for r in rollups)
+        total_cost = sum(r["cost"] for r in rollups)
 
         # プロバイダー別統計
         provider_breakdown: dict[str, int] = {}
-        for record in records:
-            provider = record["provider"]
-            provider_breakdown[provider] = provider_breakdown.get(provider, 0) + 1
+        for rollup in rollups:
+            provider = rollup["provider"]
+            provider_breakdown[provider] = provider_breakdown.get(provider, 0) + rollup["requests"]
 
         # モデル別統計
         model_breakdown: dict[str, int] = {}
-        for record in records:
-            model = record["model"]
-            model_breakdown[model] = model_breakdown.get(model, 0) + 1
+        for rollup in rollups:
+            model = rollup["model"]
+            model_breakdown[model] = model_breakdown.get(model, 0) + rollup["requests"]
 
         # 日別使用量
         daily_usage: dict[str, float] = {}
-        for record in records:
-            date_str = record["timestamp"][:10]  # YYYY-MM-DD
-            daily_usage[date_str] = daily_usage.get(date_str, 0.0) + record["cost"]
+        for rollup in rollups:
+            date_str = rollup["day"]
+            daily_usage[date_str] = daily_usage.get(date_str, 0.0) + rollup["cost"]
 
         # 平均値を計算
-        avg_tokens_per_request = total_tokens / total_requests if total_requests > 0 else 0
-        avg_cost_per_request = total_cost / total_requests if total_requests > 0 else 0
+        avg_tokens_per_request = total_tokens / total_requests
+        avg_cost_per_request = total_cost / total_requests
 
         return UsageStats(
             total_requests=total_requests,
@@ -364,6 +397,8 @@ class CostTracker:
     def check_limits(self, provider: str) -> LimitStatus:
         """使用制限をチェック
 
+        当月のプロバイダーのコストは月別の集計から取得します。
+
         Args:
             provider: プロバイダー名
 
@@ -374,15 +409,7 @@ class CostTracker:
         current_date = datetime.now()
 
         # プロバイダー別の使用量を取得
-        provider_cost = 0.0
-        for record in self._get_records():
-            record_date = datetime.fromisoformat(record["timestamp"])
-            if (
-                record_date.year == current_date.year
-                and record_date.month == current_date.month
-                and record["provider"] == provider
-            ):
-                provider_cost += record["cost"]
+        provider_cost = self.store.monthly_cost(current_date.strftime("%Y-%m"), provider)
 
         # 制限値を取得
         monthly_limit_key = f"{provider}_monthly_usd"
@@ -481,33 +508,27 @@ class CostTracker:
         Returns:
             コスト内訳
         """
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_records: list[UsageRecord] = []
-
-        for record in self._get_records():
-            record_date = datetime.fromisoformat(record["timestamp"])
-            if record_date >= cutoff_date:
-                recent_records.append(record)
+        recent_rollups = self._recent_rollups(days)
 
         # プロバイダー別コスト
         provider_costs: dict[str, float] = {}
-        for record in recent_records:
-            provider = record["provider"]
-            provider_costs[provider] = provider_costs.get(provider, 0.0) + record["cost"]
+        for rollup in recent_rollups:
+            provider = rollup["provider"]
+            provider_costs[provider] = provider_costs.get(provider, 0.0) + rollup["cost"]
 
         # モデル別コスト
         model_costs: dict[str, float] = {}
-        for record in recent_records:
-            model = record["model"]
-            model_costs[model] = model_costs.get(model, 0.0) + record["cost"]
+        for rollup in recent_rollups:
+            model = rollup["model"]
+            model_costs[model] = model_costs.get(model, 0.0) + rollup["cost"]
 
         # 分析タイプ別コスト
         type_costs: dict[str, float] = {}
-        for record in recent_records:
-            analysis_type = record["analysis_type"]
-            type_costs[analysis_type] = type_costs.get(analysis_type, 0.0) + record["cost"]
+        for rollup in recent_rollups:
+            analysis_type = rollup["analysis_type"]
+            type_costs[analysis_type] = type_costs.get(analysis_type, 0.0) + rollup["cost"]
 
-        total_cost = sum(record["cost"] for record in recent_records)
+        total_cost = sum(rollup["cost"] for rollup in recent_rollups)
 
         return {
             "total_cost": total_cost,
@@ -515,7 +536,7 @@ class CostTracker:
             "provider_breakdown": provider_costs,
             "model_breakdown": model_costs,
             "analysis_type_breakdown": type_costs,
-            "record_count": len(recent_records),
+            "record_count": sum(rollup["requests"] for rollup in recent_rollups),
         }
 
     async def export_usage_data(self, export_path: Path, export_format: str = "json") -> None:
@@ -526,8 +547,9 @@ class CostTracker:
             export_format: エクスポート形式（json, csv）
         """
         if export_format.lower() == "json":
+            export_data = {**self.usage_data, "records": list(self.store.iter_records())}
             async with aiofiles.open(export_path, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(self.usage_data, indent=2, ensure_ascii=False))
+                await f.write(json.dumps(export_data, indent=2, ensure_ascii=False))
         elif export_format.lower() == "csv":
             await self._export_csv(export_path)
         else:
@@ -558,7 +580,7 @@ class CostTracker:
         )
 
         # データ行
-        for record in self._get_records():
+        for record in self.store.iter_records():
             writer.writerow(
                 [
                     record["timestamp"],
@@ -586,25 +608,19 @@ class CostTracker:
         Returns:
             使用傾向の分析結果
         """
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_records: list[UsageRecord] = []
+        recent_rollups = self._recent_rollups(days)
 
-        for record in self._get_records():
-            record_date = datetime.fromisoformat(record["timestamp"])
-            if record_date >= cutoff_date:
-                recent_records.append(record)
-
-        if not recent_records:
+        if not recent_rollups:
             return {"message": "分析対象のデータがありません"}
 
         # 日別使用量の傾向
         daily_costs: dict[str, float] = {}
         daily_requests: dict[str, int] = {}
 
-        for record in recent_records:
-            date_str = record["timestamp"][:10]
-            daily_costs[date_str] = daily_costs.get(date_str, 0.0) + record["cost"]
-            daily_requests[date_str] = daily_requests.get(date_str, 0) + 1
+        for rollup in recent_rollups:
+            date_str = rollup["day"]
+            daily_costs[date_str] = daily_costs.get(date_str, 0.0) + rollup["cost"]
+            daily_requests[date_str] = daily_requests.get(date_str, 0) + rollup["requests"]
 
         # 傾向分析
         dates: list[str] = sorted(daily_costs.keys())
@@ -640,13 +656,15 @@ class CostTracker:
         }
 
     def save_usage_data(self) -> None:
-        """使用データを同期的に保存"""
+        """使用データを同期的に保存
+
+        自動保存が有効な場合、記録はその都度データベースに書き込まれています。
+        """
         try:
             self.usage_data["last_updated"] = time.time()
-            with open(self.storage_path, "w", encoding="utf-8") as f:
-                json.dump(self.usage_data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            raise ConfigurationError(f"使用データの保存に失敗しました: {e}")
+            self.store.flush()
+        except sqlite3.Error as e:
+            raise ConfigurationError(f"使用データの保存に失敗しました: {e}", str(self.db_path)) from e
 
     def cleanup_old_data(self, days: int = 90) -> int:
         """古いデータをクリーンアップ
@@ -655,24 +673,21 @@ class CostTracker:
             days: 保持する日数
 
         Returns:
-            削除されたレコード数
+            削除されたレコード数（レコードと日付別の使用量の件数の合計）
         """
         cutoff_date = datetime.now() - timedelta(days=days)
-        cleaned_count = 0
+        cutoff_day = cutoff_date.strftime("%Y-%m-%d")
 
-        # レコード形式のデータをクリーンアップ
-        records = self._get_records()
-        original_count = len(records)
-        filtered_records: list[UsageRecord] = [
-            record for record in records if datetime.fromisoformat(record["timestamp"]) > cutoff_date
-        ]
-        self.usage_data["records"] = filtered_records
-        cleaned_count += original_count - len(filtered_records)
+        # レコード形式のデータをクリーンアップ（集計も更新される）
+        try:
+            cleaned_count = self.store.delete_before(cutoff_date.isoformat())
+        except sqlite3.Error as e:
+            raise ConfigurationError(f"使用データのクリーンアップに失敗しました: {e}", str(self.db_path)) from e
 
-        # 階層構造のデータもクリーンアップ
+        # 日付別の使用量もクリーンアップ
         dates_to_remove: list[str] = []
-        for date_str in list(self.usage_data.keys()):
-            if date_str in ["records", "created", "last_updated", "version"]:
+        for date_str in self.usage_data:
+            if date_str in _METADATA_KEYS:
                 continue
 
             try:
@@ -688,6 +703,12 @@ class CostTracker:
             del self.usage_data[date_str]
             cleaned_count += 1
 
+        # 期間の境界の日は残ったレコードの集計で使用量を作り直す
+        self._stored_days = set(self.store.days())
+        next_day = (cutoff_date + timedelta(days=1)).strftime("%Y-%m-%d")
+        for rollup in self.store.daily_rollups(cutoff_day, next_day):
+            self._add_to_tree(self.usage_data, rollup)
+
         if cleaned_count > 0 and self.auto_save:
             # 同期的に保存
             self.save_usage_data()
@@ -706,14 +727,10 @@ class CostTracker:
             日次使用統計
         """
         target_date = datetime(year, month, day)
-        daily_records: list[UsageRecord] = []
-
-        for record in self._get_records():
-            record_date = datetime.fromisoformat(record["timestamp"])
-            if record_date.date() == target_date.date():
-                daily_records.append(record)
-
-        return self._calculate_stats(daily_records)
+        next_date = target_date + timedelta(days=1)
+        return self._calculate_stats(
+            self.store.daily_rollups(target_date.strftime("%Y-%m-%d"), next_date.strftime("%Y-%m-%d"))
+        )
 
     def get_provider_usage(self, provider: str) -> UsageStats:
         """プロバイダー別使用統計を取得
@@ -724,8 +741,4 @@ class CostTracker:
         Returns:
             プロバイダー別使用統計
         """
-        provider_records: list[UsageRecord] = [
-            record for record in self._get_records() if record["provider"] == provider
-        ]
-
-        return self._calculate_stats(provider_records)
+        return self._calculate_stats(self.store.daily_rollups(provider=provider))
@@ -6,14 +6,18 @@ ci-helperのAI分析機能の中核となるクラスです。
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from collections.abc import AsyncIterator
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from ..core.models import FailureType
 from ..utils.config import Config
+from ..utils.token_counter import get_token_counter
 from .cache_manager import CacheManager
 from .config_manager import AIConfigManager
 from .cost_manager import CostManager
@@ -36,12 +40,24 @@ from .fallback_handler import FallbackHandler
 from .fix_applier import FixApplier, FixSuggestionsSummary, RollbackResult
 from .fix_generator import FixSuggestionGenerator
 from .interactive_session import InteractiveSessionManager
+from .map_reduce import (
+    CHUNK_SIZE_MARGIN,
+    MAP_REDUCE_CONCURRENCY,
+    MAX_CHUNK_SPLITS,
+    LogChunk,
+    merge_results,
+    split_log,
+)
 from .models import AIConfig, AnalysisResult, AnalysisStatus, AnalyzeOptions, InteractiveSession, ProviderConfig
 from .prompts import PromptManager
-from .providers.base import AIProvider, ProviderFactory
+from .provider_latency import ProviderLatencyTracker
+from .providers.base import INPUT_TOKEN_LIMIT_RATIO, AIProvider, ProviderFactory
 
 logger = logging.getLogger(__name__)
 
+# 同時に分析を依頼するプロバイダーの最大数
+MAX_RACE_PROVIDERS = 3
+
 
 class AIIntegration:
     """AI統合メインクラス
@@ -81,6 +97,7 @@ class AIIntegration:
                 cache_enabled=ai_section.get("cache_enabled", True),
                 cache_ttl_hours=ai_section.get("cache_ttl_hours", 24),
                 cache_max_size_mb=ai_section.get("cache_max_size_mb", 100),
+                cache_key_mode=ai_section.get("cache_key_mode", "exact"),
                 cost_limits=ai_section.get("cost_limits", {}),
                 prompt_templates=ai_section.get("prompts", {}),
                 interactive_timeout=ai_section.get("interactive_timeout", 300),
@@ -132,6 +149,7 @@ class AIIntegration:
         self.fix_applier: FixApplier | None = None
         self.providers: dict[str, AIProvider] = {}
         self.active_sessions: dict[str, InteractiveSession] = {}
+        self.latency_tracker = ProviderLatencyTracker()
         self._initialized = False
 
     async def initialize(self) -> None:
@@ -192,12 +210,16 @@ class AIIntegration:
                     enabled=True,
                     max_size_mb=self.ai_config.cache_max_size_mb,
                     ttl_hours=self.ai_config.cache_ttl_hours,
+                    key_mode=self.ai_config.cache_key_mode,
                 )
 
             # コスト管理を初期化
             cost_storage_path = self.config.get_path("cache_dir") / "ai" / "usage.json"
             self.cost_manager = CostManager(storage_path=cost_storage_path, cost_limits=self.ai_config.cost_limits)
 
+            # プロバイダーの応答時間の記録を読み込み
+            self.latency_tracker = ProviderLatencyTracker(self.config.get_path("cache_dir") / "ai" / "latency.json")
+
             # 利用可能なプロバイダーを初期化
             await self._initialize_providers()
 
@@ -292,7 +314,7 @@ class AIIntegration:
 
         try:
             # プロバイダーを選択
-            provider = self._select_provider(options.provider)
+            provider = self._select_provider(options.provider, len(log_content))
 
             # ログ内容を前処理
             formatted_log = await self._preprocess_log(log_content)
@@ -319,13 +341,13 @@ class AIIntegration:
 
             # キャッシュをチェック
             cached_result = None
+            cache_model = options.model or provider.config.default_model
             if options.use_cache and self.cache_manager:
                 try:
-                    model = options.model or provider.config.default_model
                     cached_result = await self.cache_manager.get_cached_result(
                         prompt=options.custom_prompt or "default",
                         context=formatted_log,
-                        model=model,
+                        model=cache_model,
                         provider=provider.name,
                     )
 
@@ -353,14 +375,28 @@ class AIIntegration:
             # コスト推定と制限チェック
             await self._check_cost_limits(provider, prompt, formatted_log, options)
 
-            # AI分析を実行
-            result = await self._execute_analysis(provider, prompt, formatted_log, options)
+            # AI分析を実行（同時実行モードでは複数のプロバイダーのうち最初の有効な結果を使用）
+            try:
+                if options.race_providers:
+                    racers = await self._select_race_providers(provider, prompt, formatted_log, options)
+                    analysis_provider, run_options, result = await self._race_analysis(
+                        racers, prompt, formatted_log, options
+                    )
+                else:
+                    analysis_provider, run_options = provider, options
+                    result = await self._execute_analysis(provider, prompt, formatted_log, options)
+            except TokenLimitError as limit_error:
+                # コンテキストウィンドウに収まらないログは分割して並列に分析する
+                if limit_error.used_tokens <= 0 or limit_error.limit <= 0:
+                    raise
+                analysis_provider, run_options = provider, options
+                result = await self._map_reduce_analysis(provider, formatted_log, options, limit_error)
 
             # 分析時間を記録
             analysis_time = (datetime.now() - start_time).total_seconds()
             result.analysis_time = analysis_time
-            result.provider = provider.name
-            result.model = options.model or provider.config.default_model
+            result.provider = analysis_provider.name
+            result.model = run_options.model or analysis_provider.config.default_model
             result.status = AnalysisStatus.COMPLETED
 
             # パターン認識結果を追加
@@ -380,7 +416,7 @@ class AIIntegration:
             # 使用量を記録
             if result.tokens_used and self.cost_manager:
                 await self.cost_manager.record_ai_usage(
-                    provider=provider.name,
+                    provider=analysis_provider.name,
                     model=result.model,
                     input_tokens=result.tokens_used.input_tokens,
                     output_tokens=result.tokens_used.output_tokens,
@@ -388,13 +424,13 @@ class AIIntegration:
                     analysis_type="analysis",
                 )
 
-            # 結果をキャッシュ
+            # 結果をキャッシュ（同時実行モードでも次回の検索と同じキーで保存する）
             if self.cache_manager:
                 try:
                     await self.cache_manager.cache_result(
                         prompt=options.custom_prompt or "default",
                         context=formatted_log,
-                        model=result.model,
+                        model=cache_model,
                         provider=provider.name,
                         result=result,
                     )
@@ -452,15 +488,15 @@ class AIIntegration:
         if not self._initialized:
             await self.initialize()
 
-        if not options.streaming:
-            # ストリーミングが無効な場合は通常の分析を実行
+        if not options.streaming or options.race_providers:
+            # ストリーミングが無効な場合・同時実行モードの場合は通常の分析を実行
             result = await self.analyze_log(log_content, options)
             yield result.summary
             return
 
         try:
             # プロバイダーを選択
-            provider = self._select_provider(options.provider)
+            provider = self._select_provider(options.provider, len(log_content))
 
             # ログ内容を前処理
             formatted_log = await self._preprocess_log(log_content)
@@ -507,7 +543,7 @@ class AIIntegration:
                 await self.initialize()
 
             # プロバイダーを選択
-            provider = self._select_provider(options.provider)
+            provider = self._select_provider(options.provider, len(initial_log))
             model = options.model or provider.config.default_model
 
             # セッション管理を使用してセッションを作成
@@ -736,11 +772,13 @@ class AIIntegration:
                 raise AIError(f"修正のロールバックに失敗しました: {error_info['message']}") from e
             raise AIError(f"修正のロールバックに失敗しました: {e}") from e
 
-    def _select_provider(self, provider_name: str | None = None) -> AIProvider:
+    def _select_provider(self, provider_name: str | None = None, log_size: int | None = None) -> AIProvider:
         """使用するプロバイダーを選択
 
         Args:
             provider_name: 指定されたプロバイダー名
+            log_size: 分析するログのサイズ（指定した場合、デフォルトプロバイダーが利用できなければ
+                応答時間の記録から最も速いプロバイダーを選択）
 
         Returns:
             選択されたプロバイダー
@@ -767,9 +805,52 @@ class AIIntegration:
         if self.ai_config and self.ai_config.default_provider in self.providers:
             return self.providers[self.ai_config.default_provider]
 
+        # ログサイズに対して最も速いプロバイダーを使用
+        if log_size is not None:
+            fastest = self.latency_tracker.fastest(list(self.providers), log_size)
+            if fastest is not None:
+                return self.providers[fastest]
+
         # 最初に利用可能なプロバイダーを使用
         return next(iter(self.providers.values()))
 
+    async def _select_race_providers(
+        self,
+        provider: AIProvider,
+        prompt: str,
+        context: str,
+        options: AnalyzeOptions,
+    ) -> list[AIProvider]:
+        """同時に分析を依頼するプロバイダーを選択
+
+        選択済みのプロバイダーを先頭に、残りを応答時間の速い順に最大 ``MAX_RACE_PROVIDERS`` 個まで選びます。
+        コスト制限を超過しているプロバイダーは除外します。
+
+        Args:
+            provider: 選択済みのプロバイダー
+            prompt: プロンプト
+            context: コンテキスト
+            options: 分析オプション
+
+        Returns:
+            プロバイダーのリスト
+
+        """
+        racers = [provider]
+        for name in self.latency_tracker.rank(list(self.providers), len(context)):
+            if len(racers) >= MAX_RACE_PROVIDERS:
+                break
+            candidate = self.providers[name]
+            if candidate is provider:
+                continue
+            try:
+                await self._check_cost_limits(candidate, prompt, context, options)
+            except AIError as e:
+                logger.info("プロバイダー '%s' を同時実行から除外: %s", name, e)
+                continue
+            racers.append(candidate)
+        return racers
+
     async def _preprocess_log(self, log_content: str) -> str:
         """ログ内容を前処理
 
@@ -871,20 +952,19 @@ class AIIntegration:
         if not self.cost_manager:
             return
 
-        # 入力トークン数を推定
-        input_text = f"{prompt}\n\n{context}"
-        input_tokens = provider.count_tokens(input_text, options.model)
-
-        # 出力トークン数を推定（入力の50%と仮定）
-        estimated_output_tokens = int(input_tokens * 0.5)
-
-        # コストを推定
-        estimated_cost = provider.estimate_cost(input_tokens, estimated_output_tokens, options.model)
-
         # 制限をチェック
         limit_check = self.cost_manager.check_usage_limits(provider.name)
 
         if limit_check.get("over_limit", False):
+            # エラーメッセージ用の推定コストなので、トークン数は厳密にカウントせず推定する
+            input_text = f"{prompt}\n\n{context}"
+            input_tokens = get_token_counter().estimate(input_text, options.model)
+
+            # 出力トークン数を推定（入力の50%と仮定）
+            estimated_output_tokens = int(input_tokens * 0.5)
+
+            # コストを推定
+            estimated_cost = provider.estimate_cost(input_tokens, estimated_output_tokens, options.model)
             raise AIError(f"コスト制限を超過しています (推定: ${estimated_cost:.4f})")
 
         if limit_check.get("near_limit", False):
@@ -910,7 +990,9 @@ class AIIntegration:
 
         """
         try:
+            started = time.perf_counter()
             result = await provider.analyze(prompt, context, options)
+            self.latency_tracker.record(provider.name, len(context), time.perf_counter() - started)
             result.status = AnalysisStatus.COMPLETED
             return result
         except AIError:
@@ -923,6 +1005,198 @@ class AIIntegration:
                 raise AIError(f"AI分析の実行に失敗しました: {error_info['message']}") from e
             raise AIError(f"AI分析の実行に失敗しました: {e}") from e
 
+    async def _race_analysis(
+        self,
+        providers: list[AIProvider],
+        prompt: str,
+        context: str,
+        options: AnalyzeOptions,
+    ) -> tuple[AIProvider, AnalyzeOptions, AnalysisResult]:
+        """複数のプロバイダーで同時に分析し、最初の有効な結果を返す
+
+        有効な結果（サマリーが空でない結果）が得られた時点で、残りのプロバイダーの分析はキャンセルします。
+        モデルの指定は先頭のプロバイダーにのみ適用し、他のプロバイダーはデフォルトモデルを使用します。
+        採用しなかった結果の使用量もここで記録します（採用した結果の使用量は呼び出し元で記録）。
+
+        Args:
+            providers: 分析を依頼するプロバイダー（先頭が選択済みのプロバイダー）
+            prompt: プロンプト
+            context: コンテキスト
+            options: 分析オプション
+
+        Returns:
+            (結果を返したプロバイダー, そのプロバイダーに使用した分析オプション, 分析結果)
+
+        Raises:
+            AIError: すべてのプロバイダーで有効な結果が得られなかった場合（先頭に近いプロバイダーのエラー）
+
+        """
+        tasks: dict[asyncio.Task[AnalysisResult], tuple[AIProvider, AnalyzeOptions]] = {}
+        for index, provider in enumerate(providers):
+            run_options = options if index == 0 or options.model is None else replace(options, model=None)
+            task = asyncio.create_task(self._execute_analysis(provider, prompt, context, run_options))
+            tasks[task] = (provider, run_options)
+
+        errors: dict[asyncio.Task[AnalysisResult], BaseException] = {}
+        winner: asyncio.Task[AnalysisResult] | None = None
+        pending = set(tasks)
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # 同時に完了した場合は先頭に近いプロバイダーの結果を優先する
+                for task in [task for task in tasks if task in done]:
+                    provider, _ = tasks[task]
+                    error = task.exception()
+                    if error is not None:
+                        logger.warning("プロバイダー '%s' の分析に失敗: %s", provider.name, error)
+                        errors[task] = error
+                        continue
+                    if task.result().summary.strip():
+                        winner = task
+                        break
+                    logger.warning("プロバイダー '%s' の分析結果が空です", provider.name)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        await self._record_race_usage(tasks, winner)
+        if winner is not None:
+            provider, run_options = tasks[winner]
+            logger.info("プロバイダー '%s' の分析結果を使用 (同時実行: %d個)", provider.name, len(tasks))
+            return provider, run_options, winner.result()
+
+        first_error = next((errors[task] for task in tasks if task in errors), None)
+        if isinstance(first_error, Exception):
+            raise first_error
+        raise AIError("すべてのプロバイダーで有効な分析結果が得られませんでした")
+
+    async def _record_race_usage(
+        self,
+        tasks: dict[asyncio.Task[AnalysisResult], tuple[AIProvider, AnalyzeOptions]],
+        winner: asyncio.Task[AnalysisResult] | None,
+    ) -> None:
+        """同時実行で採用しなかった結果の使用量を記録
+
+        キャンセルまでに結果を返したプロバイダーにも料金が発生しているため、空の結果や
+        同時に完了して採用されなかった結果の使用量も記録します。
+
+        Args:
+            tasks: 分析タスクと (プロバイダー, 分析オプション) の辞書
+            winner: 採用した結果のタスク（採用した結果がない場合はNone）
+
+        """
+        if not self.cost_manager:
+            return
+
+        for task, (provider, run_options) in tasks.items():
+            if task is winner or not task.done() or task.cancelled() or task.exception() is not None:
+                continue
+            result = task.result()
+            if not result.tokens_used:
+                continue
+            await self.cost_manager.record_ai_usage(
+                provider=provider.name,
+                model=run_options.model or provider.config.default_model,
+                input_tokens=result.tokens_used.input_tokens,
+                output_tokens=result.tokens_used.output_tokens,
+                cost=result.tokens_used.estimated_cost,
+                analysis_type="analysis",
+                success=bool(result.summary.strip()),
+            )
+
+    async def _map_reduce_analysis(
+        self,
+        provider: AIProvider,
+        log_content: str,
+        options: AnalyzeOptions,
+        limit_error: TokenLimitError,
+    ) -> AnalysisResult:
+        """ログをジョブのセクションごとに分割して並列に分析し、結果を統合
+
+        チャンクの大きさは、制限を超えた入力のトークン数と制限の比から求めます。
+        それでも制限を超えたチャンクは、さらに半分に分割して分析します。
+
+        Args:
+            provider: 使用するプロバイダー
+            log_content: 前処理済みのログ内容
+            options: 分析オプション
+            limit_error: ログ全体の分析で発生したトークン制限エラー
+
+        Returns:
+            統合した分析結果（分析に失敗したチャンクがある場合は ``log_info["failed_chunks"]`` に件数を記録）
+
+        Raises:
+            AIError: すべてのチャンクの分析に失敗した場合（ログ内で最初のチャンクのエラー）
+
+        """
+        max_chars = int(
+            len(log_content) * limit_error.limit * INPUT_TOKEN_LIMIT_RATIO / limit_error.used_tokens * CHUNK_SIZE_MARGIN
+        )
+        chunks = split_log(log_content, max_chars)
+        logger.info("ログがコンテキストウィンドウを超えるため %d 個のチャンクに分割して分析します", len(chunks))
+
+        semaphore = asyncio.Semaphore(MAP_REDUCE_CONCURRENCY)
+        outcomes = await asyncio.gather(
+            *(self._analyze_chunk(provider, chunk, options, semaphore) for chunk in chunks),
+            return_exceptions=True,
+        )
+
+        parts: list[tuple[LogChunk, AnalysisResult]] = []
+        errors: list[Exception] = []
+        for chunk, outcome in zip(chunks, outcomes, strict=True):
+            if isinstance(outcome, Exception):
+                logger.warning("チャンク '%s' の分析に失敗: %s", chunk.label, outcome)
+                errors.append(outcome)
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                parts.extend(outcome)
+
+        if not parts:
+            raise errors[0] if errors else limit_error
+
+        result = merge_results(parts)
+        if errors:
+            result.log_info["failed_chunks"] = len(errors)
+        return result
+
+    async def _analyze_chunk(
+        self,
+        provider: AIProvider,
+        chunk: LogChunk,
+        options: AnalyzeOptions,
+        semaphore: asyncio.Semaphore,
+        splits: int = 0,
+    ) -> list[tuple[LogChunk, AnalysisResult]]:
+        """チャンクを分析（制限を超えた場合は ``MAX_CHUNK_SPLITS`` 回まで半分に分割して分析）
+
+        Args:
+            provider: 使用するプロバイダー
+            chunk: 分析するチャンク
+            options: 分析オプション
+            semaphore: 同時に分析するチャンク数の制限
+            splits: このチャンクまでに分割した回数
+
+        Returns:
+            (チャンク, 分析結果) のリスト（分割した場合は分割後のチャンクごと）
+
+        """
+        prompt = self._generate_analysis_prompt(chunk.text, options)
+        try:
+            async with semaphore:
+                result = await self._execute_analysis(provider, prompt, chunk.text, options)
+        except TokenLimitError:
+            halves = chunk.split() if splits < MAX_CHUNK_SPLITS else []
+            if not halves:
+                raise
+            parts = await asyncio.gather(
+                *(self._analyze_chunk(provider, half, options, semaphore, splits + 1) for half in halves)
+            )
+            return [part for half_parts in parts for part in half_parts]
+        return [(chunk, result)]
+
     async def get_usage_stats(self) -> dict[str, Any]:
         """使用統計を取得
 
@@ -0,0 +1,96 @@
+"""複数キーワードの検索
+
+テキストを一度だけ小文字化し、キーワードごとに ``str.find`` で最初の出現位置を求めます。
+``str.find`` はC実装の高速な部分文字列検索のため、Pythonで1文字ずつ状態を遷移させる
+走査（Aho-Corasick法など）よりも、キーワード数だけ検索を繰り返す方が速くなります。
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from typing import Any
+
+
+class KeywordSearcher:
+    """大文字小文字を区別しないキーワード検索"""
+
+    def __init__(self, keywords: Iterable[str]):
+        """検索器を作成
+
+        Args:
+            keywords: 検索するキーワード（空文字列は無視）
+
+        """
+        self.keywords: tuple[str, ...] = tuple(dict.fromkeys(k.lower() for k in keywords if k))
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSONに変換可能な辞書として取得
+
+        Returns:
+            キーワードの辞書
+
+        """
+        return {"keywords": list(self.keywords)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> KeywordSearcher:
+        """:meth:`to_dict` の辞書から検索器を復元
+
+        Args:
+            data: :meth:`to_dict` で取得した辞書
+
+        Returns:
+            キーワード検索器
+
+        Raises:
+            KeyError: 必要な項目が欠けている場合
+
+        """
+        return cls(data["keywords"])
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def first_positions(self, text: str, keywords: Iterable[str] | None = None) -> dict[str, int]:
+        """各キーワードの最初の出現位置を取得
+
+        Args:
+            text: 検索対象テキスト
+            keywords: 検索するキーワード（省略時は検索器の全キーワード）
+
+        Returns:
+            小文字化したキーワードから開始位置への辞書（見つからないキーワードは含まない）
+
+        """
+        targets = self.keywords if keywords is None else dict.fromkeys(k.lower() for k in keywords if k)
+        lowered = text.lower()
+        positions: dict[str, int] = {}
+
+        if len(lowered) == len(text):
+            # 小文字化で文字数が変わらなければ、小文字化したテキストの位置が元のテキストの位置と一致する
+            for keyword in targets:
+                position = lowered.find(keyword)
+                if position != -1:
+                    positions[keyword] = position
+        else:
+            # 小文字化で文字数が変わる文字を含む場合は、元のテキストを大文字小文字を区別せずに検索
+            for keyword in targets:
+                match = re.search(re.escape(keyword), text, re.IGNORECASE)
+                if match is not None:
+                    positions[keyword] = match.start()
+
+        return positions
+
+    def find_keywords(self, text: str, keywords: Iterable[str] | None = None) -> set[str]:
+        """テキスト内に現れるキーワードを取得
+
+        Args:
+            text: 検索対象テキスト
+            keywords: 検索するキーワード（省略時は検索器の全キーワード）
+
+        Returns:
+            見つかったキーワード（小文字）のセット
+
+        """
+        return set(self.first_positions(text, keywords))
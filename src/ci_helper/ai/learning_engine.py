@@ -11,7 +11,7 @@ import json
 import logging
 import re
 from collections import Counter, defaultdict
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Mapping, Sequence
 from dataclasses import replace
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -19,6 +19,8 @@ from typing import TYPE_CHECKING, Any, TypedDict, cast
 
 from .models import FixSuggestion, Pattern, PatternMatch, UserFeedback
 from .pattern_database import PatternDatabase
+from .pattern_discovery import extract_error_messages, normalize_error_message
+from .similarity_index import SetSimilarityIndex
 
 if TYPE_CHECKING:
     from .feedback_collector import FeedbackCollector
@@ -136,6 +138,10 @@ class LearningEngine:
         )
         self.fix_application_history: list[dict[str, Any]] = []
 
+        # 読み込んだ未知エラーと類似度インデックス（ファイルが変更されるまで再利用）
+        self._unknown_errors_cache: tuple[list[UnknownErrorPayload], SetSimilarityIndex] | None = None
+        self._unknown_errors_fingerprint: tuple[int, int, int] | None = None
+
         self._initialized = False
 
     async def initialize(self) -> None:
@@ -345,26 +351,39 @@ class LearningEngine:
         Args:
             failed_logs: 失敗ログのリスト
 
+        Returns:
+            発見された新しいパターンのリスト
+        """
+        logger.info("新しいパターンの発見を開始: %d 個のログを分析", len(failed_logs))
+
+        # エラーメッセージを抽出
+        error_counts: Counter[str] = Counter()
+        for log in failed_logs:
+            error_counts.update(extract_error_messages(log))
+
+        return await self.discover_patterns_from_error_counts(error_counts)
+
+    async def discover_patterns_from_error_counts(self, error_counts: Mapping[str, int]) -> list[Pattern]:
+        """エラーメッセージの出現回数をエラー頻度に加えて新しいパターンを発見
+
+        ログ履歴をまとめて集計した結果など、抽出済みのエラーメッセージの出現回数から発見する場合に使用します。
+        発見したパターンの ``occurrence_count`` にはエラー頻度（パターン候補の支持数）を設定します。
+
+        Args:
+            error_counts: 正規化したエラーメッセージごとの出現回数
+
         Returns:
             発見された新しいパターンのリスト
         """
         if not self._initialized:
             await self.initialize()
 
-        logger.info("新しいパターンの発見を開始: %d 個のログを分析", len(failed_logs))
-
         discovered_patterns: list[Pattern] = []
 
         try:
-            # エラーメッセージを抽出
-            error_messages: list[str] = []
-            for log in failed_logs:
-                extracted_errors = self._extract_error_messages(log)
-                error_messages.extend(extracted_errors)
-
             # エラー頻度を更新
-            for error in error_messages:
-                self.error_frequency[error] += 1
+            for error, count in error_counts.items():
+                self.error_frequency[error] += count
 
             # 頻出エラーから新しいパターンを生成
             frequent_errors = self._find_frequent_errors()
@@ -395,30 +414,7 @@ class LearningEngine:
         Returns:
             抽出されたエラーメッセージのリスト
         """
-        error_messages: list[str] = []
-
-        # 一般的なエラーパターン
-        error_patterns = [
-            r"Error: (.+)",
-            r"Exception: (.+)",
-            r"ERROR: (.+)",
-            r"FAILED: (.+)",
-            r"(.+Error): (.+)",
-            r"(.+Exception): (.+)",
-            r"CRITICAL: (.+)",
-            r"FATAL: (.+)",
-        ]
-
-        for pattern in error_patterns:
-            matches = re.finditer(pattern, log_content, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                error_msg = match.group(1) if match.lastindex == 1 else match.group(0)
-                # エラーメッセージを正規化
-                normalized_error = self._normalize_error_message(error_msg)
-                if normalized_error and len(normalized_error) > 10:  # 短すぎるエラーは除外
-                    error_messages.append(normalized_error)
-
-        return error_messages
+        return extract_error_messages(log_content)
 
     def _normalize_error_message(self, error_message: str) -> str:
         """エラーメッセージを正規化
@@ -429,28 +425,7 @@ class LearningEngine:
         Returns:
             正規化されたエラーメッセージ
         """
-        # 改行を削除
-        normalized = error_message.replace("\n", " ").replace("\r", " ")
-
-        # 複数のスペースを単一のスペースに
-        normalized = re.sub(r"\s+", " ", normalized)
-
-        # 先頭と末尾の空白を削除
-        normalized = normalized.strip()
-
-        # パスや数値などの可変部分を汎用化
-        # ファイルパス
-        normalized = re.sub(r"/[^\s]+", "/path/to/file", normalized)
-        normalized = re.sub(r"[A-Za-z]:\\\\[^\s]+", "C:\\\\path\\\\to\\\\file", normalized)
-
-        # 数値
-        normalized = re.sub(r"\b\d+\b", "N", normalized)
-
-        # UUIDやハッシュ
-        normalized = re.sub(r"\b[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}\b", "UUID", normalized)
-        normalized = re.sub(r"\b[a-f0-9]{32,}\b", "HASH", normalized)
-
-        return normalized
+        return normalize_error_message(error_message)
 
     def _find_frequent_errors(self) -> list[tuple[str, int]]:
         """頻出エラーを特定
@@ -469,35 +444,15 @@ class LearningEngine:
     def _is_duplicate_pattern(self, error_signature: str) -> bool:
         """既存パターンと重複していないかチェック
 
+        パターンデータベースが保持する類似度インデックスで、正規表現のマッチとキーワードの類似度を調べます。
+
         Args:
             error_signature: エラーシグネチャ
 
         Returns:
             重複している場合True
         """
-        existing_patterns = self.pattern_database.get_all_patterns()
-
-        for pattern in existing_patterns:
-            # 正規表現パターンとの類似性をチェック
-            for regex_pattern in pattern.regex_patterns:
-                try:
-                    if re.search(regex_pattern, error_signature, re.IGNORECASE):
-                        return True
-                except re.error:
-                    continue
-
-            # キーワードとの類似性をチェック
-            error_words = set(error_signature.lower().split())
-            pattern_words = set(" ".join(pattern.keywords).lower().split())
-
-            # 共通単語の割合が高い場合は重複とみなす
-            if error_words and pattern_words:
-                intersection = error_words & pattern_words
-                similarity = len(intersection) / len(error_words | pattern_words)
-                if similarity > 0.7:  # 70%以上の類似性
-                    return True
-
-        return False
+        return self.pattern_database.get_similarity_index().is_duplicate(error_signature)
 
     async def _create_pattern_from_error(self, error_signature: str, frequency: int) -> Pattern | None:
         """エラーシグネチャから新しいパターンを作成
@@ -538,6 +493,7 @@ class LearningEngine:
                 created_at=datetime.now(),
                 updated_at=datetime.now(),
                 user_defined=False,  # 自動学習パターン
+                occurrence_count=frequency,
             )
 
             # 学習済みパターンとして記録
@@ -1242,25 +1198,12 @@ class LearningEngine:
         )
 
         try:
-            unknown_errors: list[UnknownErrorPayload] = []
-            if self.unknown_errors_file.exists():
-                try:
-                    with self.unknown_errors_file.open(
-                        "r",
-                        encoding="utf-8",
-                    ) as file_obj:
-                        content = file_obj.read().strip()
-                        if content:
-                            stored_errors_raw = cast(list[dict[str, Any]], json.loads(content))
-                            unknown_errors = [
-                                self._normalize_unknown_error_payload(error) for error in stored_errors_raw
-                            ]
-                except json.JSONDecodeError, FileNotFoundError:
-                    logger.warning("未知エラーファイルが破損しています。空のリストで初期化します。")
+            unknown_errors, index = self._load_unknown_errors()
 
             similar_error = self._find_similar_unknown_error(
                 normalized_info,
                 unknown_errors,
+                index,
             )
 
             if similar_error:
@@ -1272,21 +1215,32 @@ class LearningEngine:
                 )
             else:
                 unknown_errors.append(normalized_info)
+                index.add(
+                    len(unknown_errors) - 1,
+                    self._unknown_error_keywords(normalized_info),
+                    normalized_info.get("error_category"),
+                )
                 logger.info(
                     "新しい未知エラーを追加: %s",
                     normalized_info.get("error_category"),
                 )
 
-            with self.unknown_errors_file.open(
-                "w",
-                encoding="utf-8",
-            ) as file_obj:
-                json.dump(
-                    unknown_errors,
-                    file_obj,
-                    ensure_ascii=False,
-                    indent=2,
-                )
+            try:
+                with self.unknown_errors_file.open(
+                    "w",
+                    encoding="utf-8",
+                ) as file_obj:
+                    json.dump(
+                        unknown_errors,
+                        file_obj,
+                        ensure_ascii=False,
+                        indent=2,
+                    )
+            except BaseException:
+                # 保存できなかった更新を次回に持ち越さないように読み込み直す
+                self._unknown_errors_cache = None
+                raise
+            self._unknown_errors_fingerprint = _file_fingerprint(self.unknown_errors_file)
 
             frequent_errors = self._get_frequent_unknown_errors(unknown_errors)
 
@@ -1321,35 +1275,69 @@ class LearningEngine:
                 "error_category": normalized_info.get("error_category"),
             }
 
+    def _load_unknown_errors(self) -> tuple[list[UnknownErrorPayload], SetSimilarityIndex]:
+        """未知エラーと、そのキーワードの類似度インデックスを取得
+
+        未知エラー検出器も同じファイルに書き込むため、前回の読み込み・保存以降にファイルが
+        変更されていない場合だけ保持しているデータを再利用します。
+
+        Returns:
+            (未知エラーのリスト, 類似度インデックス) のタプル（インデックスのキーはリストの位置）
+        """
+        fingerprint = _file_fingerprint(self.unknown_errors_file)
+        if self._unknown_errors_cache is not None and fingerprint == self._unknown_errors_fingerprint:
+            return self._unknown_errors_cache
+
+        unknown_errors: list[UnknownErrorPayload] = []
+        if fingerprint is not None:
+            try:
+                with self.unknown_errors_file.open(
+                    "r",
+                    encoding="utf-8",
+                ) as file_obj:
+                    content = file_obj.read().strip()
+                    if content:
+                        stored_errors_raw = cast(list[dict[str, Any]], json.loads(content))
+                        unknown_errors = [self._normalize_unknown_error_payload(error) for error in stored_errors_raw]
+            except json.JSONDecodeError, FileNotFoundError:
+                logger.warning("未知エラーファイルが破損しています。空のリストで初期化します。")
+
+        index = SetSimilarityIndex.build(
+            (position, self._unknown_error_keywords(error), error.get("error_category"))
+            for position, error in enumerate(unknown_errors)
+        )
+        self._unknown_errors_cache = (unknown_errors, index)
+        self._unknown_errors_fingerprint = fingerprint
+        return self._unknown_errors_cache
+
+    @staticmethod
+    def _unknown_error_keywords(unknown_error_info: UnknownErrorPayload) -> set[str]:
+        """未知エラーのキーワードの集合を取得"""
+        return set(unknown_error_info.get("error_features", {}).get("error_keywords", []))
+
     def _find_similar_unknown_error(
-        self, unknown_error_info: UnknownErrorPayload, existing_errors: list[UnknownErrorPayload]
+        self,
+        unknown_error_info: UnknownErrorPayload,
+        existing_errors: list[UnknownErrorPayload],
+        index: SetSimilarityIndex,
     ) -> UnknownErrorPayload | None:
         """類似の未知エラーを検索
 
+        カテゴリが同じで、キーワードの類似度が70%を超える最初のエラーを返します。
+
         Args:
             unknown_error_info: 新しい未知エラー情報
             existing_errors: 既存の未知エラーリスト
+            index: 既存の未知エラーのキーワードの類似度インデックス
 
         Returns:
             類似のエラー、見つからない場合はNone
         """
-        new_category = unknown_error_info.get("error_category")
-        new_keywords = set(unknown_error_info.get("error_features", {}).get("error_keywords", []))
-
-        for existing_error in existing_errors:
-            # カテゴリが同じかチェック
-            if existing_error.get("error_category") != new_category:
-                continue
-
-            # キーワードの類似度をチェック
-            existing_keywords = set(existing_error.get("error_features", {}).get("error_keywords", []))
-
-            if existing_keywords and new_keywords:
-                similarity = len(existing_keywords & new_keywords) / len(existing_keywords | new_keywords)
-                if similarity > 0.7:  # 70%以上の類似度
-                    return existing_error
-
-        return None
+        similar = index.find_similar(
+            self._unknown_error_keywords(unknown_error_info),
+            unknown_error_info.get("error_category"),
+        )
+        return existing_errors[similar[0]] if similar else None
 
     def _get_frequent_unknown_errors(
         self, unknown_errors: Sequence[UnknownErrorPayload], min_occurrences: int | None = None
@@ -1729,3 +1717,12 @@ class LearningEngine:
         except Exception as e:
             logger.error("未知エラークリーンアップ中にエラー: %s", e)
             return 0
+
+
+def _file_fingerprint(path: Path) -> tuple[int, int, int] | None:
+    """ファイルの変更を検出するための (inode, 更新時刻, サイズ)（ファイルがない場合はNone）"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,151 @@
+"""
+大きなログの分割分析
+
+コンテキストウィンドウに収まらないログをジョブのセクションごとに分割してチャンクにまとめ、
+チャンクごとの分析結果（根本原因、修正提案、トークン使用量、コスト）を1つの分析結果に統合します。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from ..core.log_analyzer import LogAnalyzer
+from ..core.log_index import LogIndex
+from .models import AnalysisResult, AnalysisStatus, FixSuggestion, RootCause, TokenUsage
+
+# 同時に分析するチャンクの最大数
+MAP_REDUCE_CONCURRENCY = 4
+
+# チャンクのサイズを制限から求める際の余裕（プロンプトのテンプレート部分などの分）
+CHUNK_SIZE_MARGIN = 0.75
+
+# 制限を超えたチャンクを半分に分割して分析し直す最大回数
+MAX_CHUNK_SPLITS = 3
+
+
+@dataclass
+class LogChunk:
+    """分析するログのチャンク"""
+
+    text: str
+    sections: list[str] = field(default_factory=list)  # チャンクに含まれるセクション名
+
+    @property
+    def label(self) -> str:
+        """結果の見出しに使う名前"""
+        return ", ".join(self.sections) or "default"
+
+    def split(self) -> list[LogChunk]:
+        """行の境界でチャンクを2つに分割
+
+        Returns:
+            分割したチャンクのリスト（1行しかない場合は空のリスト）
+        """
+        lines = self.text.splitlines(keepends=True)
+        if len(lines) < 2:
+            return []
+        middle = len(lines) // 2
+        return [
+            LogChunk(text="".join(lines[:middle]), sections=list(self.sections)),
+            LogChunk(text="".join(lines[middle:]), sections=list(self.sections)),
+        ]
+
+
+def split_log(log_content: str, max_chars: int, log_index: LogIndex | None = None) -> list[LogChunk]:
+    """ログをジョブのセクションごとに分割し、最大サイズ以下のチャンクにまとめる
+
+    ジョブの境界はログインデックスのジョブのセクションから求めます（``LogAnalyzer.split_sections``）。
+    隣り合う小さなセクションは1つのチャンクにまとめ、最大サイズを超えるセクションは行の境界で分割します。
+
+    Args:
+        log_content: ログ内容
+        max_chars: チャンクの最大文字数
+        log_index: 作成済みのログインデックス（Noneの場合は新規作成）
+
+    Returns:
+        ログ内の順序のチャンクのリスト
+    """
+    max_chars = max(max_chars, 1)
+    chunks: list[LogChunk] = []
+    current: LogChunk | None = None
+
+    for name, section in LogAnalyzer().split_sections(log_content, log_index):
+        if len(section) > max_chars:
+            pieces = _split_section(section, max_chars)
+            for index, piece in enumerate(pieces, 1):
+                chunks.append(LogChunk(text=piece, sections=[f"{name} ({index}/{len(pieces)})"]))
+            current = None
+        elif current is not None and len(current.text) + len(section) <= max_chars:
+            current.text += section
+            current.sections.append(name)
+        else:
+            current = LogChunk(text=section, sections=[name])
+            chunks.append(current)
+
+    return chunks
+
+
+def merge_results(parts: list[tuple[LogChunk, AnalysisResult]]) -> AnalysisResult:
+    """チャンクごとの分析結果を統合
+
+    サマリーはチャンクごとの見出し付きで連結し、根本原因・修正提案・関連エラーは重複を除いて
+    ログ内の順序で並べます。トークン使用量とコストは合計します。
+
+    Args:
+        parts: (チャンク, 分析結果) のリスト（ログ内の順序）
+
+    Returns:
+        統合した分析結果
+    """
+    summaries: list[str] = []
+    root_causes: dict[tuple[str, str, str | None, int | None], RootCause] = {}
+    fix_suggestions: dict[tuple[str, str], FixSuggestion] = {}
+    related_errors: dict[str, None] = {}
+    token_usages: list[TokenUsage] = []
+
+    for chunk, result in parts:
+        summaries.append(f"### {chunk.label}\n\n{result.summary.strip()}")
+        for cause in result.root_causes:
+            root_causes.setdefault((cause.category, cause.description, cause.file_path, cause.line_number), cause)
+        for suggestion in result.fix_suggestions:
+            fix_suggestions.setdefault((suggestion.title, suggestion.description), suggestion)
+        related_errors.update(dict.fromkeys(result.related_errors))
+        if result.tokens_used:
+            token_usages.append(result.tokens_used)
+
+    tokens_used = None
+    if token_usages:
+        tokens_used = TokenUsage(
+            input_tokens=sum(usage.input_tokens for usage in token_usages),
+            output_tokens=sum(usage.output_tokens for usage in token_usages),
+            total_tokens=sum(usage.total_tokens for usage in token_usages),
+            estimated_cost=sum(usage.estimated_cost for usage in token_usages),
+        )
+
+    return AnalysisResult(
+        summary="\n\n".join(summaries),
+        root_causes=list(root_causes.values()),
+        fix_suggestions=list(fix_suggestions.values()),
+        related_errors=list(related_errors),
+        confidence_score=sum(result.confidence_score for _, result in parts) / len(parts) if parts else 0.0,
+        tokens_used=tokens_used,
+        status=AnalysisStatus.COMPLETED,
+        log_info={"chunks": len(parts)},
+    )
+
+
+def _split_section(section: str, max_chars: int) -> list[str]:
+    """セクションを行の境界で最大サイズ以下に分割（最大サイズを超える行はその行だけで1つにする）"""
+    pieces: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in section.splitlines(keepends=True):
+        if current and size + len(line) > max_chars:
+            pieces.append("".join(current))
+            current = []
+            size = 0
+        current.append(line)
+        size += len(line)
+    if current:
+        pieces.append("".join(current))
+    return pieces
@@ -273,6 +273,7 @@ class AIConfig:
     cache_enabled: bool = True  # キャッシュ有効化
     cache_ttl_hours: int = 24  # キャッシュ有効期限（時間）
     cache_max_size_mb: int = 100  # キャッシュ最大サイズ（MB）
+    cache_key_mode: str = "exact"  # キャッシュキーの生成方式 (exact/fingerprint)
     cost_limits: dict[str, float] = field(default_factory=dict)  # コスト制限
     prompt_templates: dict[str, str] = field(default_factory=dict)  # プロンプトテンプレート
     interactive_timeout: int = 300  # 対話タイムアウト（秒）
@@ -324,6 +325,7 @@ class AIConfig:
             and self.cache_enabled == other.cache_enabled
             and self.cache_ttl_hours == other.cache_ttl_hours
             and self.cache_max_size_mb == other.cache_max_size_mb
+            and self.cache_key_mode == other.cache_key_mode
             and self.cost_limits == other.cost_limits
             and self.prompt_templates == other.prompt_templates
             and self.interactive_timeout == other.interactive_timeout
@@ -384,6 +386,11 @@ class AIConfig:
                 f"auto_fix_risk_tolerance must be one of {valid_risk_levels}, got '{self.auto_fix_risk_tolerance}'"
             )
 
+        # キャッシュキー生成方式の検証
+        valid_cache_key_modes = ["exact", "fingerprint"]
+        if self.cache_key_mode not in valid_cache_key_modes:
+            errors.append(f"cache_key_mode must be one of {valid_cache_key_modes}, got '{self.cache_key_mode}'")
+
         # パターンカテゴリの検証
         valid_categories = ["permission", "network", "config", "dependency", "build", "test"]
         invalid_categories = [cat for cat in self.enabled_pattern_categories if cat not in valid_categories]
@@ -417,6 +424,7 @@ class AIConfig:
             cache_enabled=True,
             cache_ttl_hours=24,
             cache_max_size_mb=100,
+            cache_key_mode="exact",
             cost_limits={},
             prompt_templates={},
             interactive_timeout=300,
@@ -458,6 +466,7 @@ class AIConfig:
             cache_enabled=self.cache_enabled,
             cache_ttl_hours=self.cache_ttl_hours,
             cache_max_size_mb=self.cache_max_size_mb,
+            cache_key_mode=self.cache_key_mode or default_config.cache_key_mode,
             cost_limits=self.cost_limits or default_config.cost_limits,
             prompt_templates=self.prompt_templates or default_config.prompt_templates,
             interactive_timeout=self.interactive_timeout,
@@ -949,6 +958,7 @@ class AnalyzeOptions:
     temperature: float = 0.1  # 温度パラメータ
     timeout_seconds: int = 30  # タイムアウト
     force_ai_analysis: bool = False  # AI分析を強制実行（フォールバックを無視）
+    race_providers: bool = False  # 複数のプロバイダーで同時に分析し、最初の有効な結果を使用
     pattern_analysis_options: PatternAnalysisOptions = field(
         default_factory=PatternAnalysisOptions
     )  # パターン分析オプション
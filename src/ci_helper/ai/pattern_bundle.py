@@ -0,0 +1,174 @@
+"""
+検証済みパターンバンドル
+
+パターンファイルを読み込み・検証・マージした結果と、全パターンのキーワードから構築した
+キーワード検索器を1つのJSONファイルにまとめてキャッシュします。
+バンドルには元のパターンファイルの内容のハッシュを記録し、いずれかのファイルが
+変更・追加・削除された場合は古いバンドルとして破棄します。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .keyword_searcher import KeywordSearcher
+from .models import Pattern
+
+logger = logging.getLogger(__name__)
+
+# バンドルファイルの形式バージョン（形式を変更した場合は更新する）
+BUNDLE_FORMAT_VERSION = 2
+
+# バンドルファイル名（パターンデータディレクトリ直下に保存）
+BUNDLE_FILENAME = ".pattern_bundle.json"
+
+
+def pattern_to_dict(pattern: Pattern) -> dict[str, Any]:
+    """パターンをJSONに変換可能な辞書に変換
+
+    Args:
+        pattern: パターン
+
+    Returns:
+        パターンファイル形式の辞書
+    """
+    return {
+        "id": pattern.id,
+        "name": pattern.name,
+        "category": pattern.category,
+        "regex_patterns": pattern.regex_patterns,
+        "keywords": pattern.keywords,
+        "context_requirements": pattern.context_requirements,
+        "confidence_base": pattern.confidence_base,
+        "success_rate": pattern.success_rate,
+        "created_at": pattern.created_at.isoformat(),
+        "updated_at": pattern.updated_at.isoformat(),
+        "user_defined": pattern.user_defined,
+        "auto_generated": pattern.auto_generated,
+        "source": pattern.source,
+        "occurrence_count": pattern.occurrence_count,
+    }
+
+
+def _pattern_from_dict(pattern_data: dict[str, Any]) -> Pattern:
+    """:func:`pattern_to_dict` の辞書からパターンを復元
+
+    Args:
+        pattern_data: :func:`pattern_to_dict` で変換した辞書
+
+    Returns:
+        パターン
+
+    Raises:
+        KeyError: 必要な項目が欠けている場合
+        ValueError: 日時の形式が不正な場合
+    """
+    return Pattern(
+        id=str(pattern_data["id"]),
+        name=str(pattern_data["name"]),
+        category=str(pattern_data["category"]),
+        regex_patterns=list(pattern_data["regex_patterns"]),
+        keywords=list(pattern_data["keywords"]),
+        context_requirements=list(pattern_data["context_requirements"]),
+        confidence_base=float(pattern_data["confidence_base"]),
+        success_rate=float(pattern_data["success_rate"]),
+        created_at=datetime.fromisoformat(pattern_data["created_at"]),
+        updated_at=datetime.fromisoformat(pattern_data["updated_at"]),
+        user_defined=bool(pattern_data["user_defined"]),
+        auto_generated=bool(pattern_data["auto_generated"]),
+        source=str(pattern_data["source"]),
+        occurrence_count=int(pattern_data["occurrence_count"]),
+    )
+
+
+def hash_pattern_sources(source_paths: list[Path]) -> str:
+    """パターンファイルの内容のハッシュを計算
+
+    存在しないファイルも「存在しない」という状態としてハッシュに含めるため、
+    ファイルの追加・削除でもハッシュが変わります。
+
+    Args:
+        source_paths: パターンファイルのパス（順序も含めてハッシュ化）
+
+    Returns:
+        SHA-256のハッシュ値（16進数）
+    """
+    hash_obj = hashlib.sha256(f"v{BUNDLE_FORMAT_VERSION}".encode())
+    for path in source_paths:
+        hash_obj.update(str(path).encode("utf-8") + b"\0")
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            hash_obj.update(b"-")
+            continue
+        hash_obj.update(len(content).to_bytes(8, "big"))
+        hash_obj.update(content)
+    return hash_obj.hexdigest()
+
+
+@dataclass
+class PatternBundle:
+    """検証済みパターンとキーワード検索器のバンドル"""
+
+    source_hash: str  # 元のパターンファイルの内容のハッシュ
+    patterns: dict[str, Pattern]  # 検証済みのパターン
+    keyword_searcher: KeywordSearcher  # 全パターンのキーワードの検索器
+
+    def save(self, bundle_path: Path) -> None:
+        """バンドルを保存（一時ファイルに書き出してから置き換える）
+
+        Args:
+            bundle_path: バンドルファイルのパス
+
+        Raises:
+            OSError: 書き込みに失敗した場合
+        """
+        data = {
+            "version": BUNDLE_FORMAT_VERSION,
+            "source_hash": self.source_hash,
+            "patterns": [pattern_to_dict(pattern) for pattern in self.patterns.values()],
+            "keyword_searcher": self.keyword_searcher.to_dict(),
+        }
+
+        temp_path = bundle_path.with_name(f".{bundle_path.name}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_path, bundle_path)
+
+    @classmethod
+    def load(cls, bundle_path: Path, source_hash: str) -> PatternBundle | None:
+        """保存済みのバンドルを読み込み
+
+        Args:
+            bundle_path: バンドルファイルのパス
+            source_hash: 現在のパターンファイルの内容のハッシュ
+
+        Returns:
+            パターンバンドル（存在しない・古い・破損している場合はNone）
+        """
+        try:
+            with open(bundle_path, encoding="utf-8") as f:
+                data: dict[str, Any] = json.load(f)
+
+            if data.get("version") != BUNDLE_FORMAT_VERSION or data.get("source_hash") != source_hash:
+                return None
+
+            patterns: dict[str, Pattern] = {}
+            for pattern_data in data["patterns"]:
+                pattern = _pattern_from_dict(pattern_data)
+                patterns[pattern.id] = pattern
+
+            return cls(source_hash, patterns, KeywordSearcher.from_dict(data["keyword_searcher"]))
+
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug("パターンバンドルの読み込みに失敗しました: %s - %s", bundle_path, e)
+            return None
@@ -12,7 +12,10 @@ from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+from .keyword_searcher import KeywordSearcher
 from .models import Pattern
+from .pattern_bundle import BUNDLE_FILENAME, PatternBundle, hash_pattern_sources, pattern_to_dict
+from .similarity_index import PatternSimilarityIndex
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +47,12 @@ class PatternDatabase:
         # 後方互換性のための既存ファイル
         self.legacy_pattern_file = Path("test_data") / "failure_patterns.json"
         self._loaded = False
+        # 全パターンのキーワードの検索器（パターン変更時に破棄）
+        self._keyword_searcher: KeywordSearcher | None = None
+        # 重複パターンのチェックに使うインデックス（パターン変更時に破棄）
+        self._similarity_index: PatternSimilarityIndex | None = None
+        # 検証済みパターンのキャッシュ（パターンファイルが変わらない限り再利用）
+        self.bundle_path = self.data_directory / BUNDLE_FILENAME
 
     async def load_patterns(self) -> None:
         """パターンデータベースを読み込み"""
@@ -51,6 +60,24 @@ class PatternDatabase:
             return
 
         logger.info("パターンデータベースを読み込み中: %s", self.data_directory)
+        self._keyword_searcher = None
+        self._similarity_index = None
+
+        # 事前に追加されたパターンがない場合のみバンドルを利用する（バンドルはファイルの内容のみを表す）
+        # legacyファイルはカレントディレクトリからの相対パスのため、バンドルには含めずに毎回読み込む
+        use_bundle = not self.patterns
+        source_hash = hash_pattern_sources(self._pattern_source_paths()) if use_bundle else ""
+
+        if use_bundle:
+            bundle = PatternBundle.load(self.bundle_path, source_hash)
+            if bundle is not None:
+                self.patterns.update(bundle.patterns)
+                self._keyword_searcher = bundle.keyword_searcher
+                logger.info("パターンバンドルから %d 個のパターンを読み込みました", len(self.patterns))
+                if await self._load_legacy_pattern_file():
+                    self._keyword_searcher = None
+                self._loaded = True
+                return
 
         try:
             # 新しいパターンファイル構造を読み込み
@@ -59,8 +86,13 @@ class PatternDatabase:
             # カスタムパターンファイルを読み込み
             custom_patterns_loaded = await self._load_custom_pattern_files()
 
+            if use_bundle and patterns_loaded + custom_patterns_loaded > 0:
+                self._save_bundle(source_hash)
+
             # 後方互換性: 既存のlegacyファイルがあれば読み込み
             legacy_patterns_loaded = await self._load_legacy_pattern_file()
+            if legacy_patterns_loaded:
+                self._keyword_searcher = None
 
             total_loaded = patterns_loaded + custom_patterns_loaded + legacy_patterns_loaded
 
@@ -76,6 +108,29 @@ class PatternDatabase:
             # フォールバック: デフォルトパターンを作成
             await self._create_default_patterns()
 
+    def _pattern_source_paths(self) -> list[Path]:
+        """バンドルに含めるパターンファイルのパスを取得
+
+        Returns:
+            データディレクトリ内のパターンファイルのパスのリスト（読み込み順）
+        """
+        return [
+            *(self.data_directory / pattern_file for pattern_file in self.pattern_files),
+            *(self.data_directory / pattern_file for pattern_file in self.custom_pattern_files),
+        ]
+
+    def _save_bundle(self, source_hash: str) -> None:
+        """読み込んだパターンをバンドルとして保存
+
+        Args:
+            source_hash: 読み込み時のパターンファイルの内容のハッシュ
+        """
+        bundle = PatternBundle(source_hash, dict(self.patterns), self.get_keyword_searcher())
+        try:
+            bundle.save(self.bundle_path)
+        except OSError as e:
+            logger.debug("パターンバンドルの保存に失敗しました: %s - %s", self.bundle_path, e)
+
     async def _load_new_pattern_files(self) -> int:
         """新しいパターンファイル構造を読み込み
 
@@ -449,6 +504,8 @@ class PatternDatabase:
         }
 
         self.patterns.update(default_patterns)
+        self._keyword_searcher = None
+        self._similarity_index = None
         logger.info("デフォルトパターンを %d 個作成しました", len(default_patterns))
         self._loaded = True
 
@@ -506,25 +563,7 @@ class PatternDatabase:
         file_path = self.data_directory / filename
 
         pattern_data = {
-            "patterns": [
-                {
-                    "id": pattern.id,
-                    "name": pattern.name,
-                    "category": pattern.category,
-                    "regex_patterns": pattern.regex_patterns,
-                    "keywords": pattern.keywords,
-                    "context_requirements": pattern.context_requirements,
-                    "confidence_base": pattern.confidence_base,
-                    "success_rate": pattern.success_rate,
-                    "created_at": pattern.created_at.isoformat(),
-                    "updated_at": pattern.updated_at.isoformat(),
-                    "user_defined": pattern.user_defined,
-                    "auto_generated": pattern.auto_generated,
-                    "source": pattern.source,
-                    "occurrence_count": pattern.occurrence_count,
-                }
-                for pattern in patterns
-            ],
+            "patterns": [pattern_to_dict(pattern) for pattern in patterns],
             "metadata": {
                 "description": "ユーザー定義パターン" if "user" in filename else "学習済みパターン",
                 "created_at": datetime.now().isoformat(),
@@ -568,6 +607,32 @@ class PatternDatabase:
         """
         return list(self.patterns.values())
 
+    def get_keyword_searcher(self) -> KeywordSearcher:
+        """全パターンのキーワードの検索器を取得
+
+        初回呼び出し時に構築し、パターンが追加・更新・削除されるまで再利用します。
+
+        Returns:
+            キーワード検索器
+        """
+        if self._keyword_searcher is None:
+            self._keyword_searcher = KeywordSearcher(
+                keyword for pattern in self.patterns.values() for keyword in pattern.keywords
+            )
+        return self._keyword_searcher
+
+    def get_similarity_index(self) -> PatternSimilarityIndex:
+        """エラーシグネチャと重複するパターンを検索するインデックスを取得
+
+        初回呼び出し時に構築し、パターンが追加・更新・削除されるまで再利用します。
+
+        Returns:
+            パターンの類似度インデックス
+        """
+        if self._similarity_index is None:
+            self._similarity_index = PatternSimilarityIndex(self.patterns.values())
+        return self._similarity_index
+
     def add_pattern(self, pattern: Pattern) -> bool:
         """新しいパターンを追加
 
@@ -581,6 +646,8 @@ class PatternDatabase:
             return False
 
         self.patterns[pattern.id] = pattern
+        self._keyword_searcher = None
+        self._similarity_index = None
         logger.info("パターンを追加しました: %s", pattern.id)
         return True
 
@@ -602,6 +669,8 @@ class PatternDatabase:
 
         pattern.updated_at = datetime.now()
         self.patterns[pattern.id] = pattern
+        self._keyword_searcher = None
+        self._similarity_index = None
         logger.info("パターンを更新しました: %s", pattern.id)
         return True
 
@@ -619,6 +688,8 @@ class PatternDatabase:
             return False
 
         del self.patterns[pattern_id]
+        self._keyword_searcher = None
+        self._similarity_index = None
         logger.info("パターンを削除しました: %s", pattern_id)
         return True
 
@@ -0,0 +1,247 @@
+"""
+ログ履歴からのエラーメッセージの集計
+
+ログからのエラーメッセージの抽出と正規化、ログ履歴全体のエラーメッセージの出現回数の集計を行います。
+抽出用の正規表現はどれも ``error: `` などの手がかりの文字列を含む行にしかマッチしないため、
+手がかりを含む行を文字列検索で見つけ、その行だけに正規表現を適用します。
+ログはまとまった行数ずつ読み込んで処理し、複数のログはワーカープロセスで並列に集計します。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import lzma
+import os
+import re
+import zlib
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..core.log_storage import is_compressed_log, open_log_text
+
+logger = logging.getLogger(__name__)
+
+# エラーメッセージを抽出する正規表現（グループが1つの場合はグループ、それ以外はマッチ全体をメッセージとする）
+ERROR_MESSAGE_PATTERNS = (
+    r"Error: (.+)",
+    r"Exception: (.+)",
+    r"ERROR: (.+)",
+    r"FAILED: (.+)",
+    r"(.+Error): (.+)",
+    r"(.+Exception): (.+)",
+    r"CRITICAL: (.+)",
+    r"FATAL: (.+)",
+)
+
+# 正規化後のエラーメッセージの最小の長さ（この長さ以下の短すぎるメッセージは除外）
+MIN_ERROR_MESSAGE_LENGTH = 10
+
+# 1回に読み込むログの文字数の目安（行の途中では区切らない）
+READ_BLOCK_CHARS = 4 * 1024 * 1024
+
+# 抽出用の正規表現がマッチする行に必ず含まれる文字列（小文字）
+_CANDIDATE_KEYWORDS = ("error: ", "exception: ", "failed: ", "critical: ", "fatal: ")
+
+_ERROR_MESSAGE_REGEXES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in ERROR_MESSAGE_PATTERNS)
+_CANDIDATE_KEYWORD_PATTERN = re.compile("|".join(map(re.escape, _CANDIDATE_KEYWORDS)), re.IGNORECASE)
+
+# エラーメッセージの正規化に使う正規表現
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_UNIX_PATH_PATTERN = re.compile(r"/[^\s]+")
+_WINDOWS_PATH_PATTERN = re.compile(r"[A-Za-z]:\\\\[^\s]+")
+_NUMBER_PATTERN = re.compile(r"\b\d+\b")
+_UUID_PATTERN = re.compile(r"\b[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}\b")
+_HASH_PATTERN = re.compile(r"\b[a-f0-9]{32,}\b")
+
+# ワーカープロセスで集計する場合に1回で渡すログの数の上限
+_MAX_LOGS_PER_TASK = 16
+
+
+@dataclass
+class LogErrorCounts:
+    """1つのログのエラーメッセージの出現回数"""
+
+    path: Path  # ログファイルのパス
+    counts: Counter[str] = field(default_factory=Counter)  # 正規化したエラーメッセージごとの出現回数
+    error: str | None = None  # 読み込みに失敗した場合のエラー
+
+
+def normalize_error_message(error_message: str) -> str:
+    """エラーメッセージを正規化
+
+    Args:
+        error_message: 元のエラーメッセージ
+
+    Returns:
+        正規化されたエラーメッセージ
+    """
+    # 改行を削除
+    normalized = error_message.replace("\n", " ").replace("\r", " ")
+
+    # 複数のスペースを単一のスペースに
+    normalized = _WHITESPACE_PATTERN.sub(" ", normalized)
+
+    # 先頭と末尾の空白を削除
+    normalized = normalized.strip()
+
+    # パスや数値などの可変部分を汎用化
+    # ファイルパス
+    normalized = _UNIX_PATH_PATTERN.sub("/path/to/file", normalized)
+    normalized = _WINDOWS_PATH_PATTERN.sub("C:\\\\path\\\\to\\\\file", normalized)
+
+    # 数値
+    normalized = _NUMBER_PATTERN.sub("N", normalized)
+
+    # UUIDやハッシュ
+    normalized = _UUID_PATTERN.sub("UUID", normalized)
+    normalized = _HASH_PATTERN.sub("HASH", normalized)
+
+    return normalized
+
+
+def extract_error_messages(log_content: str) -> list[str]:
+    """ログからエラーメッセージを抽出
+
+    抽出用の正規表現ごとに、ログ全体を先頭から検索した場合と同じ順序でメッセージを返します。
+
+    Args:
+        log_content: ログ内容
+
+    Returns:
+        正規化されたエラーメッセージのリスト
+    """
+    lines = _candidate_lines(log_content)
+    error_messages: list[str] = []
+    for regex in _ERROR_MESSAGE_REGEXES:
+        # 正規表現はどれも行末までマッチするため、1行に2つ以上マッチすることはない
+        for line in lines:
+            match = regex.search(line)
+            if match is None:
+                continue
+            error_msg = match.group(1) if match.lastindex == 1 else match.group(0)
+            normalized_error = normalize_error_message(error_msg)
+            if normalized_error and len(normalized_error) > MIN_ERROR_MESSAGE_LENGTH:
+                error_messages.append(normalized_error)
+    return error_messages
+
+
+def _candidate_lines(text: str) -> list[str]:
+    """手がかりの文字列を含む行を取得
+
+    Args:
+        text: ログ内容
+
+    Returns:
+        手がかりを含む行のリスト（ログ内の順序）
+    """
+    if text.isascii():
+        # ASCII文字だけなら小文字化しても位置が変わらず、大文字小文字を区別しないマッチと結果が一致する
+        lowered = text.lower()
+        positions: list[int] = []
+        for keyword in _CANDIDATE_KEYWORDS:
+            position = lowered.find(keyword)
+            while position >= 0:
+                positions.append(position)
+                position = lowered.find(keyword, position + 1)
+    else:
+        positions = [match.start() for match in _CANDIDATE_KEYWORD_PATTERN.finditer(text)]
+
+    line_starts = sorted({text.rfind("\n", 0, position) + 1 for position in positions})
+    lines: list[str] = []
+    for start in line_starts:
+        end = text.find("\n", start)
+        lines.append(text[start:] if end < 0 else text[start:end])
+    return lines
+
+
+def count_log_errors(path: Path) -> LogErrorCounts:
+    """ログファイルのエラーメッセージの出現回数を集計
+
+    ログはまとまった行数ずつ読み込むため、ファイル全体をメモリに載せません。
+
+    Args:
+        path: ログファイルのパス（圧縮済みのログも可）
+
+    Returns:
+        エラーメッセージの出現回数（読み込めない場合はエラーを設定）
+    """
+    result = LogErrorCounts(path)
+    try:
+        with open_log_text(path, errors="replace") as f:
+            while lines := f.readlines(READ_BLOCK_CHARS):
+                result.counts.update(extract_error_messages("".join(lines)))
+    except (OSError, EOFError, lzma.LZMAError, zlib.error) as e:
+        result.counts.clear()
+        result.error = str(e)
+    return result
+
+
+def count_errors_in_logs(log_paths: Sequence[Path], max_workers: int | None = None) -> Iterator[LogErrorCounts]:
+    """複数のログファイルのエラーメッセージの出現回数を集計
+
+    ワーカーが2つ以上の場合はワーカープロセスで並列に集計します。
+
+    Args:
+        log_paths: ログファイルのパスのリスト
+        max_workers: ワーカープロセスの数（省略時はCPU数）
+
+    Yields:
+        ログごとのエラーメッセージの出現回数（``log_paths`` の順）
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(log_paths))
+    if workers <= 1:
+        for path in log_paths:
+            yield count_log_errors(path)
+        return
+
+    chunksize = max(1, min(_MAX_LOGS_PER_TASK, len(log_paths) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(count_log_errors, log_paths, chunksize=chunksize)
+
+
+def log_key(path: Path) -> str:
+    """処理済みのログを識別するキーを取得（圧縮の前後で同じキー）
+
+    Args:
+        path: ログファイルのパス
+
+    Returns:
+        圧縮の拡張子を除いたファイル名
+    """
+    return path.stem if is_compressed_log(path) else path.name
+
+
+def load_processed_logs(record_path: Path) -> set[str]:
+    """集計済みのログのキーを読み込み
+
+    Args:
+        record_path: 集計済みのログの記録ファイル
+
+    Returns:
+        集計済みのログのキー（記録がない場合は空）
+    """
+    if not record_path.exists():
+        return set()
+    try:
+        with open(record_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("集計済みのログの記録を読み込めません: %s - %s", record_path, e)
+        return set()
+    return {key for key in data.get("logs", []) if isinstance(key, str)}
+
+
+def save_processed_logs(record_path: Path, keys: Iterable[str]) -> None:
+    """集計済みのログのキーを保存
+
+    Args:
+        record_path: 集計済みのログの記録ファイル
+        keys: 集計済みのログのキー
+    """
+    record_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(record_path, "w", encoding="utf-8") as f:
+        json.dump({"logs": sorted(keys)}, f, ensure_ascii=False, indent=2)
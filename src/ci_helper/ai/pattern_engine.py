@@ -9,6 +9,7 @@ import logging
 from pathlib import Path
 from typing import Any
 
+from ..core.log_index import LineIndex
 from .confidence_calculator import ConfidenceCalculator
 from .models import AnalysisResult, Pattern, PatternMatch, RootCause
 from .pattern_database import PatternDatabase
@@ -121,6 +122,7 @@ class PatternRecognitionEngine:
                 log_content,
                 all_patterns,
                 force_chunking=len(log_content) > 5 * 1024 * 1024,
+                keyword_searcher=self.pattern_database.get_keyword_searcher(),
             )
 
             logger.info(
@@ -188,11 +190,19 @@ class PatternRecognitionEngine:
         if enabled_categories:
             all_patterns = [p for p in all_patterns if p.category in enabled_categories]
 
+        # 行インデックスは正規表現とキーワードのマッチングで共有する
+        log_index = LineIndex(log_content)
+
         # 正規表現マッチング
-        regex_matches = self.pattern_matcher.match_regex_patterns(log_content, all_patterns)
+        regex_matches = self.pattern_matcher.match_regex_patterns(log_content, all_patterns, log_index)
 
         # キーワードマッチング
-        keyword_matches = self.pattern_matcher.match_keyword_patterns(log_content, all_patterns)
+        keyword_matches = self.pattern_matcher.match_keyword_patterns(
+            log_content,
+            all_patterns,
+            log_index,
+            self.pattern_database.get_keyword_searcher(),
+        )
 
         # マッチしたパターンを収集
         matched_pattern_ids: set[str] = set()
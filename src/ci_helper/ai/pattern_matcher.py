@@ -7,10 +7,14 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from .keyword_searcher import KeywordSearcher
 from .models import Match, Pattern
 
+if TYPE_CHECKING:
+    from ..core.log_index import LineIndex
+
 logger = logging.getLogger(__name__)
 
 # Constants for match strength calculation
@@ -44,13 +48,20 @@ class PatternMatcher:
         """
         self.context_window = context_window
         self._compiled_patterns: dict[str, list[re.Pattern[str]]] = {}
-
-    def match_regex_patterns(self, text: str, patterns: list[Pattern]) -> list[Match]:
+        self._keyword_searchers: dict[frozenset[str], KeywordSearcher] = {}
+
+    def match_regex_patterns(
+        self,
+        text: str,
+        patterns: list[Pattern],
+        log_index: LineIndex | None = None,
+    ) -> list[Match]:
         """正規表現パターンでマッチング.
 
         Args:
             text: 検索対象のテキスト
             patterns: パターンのリスト
+            log_index: テキストの行インデックス(指定時はコンテキストを行単位に揃える)
 
         Returns:
             マッチ結果のリスト
@@ -73,7 +84,7 @@ class PatternMatcher:
                         matched_text = match.group()
 
                         # コンテキストを抽出
-                        context_before, context_after = self.extract_error_context(text, start_pos)
+                        context_before, context_after = self.extract_error_context(text, start_pos, log_index)
 
                         # マッチ強度を計算
                         match_strength = self._calculate_regex_match_strength(match, pattern, text)
@@ -97,33 +108,45 @@ class PatternMatcher:
 
         return matches
 
-    def match_keyword_patterns(self, text: str, patterns: list[Pattern]) -> list[Match]:
+    def match_keyword_patterns(
+        self,
+        text: str,
+        patterns: list[Pattern],
+        log_index: LineIndex | None = None,
+        keyword_searcher: KeywordSearcher | None = None,
+    ) -> list[Match]:
         """キーワードパターンでマッチング.
 
+        全パターンのキーワードの最初の出現位置を、テキストを1回だけ小文字化して求めます.
+
         Args:
             text: 検索対象のテキスト
             patterns: パターンのリスト
+            log_index: テキストの行インデックス(指定時はコンテキストを行単位に揃える)
+            keyword_searcher: パターンのキーワードを含む構築済みの検索器
 
         Returns:
             マッチ結果のリスト
 
         """
         matches: list[Match] = []
-        text_lower = text.lower()
+        if keyword_searcher is None:
+            keyword_searcher = self._get_keyword_searcher(patterns)
+        keyword_positions = keyword_searcher.first_positions(text) if keyword_searcher else {}
 
         for pattern in patterns:
             if not pattern.keywords:
                 continue
 
             # キーワードマッチングを実行
-            keyword_matches = self._find_keyword_matches(text_lower, pattern.keywords)
+            keyword_matches = self._find_keyword_matches(text, pattern.keywords, keyword_positions)
 
             if keyword_matches:
                 # 最も強いマッチを選択
                 best_match = max(keyword_matches, key=lambda m: m["score"])
 
                 # コンテキストを抽出
-                context_before, context_after = self.extract_error_context(text, best_match["position"])
+                context_before, context_after = self.extract_error_context(text, best_match["position"], log_index)
 
                 matches.append(
                     Match(
@@ -140,23 +163,47 @@ class PatternMatcher:
 
         return matches
 
-    def extract_error_context(self, text: str, match_position: int) -> tuple[str, str]:
+    def extract_error_context(
+        self,
+        text: str,
+        match_position: int,
+        log_index: LineIndex | None = None,
+    ) -> tuple[str, str]:
         """エラーコンテキストを抽出.
 
+        行インデックスが指定された場合は、コンテキスト窓の両端で途中から始まる行を除外し、
+        行単位で区切られたコンテキストを返します.
+
         Args:
             text: 元のテキスト
             match_position: マッチ位置
+            log_index: テキストの行インデックス(オプション)
 
         Returns:
             前後のコンテキストのタプル
 
         """
-        # 前のコンテキスト
         start_pos = max(0, match_position - self.context_window)
+        end_pos = min(len(text), match_position + self.context_window)
+
+        if log_index is not None and log_index.text == text:
+            # 窓の先頭が行の途中なら次の行から(マッチした行より後には進めない)
+            start_line = log_index.line_number(start_pos) - 1
+            if log_index.line_start(start_line) < start_pos:
+                next_start = log_index.line_start(start_line + 1)
+                if next_start <= match_position:
+                    start_pos = next_start
+            # 窓の末尾が行の途中なら前の行まで(マッチした行より前には戻さない)
+            end_line = log_index.line_number(end_pos) - 1
+            if log_index.line_end(end_line) > end_pos:
+                previous_end = log_index.line_start(end_line) - 1
+                if previous_end >= match_position:
+                    end_pos = previous_end
+
+        # 前のコンテキスト
         context_before = text[start_pos:match_position].strip()
 
         # 後のコンテキスト
-        end_pos = min(len(text), match_position + self.context_window)
         context_after = text[match_position:end_pos].strip()
 
         return context_before, context_after
@@ -243,12 +290,18 @@ class PatternMatcher:
 
         return min(1.0, max(0.0, base_strength))
 
-    def _find_keyword_matches(self, text_lower: str, keywords: list[str]) -> list[dict[str, Any]]:
+    def _find_keyword_matches(
+        self,
+        text: str,
+        keywords: list[str],
+        keyword_positions: dict[str, int],
+    ) -> list[dict[str, Any]]:
         """キーワードマッチを検索.
 
         Args:
-            text_lower: 小文字に変換されたテキスト
+            text: 検索対象のテキスト
             keywords: キーワードのリスト
+            keyword_positions: 小文字化したキーワードから最初の出現位置への辞書
 
         Returns:
             マッチ情報のリスト
@@ -258,11 +311,11 @@ class PatternMatcher:
 
         for keyword in keywords:
             keyword_lower = keyword.lower()
-            position = text_lower.find(keyword_lower)
+            position = keyword_positions.get(keyword_lower, -1)
 
             if position != -1:
                 # 単語境界のチェック
-                is_word_boundary = self._check_word_boundary(text_lower, position, len(keyword_lower))
+                is_word_boundary = self._check_word_boundary(text, position, len(keyword_lower))
 
                 # スコア計算
                 score = KEYWORD_BASE_SCORE  # 基本スコア
@@ -282,6 +335,23 @@ class PatternMatcher:
 
         return matches
 
+    def _get_keyword_searcher(self, patterns: list[Pattern]) -> KeywordSearcher:
+        """パターンのキーワードの検索器を取得(キーワードの組み合わせごとにキャッシュ).
+
+        Args:
+            patterns: パターンのリスト
+
+        Returns:
+            キーワード検索器
+
+        """
+        keywords = frozenset(keyword.lower() for pattern in patterns for keyword in pattern.keywords if keyword)
+        searcher = self._keyword_searchers.get(keywords)
+        if searcher is None:
+            searcher = KeywordSearcher(keywords)
+            self._keyword_searchers[keywords] = searcher
+        return searcher
+
     def _check_word_boundary(self, text: str, position: int, length: int) -> bool:
         """単語境界をチェック.
 
@@ -407,4 +477,5 @@ class PatternMatcher:
     def clear_cache(self) -> None:
         """コンパイル済みパターンのキャッシュをクリア."""
         self._compiled_patterns.clear()
+        self._keyword_searchers.clear()
         logger.info("パターンマッチャーのキャッシュをクリアしました")
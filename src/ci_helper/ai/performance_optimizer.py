@@ -10,12 +10,18 @@ import asyncio
 import gc
 import logging
 import re
+import sys
 import time
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from itertools import pairwise
+from multiprocessing import shared_memory
 from typing import Any
 
+from .keyword_searcher import KeywordSearcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +38,22 @@ class PerformanceMetrics:
     optimization_applied: list[str]
 
 
+@dataclass(frozen=True)
+class ChunkSpan:
+    """ログ内のチャンク範囲
+
+    文字位置はログ全体の先頭からの位置です。``owned_end`` までに開始するマッチのみが
+    このチャンクの担当となり、``owned_end`` から ``end`` まではチャンク境界をまたぐ
+    マッチを取りこぼさないためのオーバーラップです。
+    """
+
+    start: int  # 開始位置（文字）
+    owned_end: int  # 担当範囲の終了位置（文字）
+    end: int  # オーバーラップを含む終了位置（文字）
+    byte_start: int = 0  # 共有メモリ上の開始位置（バイト）
+    byte_end: int = 0  # 共有メモリ上の終了位置（バイト）
+
+
 class LogChunker:
     """ログファイルのチャンク分割処理"""
 
@@ -93,6 +115,39 @@ class LogChunker:
 
         return chunks
 
+    def chunk_boundaries(self, log_content: str) -> list[ChunkSpan]:
+        """チャンクの境界のみを計算（チャンク文字列は作成しない）
+
+        チャンクサイズは文字数で近似し、境界は行頭に揃えます。
+
+        Args:
+            log_content: ログ内容
+
+        Returns:
+            チャンク範囲のリスト
+
+        """
+        total_length = len(log_content)
+        spans: list[ChunkSpan] = []
+        start = 0
+
+        while start < total_length:
+            newline = log_content.find("\n", start + max(1, self.chunk_size_bytes) - 1)
+            owned_end = total_length if newline == -1 else newline + 1
+
+            # オーバーラップを追加
+            end = owned_end
+            for _ in range(self.overlap_lines):
+                if end >= total_length:
+                    break
+                newline = log_content.find("\n", end)
+                end = total_length if newline == -1 else newline + 1
+
+            spans.append(ChunkSpan(start, owned_end, end))
+            start = owned_end
+
+        return spans
+
     async def process_chunks_parallel(
         self,
         chunks: list[tuple[str, int, int]],
@@ -137,13 +192,14 @@ class OptimizedPatternMatcher:
     def __init__(self):
         self.compiled_patterns: dict[str, re.Pattern[str]] = {}
         self.pattern_cache: dict[str, list[Any]] = {}
-        self.keyword_trie: KeywordTrie | None = None
+        self.keyword_searcher: KeywordSearcher | None = None
 
-    def compile_patterns(self, patterns: list[Any]) -> None:
+    def compile_patterns(self, patterns: list[Any], keyword_searcher: KeywordSearcher | None = None) -> None:
         """パターンを事前コンパイル
 
         Args:
             patterns: パターンのリスト
+            keyword_searcher: 構築済みのキーワード検索器（省略時はパターンのキーワードから構築）
 
         """
         logger.info("パターンを事前コンパイル中... (%d パターン)", len(patterns))
@@ -151,25 +207,26 @@ class OptimizedPatternMatcher:
         for pattern in patterns:
             pattern_id = pattern.id
             for regex_pattern in pattern.regex_patterns:
+                compiled_key = f"{pattern_id}:{regex_pattern}"
+                if compiled_key in self.compiled_patterns:
+                    # 前回の解析でコンパイル済み
+                    continue
                 try:
                     # 正規表現を事前コンパイル
                     compiled = re.compile(regex_pattern, re.IGNORECASE | re.MULTILINE)
-                    self.compiled_patterns[f"{pattern_id}:{regex_pattern}"] = compiled
+                    self.compiled_patterns[compiled_key] = compiled
                 except re.error as e:
                     logger.warning("正規表現のコンパイルに失敗: %s - %s", regex_pattern, e)
 
-        # キーワードトライを構築
-        all_keywords: list[str] = []
-        for pattern in patterns:
-            all_keywords.extend(pattern.keywords)
-
-        if all_keywords:
-            self.keyword_trie = KeywordTrie(all_keywords)
+        # キーワード検索器を構築
+        if keyword_searcher is None:
+            keyword_searcher = KeywordSearcher(keyword for pattern in patterns for keyword in pattern.keywords)
+        self.keyword_searcher = keyword_searcher if keyword_searcher else None
 
         logger.info(
             "パターンコンパイル完了: %d 正規表現, %d キーワード",
             len(self.compiled_patterns),
-            len(all_keywords),
+            len(keyword_searcher.keywords),
         )
 
     def match_patterns_optimized(self, text: str, patterns: list[Any]) -> list[Any]:
@@ -206,6 +263,35 @@ class OptimizedPatternMatcher:
 
         return matches
 
+    def match_patterns_in_chunk(self, text: str, patterns: list[Any], span: ChunkSpan) -> list[Any]:
+        """チャンク内のパターンマッチング
+
+        チャンクの担当範囲内で開始するマッチのみを返し、位置はログ全体の文字位置に変換します。
+        チャンクごとに内容が異なるため結果はキャッシュしません。
+
+        Args:
+            text: チャンクの内容（``span.start`` から ``span.end`` まで）
+            patterns: パターンのリスト
+            span: チャンク範囲
+
+        Returns:
+            マッチ結果のリスト
+
+        """
+        owned_length = span.owned_end - span.start
+        matches: list[Any] = []
+
+        for pattern in self._filter_patterns_by_keywords(text, patterns):
+            for match in self._match_single_pattern_optimized(text, pattern):
+                # オーバーラップ部分で開始するマッチは次のチャンクが担当する
+                if match.start_position >= owned_length:
+                    continue
+                match.start_position += span.start
+                match.end_position += span.start
+                matches.append(match)
+
+        return matches
+
     def _filter_patterns_by_keywords(self, text: str, patterns: list[Any]) -> list[Any]:
         """キーワードによるパターンフィルタリング
 
@@ -217,11 +303,13 @@ class OptimizedPatternMatcher:
             候補パターンのリスト
 
         """
-        if not self.keyword_trie:
+        if not self.keyword_searcher:
             return patterns
 
-        # テキスト内のキーワードを高速検索
-        found_keywords = self.keyword_trie.find_keywords(text.lower())
+        # 対象パターンのキーワードだけをテキスト内で検索
+        found_keywords = self.keyword_searcher.find_keywords(
+            text, (keyword for pattern in patterns for keyword in pattern.keywords)
+        )
 
         # キーワードにマッチするパターンのみを返す
         candidate_patterns: list[Any] = []
@@ -299,59 +387,6 @@ class OptimizedPatternMatcher:
         gc.collect()
 
 
-class KeywordTrie:
-    """キーワード検索用のトライ木"""
-
-    def __init__(self, keywords: list[str]):
-        self.root: dict[str, Any] = {}
-        self.keywords = set(keywords)
-        self._build_trie(keywords)
-
-    def _build_trie(self, keywords: list[str]) -> None:
-        """トライ木を構築
-
-        Args:
-            keywords: キーワードのリスト
-
-        """
-        for keyword in keywords:
-            node = self.root
-            for char in keyword.lower():
-                if char not in node:
-                    node[char] = {}
-                node = node[char]
-            node["$"] = True  # 終端マーカー
-
-    def find_keywords(self, text: str) -> set[str]:
-        """テキスト内のキーワードを高速検索
-
-        Args:
-            text: 検索対象テキスト
-
-        Returns:
-            見つかったキーワードのセット
-
-        """
-        found_keywords: set[str] = set()
-        text_lower = text.lower()
-
-        for i in range(len(text_lower)):
-            node = self.root
-            j = i
-
-            while j < len(text_lower) and text_lower[j] in node:
-                node = node[text_lower[j]]
-                j += 1
-
-                if "$" in node:
-                    # キーワードが見つかった
-                    keyword = text_lower[i:j]
-                    if keyword in self.keywords:
-                        found_keywords.add(keyword)
-
-        return found_keywords
-
-
 class MemoryOptimizer:
     """メモリ使用量最適化"""
 
@@ -436,19 +471,27 @@ class PerformanceOptimizer:
         max_workers: int = 4,
         max_memory_mb: float = 500.0,
         enable_caching: bool = True,
+        execution_backend: str = "auto",
     ):
         """Args:
         chunk_size_mb: ログチャンクサイズ（MB）
         max_workers: 最大並列ワーカー数
         max_memory_mb: 最大メモリ使用量（MB）
         enable_caching: キャッシュ有効フラグ
+        execution_backend: チャンク処理の実行方式（"auto"/"process"/"thread"）。
+            "auto" はGILが無効なフリースレッド版Pythonではスレッド、それ以外ではプロセスを使用
 
         """
+        if execution_backend not in EXECUTION_BACKENDS:
+            msg = f"不明な実行方式です: {execution_backend}（{', '.join(EXECUTION_BACKENDS)} のいずれか）"
+            raise ValueError(msg)
+
         self.log_chunker = LogChunker(chunk_size_mb)
         self.pattern_matcher = OptimizedPatternMatcher()
         self.memory_optimizer = MemoryOptimizer(max_memory_mb)
         self.max_workers = max_workers
         self.enable_caching = enable_caching
+        self.execution_backend = execution_backend
 
         self.performance_metrics = PerformanceMetrics(
             processing_time=0.0,
@@ -465,6 +508,7 @@ class PerformanceOptimizer:
         log_content: str,
         patterns: list[Any],
         force_chunking: bool = False,
+        keyword_searcher: KeywordSearcher | None = None,
     ) -> tuple[list[Any], PerformanceMetrics]:
         """パターンマッチングを最適化実行
 
@@ -472,6 +516,7 @@ class PerformanceOptimizer:
             log_content: ログ内容
             patterns: パターンのリスト
             force_chunking: 強制チャンク分割フラグ
+            keyword_searcher: パターンデータベースで構築済みのキーワード検索器
 
         Returns:
             (マッチ結果, パフォーマンスメトリクス)
@@ -481,7 +526,7 @@ class PerformanceOptimizer:
         start_memory = self.memory_optimizer.monitor_memory_usage()
 
         # パターンを事前コンパイル
-        self.pattern_matcher.compile_patterns(patterns)
+        self.pattern_matcher.compile_patterns(patterns, keyword_searcher)
 
         log_size_mb = len(log_content.encode("utf-8")) / (1024 * 1024)
         optimization_applied: list[str] = []
@@ -535,24 +580,34 @@ class PerformanceOptimizer:
     async def _process_large_log(self, log_content: str, patterns: list[Any]) -> list[Any]:
         """大きなログの並列処理
 
+        チャンクの文字列を作らずに境界のみを計算し、各ワーカーに担当範囲を渡します。
+        プロセス実行ではログを共有メモリに一度だけ書き込み、コンパイル済みパターンは
+        ワーカーごとに一度だけ初期化します。
+
         Args:
             log_content: ログ内容
             patterns: パターンのリスト
 
         Returns:
-            マッチ結果のリスト
+            マッチ結果のリスト（位置はログ全体の文字位置）
 
         """
-        # ログをチャンクに分割
-        chunks = self.log_chunker.chunk_log_content(log_content)
-        logger.info("ログを %d チャンクに分割", len(chunks))
-
-        # 並列処理用の関数を定義
-        def process_chunk(chunk_content: str) -> list[Any]:
-            return self.pattern_matcher.match_patterns_optimized(chunk_content, patterns)
-
-        # チャンクを並列処理
-        chunk_results = await self.log_chunker.process_chunks_parallel(chunks, process_chunk, self.max_workers)
+        spans = self.log_chunker.chunk_boundaries(log_content)
+        logger.info("ログを %d チャンクに分割", len(spans))
+
+        if len(spans) <= 1 or self.max_workers <= 1:
+            chunk_results = [
+                self.pattern_matcher.match_patterns_in_chunk(log_content[span.start : span.end], patterns, span)
+                for span in spans
+            ]
+        elif self._resolve_execution_backend() == "process":
+            try:
+                chunk_results = await self._match_chunks_in_processes(log_content, patterns, spans)
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning("プロセスプールを利用できないためスレッドで処理します: %s", e)
+                chunk_results = await self._match_chunks_in_threads(log_content, patterns, spans)
+        else:
+            chunk_results = await self._match_chunks_in_threads(log_content, patterns, spans)
 
         # 結果をマージ（重複除去）
         all_matches: list[Any] = []
@@ -566,9 +621,83 @@ class PerformanceOptimizer:
                     seen_matches.add(match_key)
                     all_matches.append(match)
 
+        all_matches.sort(key=lambda match: match.start_position)
+
         logger.info("チャンク処理完了: %d マッチを統合", len(all_matches))
         return all_matches
 
+    def _resolve_execution_backend(self) -> str:
+        """チャンク処理の実行方式を決定
+
+        Returns:
+            "process" または "thread"
+
+        """
+        if self.execution_backend != "auto":
+            return self.execution_backend
+        # フリースレッド版PythonではスレッドでもCPUバウンドな正規表現処理が並列化される
+        return "thread" if _is_gil_disabled() else "process"
+
+    async def _match_chunks_in_threads(
+        self,
+        log_content: str,
+        patterns: list[Any],
+        spans: list[ChunkSpan],
+    ) -> list[list[Any]]:
+        """スレッドプールでチャンクを処理
+
+        Args:
+            log_content: ログ内容
+            patterns: パターンのリスト
+            spans: チャンク範囲のリスト
+
+        Returns:
+            チャンクごとのマッチ結果のリスト
+
+        """
+
+        def process_chunk(span: ChunkSpan) -> list[Any]:
+            return self.pattern_matcher.match_patterns_in_chunk(log_content[span.start : span.end], patterns, span)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(spans))) as executor:
+            return await _gather_chunk_results(executor, process_chunk, spans)
+
+    async def _match_chunks_in_processes(
+        self,
+        log_content: str,
+        patterns: list[Any],
+        spans: list[ChunkSpan],
+    ) -> list[list[Any]]:
+        """プロセスプールでチャンクを処理
+
+        Args:
+            log_content: ログ内容
+            patterns: パターンのリスト
+            spans: チャンク範囲のリスト
+
+        Returns:
+            チャンクごとのマッチ結果のリスト
+
+        Raises:
+            OSError: 共有メモリを確保できない場合
+            BrokenProcessPool: ワーカープロセスが異常終了した場合
+
+        """
+        byte_spans, size = _encode_chunk_offsets(log_content, spans)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+        try:
+            _write_log_to_shared_memory(log_content, byte_spans, shm)
+
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(spans)),
+                initializer=_init_chunk_worker,
+                initargs=(shm.name, patterns, self.pattern_matcher.keyword_searcher),
+            ) as executor:
+                return await _gather_chunk_results(executor, _match_chunk_in_worker, byte_spans)
+        finally:
+            shm.close()
+            shm.unlink()
+
     def _calculate_cache_hit_rate(self) -> float:
         """キャッシュヒット率を計算
 
@@ -649,6 +778,136 @@ class PerformanceOptimizer:
         logger.info("パフォーマンス最適化リソースをクリーンアップしました")
 
 
+# チャンク処理の実行方式
+EXECUTION_BACKENDS = ("auto", "process", "thread")
+
+# ワーカープロセス内の状態（初期化時に一度だけ設定する）
+_worker_shm: shared_memory.SharedMemory | None = None
+_worker_matcher: OptimizedPatternMatcher | None = None
+_worker_patterns: list[Any] = []
+
+
+def _is_gil_disabled() -> bool:
+    """フリースレッド版PythonでGILが無効になっているかを判定"""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+async def _gather_chunk_results(
+    executor: Executor,
+    processor_func: Callable[[ChunkSpan], list[Any]],
+    spans: list[ChunkSpan],
+) -> list[list[Any]]:
+    """チャンクを実行器で並列処理し、失敗したチャンクを除いた結果を返す
+
+    Raises:
+        BrokenProcessPool: ワーカープロセスが異常終了した場合
+
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [loop.run_in_executor(executor, processor_func, span) for span in spans]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    successful_results: list[list[Any]] = []
+    for i, result in enumerate(results):
+        if isinstance(result, BrokenProcessPool):
+            raise result
+        if isinstance(result, BaseException):
+            logger.warning("チャンク %d の処理に失敗: %s", i, result)
+        else:
+            successful_results.append(result)
+
+    return successful_results
+
+
+def _encode_chunk_offsets(log_content: str, spans: list[ChunkSpan]) -> tuple[list[ChunkSpan], int]:
+    """チャンク範囲にUTF-8でのバイト位置を付与
+
+    Args:
+        log_content: ログ内容
+        spans: チャンク範囲のリスト
+
+    Returns:
+        (バイト位置を付与したチャンク範囲のリスト, エンコード後の全体サイズ) のタプル
+
+    """
+    if log_content.isascii():
+        byte_offsets = {position: position for span in spans for position in (span.start, span.end)}
+        total_size = len(log_content)
+    else:
+        # 境界間の区間ごとにエンコードし、全体のバイト列を一度に作らない
+        positions = sorted({0, len(log_content)} | {position for span in spans for position in (span.start, span.end)})
+        byte_offsets = {0: 0}
+        total_size = 0
+        for previous, position in pairwise(positions):
+            total_size += len(log_content[previous:position].encode("utf-8"))
+            byte_offsets[position] = total_size
+
+    byte_spans = [
+        ChunkSpan(span.start, span.owned_end, span.end, byte_offsets[span.start], byte_offsets[span.end])
+        for span in spans
+    ]
+    return byte_spans, total_size
+
+
+def _write_log_to_shared_memory(
+    log_content: str,
+    byte_spans: list[ChunkSpan],
+    shm: shared_memory.SharedMemory,
+) -> None:
+    """ログをチャンクの担当範囲ごとにエンコードして共有メモリへ書き込む"""
+    buf = shm.buf
+    if buf is None:
+        msg = "共有メモリが閉じられています"
+        raise RuntimeError(msg)
+
+    for span in byte_spans:
+        encoded = log_content[span.start : span.owned_end].encode("utf-8")
+        buf[span.byte_start : span.byte_start + len(encoded)] = encoded
+
+
+def _init_chunk_worker(
+    shm_name: str,
+    patterns: list[Any],
+    keyword_searcher: KeywordSearcher | None,
+) -> None:
+    """ワーカープロセスを初期化（共有メモリへの接続とパターンのコンパイル）
+
+    Args:
+        shm_name: ログを格納した共有メモリの名前
+        patterns: パターンのリスト
+        keyword_searcher: 親プロセスで構築済みのキーワード検索器
+
+    """
+    global _worker_shm, _worker_matcher, _worker_patterns
+
+    # 共有メモリの解放は親プロセスが行うため、ワーカー側では追跡しない
+    _worker_shm = shared_memory.SharedMemory(name=shm_name, track=False)
+    _worker_matcher = OptimizedPatternMatcher()
+    _worker_matcher.compile_patterns(patterns, keyword_searcher)
+    _worker_patterns = patterns
+
+
+def _match_chunk_in_worker(span: ChunkSpan) -> list[Any]:
+    """ワーカープロセスでチャンクを処理
+
+    Args:
+        span: バイト位置を付与したチャンク範囲
+
+    Returns:
+        マッチ結果のリスト（位置はログ全体の文字位置）
+
+    """
+    buf = _worker_shm.buf if _worker_shm is not None else None
+    if buf is None or _worker_matcher is None:
+        msg = "ワーカープロセスが初期化されていません"
+        raise RuntimeError(msg)
+
+    with buf[span.byte_start : span.byte_end] as chunk:
+        text = str(chunk, "utf-8")
+    return _worker_matcher.match_patterns_in_chunk(text, _worker_patterns, span)
+
+
 # パフォーマンス最適化のユーティリティ関数
 
 
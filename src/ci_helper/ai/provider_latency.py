@@ -0,0 +1,153 @@
+"""
+プロバイダーの応答時間の記録
+
+ログサイズの区分ごとにプロバイダーの応答時間を記録し、指数移動平均で更新します。
+記録はJSONファイルに保存し、次回以降の分析でログサイズに応じて最も速いプロバイダーを選ぶために使用します。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 応答時間の更新で新しい測定値に与える重み
+LATENCY_SMOOTHING = 0.3
+
+# 保存形式のバージョン
+_STORAGE_VERSION = 1
+
+
+def size_bucket(log_size: int) -> int:
+    """ログサイズの区分（サイズが2倍になるごとに1つ上の区分）
+
+    Args:
+        log_size: ログのサイズ（文字数）
+
+    Returns:
+        区分番号
+    """
+    return max(log_size, 1).bit_length()
+
+
+class ProviderLatencyTracker:
+    """ログサイズの区分ごとのプロバイダー応答時間"""
+
+    def __init__(self, storage_path: Path | None = None):
+        """応答時間の記録を初期化
+
+        Args:
+            storage_path: 記録の保存パス（Noneの場合は保存しない）
+        """
+        self.storage_path = storage_path
+        self._latency: dict[str, dict[int, float]] = self._load()
+
+    def record(self, provider: str, log_size: int, seconds: float) -> None:
+        """応答時間を記録
+
+        Args:
+            provider: プロバイダー名
+            log_size: 分析したログのサイズ（文字数）
+            seconds: 応答時間（秒）
+        """
+        buckets = self._latency.setdefault(provider, {})
+        bucket = size_bucket(log_size)
+        current = buckets.get(bucket)
+        if current is None:
+            buckets[bucket] = seconds
+        else:
+            buckets[bucket] = current + (seconds - current) * LATENCY_SMOOTHING
+        self._save()
+
+    def latency(self, provider: str, log_size: int) -> float | None:
+        """ログサイズに対する応答時間の推定値を取得
+
+        同じ区分の記録がない場合は、最も近い区分の記録を使用します。
+
+        Args:
+            provider: プロバイダー名
+            log_size: ログのサイズ（文字数）
+
+        Returns:
+            応答時間の推定値（秒、記録がない場合はNone）
+        """
+        buckets = self._latency.get(provider)
+        if not buckets:
+            return None
+        bucket = size_bucket(log_size)
+        nearest = min(buckets, key=lambda recorded: (abs(recorded - bucket), recorded))
+        return buckets[nearest]
+
+    def rank(self, providers: list[str], log_size: int) -> list[str]:
+        """プロバイダーを応答時間の速い順に並べる
+
+        記録のないプロバイダーは、記録のあるプロバイダーの後に元の順序で並べます。
+
+        Args:
+            providers: プロバイダー名のリスト
+            log_size: ログのサイズ（文字数）
+
+        Returns:
+            並べ替えたプロバイダー名のリスト
+        """
+        known: list[tuple[float, int, str]] = []
+        unknown: list[str] = []
+        for index, provider in enumerate(providers):
+            latency = self.latency(provider, log_size)
+            if latency is None:
+                unknown.append(provider)
+            else:
+                known.append((latency, index, provider))
+        return [provider for _, _, provider in sorted(known)] + unknown
+
+    def fastest(self, providers: list[str], log_size: int) -> str | None:
+        """ログサイズに対して最も速いプロバイダーを取得
+
+        Args:
+            providers: 候補のプロバイダー名のリスト
+            log_size: ログのサイズ（文字数）
+
+        Returns:
+            最も速いプロバイダー名（どの候補にも記録がない場合はNone）
+        """
+        ranked = self.rank(providers, log_size)
+        if ranked and self.latency(ranked[0], log_size) is not None:
+            return ranked[0]
+        return None
+
+    def _load(self) -> dict[str, dict[int, float]]:
+        """保存した記録を読み込み"""
+        if self.storage_path is None or not self.storage_path.exists():
+            return {}
+        try:
+            with open(self.storage_path, encoding="utf-8") as f:
+                data = json.load(f)
+            return {
+                provider: {int(bucket): float(seconds) for bucket, seconds in buckets.items()}
+                for provider, buckets in data.get("latency", {}).items()
+            }
+        except Exception as e:
+            # 記録が破損している場合は記録なしとして扱う
+            logger.warning("プロバイダーの応答時間の記録を読み込めません: %s", e)
+            return {}
+
+    def _save(self) -> None:
+        """記録を保存"""
+        if self.storage_path is None:
+            return
+        data = {
+            "version": _STORAGE_VERSION,
+            "latency": {
+                provider: {str(bucket): seconds for bucket, seconds in sorted(buckets.items())}
+                for provider, buckets in self._latency.items()
+            },
+        }
+        try:
+            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.storage_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            # 記録の保存に失敗しても分析は継続する
+            logger.warning("プロバイダーの応答時間の記録を保存できません: %s", e)
@@ -8,16 +8,34 @@ from __future__ import annotations
 
 import time
 from collections.abc import AsyncIterator
-from typing import ClassVar
-
-import aiohttp
-import anthropic
-from anthropic import AsyncAnthropic
-from anthropic.types import TextBlock
+from typing import TYPE_CHECKING, Any, ClassVar
 
+from ...utils.token_counter import get_token_counter
 from ..exceptions import APIKeyError, NetworkError, ProviderError, RateLimitError, TokenLimitError
 from ..models import AnalysisResult, AnalyzeOptions, ProviderConfig
-from .base import AIProvider
+from .base import INPUT_TOKEN_LIMIT_RATIO, AIProvider, import_provider_sdk
+
+if TYPE_CHECKING:
+    import aiohttp
+    import anthropic
+    from anthropic import AsyncAnthropic
+    from anthropic.types import TextBlock
+
+# 使用時にインポートするSDK（ci-run の起動時に読み込まないため）
+_SDK_IMPORTS = {
+    "aiohttp": "aiohttp",
+    "anthropic": "anthropic",
+    "AsyncAnthropic": "anthropic:AsyncAnthropic",
+    "TextBlock": "anthropic.types:TextBlock",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """SDKの名前を参照された時点でインポート"""
+    if name in _SDK_IMPORTS:
+        import_provider_sdk(globals(), _SDK_IMPORTS)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class AnthropicProvider(AIProvider):
@@ -49,6 +67,7 @@ class AnthropicProvider(AIProvider):
 
         """
         super().__init__(config)
+        import_provider_sdk(globals(), _SDK_IMPORTS)
         self._client: AsyncAnthropic | None = None
 
     async def initialize(self) -> None:
@@ -136,10 +155,10 @@ class AnthropicProvider(AIProvider):
         start_time = time.time()
 
         # トークン制限チェック
-        input_tokens = self.count_tokens(f"{prompt}\n{context}", model)
         max_tokens = self.MODEL_LIMITS.get(model, 200000)
+        input_tokens = self.count_tokens_for_limit(f"{prompt}\n{context}", max_tokens * INPUT_TOKEN_LIMIT_RATIO, model)
 
-        if input_tokens > max_tokens * 0.8:  # 80%を超えたら警告
+        if input_tokens > max_tokens * INPUT_TOKEN_LIMIT_RATIO:  # 80%を超えたら警告
             raise TokenLimitError(input_tokens, max_tokens, model)
 
         try:
@@ -218,10 +237,10 @@ class AnthropicProvider(AIProvider):
         model = self.get_model(options.model)
 
         # トークン制限チェック
-        input_tokens = self.count_tokens(f"{prompt}\n{context}", model)
         max_tokens = self.MODEL_LIMITS.get(model, 200000)
+        input_tokens = self.count_tokens_for_limit(f"{prompt}\n{context}", max_tokens * INPUT_TOKEN_LIMIT_RATIO, model)
 
-        if input_tokens > max_tokens * 0.8:
+        if input_tokens > max_tokens * INPUT_TOKEN_LIMIT_RATIO:
             raise TokenLimitError(input_tokens, max_tokens, model)
 
         try:
@@ -286,17 +305,8 @@ class AnthropicProvider(AIProvider):
 
         """
         # Anthropicは独自のトークナイザーを使用するが、
-        # 簡易的にtiktokenで推定（Claude 3はGPT-4と似たトークナイザー）
-        try:
-            import tiktoken
-
-            # cl100k_baseエンコーディングを使用（Claude 3系で近似）
-            encoding = tiktoken.get_encoding("cl100k_base")
-            return len(encoding.encode(text))
-
-        except ImportError:
-            # tiktokenが利用できない場合は文字数ベースで推定
-            return len(text) // 4
+        # 簡易的にcl100k_baseエンコーディングで推定（Claude 3はGPT-4と似たトークナイザー）
+        return get_token_counter().count(text)
 
     def get_available_models(self) -> list[str]:
         """利用可能なモデル一覧を取得
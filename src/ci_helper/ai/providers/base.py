@@ -7,13 +7,37 @@ AIプロバイダーの基底クラス
 
 from __future__ import annotations
 
+import importlib
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator, Awaitable
 from typing import Any, ClassVar, cast
 
+from ...utils.token_counter import EXACT_COUNT_THRESHOLD, get_token_counter
 from ..exceptions import NetworkError, ProviderError, RateLimitError, TokenLimitError
 from ..models import AnalysisResult, AnalyzeOptions, ProviderConfig, TokenUsage
 
+# 入力に使用できるトークン数のモデルの制限に対する割合（残りは出力に使用する）
+INPUT_TOKEN_LIMIT_RATIO = 0.8
+
+
+def import_provider_sdk(namespace: dict[str, Any], imports: dict[str, str]) -> None:
+    """プロバイダーのSDKをインポートしてモジュールの名前空間に設定
+
+    SDKのインポートには時間がかかるため、各プロバイダーはモジュールの読み込み時ではなく
+    インスタンスの作成時（またはモジュール属性の参照時）にこの関数でSDKを読み込みます。
+    既に設定されている名前（テストで差し替えたものを含む）は上書きしません。
+
+    Args:
+        namespace: プロバイダーモジュールの ``globals()``
+        imports: 名前 -> ``"モジュール"`` または ``"モジュール:属性"``
+    """
+    for name, target in imports.items():
+        if name in namespace:
+            continue
+        module_name, _, attr_name = target.partition(":")
+        module = importlib.import_module(module_name)
+        namespace[name] = getattr(module, attr_name) if attr_name else module
+
 
 class AIProvider(ABC):
     """AIプロバイダーの抽象基底クラス"""
@@ -100,6 +124,39 @@ class AIProvider(ABC):
             トークン数
         """
 
+    def estimate_tokens(self, text: str, model: str | None = None) -> int:
+        """テキストのトークン数を高速に推定
+
+        予算判定など厳密な値が不要な場面で使用します。
+
+        Args:
+            text: 推定対象のテキスト
+            model: モデル名
+
+        Returns:
+            推定トークン数
+        """
+        return get_token_counter().estimate(text, model)
+
+    def count_tokens_for_limit(self, text: str, limit: float, model: str | None = None) -> int:
+        """制限との比較に使うトークン数を取得
+
+        推定値が制限から十分に離れている場合は推定値を返し、
+        制限に近い場合のみ ``count_tokens`` で厳密にカウントします。
+
+        Args:
+            text: カウント対象のテキスト
+            limit: 比較する制限（トークン数）
+            model: モデル名
+
+        Returns:
+            トークン数（推定値または厳密な値）
+        """
+        estimate = self.estimate_tokens(text, model)
+        if estimate < limit * EXACT_COUNT_THRESHOLD:
+            return estimate
+        return self.count_tokens(text, model)
+
     @abstractmethod
     def get_available_models(self) -> list[str]:
         """利用可能なモデル一覧を取得
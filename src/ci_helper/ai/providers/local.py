@@ -10,13 +10,25 @@ from __future__ import annotations
 import json
 import time
 from collections.abc import AsyncIterator
-from typing import ClassVar
-
-import aiohttp
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from ..exceptions import NetworkError, ProviderError, TokenLimitError
 from ..models import AnalysisResult, AnalyzeOptions, ProviderConfig
-from .base import AIProvider
+from .base import INPUT_TOKEN_LIMIT_RATIO, AIProvider, import_provider_sdk
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# 使用時にインポートするSDK（ci-run の起動時に読み込まないため）
+_SDK_IMPORTS = {"aiohttp": "aiohttp"}
+
+
+def __getattr__(name: str) -> Any:
+    """SDKの名前を参照された時点でインポート"""
+    if name in _SDK_IMPORTS:
+        import_provider_sdk(globals(), _SDK_IMPORTS)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class LocalLLMProvider(AIProvider):
@@ -38,6 +50,7 @@ class LocalLLMProvider(AIProvider):
             config: プロバイダー設定
         """
         super().__init__(config)
+        import_provider_sdk(globals(), _SDK_IMPORTS)
         # base_urlが"auto"の場合は自動検出
         if config.base_url == "auto":
             self.base_url = self._detect_ollama_url()
@@ -158,7 +171,7 @@ class LocalLLMProvider(AIProvider):
         input_tokens = self.count_tokens(f"{prompt}\n{context}", model)
         max_tokens = self.MODEL_LIMITS.get(model, 32768)
 
-        if input_tokens > max_tokens * 0.8:  # 80%を超えたら警告
+        if input_tokens > max_tokens * INPUT_TOKEN_LIMIT_RATIO:  # 80%を超えたら警告
             raise TokenLimitError(input_tokens, max_tokens, model)
 
         try:
@@ -230,7 +243,7 @@ class LocalLLMProvider(AIProvider):
         input_tokens = self.count_tokens(f"{prompt}\n{context}", model)
         max_tokens = self.MODEL_LIMITS.get(model, 32768)
 
-        if input_tokens > max_tokens * 0.8:
+        if input_tokens > max_tokens * INPUT_TOKEN_LIMIT_RATIO:
             raise TokenLimitError(input_tokens, max_tokens, model)
 
         try:
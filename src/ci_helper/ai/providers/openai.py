@@ -9,15 +9,28 @@ from __future__ import annotations
 
 import time
 from collections.abc import AsyncIterator
-from typing import ClassVar
-
-import aiohttp
-import openai
-from openai import AsyncOpenAI
+from typing import TYPE_CHECKING, Any, ClassVar
 
+from ...utils.token_counter import get_token_counter
 from ..exceptions import APIKeyError, NetworkError, ProviderError, RateLimitError, TokenLimitError
 from ..models import AnalysisResult, AnalyzeOptions, ProviderConfig
-from .base import AIProvider
+from .base import INPUT_TOKEN_LIMIT_RATIO, AIProvider, import_provider_sdk
+
+if TYPE_CHECKING:
+    import aiohttp
+    import openai
+    from openai import AsyncOpenAI
+
+# 使用時にインポートするSDK（ci-run の起動時に読み込まないため）
+_SDK_IMPORTS = {"aiohttp": "aiohttp", "openai": "openai", "AsyncOpenAI": "openai:AsyncOpenAI"}
+
+
+def __getattr__(name: str) -> Any:
+    """SDKの名前を参照された時点でインポート"""
+    if name in _SDK_IMPORTS:
+        import_provider_sdk(globals(), _SDK_IMPORTS)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class OpenAIProvider(AIProvider):
@@ -52,6 +65,7 @@ class OpenAIProvider(AIProvider):
             config: プロバイダー設定
         """
         super().__init__(config)
+        import_provider_sdk(globals(), _SDK_IMPORTS)
         self._client: AsyncOpenAI | None = None
 
     async def initialize(self) -> None:
@@ -139,10 +153,10 @@ class OpenAIProvider(AIProvider):
         start_time = time.time()
 
         # トークン制限チェック
-        input_tokens = self.count_tokens(f"{prompt}\n{context}", model)
         max_tokens = self.MODEL_LIMITS.get(model, 8192)
+        input_tokens = self.count_tokens_for_limit(f"{prompt}\n{context}", max_tokens * INPUT_TOKEN_LIMIT_RATIO, model)
 
-        if input_tokens > max_tokens * 0.8:  # 80%を超えたら警告
+        if input_tokens > max_tokens * INPUT_TOKEN_LIMIT_RATIO:  # 80%を超えたら警告
             raise TokenLimitError(input_tokens, max_tokens, model)
 
         try:
@@ -218,10 +232,10 @@ class OpenAIProvider(AIProvider):
         model = self.get_model(options.model)
 
         # トークン制限チェック
-        input_tokens = self.count_tokens(f"{prompt}\n{context}", model)
         max_tokens = self.MODEL_LIMITS.get(model, 8192)
+        input_tokens = self.count_tokens_for_limit(f"{prompt}\n{context}", max_tokens * INPUT_TOKEN_LIMIT_RATIO, model)
 
-        if input_tokens > max_tokens * 0.8:
+        if input_tokens > max_tokens * INPUT_TOKEN_LIMIT_RATIO:
             raise TokenLimitError(input_tokens, max_tokens, model)
 
         try:
@@ -289,23 +303,8 @@ class OpenAIProvider(AIProvider):
         Returns:
             トークン数
         """
-        try:
-            import tiktoken
-
-            model_name = model or self.config.default_model
-
-            # モデルに対応するエンコーダーを取得
-            try:
-                encoding = tiktoken.encoding_for_model(model_name)
-            except KeyError:
-                # 未知のモデルの場合はcl100k_baseエンコーディングを使用
-                encoding = tiktoken.get_encoding("cl100k_base")
-
-            return len(encoding.encode(text))
-
-        except ImportError:
-            # tiktokenが利用できない場合は文字数ベースで推定
-            return len(text) // 4
+        # tiktokenが利用できない場合は推定値を返す
+        return get_token_counter().count(text, model or self.config.default_model)
 
     def get_available_models(self) -> list[str]:
         """利用可能なモデル一覧を取得
@@ -0,0 +1,339 @@
+"""
+キーワード集合の類似度検索
+
+未知エラーの重複判定やパターンの重複チェックで使う、Jaccard類似度が閾値を超える集合の検索を行います。
+集合の要素を出現頻度の低い順に並べた先頭部分（プレフィックス）だけを転置インデックスに登録し、
+閾値を超え得る集合だけを候補として類似度を計算するため、登録数が増えても全件を比較せずに済みます。
+プレフィックスの長さは類似度が閾値以上の集合が必ず共通の要素を持つように決めているため、検索漏れはありません。
+
+パターンの正規表現は、マッチに必ず含まれるリテラル文字列から手がかりとなる単語（または文字列）を選び、
+手がかりがエラーシグネチャに現れる正規表現だけを評価します。
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter, defaultdict
+from collections.abc import Hashable, Iterable, Mapping
+
+from .keyword_searcher import KeywordSearcher
+from .models import Pattern
+
+# 重複とみなすJaccard類似度の閾値（この値を超える場合に重複）
+SIMILARITY_THRESHOLD = 0.7
+
+# プレフィックス長の計算で浮動小数点の誤差によってプレフィックスが短くなるのを防ぐための余裕
+_PREFIX_EPSILON = 1e-9
+
+# 正規表現の量指定子のうち、直前の要素が0回でもマッチするもの
+_OPTIONAL_QUANTIFIERS = frozenset("*?{")
+
+# リテラルを含まない（位置や文字の種類を表す）エスケープ
+_CLASS_ESCAPES = frozenset("dDwWsSbBAZ")
+
+# 単語（英数字とアンダースコアの並び）
+_WORD_PATTERN = re.compile(r"\w+", re.ASCII)
+
+
+class SetSimilarityIndex:
+    """Jaccard類似度が閾値を超えるキーワード集合を検索する転置インデックス
+
+    集合はグループ（例: エラーカテゴリ）ごとに分けて登録し、同じグループの集合だけを検索します。
+    """
+
+    def __init__(
+        self,
+        threshold: float = SIMILARITY_THRESHOLD,
+        token_frequencies: Mapping[str, int] | None = None,
+    ):
+        """インデックスを初期化
+
+        Args:
+            threshold: 類似とみなすJaccard類似度の閾値（この値を超える場合に類似）
+            token_frequencies: 要素の出現頻度（要素の並び順に使用し、登録後は変更しない）
+        """
+        self.threshold = threshold
+        self._token_frequencies = dict(token_frequencies or {})
+        self._sets: dict[int, frozenset[str]] = {}
+        self._postings: dict[tuple[Hashable, str], list[int]] = defaultdict(list)
+
+    @classmethod
+    def build(
+        cls,
+        items: Iterable[tuple[int, Iterable[str], Hashable]],
+        threshold: float = SIMILARITY_THRESHOLD,
+    ) -> SetSimilarityIndex:
+        """集合をまとめて登録したインデックスを構築
+
+        要素は登録する集合全体での出現頻度の低い順に並べるため、よく現れる要素が候補を増やしません。
+
+        Args:
+            items: (キー, 集合の要素, グループ) のタプル
+            threshold: 類似とみなすJaccard類似度の閾値
+
+        Returns:
+            構築したインデックス
+        """
+        entries = [(key, frozenset(tokens), group) for key, tokens, group in items]
+        frequencies = Counter(token for _, tokens, _ in entries for token in tokens)
+        index = cls(threshold, frequencies)
+        for key, tokens, group in entries:
+            index.add(key, tokens, group)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def add(self, key: int, tokens: Iterable[str], group: Hashable = None) -> None:
+        """集合を登録（空の集合は類似度を計算できないため登録しない）
+
+        Args:
+            key: 集合のキー（検索結果はキーの昇順）
+            tokens: 集合の要素
+            group: 集合のグループ
+        """
+        token_set = frozenset(tokens)
+        if not token_set:
+            return
+        self._sets[key] = token_set
+        for token in self._prefix(token_set):
+            self._postings[(group, token)].append(key)
+
+    def find_similar(self, tokens: Iterable[str], group: Hashable = None) -> list[int]:
+        """同じグループの集合のうち、Jaccard類似度が閾値を超える集合のキーを取得
+
+        Args:
+            tokens: 検索する集合の要素
+            group: 検索するグループ
+
+        Returns:
+            類似する集合のキーのリスト（昇順）
+        """
+        query = frozenset(tokens)
+        if not query:
+            return []
+
+        candidates: set[int] = set()
+        for token in self._prefix(query):
+            candidates.update(self._postings.get((group, token), ()))
+
+        # 要素数の差が大きい集合は類似度が閾値を超えないため除外してから類似度を計算
+        min_size = self.threshold * len(query) - _PREFIX_EPSILON
+        max_size = len(query) / self.threshold + _PREFIX_EPSILON
+        similar: list[int] = []
+        for key in sorted(candidates):
+            stored = self._sets[key]
+            if not min_size <= len(stored) <= max_size:
+                continue
+            if len(stored & query) / len(stored | query) > self.threshold:
+                similar.append(key)
+        return similar
+
+    def _prefix(self, tokens: frozenset[str]) -> list[str]:
+        """集合のプレフィックス（出現頻度の低い順に並べた先頭の要素）を取得
+
+        類似度が閾値以上の2つの集合は、それぞれのプレフィックスに共通の要素を必ず含みます。
+        """
+        size = len(tokens)
+        length = size - math.ceil(self.threshold * size - _PREFIX_EPSILON) + 1
+        frequencies = self._token_frequencies
+        return sorted(tokens, key=lambda token: (frequencies.get(token, 0), token))[:length]
+
+
+class PatternSimilarityIndex:
+    """エラーシグネチャと重複する既存パターンの検索
+
+    正規表現は一度だけコンパイルし、マッチに必ず含まれるリテラルの手がかりがシグネチャに現れる正規表現だけを評価します。
+    手がかりには、リテラル内で前後を区切り文字に挟まれた単語（マッチしたテキストでも単語として現れる）のうち
+    全パターンの中で最も少ないものを使い、そのような単語がない場合はリテラル全体をキーワード検索器で検索します。
+    キーワードの類似度は :class:`SetSimilarityIndex` で検索します。
+    """
+
+    def __init__(self, patterns: Iterable[Pattern], threshold: float = SIMILARITY_THRESHOLD):
+        """パターンからインデックスを構築
+
+        Args:
+            patterns: 既存のパターン
+            threshold: 重複とみなすキーワードのJaccard類似度の閾値
+        """
+        self._by_word: dict[str, list[re.Pattern[str]]] = defaultdict(list)
+        self._by_literal: dict[str, list[re.Pattern[str]]] = defaultdict(list)
+        self._unanchored: list[re.Pattern[str]] = []
+        anchored: list[tuple[re.Pattern[str], str, list[str]]] = []
+        keyword_sets: list[tuple[int, list[str], Hashable]] = []
+
+        for position, pattern in enumerate(patterns):
+            for regex_pattern in pattern.regex_patterns:
+                try:
+                    compiled = re.compile(regex_pattern, re.IGNORECASE)
+                except re.error:
+                    continue
+                literal = required_literal(compiled)
+                if literal:
+                    anchored.append((compiled, literal, _delimited_words(literal)))
+                else:
+                    self._unanchored.append(compiled)
+            keyword_sets.append((position, " ".join(pattern.keywords).lower().split(), None))
+
+        word_counts = Counter(word for _, _, words in anchored for word in set(words))
+        for compiled, literal, words in anchored:
+            if words:
+                self._by_word[min(words, key=lambda word: (word_counts[word], -len(word)))].append(compiled)
+            else:
+                self._by_literal[literal].append(compiled)
+
+        self._literal_searcher = KeywordSearcher(self._by_literal)
+        self._keyword_index = SetSimilarityIndex.build(keyword_sets, threshold)
+
+    def is_duplicate(self, error_signature: str) -> bool:
+        """エラーシグネチャが既存パターンと重複しているかチェック
+
+        いずれかのパターンの正規表現にマッチするか、キーワードとの類似度が閾値を超える場合に重複とみなします。
+
+        Args:
+            error_signature: エラーシグネチャ
+
+        Returns:
+            重複している場合True
+        """
+        lowered = error_signature.lower()
+        if error_signature.isascii():
+            candidates = [
+                regex for word in set(_WORD_PATTERN.findall(lowered)) for regex in self._by_word.get(word, ())
+            ]
+            candidates.extend(
+                regex
+                for literal in self._literal_searcher.find_keywords(lowered)
+                for regex in self._by_literal[literal]
+            )
+        else:
+            # ASCII以外の文字は小文字化と大文字小文字を区別しないマッチの結果が異なる場合があるため全件を評価
+            candidates = [regex for regexes in self._by_word.values() for regex in regexes]
+            candidates.extend(regex for regexes in self._by_literal.values() for regex in regexes)
+        candidates.extend(self._unanchored)
+        if any(regex.search(error_signature) for regex in candidates):
+            return True
+
+        error_words = lowered.split()
+        return bool(error_words) and bool(self._keyword_index.find_similar(error_words))
+
+
+def required_literal(compiled: re.Pattern[str]) -> str | None:
+    """正規表現のマッチに必ず含まれる最長のリテラル文字列を取得
+
+    選択（``|``）を含む正規表現やグループの中身は解析せず、確実に判定できる範囲だけを対象にします。
+
+    Args:
+        compiled: コンパイル済みの正規表現
+
+    Returns:
+        小文字化したリテラル文字列（ASCII文字のみ、見つからない場合はNone）
+    """
+    pattern = compiled.pattern
+    if "|" in pattern or compiled.flags & re.VERBOSE:
+        return None
+
+    runs: list[str] = []
+    current: list[str] = []
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        literal: str | None = None
+        if char == "\\":
+            escaped = pattern[position + 1 : position + 2]
+            if not escaped:
+                return None
+            if escaped.isalnum():
+                if escaped not in _CLASS_ESCAPES:
+                    # 文字コードや後方参照などのエスケープは解析しない
+                    return None
+            else:
+                literal = escaped
+            position += 2
+        elif char == "[":
+            position = _skip_class(pattern, position)
+        elif char == "(":
+            position = _skip_group(pattern, position)
+        elif char in ")*+?{":
+            return None
+        else:
+            if char not in ".^$":
+                literal = char
+            position += 1
+        if position < 0:
+            return None
+
+        # 直前の要素に付いた量指定子
+        quantifier = pattern[position : position + 1]
+        if quantifier == "{":
+            position = pattern.find("}", position) + 1
+            if position == 0:
+                return None
+        elif quantifier in ("*", "?", "+"):
+            position += 1
+        else:
+            quantifier = ""
+        if quantifier and pattern[position : position + 1] in ("?", "+"):
+            # 最短一致・強欲な量指定子の接尾辞
+            position += 1
+
+        # 0回を許す量指定子が付いた要素は必須ではなく、+ が付いた要素は1文字だけが必須
+        if literal is not None and literal.isascii() and quantifier not in _OPTIONAL_QUANTIFIERS:
+            current.append(literal)
+            if not quantifier:
+                continue
+        runs.append("".join(current))
+        current = []
+    runs.append("".join(current))
+
+    longest = max(runs, key=len)
+    return longest.lower() or None
+
+
+def _delimited_words(literal: str) -> list[str]:
+    """リテラル内で前後を単語以外の文字に挟まれた単語を取得（先頭・末尾の単語は長い単語の一部の場合がある）"""
+    return [
+        match.group() for match in _WORD_PATTERN.finditer(literal) if match.start() > 0 and match.end() < len(literal)
+    ]
+
+
+def _skip_class(pattern: str, position: int) -> int:
+    """文字クラス（``[...]``）の次の位置を取得（閉じていない場合は-1）"""
+    position += 1
+    if pattern[position : position + 1] == "^":
+        position += 1
+    if pattern[position : position + 1] == "]":
+        position += 1
+    while position < len(pattern):
+        char = pattern[position]
+        if char == "\\":
+            position += 2
+        elif char == "]":
+            return position + 1
+        else:
+            position += 1
+    return -1
+
+
+def _skip_group(pattern: str, position: int) -> int:
+    """グループ（``(...)``）の次の位置を取得（閉じていない場合は-1）"""
+    depth = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char == "\\":
+            position += 2
+            continue
+        if char == "[":
+            position = _skip_class(pattern, position)
+            if position < 0:
+                return -1
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return position + 1
+        position += 1
+    return -1
@@ -0,0 +1,461 @@
+"""
+AI使用量ストア
+
+API呼び出しごとの使用レコードをSQLiteデータベースに保存し、同じトランザクションで
+日別（日付・プロバイダー・モデル・分析タイプ別）と月別（月・プロバイダー別）の集計を更新します。
+期間ごとの統計は集計から求めるため、レコード数によらず保持している日数に比例した時間で、
+月間の使用制限のチェックは主キーの参照だけで行えます。
+
+WALモードで開くため、並列に実行された複数の ``ci-run analyze`` プロセスから同時に記録できます。
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import weakref
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypedDict
+
+# データベースのスキーマバージョン（スキーマを変更した場合は更新する）
+USAGE_SCHEMA_VERSION = 1
+
+# 他プロセスの書き込みが終わるまで待つ秒数
+_BUSY_TIMEOUT_SECONDS = 30.0
+
+# usage_daily は usage_records から求めた日別の集計（旧形式の日別集計から取り込んだ分はレコードを持たない）
+# usage_monthly は usage_daily を月・プロバイダー別にまとめた集計
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    day TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    total_tokens INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    analysis_type TEXT NOT NULL,
+    success INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS usage_records_timestamp ON usage_records (timestamp);
+CREATE TABLE IF NOT EXISTS usage_daily (
+    day TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    analysis_type TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    successful_requests INTEGER NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    total_tokens INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    PRIMARY KEY (day, provider, model, analysis_type)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS usage_daily_provider ON usage_daily (provider, day);
+CREATE TABLE IF NOT EXISTS usage_monthly (
+    month TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    PRIMARY KEY (month, provider)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS usage_info (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# 日別集計を期間で取得する問い合わせ（列の並びは _rollup_from_row の順序）
+_SELECT_DAILY = (
+    "SELECT day, provider, model, analysis_type, requests, successful_requests, input_tokens, output_tokens, "
+    "total_tokens, cost FROM usage_daily WHERE day >= ? AND day < ?"
+)
+
+# 期間の終わりを指定しない場合の上限（日付の文字列より大きい文字列）
+_DAY_UPPER_BOUND = "~"
+
+# 日別・月別の集計に加算する（行がない場合は追加する）
+_UPSERT_DAILY = (
+    "INSERT INTO usage_daily (day, provider, model, analysis_type, requests, successful_requests, "
+    "input_tokens, output_tokens, total_tokens, cost) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (day, provider, model, analysis_type) DO UPDATE SET "
+    "requests = requests + excluded.requests, "
+    "successful_requests = successful_requests + excluded.successful_requests, "
+    "input_tokens = input_tokens + excluded.input_tokens, "
+    "output_tokens = output_tokens + excluded.output_tokens, "
+    "total_tokens = total_tokens + excluded.total_tokens, "
+    "cost = cost + excluded.cost"
+)
+
+_UPSERT_MONTHLY = (
+    "INSERT INTO usage_monthly (month, provider, requests, cost) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (month, provider) DO UPDATE SET "
+    "requests = requests + excluded.requests, cost = cost + excluded.cost"
+)
+
+
+class UsageRecord(TypedDict):
+    """単一の使用レコード"""
+
+    timestamp: str
+    provider: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    total_tokens: int
+    cost: float
+    analysis_type: str
+    success: bool
+
+
+class UsageRollup(TypedDict):
+    """日付・プロバイダー・モデル・分析タイプ別の使用量の集計"""
+
+    day: str  # YYYY-MM-DD
+    provider: str
+    model: str
+    analysis_type: str
+    requests: int
+    successful_requests: int
+    input_tokens: int
+    output_tokens: int
+    total_tokens: int
+    cost: float
+
+
+class UsageStore:
+    """使用レコードと日別・月別の集計を保存する使用量ストア
+
+    1つの接続を複数スレッドから使用するため、操作はロックで直列化します。
+    """
+
+    def __init__(self, db_path: Path, in_memory: bool = False):
+        """使用量ストアを開く
+
+        Args:
+            db_path: データベースファイルのパス
+            in_memory: メモリ上のデータベースで記録するかどうか（Trueの場合は既存のデータベースの内容を
+                読み込み、``flush()`` を呼び出したときにファイルへ書き込む）
+
+        Raises:
+            sqlite3.Error: データベースを開けない場合
+        """
+        self.db_path = db_path
+        self.in_memory = in_memory
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            ":memory:" if in_memory else db_path,
+            timeout=_BUSY_TIMEOUT_SECONDS,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            if in_memory:
+                if db_path.exists():
+                    with _open_file_database(db_path) as source:
+                        source.backup(self._connection)
+            else:
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {USAGE_SCHEMA_VERSION}")
+        except sqlite3.Error:
+            self._connection.close()
+            raise
+
+        # インスタンスの破棄時・プロセス終了時に接続を閉じる
+        self._finalizer = weakref.finalize(self, self._connection.close)
+
+    @contextmanager
+    def _write_transaction(self) -> Generator[sqlite3.Connection]:
+        """開始時に書き込みロックを取得するトランザクション
+
+        Yields:
+            使用量データベースへの接続
+        """
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.rollback()
+                raise
+            connection.commit()
+
+    def _query(self, sql: str, parameters: Iterable[Any] = ()) -> list[tuple[Any, ...]]:
+        """読み込みの問い合わせを実行"""
+        with self._lock:
+            return self._connection.execute(sql, tuple(parameters)).fetchall()
+
+    def close(self) -> None:
+        """データベースへの接続を閉じる"""
+        self._finalizer()
+
+    def flush(self) -> None:
+        """メモリ上のデータベースの内容をファイルに書き込む（ファイルで記録している場合は何もしない）"""
+        if not self.in_memory:
+            return
+        with self._lock, _open_file_database(self.db_path) as destination:
+            self._connection.backup(destination)
+
+    def get_info(self, name: str) -> str | None:
+        """ストアの情報を取得
+
+        Args:
+            name: 情報の名前
+
+        Returns:
+            値（未設定の場合はNone）
+        """
+        rows = self._query("SELECT value FROM usage_info WHERE name = ?", (name,))
+        return rows[0][0] if rows else None
+
+    def set_info(self, name: str, value: str) -> None:
+        """ストアの情報を設定
+
+        Args:
+            name: 情報の名前
+            value: 値
+        """
+        with self._write_transaction() as connection:
+            connection.execute("INSERT OR REPLACE INTO usage_info (name, value) VALUES (?, ?)", (name, value))
+
+    def add(self, record: UsageRecord) -> None:
+        """使用レコードを追加し、日別・月別の集計を更新
+
+        Args:
+            record: 使用レコード
+        """
+        with self._write_transaction() as connection:
+            self._insert_records(connection, [record])
+
+    def import_legacy(self, records: list[UsageRecord], rollups: list[UsageRollup]) -> None:
+        """旧形式のJSONファイルの使用データを取り込む
+
+        取り込みは1回だけ行い、取り込み済みの印を同じトランザクションで記録します。
+
+        Args:
+            records: 使用レコード
+            rollups: レコードのない日の日別集計
+        """
+        with self._write_transaction() as connection:
+            if connection.execute("SELECT 1 FROM usage_info WHERE name = 'legacy_imported'").fetchone():
+                return
+            self._insert_records(connection, records)
+            for rollup in rollups:
+                self._add_rollup(connection, rollup)
+            connection.execute("INSERT OR REPLACE INTO usage_info (name, value) VALUES ('legacy_imported', '1')")
+
+    def _insert_records(self, connection: sqlite3.Connection, records: list[UsageRecord]) -> None:
+        """書き込みトランザクション中にレコードを挿入して集計を更新"""
+        for record in records:
+            day = record["timestamp"][:10]
+            connection.execute(
+                "INSERT INTO usage_records (timestamp, day, provider, model, input_tokens, output_tokens, "
+                "total_tokens, cost, analysis_type, success) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record["timestamp"],
+                    day,
+                    record["provider"],
+                    record["model"],
+                    record["input_tokens"],
+                    record["output_tokens"],
+                    record["total_tokens"],
+                    record["cost"],
+                    record["analysis_type"],
+                    int(record["success"]),
+                ),
+            )
+            self._add_rollup(
+                connection,
+                UsageRollup(
+                    day=day,
+                    provider=record["provider"],
+                    model=record["model"],
+                    analysis_type=record["analysis_type"],
+                    requests=1,
+                    successful_requests=int(record["success"]),
+                    input_tokens=record["input_tokens"],
+                    output_tokens=record["output_tokens"],
+                    total_tokens=record["total_tokens"],
+                    cost=record["cost"],
+                ),
+            )
+
+    @staticmethod
+    def _add_rollup(connection: sqlite3.Connection, rollup: UsageRollup) -> None:
+        """書き込みトランザクション中に日別・月別の集計へ加算"""
+        connection.execute(
+            _UPSERT_DAILY,
+            (
+                rollup["day"],
+                rollup["provider"],
+                rollup["model"],
+                rollup["analysis_type"],
+                rollup["requests"],
+                rollup["successful_requests"],
+                rollup["input_tokens"],
+                rollup["output_tokens"],
+                rollup["total_tokens"],
+                rollup["cost"],
+            ),
+        )
+        connection.execute(_UPSERT_MONTHLY, (rollup["day"][:7], rollup["provider"], rollup["requests"], rollup["cost"]))
+
+    def monthly_cost(self, month: str, provider: str) -> float:
+        """月間のプロバイダーのコストを取得
+
+        Args:
+            month: 対象月（YYYY-MM）
+            provider: プロバイダー名
+
+        Returns:
+            コスト（USD）
+        """
+        rows = self._query("SELECT cost FROM usage_monthly WHERE month = ? AND provider = ?", (month, provider))
+        return float(rows[0][0]) if rows else 0.0
+
+    def providers(self) -> list[str]:
+        """使用量が記録されているプロバイダー名の一覧"""
+        return [row[0] for row in self._query("SELECT DISTINCT provider FROM usage_monthly ORDER BY provider")]
+
+    def days(self) -> set[str]:
+        """使用量が記録されている日付（YYYY-MM-DD）の集合"""
+        return {row[0] for row in self._query("SELECT DISTINCT day FROM usage_daily")}
+
+    def daily_rollups(
+        self,
+        start_day: str | None = None,
+        end_day: str | None = None,
+        provider: str | None = None,
+    ) -> list[UsageRollup]:
+        """日別の集計を取得
+
+        Args:
+            start_day: 対象期間の最初の日付（YYYY-MM-DD、この日を含む。Noneの場合は制限しない）
+            end_day: 対象期間の最後の日付（YYYY-MM-DD、この日を含まない。Noneの場合は制限しない）
+            provider: プロバイダー名（Noneの場合はすべて）
+
+        Returns:
+            日付順の集計のリスト
+        """
+        bounds = (start_day or "", end_day or _DAY_UPPER_BOUND)
+        if provider is None:
+            rows = self._query(f"{_SELECT_DAILY} ORDER BY day, provider, model, analysis_type", bounds)
+        else:
+            rows = self._query(
+                f"{_SELECT_DAILY} AND provider = ? ORDER BY day, provider, model, analysis_type", (*bounds, provider)
+            )
+        return [_rollup_from_row(row) for row in rows]
+
+    def record_rollups(self, start_timestamp: str, end_timestamp: str) -> list[UsageRollup]:
+        """指定した時刻の範囲のレコードを日別にまとめた集計を取得
+
+        日の途中から始まる期間の最初の日のように、日別の集計をそのまま使えない範囲に使用します。
+
+        Args:
+            start_timestamp: 範囲の開始時刻（ISO形式、この時刻を含む）
+            end_timestamp: 範囲の終了時刻（ISO形式、この時刻を含まない）
+
+        Returns:
+            日付順の集計のリスト
+        """
+        rows = self._query(
+            "SELECT day, provider, model, analysis_type, COUNT(*), SUM(success), SUM(input_tokens), "
+            "SUM(output_tokens), SUM(total_tokens), SUM(cost) FROM usage_records "
+            "WHERE timestamp >= ? AND timestamp < ? GROUP BY day, provider, model, analysis_type "
+            "ORDER BY day, provider, model, analysis_type",
+            (start_timestamp, end_timestamp),
+        )
+        return [_rollup_from_row(row) for row in rows]
+
+    def iter_records(self) -> Iterator[UsageRecord]:
+        """すべての使用レコードを記録順に取得"""
+        rows = self._query(
+            "SELECT timestamp, provider, model, input_tokens, output_tokens, total_tokens, cost, "
+            "analysis_type, success FROM usage_records ORDER BY id"
+        )
+        for row in rows:
+            yield UsageRecord(
+                timestamp=row[0],
+                provider=row[1],
+                model=row[2],
+                input_tokens=row[3],
+                output_tokens=row[4],
+                total_tokens=row[5],
+                cost=row[6],
+                analysis_type=row[7],
+                success=bool(row[8]),
+            )
+
+    def delete_before(self, cutoff_timestamp: str) -> int:
+        """指定した時刻以前の使用レコードと、それより前の日の集計を削除
+
+        削除したレコードの分を日別の集計から差し引き、月別の集計は対象の月について日別の集計から作り直します。
+
+        Args:
+            cutoff_timestamp: 削除する範囲の終わりの時刻（ISO形式、この時刻を含む）
+
+        Returns:
+            削除したレコード数
+        """
+        cutoff_day = cutoff_timestamp[:10]
+        with self._write_transaction() as connection:
+            # 削除するレコードの分を日別の集計から差し引く
+            removed = connection.execute(
+                "SELECT day, provider, model, analysis_type, COUNT(*), SUM(success), SUM(input_tokens), "
+                "SUM(output_tokens), SUM(total_tokens), SUM(cost) FROM usage_records "
+                "WHERE timestamp <= ? GROUP BY day, provider, model, analysis_type",
+                (cutoff_timestamp,),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE usage_daily SET requests = requests - ?, successful_requests = successful_requests - ?, "
+                "input_tokens = input_tokens - ?, output_tokens = output_tokens - ?, "
+                "total_tokens = total_tokens - ?, cost = cost - ? "
+                "WHERE day = ? AND provider = ? AND model = ? AND analysis_type = ?",
+                [(*row[4:], *row[:4]) for row in removed],
+            )
+            deleted = connection.execute("DELETE FROM usage_records WHERE timestamp <= ?", (cutoff_timestamp,)).rowcount
+            connection.execute("DELETE FROM usage_daily WHERE day < ? OR requests <= 0", (cutoff_day,))
+
+            # 月別の集計を作り直す
+            cutoff_month = cutoff_day[:7]
+            connection.execute("DELETE FROM usage_monthly WHERE month <= ?", (cutoff_month,))
+            connection.execute(
+                "INSERT INTO usage_monthly (month, provider, requests, cost) "
+                "SELECT substr(day, 1, 7), provider, SUM(requests), SUM(cost) FROM usage_daily "
+                "WHERE substr(day, 1, 7) <= ? GROUP BY substr(day, 1, 7), provider",
+                (cutoff_month,),
+            )
+        return deleted
+
+
+def _rollup_from_row(row: tuple[Any, ...]) -> UsageRollup:
+    """問い合わせ結果の行から集計を作成"""
+    return UsageRollup(
+        day=row[0],
+        provider=row[1],
+        model=row[2],
+        analysis_type=row[3],
+        requests=int(row[4]),
+        successful_requests=int(row[5]),
+        input_tokens=int(row[6]),
+        output_tokens=int(row[7]),
+        total_tokens=int(row[8]),
+        cost=float(row[9]),
+    )
+
+
+@contextmanager
+def _open_file_database(db_path: Path) -> Generator[sqlite3.Connection]:
+    """メモリ上のデータベースとの読み書き用にファイルのデータベースを開く"""
+    connection = sqlite3.connect(db_path, timeout=_BUSY_TIMEOUT_SECONDS)
+    try:
+        yield connection
+    finally:
+        connection.close()
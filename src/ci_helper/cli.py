@@ -1,10 +1,14 @@
 """ci-helper CLIエントリーポイント
 
 Clickを使用したマルチコマンドCLIインターフェースを提供します。
+
+サブコマンドのモジュールは実行時に初めてインポートします。``ci-run logs`` や
+``ci-run --version`` の起動時に、AI分析用のプロバイダーSDKなどを読み込まずに済みます。
 """
 
 from __future__ import annotations
 
+import importlib
 import sys
 import traceback
 from collections.abc import Callable
@@ -15,25 +19,100 @@ import click
 from rich.console import Console
 
 from . import __version__
-
-# サブコマンドのインポート
-from .commands.cache import cache
-from .commands.clean import clean
-from .commands.doctor import doctor
-from .commands.format_logs import format_logs, format_logs_custom_handler, format_logs_handler
-from .commands.init import init, setup
-from .commands.logs import logs
-from .commands.secrets import secrets
-from .commands.test import test
 from .core.error_handler import ErrorHandler
 from .core.exceptions import CIHelperError
-from .ui import CommandMenuBuilder, MenuSystem
 from .utils.config import Config
 
 console = Console()
 
+# サブコマンド名 -> (モジュール名, 属性名)（登録順にヘルプへ表示）
+SUBCOMMANDS: dict[str, tuple[str, str]] = {
+    "init": ("init", "init"),
+    "setup": ("init", "setup"),
+    "doctor": ("doctor", "doctor"),
+    "test": ("test", "test"),
+    "logs": ("logs", "logs"),
+    "format-logs": ("format_logs", "format_logs"),
+    "secrets": ("secrets", "secrets"),
+    "clean": ("clean", "clean"),
+    "cache": ("cache", "cache"),
+    "feedback": ("feedback", "feedback"),
+    "analyze": ("analyze", "analyze"),
+    "discover-patterns": ("discover_patterns", "discover_patterns"),
+}
+
+# 依存関係が不足している場合は登録しないサブコマンド
+OPTIONAL_SUBCOMMANDS = frozenset({"feedback", "analyze", "discover-patterns"})
+
+
+def _load_command_attr(module_name: str, attr_name: str) -> Any:
+    """サブコマンドのモジュールをインポートして属性を取得
+
+    Args:
+        module_name: ``ci_helper.commands`` 配下のモジュール名
+        attr_name: 属性名
+
+    Returns:
+        モジュールの属性
+
+    Raises:
+        ImportError: モジュールをインポートできない場合
+    """
+    module = importlib.import_module(f"{__package__}.commands.{module_name}")
+    return getattr(module, attr_name)
+
+
+def _load_command(name: str) -> click.Command:
+    """サブコマンドを取得
 
-@click.group(invoke_without_command=True)
+    Args:
+        name: サブコマンド名
+
+    Returns:
+        サブコマンド
+
+    Raises:
+        ImportError: モジュールをインポートできない場合
+    """
+    command = _load_command_attr(*SUBCOMMANDS[name])
+    if not isinstance(command, click.Command):
+        raise TypeError(f"Clickのコマンドではありません: {name}")
+    return command
+
+
+class LazyGroup(click.Group):
+    """サブコマンドを必要になった時点でインポートするコマンドグループ"""
+
+    def __init__(self, *args: Any, lazy_commands: dict[str, tuple[str, str]] | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        """遅延読み込みするコマンドと登録済みのコマンドの名前を取得（インポートは行わない）"""
+        names = list(self.lazy_commands)
+        names.extend(name for name in super().list_commands(ctx) if name not in self.lazy_commands)
+        return names
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        """コマンドを取得（未インポートの場合はここでインポートして登録）"""
+        command = super().get_command(ctx, cmd_name)
+        if command is not None or cmd_name not in self.lazy_commands:
+            return command
+
+        try:
+            command = _load_command_attr(*self.lazy_commands[cmd_name])
+        except ImportError:
+            if cmd_name in OPTIONAL_SUBCOMMANDS:
+                # AI統合などの依存関係が利用できない場合はコマンドなしとして扱う
+                return None
+            raise
+        if not isinstance(command, click.Command):
+            return None
+        self.add_command(command, cmd_name)
+        return command
+
+
+@click.group(cls=LazyGroup, lazy_commands=SUBCOMMANDS, invoke_without_command=True)
 @click.version_option(version=__version__, prog_name="ci-run")
 @click.option(
     "--verbose",
@@ -121,35 +200,6 @@ def cli(ctx: click.Context, verbose: bool, config_file: Path | None, menu: bool)
         sys.exit(1)
 
 
-# サブコマンドの登録
-cli.add_command(init)
-cli.add_command(setup)
-cli.add_command(doctor)
-cli.add_command(test)
-cli.add_command(logs)
-cli.add_command(format_logs)
-cli.add_command(secrets)
-cli.add_command(clean)
-cli.add_command(cache)
-
-# フィードバックコマンドの登録
-try:
-    from .commands.feedback import feedback
-
-    cli.add_command(feedback)
-except ImportError:
-    pass
-
-# AI統合コマンドの遅延登録（循環インポート回避）
-try:
-    from .commands.analyze import analyze
-
-    cli.add_command(analyze)
-except ImportError:
-    # AI統合が利用できない場合はスキップ
-    pass
-
-
 def _find_project_root(start_path: Path) -> Path:
     """プロジェクトルートを探索"""
     search_paths = [start_path, *start_path.parents]
@@ -180,6 +230,8 @@ def _start_menu_mode(ctx: click.Context) -> None:
         command_handlers = _create_command_handlers(ctx)
 
         # メニューシステムを初期化
+        from .ui import CommandMenuBuilder, MenuSystem
+
         menu_builder = CommandMenuBuilder(console, command_handlers)
         menu_system = MenuSystem(console)
 
@@ -246,7 +298,7 @@ def _test_workflow_handler(ctx: click.Context, workflow: str) -> object:
     """Test specific workflow handler."""
     return _invoke_command(
         ctx,
-        test,
+        _load_command("test"),
         workflow=(workflow,),
         verbose=False,
         output_format="markdown",
@@ -254,6 +306,8 @@ def _test_workflow_handler(ctx: click.Context, workflow: str) -> object:
         log_file=None,
         diff=False,
         save=True,
+        parallel=None,
+        stream=False,
         sanitize=True,
     )
 
@@ -270,11 +324,9 @@ def _analyze_interactive_handler(ctx: click.Context) -> object:
     """Interactive AI analysis handler."""
     console = ctx.obj["console"]
     try:
-        from .commands.analyze import analyze
-
         return _invoke_command(
             ctx,
-            analyze,
+            _load_command("analyze"),
             log_file=None,
             provider=None,
             model=None,
@@ -297,11 +349,9 @@ def _analyze_file_handler(ctx: click.Context, log_file: str) -> object:
     """Specific file analysis handler."""
     console = ctx.obj["console"]
     try:
-        from .commands.analyze import analyze
-
         return _invoke_command(
             ctx,
-            analyze,
+            _load_command("analyze"),
             log_file=Path(log_file),
             provider=None,
             model=None,
@@ -315,7 +365,7 @@ def _analyze_file_handler(ctx: click.Context, log_file: str) -> object:
             verbose=False,
             retry_operation_id=None,
         )
-    except NameError:
+    except ImportError, NameError:
         console.print("[red]AI分析機能は利用できません。[/red]")
         return False
 
@@ -323,8 +373,8 @@ def _analyze_file_handler(ctx: click.Context, log_file: str) -> object:
 def _cache_pull_handler(ctx: click.Context, images: tuple[str, ...] | None = None, timeout: int = 3600) -> object:
     """Cache pull handler."""
     if images:
-        return _invoke_command(ctx, cache, pull=True, image=images, timeout=timeout)
-    return _invoke_command(ctx, cache, pull=True, timeout=timeout)
+        return _invoke_command(ctx, _load_command("cache"), pull=True, image=images, timeout=timeout)
+    return _invoke_command(ctx, _load_command("cache"), pull=True, timeout=timeout)
 
 
 def _create_command_handlers(ctx: click.Context) -> dict[str, Callable[..., object]]:
@@ -340,14 +390,14 @@ def _create_command_handlers(ctx: click.Context) -> dict[str, Callable[..., obje
     console = ctx.obj["console"]
     handlers: dict[str, Callable[..., Any]] = {}
 
-    handlers["init"] = lambda: _invoke_command(ctx, init, force=False, interactive=False)
-    handlers["init_interactive"] = lambda: _invoke_command(ctx, init, force=False, interactive=True)
-    handlers["setup"] = lambda: _invoke_command(ctx, setup, force=False)
-    handlers["doctor"] = lambda: _invoke_command(ctx, doctor, verbose=False, guide=None)
+    handlers["init"] = lambda: _invoke_command(ctx, _load_command("init"), force=False, interactive=False)
+    handlers["init_interactive"] = lambda: _invoke_command(ctx, _load_command("init"), force=False, interactive=True)
+    handlers["setup"] = lambda: _invoke_command(ctx, _load_command("setup"), force=False)
+    handlers["doctor"] = lambda: _invoke_command(ctx, _load_command("doctor"), verbose=False, guide=None)
 
     handlers["test"] = lambda: _invoke_command(
         ctx,
-        test,
+        _load_command("test"),
         workflow=(),
         verbose=False,
         output_format="markdown",
@@ -355,19 +405,25 @@ def _create_command_handlers(ctx: click.Context) -> dict[str, Callable[..., obje
         log_file=None,
         diff=False,
         save=True,
+        parallel=None,
+        stream=False,
         sanitize=True,
     )
 
-    handlers["logs"] = lambda: _invoke_command(ctx, logs)
-    handlers["secrets"] = lambda: _invoke_command(ctx, secrets)
-    handlers["cache"] = lambda: _invoke_command(ctx, cache)
-    handlers["clean"] = lambda: _invoke_command(ctx, clean)
+    handlers["logs"] = lambda: _invoke_command(ctx, _load_command("logs"))
+    handlers["secrets"] = lambda: _invoke_command(ctx, _load_command("secrets"))
+    handlers["cache"] = lambda: _invoke_command(ctx, _load_command("cache"))
+    handlers["clean"] = lambda: _invoke_command(ctx, _load_command("clean"))
 
-    # analyze command
-    try:
-        from .commands.analyze import analyze
+    # analyze command（AI統合は選択された時点でインポートする）
+    def analyze_wrapper() -> object:
+        try:
+            analyze = _load_command("analyze")
+        except ImportError:
+            console.print("[red]AI分析機能は利用できません。必要な依存関係を確認してください。[/red]")
+            return False
 
-        handlers["analyze"] = lambda: _invoke_command(
+        return _invoke_command(
             ctx,
             analyze,
             log_file=None,
@@ -383,13 +439,8 @@ def _create_command_handlers(ctx: click.Context) -> dict[str, Callable[..., obje
             verbose=False,
             retry_operation_id=None,
         )
-    except ImportError, NameError:
 
-        def analyze_unavailable() -> bool:
-            console.print("[red]AI分析機能は利用できません。必要な依存関係を確認してください。[/red]")
-            return False
-
-        handlers["analyze"] = analyze_unavailable
+    handlers["analyze"] = analyze_wrapper
 
     def test_workflow_wrapper(workflow: str) -> object:
         return _test_workflow_handler(ctx, workflow)
@@ -411,24 +462,31 @@ def _create_command_handlers(ctx: click.Context) -> dict[str, Callable[..., obje
 
     handlers["analyze_file"] = analyze_file_wrapper
 
-    handlers["logs_latest"] = lambda: _invoke_command(ctx, logs, latest=True)
+    handlers["logs_latest"] = lambda: _invoke_command(ctx, _load_command("logs"), latest=True)
 
     def logs_compare_wrapper(log1: str, log2: str) -> object:
-        return _invoke_command(ctx, logs, compare=[log1, log2])
+        return _invoke_command(ctx, _load_command("logs"), compare=[log1, log2])
 
     handlers["logs_compare"] = logs_compare_wrapper
 
-    handlers["secrets_list"] = lambda: _invoke_command(ctx, secrets, list_secrets=True)
+    handlers["secrets_list"] = lambda: _invoke_command(ctx, _load_command("secrets"), list_secrets=True)
 
     def cache_pull_wrapper(images: tuple[str, ...] | None = None, timeout: int = 3600) -> object:
         return _cache_pull_handler(ctx, images, timeout)
 
     handlers["cache_pull"] = cache_pull_wrapper
 
-    handlers["cache_clear"] = lambda: _invoke_command(ctx, cache, clear=True)
+    handlers["cache_clear"] = lambda: _invoke_command(ctx, _load_command("cache"), clear=True)
+
+    def format_logs_wrapper(*args: Any, **kwargs: Any) -> bool:
+        return _load_command_attr("format_logs", "format_logs_handler")(*args, **kwargs)
+
+    handlers["format_logs"] = format_logs_wrapper
+
+    def format_logs_custom_wrapper(*args: Any, **kwargs: Any) -> bool:
+        return _load_command_attr("format_logs", "format_logs_custom_handler")(*args, **kwargs)
 
-    handlers["format_logs"] = format_logs_handler
-    handlers["format_logs_custom"] = format_logs_custom_handler
+    handlers["format_logs_custom"] = format_logs_custom_wrapper
 
     return handlers
 
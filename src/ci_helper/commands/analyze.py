@@ -40,6 +40,7 @@ from ci_helper.core.error_handler import ErrorHandler
 from ci_helper.core.exceptions import CIHelperError
 from ci_helper.core.japanese_messages import JapaneseErrorHandler
 from ci_helper.core.log_manager import LogManager
+from ci_helper.core.log_view import LogView
 from ci_helper.ui.enhanced_formatter import EnhancedAnalysisFormatter
 
 CONFIDENCE_HIGH = 0.8
@@ -136,6 +137,11 @@ class AnalysisErrorContext:
     default=None,
     help="ストリーミングレスポンスの有効/無効(設定ファイルの値を上書き)",
 )
+@click.option(
+    "--race",
+    is_flag=True,
+    help="設定済みの複数のプロバイダーで同時に分析し、最初に得られた結果を使用",
+)
 @click.option(
     "--cache/--no-cache",
     default=True,
@@ -174,6 +180,7 @@ def analyze(
     fix: bool,
     interactive: bool,
     streaming: bool | None,
+    race: bool,
     cache: bool,
     stats: bool,
     output_format: str,
@@ -191,6 +198,7 @@ def analyze(
       ci-run analyze --log path/to/log         # 特定のログファイルを分析
       ci-run analyze --provider openai         # OpenAIプロバイダーを使用
       ci-run analyze --model gpt-4o            # 特定のモデルを使用
+      ci-run analyze --race                    # 複数のプロバイダーで同時に分析
       ci-run analyze --fix                     # 修正提案を生成
       ci-run analyze --interactive             # 対話モードで分析
       ci-run analyze --stats                   # 使用統計を表示
@@ -242,6 +250,7 @@ def analyze(
             fix=fix,
             interactive=interactive,
             streaming=streaming,
+            race=race,
             use_cache=cache,
             output_format=output_format,
             verbose=verbose,
@@ -311,6 +320,7 @@ def analyze(
                         "fix": fix,
                         "interactive": interactive,
                         "streaming": streaming,
+                        "race": race,
                         "cache": cache,
                         "output_format": output_format,
                         "verbose": verbose,
@@ -356,6 +366,7 @@ class AnalysisConfig:
     fix: bool
     interactive: bool
     streaming: bool | None
+    race: bool
     use_cache: bool
     output_format: str
     verbose: bool
@@ -381,6 +392,7 @@ async def _run_analysis(
     fix = config.fix
     interactive = config.interactive
     streaming = config.streaming
+    race = config.race
     use_cache = config.use_cache
     output_format = config.output_format
     verbose = config.verbose
@@ -412,6 +424,7 @@ async def _run_analysis(
             model=model,
             custom_prompt=custom_prompt,
             streaming=streaming if streaming is not None else True,
+            race_providers=race,
             use_cache=use_cache,
             generate_fixes=fix,
             output_format=output_format,
@@ -916,7 +929,9 @@ def _read_log_file(log_file: Path) -> str:
 
     """
     try:
-        return log_file.read_text(encoding="utf-8")
+        # 大きなログはmmapから直接デコードし、バイト列のコピーを作らない
+        with LogView.open(log_file) as view:
+            return view.read_text()
     except Exception as e:
         msg = f"ログファイルの読み込みに失敗しました: {e}"
         raise CIHelperError(msg) from e
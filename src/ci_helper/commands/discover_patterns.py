@@ -0,0 +1,200 @@
+"""
+discover-patterns コマンドの実装
+
+ログ履歴全体からエラーメッセージを集計し、新しいエラーパターンの候補を発見します。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.progress import track
+from rich.table import Table
+
+from ..ai.learning_engine import LearningEngine
+from ..ai.models import Pattern
+from ..ai.pattern_bundle import pattern_to_dict
+from ..ai.pattern_database import PatternDatabase
+from ..ai.pattern_discovery import count_errors_in_logs, load_processed_logs, log_key, save_processed_logs
+from ..core.log_storage import iter_log_files
+from ..utils.config import Config
+
+console = Console()
+
+# パターン候補の出力ファイル名（パターンデータベースのディレクトリ内）
+CANDIDATES_FILENAME = "pattern_candidates.json"
+
+# 集計済みのログの記録ファイル名（パターンデータベースのディレクトリ内）
+PROCESSED_LOGS_FILENAME = "discovered_logs.json"
+
+# 画面に表示するパターン候補の最大数
+_MAX_DISPLAYED_CANDIDATES = 20
+
+
+@click.command("discover-patterns")
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    help="ログを集計するワーカープロセスの数（省略時はCPU数）",
+)
+@click.option(
+    "--min-occurrences",
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+    help="パターン候補とするエラーの最小出現回数",
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help=f"パターン候補の出力先（省略時はパターンデータベースの {CANDIDATES_FILENAME}）",
+)
+@click.option(
+    "--rescan",
+    is_flag=True,
+    help="集計済みのログも含めてエラー頻度を集計し直します",
+)
+@click.pass_context
+def discover_patterns(
+    ctx: click.Context,
+    workers: int | None,
+    min_occurrences: int,
+    output_file: Path | None,
+    rescan: bool,
+) -> None:
+    """ログ履歴全体から新しいエラーパターンの候補を発見
+
+    ログディレクトリ内のまだ集計していないログ（圧縮済みを含む）をワーカープロセスで並列に集計し、
+    エラー頻度に加えます。既存パターンと重複しない頻出エラーをパターン候補として出力します。
+    出力はパターンファイルと同じ形式で、occurrence_count が候補の支持数（エラーの出現回数）です。
+
+    \b
+    使用例:
+      ci-run discover-patterns                 # 新しいログを集計して候補を出力
+      ci-run discover-patterns -j 8            # 8プロセスで集計
+      ci-run discover-patterns --rescan        # すべてのログを集計し直す
+    """
+    config: Config = ctx.obj["config"]
+    log_dir = config.get_path("log_dir")
+    pattern_dir = config.get_pattern_database_path()
+    output_path = output_file or pattern_dir / CANDIDATES_FILENAME
+    record_path = pattern_dir / PROCESSED_LOGS_FILENAME
+
+    processed: set[str] = set() if rescan else load_processed_logs(record_path)
+    log_paths: dict[str, Path] = {}
+    if log_dir.exists():
+        for path in sorted(iter_log_files(log_dir)):
+            # 圧縮の途中で同じログが2つある場合は1回だけ集計する
+            log_paths.setdefault(log_key(path), path)
+    new_logs = [path for key, path in log_paths.items() if key not in processed]
+
+    console.print(f"[bold blue]🔍 {len(new_logs)}個のログを集計します[/bold blue] (集計済み: {len(processed)}個)")
+
+    error_counts: Counter[str] = Counter()
+    failed_logs: list[tuple[Path, str]] = []
+    for result in track(
+        count_errors_in_logs(new_logs, workers),
+        total=len(new_logs),
+        description="ログを集計中...",
+        console=console,
+    ):
+        if result.error is not None:
+            failed_logs.append((result.path, result.error))
+            continue
+        error_counts.update(result.counts)
+        processed.add(log_key(result.path))
+
+    for path, error in failed_logs:
+        console.print(f"[yellow]⚠️  ログを読み込めませんでした: {path.name} - {error}[/yellow]")
+
+    candidates = asyncio.run(_discover_candidates(pattern_dir, error_counts, min_occurrences, rescan))
+    save_processed_logs(record_path, processed)
+    _write_candidates(output_path, [pattern for pattern, _ in candidates], len(processed))
+
+    _display_candidates(candidates)
+    console.print(f"\n[green]✅ {len(candidates)}個のパターン候補を出力しました: {output_path}[/green]")
+
+
+async def _discover_candidates(
+    pattern_dir: Path,
+    error_counts: Counter[str],
+    min_occurrences: int,
+    rescan: bool,
+) -> list[tuple[Pattern, str]]:
+    """集計したエラーメッセージの出現回数からパターン候補を発見
+
+    Args:
+        pattern_dir: パターンデータベースのディレクトリ（学習データも保存）
+        error_counts: 今回集計したエラーメッセージの出現回数
+        min_occurrences: パターン候補とするエラーの最小出現回数
+        rescan: これまでのエラー頻度を破棄して集計し直す場合True
+
+    Returns:
+        (パターン候補, エラーシグネチャ) のタプルのリスト（支持数の多い順）
+    """
+    pattern_database = PatternDatabase(pattern_dir)
+    await pattern_database.load_patterns()
+
+    learning_engine = LearningEngine(
+        pattern_database,
+        learning_data_dir=pattern_dir,
+        min_pattern_occurrences=min_occurrences,
+    )
+    await learning_engine.initialize()
+    if rescan:
+        learning_engine.error_frequency.clear()
+
+    patterns = await learning_engine.discover_patterns_from_error_counts(error_counts)
+    return [(pattern, learning_engine.learned_patterns[pattern.id]["error_signature"]) for pattern in patterns]
+
+
+def _write_candidates(output_path: Path, candidates: list[Pattern], log_count: int) -> None:
+    """パターン候補をパターンファイルと同じ形式で書き込み
+
+    Args:
+        output_path: 出力先
+        candidates: パターン候補
+        log_count: 集計済みのログの数
+    """
+    now = datetime.now().isoformat()
+    data = {
+        "patterns": [pattern_to_dict(pattern) for pattern in candidates],
+        "metadata": {
+            "description": "ログ履歴から発見したパターン候補",
+            "created_at": now,
+            "updated_at": now,
+            "pattern_count": len(candidates),
+            "log_count": log_count,
+        },
+    }
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def _display_candidates(candidates: list[tuple[Pattern, str]]) -> None:
+    """支持数の多いパターン候補を表示"""
+    if not candidates:
+        console.print("[yellow]新しいパターン候補は見つかりませんでした[/yellow]")
+        return
+
+    table = Table(title="パターン候補")
+    table.add_column("ID", style="cyan")
+    table.add_column("カテゴリ")
+    table.add_column("支持数", justify="right")
+    table.add_column("エラーシグネチャ")
+    for pattern, error_signature in candidates[:_MAX_DISPLAYED_CANDIDATES]:
+        table.add_row(pattern.id, pattern.category, str(pattern.occurrence_count), error_signature)
+    console.print(table)
+
+    if len(candidates) > _MAX_DISPLAYED_CANDIDATES:
+        console.print(f"... 他 {len(candidates) - _MAX_DISPLAYED_CANDIDATES}個")
@@ -7,6 +7,7 @@ CI実行ログを様々な形式で整形するコマンドを提供します。
 from __future__ import annotations
 
 import time
+from dataclasses import replace
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -16,11 +17,12 @@ from rich.console import Console
 from ..core.exceptions import ExecutionError, FileOperationError, LogFormattingError, UserInputError
 from ..core.log_extractor import LogExtractor
 from ..core.log_manager import LogManager
-from ..core.models import ExecutionResult
+from ..core.log_view import DEFAULT_MMAP_THRESHOLD_MB, LogView
+from ..core.models import ExecutionResult, Failure
 from ..formatters import get_formatter_manager
 from ..utils.config import Config
-from ..utils.file_save_utils import FileSaveManager
-from ..utils.progress_display import get_progress_manager
+from ..utils.file_save_utils import DEFAULT_STREAM_BUFFER_CHARS, FileSaveManager
+from ..utils.progress_display import ProgressDisplayManager, get_progress_manager
 
 if TYPE_CHECKING:
     pass
@@ -78,6 +80,17 @@ if TYPE_CHECKING:
     is_flag=True,
     help="フォーマット結果キャッシュをクリア",
 )
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="整形結果を生成しながら出力（大きなログ向け、キャッシュは使用しない）",
+)
+@click.option(
+    "--buffer-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_STREAM_BUFFER_CHARS // 1024,
+    help=f"--stream の書き込みバッファサイズ（K文字、デフォルト: {DEFAULT_STREAM_BUFFER_CHARS // 1024}）",
+)
 @click.pass_context
 def format_logs(
     ctx: click.Context,
@@ -90,6 +103,8 @@ def format_logs(
     disable_optimization: bool,
     max_memory: int,
     clear_cache: bool,
+    stream: bool,
+    buffer_size: int,
 ) -> None:
     """ログを指定された形式で整形
 
@@ -99,6 +114,7 @@ def format_logs(
       ci-run format-logs --format human           # 人間可読形式で出力
       ci-run format-logs --format json --output result.json  # JSON形式でファイル保存
       ci-run format-logs --input act_20240101.log --format ai  # 特定ログをAI形式で出力
+      ci-run format-logs --format json --output result.json --stream  # 生成しながらファイルに書き込み
     """
     console = Console()
     progress_manager = get_progress_manager(console)
@@ -156,8 +172,29 @@ def format_logs(
         def format_task():
             return formatter_manager.format_log(execution_result, output_format, **format_options)
 
+        # ストリーミング出力（整形結果全体を保持せずに書き込む）
+        if stream:
+            chunks = formatter_manager.format_log_stream(execution_result, output_format, **format_options)
+
+            if output_file is None:
+                for chunk in chunks:
+                    click.echo(chunk, nl=False)
+                click.echo()
+                return
+
+            file_manager = FileSaveManager(console, enable_security=True)
+            success, saved_path = file_manager.save_formatted_log_stream(
+                chunks,
+                output_file=str(output_file),
+                format_type=output_format,
+                default_dir=file_manager.get_default_output_directory(),
+                confirm_overwrite=not no_confirm,
+                buffer_size=buffer_size * 1024,
+            )
+            _show_save_result(progress_manager, ctx, success, saved_path, output_format, start_time)
+
         # 標準出力の場合は進行状況を表示しない
-        if output_file is None:
+        elif output_file is None:
             # 標準出力への出力（シンプルな進行状況表示）
             formatted_content = progress_manager.execute_with_progress(
                 task_func=format_task,
@@ -188,29 +225,7 @@ def format_logs(
                 confirm_overwrite=not no_confirm,
             )
 
-            if not success:
-                error_suggestions = [
-                    "出力ディレクトリの書き込み権限を確認してください",
-                    "ディスク容量が十分にあるか確認してください",
-                    "別の出力パスを試してみてください",
-                ]
-                progress_manager.show_error_message(
-                    error=Exception("ログの保存に失敗しました"),
-                    context="ファイル保存処理",
-                    suggestions=error_suggestions,
-                )
-                # ファイル保存失敗時は終了コード1
-                ctx.exit(1)
-
-            # 処理時間を計算
-            processing_time = time.time() - start_time
-
-            # 成功メッセージを表示
-            progress_manager.show_success_message(
-                format_type=output_format,
-                output_file=saved_path,
-                processing_time=processing_time,
-            )
+            _show_save_result(progress_manager, ctx, success, saved_path, output_format, start_time)
 
         # 正常終了時は終了コード0（デフォルト）
 
@@ -255,6 +270,49 @@ def format_logs(
         ctx.exit(1)
 
 
+def _show_save_result(
+    progress_manager: ProgressDisplayManager,
+    ctx: click.Context,
+    success: bool,
+    saved_path: str | None,
+    output_format: str,
+    start_time: float,
+) -> None:
+    """ファイル保存の結果を表示（失敗時は終了コード1で終了）
+
+    Args:
+        progress_manager: 進行状況マネージャー
+        ctx: Clickコンテキスト
+        success: 保存に成功したかどうか
+        saved_path: 保存されたファイルパス
+        output_format: 出力フォーマット
+        start_time: 処理開始時刻
+    """
+    if not success:
+        error_suggestions = [
+            "出力ディレクトリの書き込み権限を確認してください",
+            "ディスク容量が十分にあるか確認してください",
+            "別の出力パスを試してみてください",
+        ]
+        progress_manager.show_error_message(
+            error=Exception("ログの保存に失敗しました"),
+            context="ファイル保存処理",
+            suggestions=error_suggestions,
+        )
+        # ファイル保存失敗時は終了コード1
+        ctx.exit(1)
+
+    # 処理時間を計算
+    processing_time = time.time() - start_time
+
+    # 成功メッセージを表示
+    progress_manager.show_success_message(
+        format_type=output_format,
+        output_file=saved_path,
+        processing_time=processing_time,
+    )
+
+
 def _sanitize_log_content(content: str) -> str:
     """ログ内容をサニタイズしてRichマークアップエラーを防ぐ
 
@@ -279,6 +337,24 @@ def _sanitize_log_content(content: str) -> str:
     return content
 
 
+def _sanitize_failure(failure: Failure) -> Failure:
+    """抽出した失敗情報のテキストをサニタイズしてRichマークアップエラーを防ぐ
+
+    Args:
+        failure: 抽出した失敗情報
+
+    Returns:
+        サニタイズされた失敗情報
+    """
+    return replace(
+        failure,
+        message=_sanitize_log_content(failure.message),
+        context_before=[_sanitize_log_content(line) for line in failure.context_before],
+        context_after=[_sanitize_log_content(line) for line in failure.context_after],
+        stack_trace=_sanitize_log_content(failure.stack_trace) if failure.stack_trace else failure.stack_trace,
+    )
+
+
 def _get_execution_result(log_manager: LogManager, input_file: Path | None, console: Console) -> ExecutionResult | None:
     """実行結果を取得
 
@@ -294,7 +370,8 @@ def _get_execution_result(log_manager: LogManager, input_file: Path | None, cons
         if input_file:
             # 指定されたファイルから読み込み
             console.print(f"[dim]ログファイルを読み込み中: {input_file}[/dim]")
-            log_content = input_file.read_text(encoding="utf-8")
+            threshold_mb = log_manager.config.get("log_mmap_threshold_mb", DEFAULT_MMAP_THRESHOLD_MB)
+            log_view = LogView.open(input_file, threshold_mb)
         else:
             # 最新ログを取得
             console.print("[dim]最新ログを取得中...[/dim]")
@@ -305,14 +382,12 @@ def _get_execution_result(log_manager: LogManager, input_file: Path | None, cons
                 return None
 
             latest_log = logs[0]
-            log_content = log_manager.get_log_content(latest_log["log_file"])
-
-        # ログ内容をサニタイズ（Richマークアップエラーを防ぐ）
-        log_content = _sanitize_log_content(log_content)
+            log_view = log_manager.open_log_view(latest_log["log_file"])
 
-        # ログ内容から実行結果を構築
+        # 大きなログはmmapのまま走査し、抽出した箇所のみをデコードする
         extractor = LogExtractor()
-        failures = extractor.extract_failures(log_content)
+        with log_view:
+            failures = [_sanitize_failure(failure) for failure in extractor.extract_failures_from_view(log_view)]
 
         # ダミーのJobResultとWorkflowResultを作成
         from ..core.models import JobResult, WorkflowResult
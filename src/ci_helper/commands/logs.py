@@ -138,6 +138,10 @@ def _show_log_statistics(log_manager: LogManager) -> None:
 
     table.add_row("総ログ数", str(stats["total_logs"]))
     table.add_row("総サイズ", f"{stats['total_size_mb']} MB")
+    raw_size_mb = stats.get("total_raw_size_mb")
+    if raw_size_mb is not None and raw_size_mb != stats["total_size_mb"]:
+        # 圧縮保存したログがある場合は展開後のサイズも表示
+        table.add_row("総サイズ（展開後）", f"{raw_size_mb} MB")
     table.add_row("成功率", f"{stats['success_rate']}%")
     table.add_row("平均実行時間", f"{stats['average_duration']}秒")
 
@@ -25,6 +25,7 @@ from ..core.ci_runner import CIRunner
 from ..core.error_handler import DependencyChecker, ErrorHandler
 from ..core.exceptions import CIHelperError
 from ..core.log_manager import LogManager
+from ..core.log_storage import open_log_text
 from ..utils.config import Config
 
 console = Console()
@@ -71,6 +72,19 @@ console = Console()
     default=True,
     help="実行ログを保存するかどうか（デフォルト: 保存する）",
 )
+@click.option(
+    "--parallel",
+    type=click.IntRange(min=0),
+    is_flag=False,
+    flag_value=0,
+    default=None,
+    help="ワークフローを並列実行する同時実行数（値省略時はCPU数から自動決定、デフォルト: 設定値）",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="actの出力をリアルタイムで表示",
+)
 @click.option(
     "--sanitize/--no-sanitize",
     default=True,
@@ -86,6 +100,8 @@ def test(
     log_file: Path | None,
     diff: bool,
     save: bool,
+    parallel: int | None,
+    stream: bool,
     sanitize: bool,
 ) -> ExecutionResult | None:
     """CI/CDワークフローをローカルで実行
@@ -99,6 +115,8 @@ def test(
       ci-run test -w test.yml               # 特定のワークフローを実行
       ci-run test -w test.yml -w build.yml  # 複数のワークフローを実行
       ci-run test --verbose                 # 詳細出力で実行
+      ci-run test --parallel 4              # 最大4ワークフローを並列実行
+      ci-run test --stream                  # actの出力をリアルタイムで表示
       ci-run test --dry-run                 # ドライラン（実行せずに確認）
       ci-run test --format json             # JSON形式で出力
       ci-run test --diff                    # 前回実行との差分表示
@@ -137,6 +155,8 @@ def test(
                 verbose=verbose,
                 dry_run=dry_run,
                 save_logs=save,
+                parallel=parallel,
+                output_callback=_echo_act_output if stream and not dry_run else None,
             )
 
             progress.update(task, completed=True)
@@ -164,6 +184,11 @@ def test(
         ctx.exit(1)
 
 
+def _echo_act_output(line: str) -> None:
+    """actの出力行をそのままコンソールに表示"""
+    console.print(line, markup=False, highlight=False, soft_wrap=True)
+
+
 def _display_failure_summary(execution_result: ExecutionResult) -> None:
     """CI失敗時の概要を表示"""
     console = Console()
@@ -221,7 +246,7 @@ def _analyze_existing_log(log_file: Path, output_format: str, verbose: bool) ->
     console.print(f"[dim]ログファイルを解析中: {log_file}[/dim]")
 
     try:
-        with open(log_file, encoding="utf-8") as f:
+        with open_log_text(log_file) as f:
             log_content = f.read()
 
         # 基本的なログ解析（詳細な失敗抽出は後のタスクで実装）
@@ -24,11 +24,14 @@ reports_dir = ".ci-helper/reports"
 # ログ解析設定
 context_lines = 3  # エラー前後のコンテキスト行数
 max_log_size_mb = 100  # 最大ログファイルサイズ（MB）
+log_mmap_threshold_mb = 64  # これ以上のログはメモリマップで走査（MB）
+log_compression = "none"  # ログの圧縮保存（none / gzip / lzma）
 max_cache_size_mb = 500  # 最大キャッシュサイズ（MB）
 
 # act実行設定
 act_image = "ghcr.io/catthehacker/ubuntu:full-24.04"  # デフォルトDockerイメージ
 timeout_seconds = 1800  # タイムアウト（秒）
+parallel_workflows = 1  # ワークフローの同時実行数（0はCPU数から自動決定）
 
 # デフォルト動作
 verbose = false  # 詳細ログを有効にするか
@@ -20,6 +20,7 @@ from ci_helper.core.models import (
     WorkflowResult,
 )
 from ci_helper.core.security import SecurityValidator
+from ci_helper.utils.token_counter import get_token_counter
 
 logger = logging.getLogger(__name__)
 
@@ -392,16 +393,8 @@ class AIFormatter:
             )
             raise ImportError(msg)
 
-        try:
-            # モデルに対応するエンコーダーを取得
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            # 未知のモデルの場合はcl100k_baseエンコーディングを使用
-            encoding = tiktoken.get_encoding("cl100k_base")
-
-        # トークン数をカウント
-        tokens = encoding.encode(content)
-        return len(tokens)
+        # エンコーダーとカウント結果は共有のカウンターでキャッシュする
+        return get_token_counter(tiktoken).count(content, model)
 
     def check_token_limits(self, content: str, model: str = "gpt-4") -> dict[str, Any]:
         """トークン制限をチェックし、警告情報を返す.
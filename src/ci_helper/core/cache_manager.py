@@ -14,6 +14,9 @@ from pathlib import Path
 from typing import Any, TypedDict, cast
 
 from ..core.exceptions import ExecutionError
+from ..core.execution_history import HISTORY_DB_FILENAME
+from ..core.log_index import LogIndex
+from ..core.log_storage import LOG_FILE_PATTERNS, iter_log_files
 from ..utils.config import Config
 
 
@@ -133,7 +136,7 @@ class CacheManager:
             クリーンアップ結果
         """
         if remove_all:
-            files = [f for f in self.log_dir.glob("*.log") if f.is_file()]
+            files = [f for f in iter_log_files(self.log_dir) if f.is_file()]
             errors: list[str] = []
             freed_size = 0
 
@@ -146,18 +149,21 @@ class CacheManager:
                     files_to_delete=[str(f) for f in files],
                 )
 
-            deleted_files = 0
+            deleted_paths: list[Path] = []
             for file_path in files:
                 try:
                     file_size = file_path.stat().st_size
                     file_path.unlink()
-                    deleted_files += 1
+                    LogIndex.index_path(file_path).unlink(missing_ok=True)
+                    deleted_paths.append(file_path)
                     freed_size += file_size
                 except Exception as e:
                     errors.append(f"ファイル削除エラー {file_path}: {e}")
 
+            self._forget_deleted_logs(deleted_paths, errors)
+
             return CleanupResult(
-                deleted_files=deleted_files,
+                deleted_files=len(deleted_paths),
                 freed_size_mb=round(freed_size / (1024 * 1024), 2),
                 errors=errors,
                 files_to_delete=[],
@@ -173,7 +179,7 @@ class CacheManager:
             max_size_mb=max_size_mb,
             max_age_days=max_age_days,
             dry_run=dry_run,
-            file_pattern="*.log",
+            file_pattern=LOG_FILE_PATTERNS,
         )
 
     def cleanup_cache_only(self, dry_run: bool = False) -> CleanupResult:
@@ -234,7 +240,7 @@ class CacheManager:
         max_size_mb: int | None = None,
         max_age_days: float | int | None = None,
         dry_run: bool = False,
-        file_pattern: str = "*",
+        file_pattern: str | tuple[str, ...] = "*",
         exclude_files: list[str] | None = None,
     ) -> CleanupResult:
         """ディレクトリのクリーンアップを実行
@@ -245,7 +251,7 @@ class CacheManager:
             max_size_mb: 保持する最大サイズ（MB）
             max_age_days: 保持する最大日数
             dry_run: 実際の削除を行わない
-            file_pattern: ファイルパターン
+            file_pattern: ファイルパターン（複数指定した場合はいずれかに一致するファイル）
             exclude_files: 除外するファイル名のリスト
 
         Returns:
@@ -257,7 +263,8 @@ class CacheManager:
         exclude_files = exclude_files or []
 
         # ファイル一覧を取得（新しい順）
-        files: list[Path] = list(directory.glob(file_pattern))
+        patterns = (file_pattern,) if isinstance(file_pattern, str) else file_pattern
+        files: list[Path] = [f for pattern in patterns for f in directory.glob(pattern)]
         files = [f for f in files if f.is_file() and f.name not in exclude_files]
         files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
 
@@ -301,14 +308,20 @@ class CacheManager:
         freed_size = 0
 
         if not dry_run:
+            deleted_paths: list[Path] = []
             for file_path in files_to_delete:
                 try:
                     file_size = file_path.stat().st_size
                     file_path.unlink()
-                    deleted_files += 1
+                    LogIndex.index_path(file_path).unlink(missing_ok=True)
+                    deleted_paths.append(file_path)
                     freed_size += file_size
                 except Exception as e:
                     errors.append(f"ファイル削除エラー {file_path}: {e}")
+            deleted_files = len(deleted_paths)
+
+            if directory == self.log_dir:
+                self._forget_deleted_logs(deleted_paths, errors)
         else:
             deleted_files = len(files_to_delete)
             freed_size = sum(f.stat().st_size for f in files_to_delete)
@@ -320,6 +333,24 @@ class CacheManager:
             files_to_delete=[str(f) for f in files_to_delete] if dry_run else [],
         )
 
+    def _forget_deleted_logs(self, deleted_paths: list[Path], errors: list[str]) -> None:
+        """削除したログファイルの実行を実行履歴から除外
+
+        Args:
+            deleted_paths: 削除したログファイルのパス
+            errors: エラーメッセージの追加先
+        """
+        # 実行履歴がまだ作成されていない場合は除外する実行もない
+        if not deleted_paths or not (self.log_dir / HISTORY_DB_FILENAME).exists():
+            return
+
+        from ..core.log_manager import LogManager
+
+        try:
+            LogManager(self.config).forget_log_files(path.name for path in deleted_paths)
+        except Exception as e:
+            errors.append(f"実行履歴の更新エラー: {e}")
+
     def auto_cleanup(self) -> dict[str, Any]:
         """自動クリーンアップを実行
 
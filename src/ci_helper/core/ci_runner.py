@@ -6,16 +6,24 @@ actコマンドを使用してGitHub Actionsワークフローをローカルで
 from __future__ import annotations
 
 import logging
+import os
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Sequence
+
+    from .log_manager import LogManager
 
 from ..core.exceptions import ExecutionError, SecurityError
-from ..core.models import ExecutionResult, JobResult, StepResult, WorkflowResult
+from ..core.log_stream import ActLogCollector, ActLogWriter
+from ..core.models import ExecutionResult, Failure, JobResult, StepResult, WorkflowResult
+from ..core.ownership_guard import OwnershipGuard, OwnershipScanStats
 from ..core.security import EnvironmentSecretManager, SecretSummary, SecretValidationResult, SecurityValidator
 from ..utils.config import Config
 
@@ -39,6 +47,8 @@ class CIRunner:
         self.project_root = config.project_root
         self.secret_manager = EnvironmentSecretManager()
         self.security_validator = SecurityValidator()
+        # 直近のact実行後の所有権チェックの統計
+        self.last_ownership_stats: OwnershipScanStats | None = None
 
     def run_workflows(
         self,
@@ -46,6 +56,8 @@ class CIRunner:
         verbose: bool = False,
         dry_run: bool = False,
         save_logs: bool = True,
+        parallel: int | None = None,
+        output_callback: Callable[[str], None] | None = None,
     ) -> ExecutionResult:
         """ワークフローを実行
 
@@ -54,6 +66,8 @@ class CIRunner:
             verbose: 詳細出力フラグ
             dry_run: ドライランフラグ（実際には実行しない）
             save_logs: ログ保存フラグ
+            parallel: 同時実行するワークフロー数（Noneの場合は設定値、0の場合はCPU数から自動決定）
+            output_callback: actの出力を1行ずつ受け取るコールバック（コンソール表示用）
 
         Returns:
             実行結果
@@ -63,6 +77,7 @@ class CIRunner:
 
         """
         start_time = time.time()
+        timestamp = datetime.now()
 
         if not dry_run:
             self.check_lock_file()
@@ -76,53 +91,134 @@ class CIRunner:
             )
 
         workflow_results: list[WorkflowResult] = []
-        overall_success = True
-        all_output: list[str] = []
-
-        for workflow_file in workflow_files:
-            if dry_run:
-                # ドライランの場合は実行をスキップ
-                workflow_result = WorkflowResult(
+        log_manager: LogManager | None = None
+        log_path: Path | None = None
+        log_raw_size: int | None = None
+
+        if dry_run:
+            # ドライランの場合は実行をスキップ
+            workflow_results = [
+                WorkflowResult(
                     name=workflow_file.name,
                     success=True,
                     jobs=[],
                     duration=0.0,
                 )
-                all_output.append(f"[DRY RUN] Would execute: {workflow_file.name}")
-            else:
-                workflow_result, output = self._run_single_workflow(workflow_file, verbose)
-                all_output.append(output)
-                if not workflow_result.success:
-                    overall_success = False
+                for workflow_file in workflow_files
+            ]
+        else:
+            if save_logs:
+                from .log_manager import LogManager
+
+                log_manager = LogManager(self.config)
+                log_path = log_manager.create_log_path(timestamp)
+
+            # actの出力はメモリに溜めず、ワークフローごとにディスクへストリーミングする
+            collector = ActLogCollector(
+                log_path,
+                echo=output_callback,
+                context_lines=self.config.get("context_lines", 3),
+            )
+            max_workers = self._resolve_parallelism(parallel, len(workflow_files))
+            try:
+                workflow_results = self._run_workflow_batch(workflow_files, verbose, max_workers, collector)
+            except BaseException:
+                collector.discard()
+                raise
 
-            workflow_results.append(workflow_result)
+            # ワークフローの検出順に結合するため、並列実行でもログの順序は決定的
+            collector.finalize()
+            log_raw_size = collector.raw_size
 
         total_duration = time.time() - start_time
-        combined_output = "\n".join(all_output)
 
         execution_result = ExecutionResult(
-            success=overall_success,
+            success=all(workflow_result.success for workflow_result in workflow_results),
             workflows=workflow_results,
             total_duration=total_duration,
+            timestamp=timestamp,
         )
 
-        # ログ保存（save_logsがTrueかつドライランでない場合）
-        if save_logs and not dry_run:
-            from .log_manager import LogManager
-
-            log_manager = LogManager(self.config)
-            command_args: dict[str, bool | Sequence[str] | None] = {
+        # ログ登録（save_logsがTrueかつドライランでない場合）
+        if log_manager is not None and log_path is not None:
+            command_args: dict[str, bool | int | Sequence[str] | None] = {
                 "workflows": workflows,
                 "verbose": verbose,
                 "dry_run": dry_run,
+                "parallel": parallel,
             }
-            log_manager.save_execution_log(execution_result, combined_output, command_args)
+            log_manager.register_execution_log(execution_result, log_path, command_args, raw_size=log_raw_size)
 
             # 実行履歴のメタデータも保存
             log_manager.save_execution_history_metadata(execution_result)
 
         return execution_result
 
+    def _resolve_parallelism(self, parallel: int | None, workflow_count: int) -> int:
+        """ワークフローの同時実行数を決定
+
+        Args:
+            parallel: 指定された同時実行数（Noneの場合は設定値、0以下の場合は自動）
+            workflow_count: 実行対象のワークフロー数
+
+        Returns:
+            1以上かつワークフロー数以下の同時実行数
+
+        """
+        if parallel is None:
+            parallel = int(self.config.get("parallel_workflows", 1) or 0)
+
+        if parallel <= 0:
+            # 自動: actは各ジョブをDockerコンテナで実行するため、CPU数を上限とする
+            parallel = os.cpu_count() or 1
+
+        return max(1, min(parallel, workflow_count))
+
+    def _run_workflow_batch(
+        self,
+        workflow_files: Sequence[Path],
+        verbose: bool,
+        max_workers: int,
+        collector: ActLogCollector,
+    ) -> list[WorkflowResult]:
+        """複数のワークフローを実行し、入力順に結果を返す
+
+        Args:
+            workflow_files: ワークフローファイルのパスリスト
+            verbose: 詳細出力フラグ
+            max_workers: 同時実行数（1の場合は逐次実行）
+            collector: ワークフローごとの出力を受け取るログコレクター
+
+        Returns:
+            ワークフロー実行結果のリスト（workflow_filesと同じ順序）
+
+        Raises:
+            ExecutionError: いずれかのワークフローの実行に失敗した場合
+
+        """
+        log_writers = [collector.open_writer(index) for index in range(len(workflow_files))]
+
+        if max_workers <= 1:
+            return [
+                self._run_single_workflow(workflow_file, verbose, log_writer)
+                for workflow_file, log_writer in zip(workflow_files, log_writers, strict=True)
+            ]
+
+        logger.debug(f"{len(workflow_files)}個のワークフローを最大{max_workers}並列で実行します")
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ci-runner") as executor:
+            futures = [
+                executor.submit(self._run_single_workflow, workflow_file, verbose, log_writer)
+                for workflow_file, log_writer in zip(workflow_files, log_writers, strict=True)
+            ]
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                # 未着手のワークフローは実行しない（実行中のものは完了を待つ）
+                for future in futures:
+                    future.cancel()
+                raise
+
     def _discover_workflows(self, workflow_names: Sequence[str] | None = None) -> list[Path]:
         """ワークフローファイルを検出
 
@@ -158,36 +254,47 @@ class CIRunner:
 
         return sorted(workflow_files)
 
-    def _run_single_workflow(self, workflow_file: Path, verbose: bool = False) -> tuple[WorkflowResult, str]:
+    def _run_single_workflow(
+        self,
+        workflow_file: Path,
+        verbose: bool = False,
+        log_writer: ActLogWriter | None = None,
+    ) -> WorkflowResult:
         """単一のワークフローを実行
 
+        actの出力は常にログライターへ1行ずつ流し、出力全体をメモリに保持しません。
+
         Args:
             workflow_file: ワークフローファイルのパス
             verbose: 詳細出力フラグ
+            log_writer: 出力のストリーミング先（Noneの場合はファイルに保存せず失敗の検出のみ行う）
 
         Returns:
-            ワークフロー実行結果と出力のタプル
+            ワークフロー実行結果
 
         """
         start_time = time.time()
+        if log_writer is None:
+            log_writer = ActLogWriter()
 
         try:
-            result = self._execute_act(workflow_file, verbose)
-            success = result.returncode == 0
+            # 出力はログライターへ書き出し済みのため、末尾と検出済みの失敗のみ保持する
+            success = self._stream_act(workflow_file, verbose, log_writer) == 0
+            step_output = log_writer.tail
+            detected_failures = log_writer.finish()
+            failures: list[Failure] = [] if success else detected_failures
             duration = time.time() - start_time
-            output = result.stdout + result.stderr
 
-            # 基本的なジョブ結果を作成（詳細な解析は後のタスクで実装）
             job_result = JobResult(
                 name="default",
                 success=success,
-                failures=[],
+                failures=failures,
                 steps=[
                     StepResult(
                         name="act execution",
                         success=success,
                         duration=duration,
-                        output=output,
+                        output=step_output,
                     ),
                 ],
                 duration=duration,
@@ -200,7 +307,7 @@ class CIRunner:
                 duration=duration,
             )
 
-            return workflow_result, output
+            return workflow_result
 
         except subprocess.TimeoutExpired as e:
             duration = time.time() - start_time
@@ -215,15 +322,18 @@ class CIRunner:
                 f"エラー詳細: {e}",
             ) from e
 
-    def _execute_act(self, workflow_file: Path, verbose: bool = False) -> subprocess.CompletedProcess[str]:
-        """actコマンドを実行
+    def _stream_act(self, workflow_file: Path, verbose: bool, log_writer: ActLogWriter) -> int:
+        """actコマンドを実行し、出力を1行ずつログライターへ流す
+
+        標準エラー出力は標準出力に統合され、出力順のまま記録されます。
 
         Args:
             workflow_file: ワークフローファイルのパス
             verbose: 詳細出力フラグ
+            log_writer: 出力のストリーミング先
 
         Returns:
-            subprocess実行結果
+            actの終了コード
 
         Raises:
             ExecutionError: actコマンドの実行に失敗した場合
@@ -232,6 +342,76 @@ class CIRunner:
         # 実行前のファイル所有権を記録
         original_ownership = self._record_file_ownership()
 
+        cmd = self._build_act_command(workflow_file, verbose)
+
+        # 安全な環境変数を準備
+        safe_env = self._prepare_secure_environment()
+        timeout = self.config.get("timeout_seconds", 1800)
+
+        try:
+            process = subprocess.Popen(
+                cmd,
+                cwd=self.project_root,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,  # 行バッファリング
+                env=safe_env,
+            )
+        except FileNotFoundError as e:
+            raise ExecutionError(
+                "actコマンドが見つかりません",
+                "actをインストールしてください: https://github.com/nektos/act#installation",
+            ) from e
+
+        timed_out = threading.Event()
+
+        def _kill_on_timeout() -> None:
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(timeout, _kill_on_timeout)
+        timer.daemon = True
+        timer.start()
+
+        try:
+            if process.stdout is not None:
+                for line in process.stdout:
+                    log_writer.write_line(line)
+            returncode = process.wait()
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            timer.cancel()
+            if process.stdout is not None:
+                process.stdout.close()
+
+        # 実行後にファイル所有権をチェックして修正
+        self._restore_file_ownership(original_ownership)
+
+        if timed_out.is_set():
+            raise ExecutionError(
+                f"actコマンドの実行がタイムアウトしました（{timeout}秒）",
+                "より長いタイムアウト時間を設定するか、ワークフローを最適化してください",
+            )
+
+        return returncode
+
+    def _build_act_command(self, workflow_file: Path, verbose: bool = False) -> list[str]:
+        """actコマンドを構築
+
+        Args:
+            workflow_file: ワークフローファイルのパス
+            verbose: 詳細出力フラグ
+
+        Returns:
+            actコマンドの引数リスト
+
+        """
         # actコマンドの構築
         cmd = ["act"]
 
@@ -257,72 +437,18 @@ class CIRunner:
 
         # .actrcファイルがある場合は自動的に読み込まれる
 
-        # 安全な環境変数を準備
-        safe_env = self._prepare_secure_environment()
-
-        try:
-            # actコマンドを実行
-            result = subprocess.run(
-                cmd,
-                cwd=self.project_root,
-                capture_output=True,
-                text=True,
-                timeout=self.config.get("timeout_seconds", 1800),
-                check=False,  # エラーでも例外を発生させない
-                env=safe_env,  # 安全な環境変数を使用
-            )
-
-            # 実行後にファイル所有権をチェックして修正
-            self._restore_file_ownership(original_ownership)
-
-            return result
+        return cmd
 
-        except FileNotFoundError as e:
-            raise ExecutionError(
-                "actコマンドが見つかりません",
-                "actをインストールしてください: https://github.com/nektos/act#installation",
-            ) from e
-
-        except subprocess.TimeoutExpired as e:
-            raise ExecutionError(
-                f"actコマンドの実行がタイムアウトしました（{self.config.get('timeout_seconds')}秒）",
-                "より長いタイムアウト時間を設定するか、ワークフローを最適化してください",
-            ) from e
-
-    def _record_file_ownership(self) -> dict[str, tuple[int, int]]:
+    def _record_file_ownership(self) -> OwnershipGuard:
         """実行前のファイル所有権を記録
 
         Returns:
-            ファイルパスと(uid, gid)のマッピング
+            実行開始時刻とプロジェクトルートの所有者を記録した所有権ガード
 
         """
-        ownership_map: dict[str, tuple[int, int]] = {}
-
-        try:
-            # プロジェクトルート配下の重要なファイル・ディレクトリの所有権を記録
-            important_paths = [
-                self.project_root,
-                self.project_root / ".github",
-                self.project_root / ".ci-helper",
-            ]
-
-            # 存在するパスのみを対象とする
-            for path in important_paths:
-                if path.exists():
-                    stat_info = path.stat()
-                    ownership_map[str(path)] = (stat_info.st_uid, stat_info.st_gid)
-
-                    # ディレクトリの場合は中身も記録
-                    if path.is_dir():
-                        for item in path.rglob("*"):
-                            if item.exists():
-                                item_stat = item.stat()
-                                ownership_map[str(item)] = (item_stat.st_uid, item_stat.st_gid)
-
-        except (OSError, PermissionError) as e:
-            logger.warning(f"ファイル所有権の記録に失敗しました: {e}")
-
-        return ownership_map
+        guard = OwnershipGuard(self.project_root)
+        guard.start()
+        return guard
 
     def _add_ownership_preservation_options(self, cmd: list[str]) -> None:
         """ファイル所有権保持のためのオプションを追加
@@ -342,52 +468,37 @@ class CIRunner:
 
         logger.debug(f"Docker実行時のユーザー設定: {uid}:{gid}")
 
-    def _restore_file_ownership(self, original_ownership: dict[str, tuple[int, int]]) -> None:
-        """ファイル所有権を元に戻す
+    def _restore_file_ownership(self, guard: OwnershipGuard) -> None:
+        """act実行中に所有者が変わったファイルの所有権を元に戻す
 
         Args:
-            original_ownership: 元の所有権情報
+            guard: 実行前に記録した所有権ガード
 
         """
-        import os
-
-        changed_files: list[str] = []
-
         try:
-            for file_path, (original_uid, original_gid) in original_ownership.items():
-                path = Path(file_path)
-                if not path.exists():
-                    continue
-
-                current_stat = path.stat()
-                current_uid = current_stat.st_uid
-                current_gid = current_stat.st_gid
-
-                # 所有権が変更されている場合
-                if current_uid != original_uid or current_gid != original_gid:
-                    changed_files.append(str(path))
-
-                    try:
-                        # 所有権を復元
-                        os.chown(path, original_uid, original_gid)
-                        logger.debug(
-                            f"所有権を復元しました: {path} ({current_uid}:{current_gid} -> {original_uid}:{original_gid})",
-                        )
-                    except (OSError, PermissionError) as e:
-                        logger.warning(f"所有権の復元に失敗しました: {path} - {e}")
-
-            if changed_files:
-                logger.info(f"ファイル所有権を修正しました: {len(changed_files)}個のファイル")
-                if logger.isEnabledFor(logging.DEBUG):
-                    for file_path in changed_files[:10]:  # 最初の10個のみ表示
-                        logger.debug(f"  修正: {file_path}")
-                    if len(changed_files) > 10:
-                        logger.debug(f"  ... 他{len(changed_files) - 10}個")
-
+            stats = guard.restore()
         except Exception as e:
             logger.error(f"ファイル所有権の復元処理でエラーが発生しました: {e}")
             # 手動修正のガイダンスを表示
             self._show_manual_fix_guidance()
+            return
+
+        self.last_ownership_stats = stats
+        logger.debug(
+            "ファイル所有権チェック: 走査 %.3f秒 (ディレクトリ %d件, 省略 %d件, 確認 %d件), 復元 %.3f秒",
+            stats.scan_seconds,
+            stats.directories_scanned,
+            stats.directories_pruned,
+            stats.entries_checked,
+            stats.chown_seconds,
+        )
+
+        if stats.paths_restored:
+            logger.info(f"ファイル所有権を修正しました: {stats.paths_restored}個のファイル")
+
+        if stats.failures:
+            logger.warning(f"所有権の復元に失敗しました: {stats.failures}個のファイル")
+            self._show_manual_fix_guidance()
 
     def _show_manual_fix_guidance(self) -> None:
         """手動でのファイル所有権修正ガイダンスを表示"""
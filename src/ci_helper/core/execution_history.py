@@ -0,0 +1,454 @@
+"""実行履歴ストア
+
+保存時に解析済みの実行結果（ワークフロー・ジョブ・ステップ・失敗）をログディレクトリ内の
+SQLiteデータベースに保存します。ログ一覧・ワークフロー別の検索・統計・前回実行の取得は
+インデックスを使った問い合わせで行い、生ログの再読み込みや再解析を行いません。
+
+このデータベースがログのインデックスを兼ねます。追記は1行の挿入で済み、書き込みは
+SQLiteのロックで直列化されるため、複数の ``ci-run test`` が同時に終了しても実行は失われません。
+
+ステップの出力は生ログに含まれるため保存しません。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import weakref
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, cast
+
+from .models import ExecutionResult, Failure, FailureType, JobResult, StepResult, WorkflowResult
+
+logger = logging.getLogger(__name__)
+
+# データベースのスキーマバージョン（スキーマを変更した場合は更新する）
+HISTORY_SCHEMA_VERSION = 2
+
+# 実行履歴データベースのファイル名（ログディレクトリ直下に保存）
+HISTORY_DB_FILENAME = "history.db"
+
+# 他プロセスの書き込みが終わるまで待つ秒数
+_BUSY_TIMEOUT_SECONDS = 30.0
+
+# entry には index.json と同じ形のログエントリ、result には解析済みの実行結果を保存する
+# （result が NULL の行は index.json から取り込んだ未解析の実行）
+# file_size はディスク上のサイズ、raw_size は圧縮保存したログを展開した後のサイズ
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    log_file TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    total_duration REAL NOT NULL,
+    total_failures INTEGER NOT NULL,
+    file_size INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL DEFAULT 0,
+    entry TEXT NOT NULL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS executions_timestamp ON executions (timestamp);
+CREATE INDEX IF NOT EXISTS executions_log_file ON executions (log_file);
+CREATE TABLE IF NOT EXISTS execution_workflows (
+    execution_id INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS execution_workflows_name ON execution_workflows (name, execution_id);
+CREATE TRIGGER IF NOT EXISTS executions_delete AFTER DELETE ON executions BEGIN
+    DELETE FROM execution_workflows WHERE execution_id = OLD.id;
+END;
+CREATE TABLE IF NOT EXISTS history_info (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def serialize_execution_result(execution_result: ExecutionResult) -> dict[str, Any]:
+    """実行結果を保存用の辞書に変換
+
+    ログパスとタイムスタンプはログエントリ側に保存するため含めません。
+
+    Args:
+        execution_result: 実行結果
+
+    Returns:
+        JSONに変換可能な辞書
+    """
+    return {
+        "success": execution_result.success,
+        "total_duration": execution_result.total_duration,
+        "workflows": [
+            {
+                "name": workflow.name,
+                "success": workflow.success,
+                "duration": workflow.duration,
+                "jobs": [
+                    {
+                        "name": job.name,
+                        "success": job.success,
+                        "duration": job.duration,
+                        "failures": [
+                            {
+                                "type": failure.type.value,
+                                "message": failure.message,
+                                "file_path": failure.file_path,
+                                "line_number": failure.line_number,
+                                "context_before": failure.context_before,
+                                "context_after": failure.context_after,
+                                "stack_trace": failure.stack_trace,
+                            }
+                            for failure in job.failures
+                        ],
+                        "steps": [
+                            {"name": step.name, "success": step.success, "duration": step.duration}
+                            for step in job.steps
+                        ],
+                    }
+                    for job in workflow.jobs
+                ],
+            }
+            for workflow in execution_result.workflows
+        ],
+    }
+
+
+def deserialize_execution_result(data: dict[str, Any], timestamp: datetime, log_path: str) -> ExecutionResult:
+    """保存用の辞書から実行結果を復元
+
+    Args:
+        data: ``serialize_execution_result`` で変換した辞書
+        timestamp: 実行のタイムスタンプ
+        log_path: ログファイルのパス
+
+    Returns:
+        復元された実行結果
+    """
+    return ExecutionResult(
+        success=data["success"],
+        total_duration=data["total_duration"],
+        log_path=log_path,
+        timestamp=timestamp,
+        workflows=[
+            WorkflowResult(
+                name=workflow["name"],
+                success=workflow["success"],
+                duration=workflow["duration"],
+                jobs=[
+                    JobResult(
+                        name=job["name"],
+                        success=job["success"],
+                        duration=job["duration"],
+                        failures=[
+                            Failure(
+                                type=FailureType(failure["type"]),
+                                message=failure["message"],
+                                file_path=failure.get("file_path"),
+                                line_number=failure.get("line_number"),
+                                context_before=failure.get("context_before", []),
+                                context_after=failure.get("context_after", []),
+                                stack_trace=failure.get("stack_trace"),
+                            )
+                            for failure in job.get("failures", [])
+                        ],
+                        steps=[
+                            StepResult(name=step["name"], success=step["success"], duration=step["duration"])
+                            for step in job.get("steps", [])
+                        ],
+                    )
+                    for job in workflow.get("jobs", [])
+                ],
+            )
+            for workflow in data.get("workflows", [])
+        ],
+    )
+
+
+class ExecutionHistoryStore:
+    """解析済みの実行結果を保存する実行履歴ストア
+
+    1つの接続を複数スレッドから使用するため、操作はロックで直列化します。
+    """
+
+    def __init__(self, db_path: Path):
+        """実行履歴ストアを開く
+
+        Args:
+            db_path: データベースファイルのパス
+
+        Raises:
+            sqlite3.Error: データベースを開けない場合
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            db_path,
+            timeout=_BUSY_TIMEOUT_SECONDS,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+            self._migrate_schema()
+        except sqlite3.Error:
+            self._connection.close()
+            raise
+
+        # インスタンスの破棄時・プロセス終了時に接続を閉じる
+        self._finalizer = weakref.finalize(self, self._connection.close)
+
+    def _migrate_schema(self) -> None:
+        """古いスキーマのデータベースを現在のスキーマに更新"""
+        with self._write_transaction() as connection:
+            (version,) = connection.execute("PRAGMA user_version").fetchone()
+            if version == HISTORY_SCHEMA_VERSION:
+                return
+            if version == 1:
+                # バージョン1のログは常に非圧縮で保存されている
+                connection.execute("ALTER TABLE executions ADD COLUMN raw_size INTEGER NOT NULL DEFAULT 0")
+                connection.execute("UPDATE executions SET raw_size = file_size")
+            connection.execute(f"PRAGMA user_version = {HISTORY_SCHEMA_VERSION}")
+
+    @contextmanager
+    def _write_transaction(self) -> Generator[sqlite3.Connection]:
+        """開始時に書き込みロックを取得するトランザクション
+
+        Yields:
+            実行履歴データベースへの接続
+        """
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.rollback()
+                raise
+            connection.commit()
+
+    def _query(self, sql: str, parameters: Iterable[Any] = ()) -> list[tuple[Any, ...]]:
+        """読み込みの問い合わせを実行"""
+        with self._lock:
+            return self._connection.execute(sql, tuple(parameters)).fetchall()
+
+    def close(self) -> None:
+        """データベースへの接続を閉じる"""
+        self._finalizer()
+
+    def is_imported(self) -> bool:
+        """index.json からの取り込みが済んでいるかどうか"""
+        return bool(self._query("SELECT 1 FROM history_info WHERE name = 'index_imported'"))
+
+    def import_entries(self, entries: list[dict[str, Any]]) -> int:
+        """index.json のログエントリを未解析の実行として取り込む
+
+        既に実行が登録されている場合は取り込みません。
+
+        Args:
+            entries: index.json のログエントリ
+
+        Returns:
+            取り込んだエントリ数
+        """
+        imported = 0
+        with self._write_transaction() as connection:
+            (existing,) = connection.execute("SELECT COUNT(*) FROM executions").fetchone()
+            if existing == 0:
+                for entry in entries:
+                    if "timestamp" in entry and "log_file" in entry:
+                        self._insert(connection, entry, None)
+                        imported += 1
+            connection.execute("INSERT OR REPLACE INTO history_info (name, value) VALUES ('index_imported', ?)", ("1",))
+        return imported
+
+    def add(self, entry: dict[str, Any], execution_result: ExecutionResult | None) -> int:
+        """実行を登録
+
+        Args:
+            entry: index.json と同じ形のログエントリ
+            execution_result: 解析済みの実行結果
+
+        Returns:
+            登録した実行のID
+        """
+        with self._write_transaction() as connection:
+            return self._insert(connection, entry, execution_result)
+
+    def _insert(
+        self, connection: sqlite3.Connection, entry: dict[str, Any], execution_result: ExecutionResult | None
+    ) -> int:
+        """書き込みトランザクション中に実行を1件挿入"""
+        result_json = (
+            json.dumps(serialize_execution_result(execution_result), ensure_ascii=False, separators=(",", ":"))
+            if execution_result is not None
+            else None
+        )
+        cursor = connection.execute(
+            "INSERT INTO executions "
+            "(timestamp, log_file, success, total_duration, total_failures, file_size, raw_size, entry, result) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                entry["timestamp"],
+                entry["log_file"],
+                int(bool(entry.get("success", False))),
+                float(entry.get("total_duration", 0.0)),
+                int(entry.get("total_failures", 0)),
+                int(entry.get("file_size", 0)),
+                int(entry.get("raw_size", entry.get("file_size", 0))),
+                json.dumps(entry, ensure_ascii=False, separators=(",", ":")),
+                result_json,
+            ),
+        )
+        execution_id = cast("int", cursor.lastrowid)
+        connection.executemany(
+            "INSERT INTO execution_workflows (execution_id, name) VALUES (?, ?)",
+            [(execution_id, workflow["name"]) for workflow in entry.get("workflows", []) if "name" in workflow],
+        )
+        return execution_id
+
+    def save_result(self, execution_id: int, execution_result: ExecutionResult) -> None:
+        """未解析の実行に解析結果を保存
+
+        Args:
+            execution_id: 実行のID
+            execution_result: 解析済みの実行結果
+        """
+        result_json = json.dumps(
+            serialize_execution_result(execution_result), ensure_ascii=False, separators=(",", ":")
+        )
+        with self._write_transaction() as connection:
+            connection.execute("UPDATE executions SET result = ? WHERE id = ?", (result_json, execution_id))
+
+    def update_entry(self, timestamp: str, fields: dict[str, Any]) -> bool:
+        """指定時刻の最新の実行のログエントリに項目を追加
+
+        Args:
+            timestamp: 対象の実行のタイムスタンプ（ISO形式）
+            fields: 追加する項目
+
+        Returns:
+            該当する実行があり更新した場合True
+        """
+        with self._write_transaction() as connection:
+            row = connection.execute(
+                "SELECT id, entry FROM executions WHERE timestamp = ? ORDER BY id DESC LIMIT 1", (timestamp,)
+            ).fetchone()
+            if row is None:
+                return False
+            execution_id, entry_json = row
+            entry = cast("dict[str, Any]", json.loads(entry_json))
+            entry.update(fields)
+            connection.execute(
+                "UPDATE executions SET entry = ? WHERE id = ?",
+                (json.dumps(entry, ensure_ascii=False, separators=(",", ":")), execution_id),
+            )
+        return True
+
+    def remove_log_files(self, log_files: Iterable[str]) -> int:
+        """ログファイルに対応する実行を削除
+
+        Args:
+            log_files: 削除するログファイル名
+
+        Returns:
+            削除した実行数
+        """
+        with self._write_transaction() as connection:
+            cursor = connection.executemany(
+                "DELETE FROM executions WHERE log_file = ?", [(log_file,) for log_file in log_files]
+            )
+            return cursor.rowcount
+
+    def list_entries(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """ログエントリを新しい順に取得
+
+        Args:
+            limit: 取得する最大件数（Noneの場合は全て）
+
+        Returns:
+            ログエントリのリスト（新しい順）
+        """
+        rows = self._query(
+            "SELECT entry FROM executions ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (-1 if limit is None else limit,),
+        )
+        return [json.loads(entry) for (entry,) in rows]
+
+    def find_by_workflow(self, workflow_name: str) -> list[dict[str, Any]]:
+        """ワークフローを含むログエントリを新しい順に取得
+
+        Args:
+            workflow_name: ワークフロー名
+
+        Returns:
+            該当するログエントリのリスト（新しい順）
+        """
+        rows = self._query(
+            "SELECT entry FROM executions WHERE id IN "
+            "(SELECT execution_id FROM execution_workflows WHERE name = ?) "
+            "ORDER BY timestamp DESC, id DESC",
+            (workflow_name,),
+        )
+        return [json.loads(entry) for (entry,) in rows]
+
+    def get_statistics(self) -> dict[str, Any]:
+        """実行数・成功数・合計時間・合計サイズ（保存時・展開後）・最新の実行時刻を集計
+
+        Returns:
+            集計結果の辞書
+        """
+        ((count, successes, total_duration, total_size, total_raw_size, latest),) = self._query(
+            "SELECT COUNT(*), COALESCE(SUM(success), 0), COALESCE(SUM(total_duration), 0), "
+            "COALESCE(SUM(file_size), 0), COALESCE(SUM(raw_size), 0), MAX(timestamp) FROM executions"
+        )
+        return {
+            "count": count,
+            "successes": successes,
+            "total_duration": total_duration,
+            "total_size": total_size,
+            "total_raw_size": total_raw_size,
+            "latest": latest,
+        }
+
+    def load_executions(
+        self, limit: int | None = None, before: datetime | str | None = None
+    ) -> list[tuple[int, dict[str, Any], ExecutionResult | None]]:
+        """実行を新しい順に取得
+
+        Args:
+            limit: 取得する最大件数（Noneの場合は全て）
+            before: 指定時はこの時刻（datetime またはISO形式の文字列）より前の実行のみ取得
+
+        Returns:
+            (実行のID, ログエントリ, 解析済みの実行結果) のリスト（未解析の場合は実行結果がNone）
+        """
+        if before is None:
+            rows = self._query(
+                "SELECT id, entry, result FROM executions ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (-1 if limit is None else limit,),
+            )
+        else:
+            rows = self._query(
+                "SELECT id, entry, result FROM executions WHERE timestamp < ? ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (before.isoformat() if isinstance(before, datetime) else before, -1 if limit is None else limit),
+            )
+
+        executions: list[tuple[int, dict[str, Any], ExecutionResult | None]] = []
+        for execution_id, entry_json, result_json in rows:
+            entry = cast("dict[str, Any]", json.loads(entry_json))
+            execution_result = None
+            if result_json is not None:
+                execution_result = deserialize_execution_result(
+                    json.loads(result_json),
+                    datetime.fromisoformat(entry["timestamp"]),
+                    str(self.db_path.parent / entry["log_file"]),
+                )
+            executions.append((execution_id, entry, execution_result))
+        return executions
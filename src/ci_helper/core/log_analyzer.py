@@ -11,6 +11,7 @@ from datetime import datetime
 
 from ..core.exceptions import LogParsingError
 from ..core.log_extractor import LogExtractor
+from ..core.log_index import LogIndex
 from ..core.models import ExecutionResult, Failure, JobResult, StepResult, WorkflowResult
 
 
@@ -52,12 +53,18 @@ class LogAnalyzer:
         # エラー出力パターン
         self.error_output_pattern = re.compile(r"^\[.*\]\s*💬\s*(.+)$", re.MULTILINE)
 
-    def analyze_log(self, log_content: str, workflows: list[str] | None = None) -> ExecutionResult:
+    def analyze_log(
+        self,
+        log_content: str,
+        workflows: list[str] | None = None,
+        log_index: LogIndex | None = None,
+    ) -> ExecutionResult:
         """ログを解析してExecutionResultを生成
 
         Args:
             log_content: actの実行ログ
             workflows: 実行されたワークフローのリスト（Noneの場合は自動検出）
+            log_index: 作成済みのログインデックス（Noneの場合は新規作成）
 
         Returns:
             解析されたExecutionResult
@@ -69,8 +76,12 @@ class LogAnalyzer:
             raise LogParsingError("ログが空です", "有効なactの実行ログを提供してください")
 
         try:
+            # ログの分割は1回だけ行い、抽出と各ワークフローの解析で共有する
+            if log_index is None or log_index.text != log_content:
+                log_index = LogIndex(log_content)
+
             # 全体の失敗を抽出
-            all_failures = self.log_extractor.extract_failures(log_content)
+            all_failures = self.log_extractor.extract_failures(log_content, log_index)
 
             # ワークフローを検出または使用
             detected_workflows = workflows or self._detect_workflows(log_content)
@@ -81,7 +92,7 @@ class LogAnalyzer:
             overall_success = True
 
             for workflow_name in detected_workflows:
-                workflow_result = self._analyze_workflow(log_content, workflow_name, all_failures)
+                workflow_result = self._analyze_workflow(log_content, workflow_name, all_failures, log_index)
                 workflow_results.append(workflow_result)
                 total_duration += workflow_result.duration
                 if not workflow_result.success:
@@ -105,6 +116,37 @@ class LogAnalyzer:
                 f"ログ解析中にエラーが発生しました: {e}", "ログファイルの形式を確認してください"
             ) from e
 
+    def split_sections(self, log_content: str, log_index: LogIndex | None = None) -> list[tuple[str, str]]:
+        """ログをジョブごとのセクションに分割
+
+        ジョブの境界はログインデックスのジョブのセクションの開始行とし、各セクションは次のジョブの
+        開始行の直前までとします。最初のジョブより前の行は ``default`` セクションとします。
+        ジョブが検出されない場合はログ全体を1つの ``default`` セクションとして返します。
+
+        Args:
+            log_content: ログ内容
+            log_index: 作成済みのログインデックス（Noneの場合は新規作成）
+
+        Returns:
+            (セクション名, セクションのログ) のリスト（ログ内の順序）
+        """
+        if log_index is None or log_index.text != log_content:
+            log_index = LogIndex(log_content)
+
+        jobs = log_index.get_sections("job")
+        if not jobs:
+            return [("default", log_content)] if log_content.strip() else []
+
+        sections: list[tuple[str, str]] = []
+        preamble = log_content[: log_index.line_start(jobs[0].start_line)]
+        if preamble.strip():
+            sections.append(("default", preamble))
+        for i, job in enumerate(jobs):
+            start_pos = log_index.line_start(job.start_line)
+            end_pos = log_index.line_start(jobs[i + 1].start_line) if i + 1 < len(jobs) else len(log_content)
+            sections.append((job.name, log_content[start_pos:end_pos]))
+        return sections
+
     def _detect_workflows(self, log_content: str) -> list[str]:
         """ログからワークフロー名を検出
 
@@ -131,19 +173,26 @@ class LogAnalyzer:
 
         return list(workflow_names)
 
-    def _analyze_workflow(self, log_content: str, workflow_name: str, all_failures: list[Failure]) -> WorkflowResult:
+    def _analyze_workflow(
+        self,
+        log_content: str,
+        workflow_name: str,
+        all_failures: list[Failure],
+        log_index: LogIndex | None = None,
+    ) -> WorkflowResult:
         """特定のワークフローを解析
 
         Args:
             log_content: ログ内容
             workflow_name: ワークフロー名
             all_failures: 全失敗のリスト
+            log_index: ログインデックス
 
         Returns:
             ワークフローの解析結果
         """
         # ワークフロー関連のログセクションを抽出
-        workflow_section = self._extract_workflow_section(log_content, workflow_name)
+        workflow_section = self._extract_workflow_section(log_content, workflow_name, log_index)
 
         # ジョブを検出・解析
         jobs = self._analyze_jobs(workflow_section, all_failures)
@@ -190,35 +239,41 @@ class LogAnalyzer:
             duration=workflow_duration,
         )
 
-    def _extract_workflow_section(self, log_content: str, workflow_name: str) -> str:
+    def _extract_workflow_section(
+        self,
+        log_content: str,
+        workflow_name: str,
+        log_index: LogIndex | None = None,
+    ) -> str:
         """ワークフロー関連のログセクションを抽出
 
+        ログインデックスのセクションのうち、ワークフロー名またはジョブ名が一致する最初のセクションの
+        開始行から、ログの終端までをセクションとします。
+
         Args:
             log_content: 全ログ内容
             workflow_name: ワークフロー名
+            log_index: ログインデックス（Noneの場合は新規作成）
 
         Returns:
             ワークフロー関連のログセクション
         """
-        lines = log_content.splitlines()
-        workflow_lines: list[str] = []
-        in_workflow = False
-
-        for line in lines:
-            # ワークフロー開始の検出
-            if workflow_name in line and ("Starting" in line or "Start" in line):
-                in_workflow = True
-
-            # ワークフロー終了の検出
-            elif in_workflow and ("Job succeeded" in line or "Job failed" in line):
-                workflow_lines.append(line)
-                # 次のワークフローが始まるまで継続
-                continue
-
-            if in_workflow:
-                workflow_lines.append(line)
+        if log_index is None or log_index.text != log_content:
+            log_index = LogIndex(log_content)
+
+        # ワークフロー名はジョブ名から検出される場合もあるため、ジョブのセクションも対象とする
+        section = next(
+            (
+                section
+                for section in log_index.sections
+                if section.kind in ("workflow", "job") and section.name == workflow_name
+            ),
+            None,
+        )
+        if section is None:
+            return ""
 
-        return "\n".join(workflow_lines)
+        return "\n".join(log_index.lines(section.start_line, log_index.line_count))
 
     def _analyze_jobs(self, log_section: str, all_failures: list[Failure]) -> list[JobResult]:
         """ログセクションからジョブを解析
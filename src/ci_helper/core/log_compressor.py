@@ -2,18 +2,88 @@
 
 大量ログファイルを効率的に圧縮し、重要な情報を保持しながら
 サイズを削減します。
+
+ログは1回だけ走査し、低優先度の行を除去しながら重要な行とその前後のコンテキストを
+重複を集約して保持します。目標トークン数を指定した場合は行ごとのトークン数を積み上げ、
+目標を超えた時点で重要度の低い行から捨てるため、保持する行は目標の大きさに収まります。
 """
 
 from __future__ import annotations
 
+import heapq
 import logging
 import re
+from collections import deque
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
+from ..utils.token_counter import TokenCounter, get_token_counter
+from .log_storage import open_log_text
+from .log_templates import LogTemplate, LogTemplateMiner
+
 logger = logging.getLogger(__name__)
 
 
+# 重複除去用の正規化パターン（置換は上から順に適用する）
+_TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}[.\d]*[Z]?")
+_BRACKETED_TIMESTAMP_PATTERN = re.compile(r"\[\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}[.\d]*[Z]?\]")
+_NUMBER_PATTERN = re.compile(r"\b\d+\b")
+_PATH_PATTERN = re.compile(r"/[^\s]+")
+
+# 重要なパターンのいずれかにマッチする行が必ず含むキーワード（小文字）
+# 大半の行はどのキーワードも含まないため、重要なパターンの正規表現を評価する前にこれで除外する
+_IMPORTANT_KEYWORD_PATTERN = re.compile(
+    r"error|fail|exception|traceback|warning|critical|fatal|denied|timeout|not found|permission|module"
+)
+
+# 重要度計算用のパターン
+_TRACEBACK_PATTERN = re.compile(r"traceback|stack trace|at\s+\w+\.\w+", re.IGNORECASE)
+_SOURCE_LOCATION_PATTERN = re.compile(r"\.py:\d+|\.js:\d+|\.java:\d+")
+
+# 行の区切り（\n、\r\n、\r）
+_LINE_PATTERN = re.compile(r"[^\r\n]*(?:\r\n|[\r\n])|[^\r\n]+")
+
+# 重要な行の前後に保持するコンテキストの行数
+CONTEXT_LINES = 2
+
+# コンテキスト行の最低重要度（元の重要な行の重要度に対する割合）
+CONTEXT_SCORE_RATIO = 0.5
+
+# 行の最大長（これを超える行は短縮する）
+MAX_LINE_LENGTH = 500
+
+# 重要なパターンを含む長い行を短縮する際に、パターンの前後に残す文字数
+_TRUNCATE_CONTEXT_CHARS = 100
+
+
+def normalize_line_for_deduplication(line: str) -> str:
+    """タイムスタンプ・数値・パスを置き換えて行を正規化
+
+    実行ごとに変わる値だけが異なる行を同じ行として扱うために使用します。
+
+    Args:
+        line: 元の行
+
+    Returns:
+        正規化された行
+
+    """
+    # タイムスタンプパターンを除去
+    normalized = _TIMESTAMP_PATTERN.sub("[TIMESTAMP]", line)
+    normalized = _BRACKETED_TIMESTAMP_PATTERN.sub("[TIMESTAMP]", normalized)
+
+    # 数値を正規化
+    normalized = _NUMBER_PATTERN.sub("[NUMBER]", normalized)
+
+    # パスを正規化
+    normalized = _PATH_PATTERN.sub("[PATH]", normalized)
+
+    # 先頭と末尾の空白を除去
+    return normalized.strip()
+
+
 @dataclass
 class CompressionResult:
     """圧縮結果"""
@@ -26,17 +96,114 @@ class CompressionResult:
     techniques_applied: list[str]
 
 
+@dataclass
+class _KeptLine:
+    """圧縮結果に保持する行"""
+
+    index: int
+    text: str
+    score: float
+    cost: int = 0
+    count: int = 1
+    template: LogTemplate | None = None
+    cost_state: tuple[int, int] = (0, 1)  # コストを計算した時点の (テンプレートの版, 件数の桁数)
+    evicted: bool = False
+
+    @property
+    def key(self) -> int | None:
+        """重複の集約に使うキー（テンプレートID）"""
+        return self.template.template_id if self.template is not None else None
+
+
+class _LineSelector:
+    """予算内に収まるように保持する行を選択
+
+    予算を超えた時点で、重要度が最も低い行（同じ重要度では後に出現した行）から捨てます。
+    行は出現順に追加する必要があります。保持中の行はテンプレートIDで引けるため、重複の集約にも使用します。
+    """
+
+    def __init__(self, budget: int | None):
+        """Args:
+        budget: 保持する行のコストの合計の上限（Noneの場合は無制限）
+
+        """
+        self.budget = budget
+        self.total_cost = 0
+        self.evicted_count = 0
+        self._entries: list[_KeptLine] = []
+        self._heap: list[tuple[float, int, _KeptLine]] = []
+        self._by_key: dict[int, _KeptLine] = {}
+
+    def find(self, key: int) -> _KeptLine | None:
+        """保持中の行をテンプレートIDで検索"""
+        return self._by_key.get(key)
+
+    def add(self, entry: _KeptLine) -> None:
+        """行を追加（予算を超えた場合は重要度の低い行を捨てる）"""
+        if (
+            self.budget is not None
+            and self.total_cost + entry.cost > self.budget
+            and (not self._heap or entry.score <= self._heap[0][0])
+        ):
+            # 追加してもすぐに捨てられる行（保持中のどの行よりも優先度が低い）は登録しない
+            entry.evicted = True
+            self.evicted_count += 1
+            return
+
+        if entry.key is not None:
+            self._by_key[entry.key] = entry
+        self.total_cost += entry.cost
+        if self.budget is None:
+            self._entries.append(entry)
+            return
+        heapq.heappush(self._heap, (entry.score, -entry.index, entry))
+        self._evict()
+
+    def update_cost(self, entry: _KeptLine, cost: int) -> None:
+        """保持中の行のコストを更新"""
+        self.total_cost += cost - entry.cost
+        entry.cost = cost
+        if self.budget is not None:
+            self._evict()
+
+    def kept(self) -> list[_KeptLine]:
+        """保持した行を元の順序で取得"""
+        if self.budget is None:
+            return list(self._entries)
+        return sorted((item[2] for item in self._heap), key=lambda entry: entry.index)
+
+    def _evict(self) -> None:
+        assert self.budget is not None
+        while self.total_cost > self.budget and self._heap:
+            _, _, entry = heapq.heappop(self._heap)
+            entry.evicted = True
+            self.total_cost -= entry.cost
+            self.evicted_count += 1
+            if entry.key is not None and self._by_key.get(entry.key) is entry:
+                del self._by_key[entry.key]
+
+
 class LogCompressor:
     """ログ圧縮クラス"""
 
-    def __init__(self, target_tokens: int | None = None, target_size_mb: float | None = None):
+    def __init__(
+        self,
+        target_tokens: int | None = None,
+        target_size_mb: float | None = None,
+        model: str | None = None,
+        token_counter: TokenCounter | None = None,
+    ):
         """Args:
         target_tokens: 目標トークン数
-        target_size_mb: 目標サイズ（MB）
+        target_size_mb: 目標サイズ（MB、目標トークン数より優先）
+        model: トークン数のカウントに使用するモデル名
+        token_counter: トークンカウンター（Noneの場合は共有のカウンター）
 
         """
         self.target_tokens = target_tokens
         self.target_size_bytes = int(target_size_mb * 1024 * 1024) if target_size_mb else None
+        self.model = model
+        self.token_counter = token_counter or get_token_counter()
 
         # 重要度の高いパターン（保持すべき）
         self.important_patterns = [
@@ -82,6 +249,10 @@ class LogCompressor:
             r"^\s*\d+%\s*$",  # パーセンテージ
         ]
 
+        # 行ごとに評価するパターンはまとめてコンパイルしておく
+        self._important_re = _compile_alternation(self.important_patterns, re.IGNORECASE)
+        self._removable_re = _compile_alternation(self.removable_patterns)
+
     def compress_log(self, log_content: str) -> str:
         """ログを圧縮
 
@@ -92,276 +263,210 @@ class LogCompressor:
             圧縮されたログ内容
 
         """
-        original_size = len(log_content.encode("utf-8"))
-        lines = log_content.splitlines()
-        original_line_count = len(lines)
+        compressed_lines, _ = self.compress_lines(_iter_lines(log_content))
+        return "\n".join(compressed_lines)
 
-        logger.info("ログ圧縮開始: %d 行, %.1f MB", original_line_count, original_size / (1024 * 1024))
+    def compress_file(self, log_path: Path) -> tuple[str, CompressionResult]:
+        """ログファイルをストリーミングで読み込みながら圧縮
 
-        techniques_applied: list[str] = []
-        compressed_lines = lines.copy()
-
-        # 1. 空行とコメント行の除去
-        compressed_lines, removed_count = self._remove_low_priority_lines(compressed_lines)
-        if removed_count > 0:
-            techniques_applied.append(f"low_priority_removal({removed_count})")
-
-        # 2. 重複行の除去と集約
-        compressed_lines, duplicate_count = self._remove_duplicates(compressed_lines)
-        if duplicate_count > 0:
-            techniques_applied.append(f"duplicate_removal({duplicate_count})")
-
-        # 3. 重要な行の保持と不要な行の削除
-        compressed_lines = self._preserve_important_lines(compressed_lines)
-        techniques_applied.append("importance_filtering")
-
-        # 4. 長い行の短縮
-        compressed_lines = self._truncate_long_lines(compressed_lines)
-        techniques_applied.append("line_truncation")
-
-        # 5. 目標サイズに合わせた追加圧縮
-        if self.target_tokens or self.target_size_bytes:
-            compressed_lines = self._compress_to_target_size(compressed_lines)
-            techniques_applied.append("target_size_compression")
-
-        # 圧縮結果の作成
-        compressed_content = "\n".join(compressed_lines)
-        compressed_size = len(compressed_content.encode("utf-8"))
-
-        compression_result = CompressionResult(
-            original_size=original_size,
-            compressed_size=compressed_size,
-            compression_ratio=compressed_size / original_size if original_size > 0 else 0,
-            lines_removed=original_line_count - len(compressed_lines),
-            lines_kept=len(compressed_lines),
-            techniques_applied=techniques_applied,
-        )
-
-        logger.info(
-            "ログ圧縮完了: %d → %d 行 (%.1f%%), %.1f → %.1f MB (%.1f%%)",
-            original_line_count,
-            len(compressed_lines),
-            (len(compressed_lines) / original_line_count) * 100 if original_line_count > 0 else 0,
-            original_size / (1024 * 1024),
-            compressed_size / (1024 * 1024),
-            compression_result.compression_ratio * 100,
-        )
-
-        return compressed_content
-
-    def _remove_low_priority_lines(self, lines: list[str]) -> tuple[list[str], int]:
-        """低優先度行の除去
+        ファイル全体をメモリに読み込まないため、大きなログ（圧縮保存されたログを含む）にも使用できます。
 
         Args:
-            lines: 行のリスト
+            log_path: ログファイルのパス
 
         Returns:
-            (フィルタ後の行, 除去された行数)
+            (圧縮されたログ内容, 圧縮結果)
 
         """
-        filtered_lines: list[str] = []
-        removed_count = 0
-
-        for line in lines:
-            # 重要なパターンが含まれている場合は保持
-            if any(re.search(pattern, line, re.IGNORECASE) for pattern in self.important_patterns):
-                filtered_lines.append(line)
-                continue
+        with open_log_text(log_path, errors="replace") as f:
+            compressed_lines, result = self.compress_lines(line.rstrip("\n") for line in f)
+        return "\n".join(compressed_lines), result
 
-            # 削除対象パターンにマッチする場合は除去
-            if any(re.match(pattern, line) for pattern in self.removable_patterns):
-                removed_count += 1
-                continue
+    def compress_lines(self, lines: Iterable[str]) -> tuple[list[str], CompressionResult]:
+        """行を1回だけ走査して圧縮
 
-            # その他の行は保持
-            filtered_lines.append(line)
-
-        return filtered_lines, removed_count
-
-    def _remove_duplicates(self, lines: list[str]) -> tuple[list[str], int]:
-        """重複行の除去と集約
+        低優先度の行を除去し、重要な行とその前後のコンテキストを重複を集約しながら保持します。
+        目標トークン数（またはサイズ）を指定した場合は、行ごとのトークン数を積み上げ、
+        目標を超えた時点で重要度の低い行から捨てます。
 
         Args:
-            lines: 行のリスト
+            lines: ログの行（改行コードを含まない）
 
         Returns:
-            (重複除去後の行, 除去された行数)
+            (圧縮された行, 圧縮結果)
 
         """
-        line_counts: dict[str, int] = {}
-        unique_lines: list[str] = []
+        selector = _LineSelector(self._budget())
+        miner = LogTemplateMiner()
+        before_context: deque[tuple[int, str]] = deque(maxlen=CONTEXT_LINES)
+        after_context_remaining = 0
+        context_score = 0.0
+        line_count = 0
+        original_size = 0
+        removed_count = 0
         duplicate_count = 0
-
-        for line in lines:
-            # タイムスタンプを除去して正規化
-            normalized_line = self._normalize_line_for_deduplication(line)
-
-            if normalized_line in line_counts:
-                line_counts[normalized_line] += 1
+        truncated_count = 0
+
+        def keep(index: int, line: str, score: float | None = None, context_of: float = 0.0) -> bool:
+            """行を保持（重複の場合は集約してFalseを返す）
+
+            score を省略した場合は、重複でなければ行の重要度（コンテキスト行の場合は
+            元の重要な行の重要度 context_of の一定割合以上）を計算します。
+            """
+            nonlocal duplicate_count, truncated_count
+            template = miner.add(line)
+            existing = selector.find(template.template_id)
+            if existing is not None:
+                existing.count += 1
                 duplicate_count += 1
-            else:
-                line_counts[normalized_line] = 1
-                unique_lines.append(line)
+                if selector.budget is not None:
+                    # 要約の文字列が変わった場合のみコストを数え直す
+                    cost_state = (template.revision, len(str(existing.count)))
+                    if cost_state != existing.cost_state:
+                        existing.cost_state = cost_state
+                        selector.update_cost(existing, self._line_cost(self._render(existing)))
+                return False
+
+            if score is None:
+                score = max(self.calculate_line_importance(line), context_of * CONTEXT_SCORE_RATIO)
+            text = self._truncate_line(line)
+            if text is not line:
+                truncated_count += 1
+            entry = _KeptLine(index=index, text=text, score=score, template=template)
+            if selector.budget is not None:
+                entry.cost = self._line_cost(text)
+            selector.add(entry)
+            return True
+
+        for index, line in enumerate(lines):
+            line_count += 1
+            original_size += _utf8_size(line) + 1
+
+            if self._is_important(line):
+                score = self.calculate_line_importance(line)
+                # 重要な行の前のコンテキストを保持
+                for context_index, context_line in before_context:
+                    keep(context_index, context_line, context_of=score)
+                before_context.clear()
+                # 重複した重要な行ではコンテキストを取り直さない
+                if keep(index, line, score):
+                    after_context_remaining = CONTEXT_LINES
+                    context_score = score
+                continue
 
-        # 重複が多い行には集約マークを追加
-        final_lines: list[str] = []
-        for line in unique_lines:
-            normalized_line = self._normalize_line_for_deduplication(line)
-            count = line_counts[normalized_line]
+            if self._removable_re.match(line):
+                removed_count += 1
+                continue
 
-            if count > 1:
-                final_lines.append(f"{line} (repeated {count} times)")
+            if after_context_remaining > 0:
+                # 重要な行の後のコンテキストを保持
+                after_context_remaining -= 1
+                keep(index, line, context_of=context_score)
             else:
-                final_lines.append(line)
+                before_context.append((index, line))
 
-        return final_lines, duplicate_count
-
-    def _normalize_line_for_deduplication(self, line: str) -> str:
-        """重複除去用の行正規化
-
-        Args:
-            line: 元の行
-
-        Returns:
-            正規化された行
+        compressed_lines = [self._render(entry) for entry in selector.kept()]
+        compressed_size = sum(_utf8_size(line) for line in compressed_lines) + max(len(compressed_lines) - 1, 0)
+        original_size = max(original_size - 1, 0)
 
-        """
-        # タイムスタンプパターンを除去
-        normalized = re.sub(r"\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}[.\d]*[Z]?", "[TIMESTAMP]", line)
-        normalized = re.sub(r"\[\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2}[.\d]*[Z]?\]", "[TIMESTAMP]", normalized)
+        techniques_applied: list[str] = []
+        if removed_count > 0:
+            techniques_applied.append(f"low_priority_removal({removed_count})")
+        if duplicate_count > 0:
+            techniques_applied.append(f"duplicate_removal({duplicate_count})")
+        techniques_applied.append("importance_filtering")
+        if truncated_count > 0:
+            techniques_applied.append(f"line_truncation({truncated_count})")
+        if selector.budget is not None:
+            techniques_applied.append(f"target_size_compression({selector.evicted_count})")
 
-        # 数値を正規化
-        normalized = re.sub(r"\b\d+\b", "[NUMBER]", normalized)
+        result = CompressionResult(
+            original_size=original_size,
+            compressed_size=compressed_size,
+            compression_ratio=compressed_size / original_size if original_size > 0 else 0,
+            lines_removed=line_count - len(compressed_lines),
+            lines_kept=len(compressed_lines),
+            techniques_applied=techniques_applied,
+        )
 
-        # パスを正規化
-        normalized = re.sub(r"/[^\s]+", "[PATH]", normalized)
+        logger.info(
+            "ログ圧縮完了: %d → %d 行 (%.1f%%), %.1f → %.1f MB (%.1f%%)",
+            line_count,
+            len(compressed_lines),
+            (len(compressed_lines) / line_count) * 100 if line_count > 0 else 0,
+            original_size / (1024 * 1024),
+            compressed_size / (1024 * 1024),
+            result.compression_ratio * 100,
+        )
 
-        # 先頭と末尾の空白を除去
-        return normalized.strip()
+        return compressed_lines, result
 
-    def _preserve_important_lines(self, lines: list[str]) -> list[str]:
-        """重要な行の保持
+    def _truncate_line(self, line: str, max_length: int = MAX_LINE_LENGTH) -> str:
+        """長い行を短縮（重要なパターンを含む場合はその周辺を保持）
 
         Args:
-            lines: 行のリスト
+            line: 行内容
+            max_length: 最大行長
 
         Returns:
-            重要な行を保持したリスト
+            短縮された行（短縮不要の場合は元の行）
 
         """
-        important_lines: list[str] = []
-        context_buffer: list[str] = []
-        context_size = 2  # 重要な行の前後2行を保持
-
-        for i, line in enumerate(lines):
-            is_important = any(re.search(pattern, line, re.IGNORECASE) for pattern in self.important_patterns)
-
-            if is_important:
-                # 重要な行の前のコンテキストを追加
-                start_context = max(0, i - context_size)
-                for j in range(start_context, i):
-                    if j < len(lines) and lines[j] not in important_lines:
-                        important_lines.append(lines[j])
-
-                # 重要な行を追加
-                important_lines.append(line)
-
-                # 重要な行の後のコンテキストを予約
-                end_context = min(len(lines), i + context_size + 1)
-                for j in range(i + 1, end_context):
-                    if j < len(lines):
-                        context_buffer.append(lines[j])
-
-            elif context_buffer and line in context_buffer:
-                # コンテキストバッファにある行を追加
-                important_lines.append(line)
-                context_buffer.remove(line)
-
-        return important_lines
-
-    def _truncate_long_lines(self, lines: list[str], max_length: int = 500) -> list[str]:
-        """長い行の短縮
-
-        Args:
-            lines: 行のリスト
-            max_length: 最大行長
+        if len(line) <= max_length:
+            return line
+
+        match = self._important_re.search(line)
+        if match is None:
+            # 重要でない長い行は先頭のみ保持
+            return line[:max_length] + "..."
+
+        start = max(0, match.start() - _TRUNCATE_CONTEXT_CHARS)
+        end = min(len(line), match.end() + _TRUNCATE_CONTEXT_CHARS)
+        truncated_line = line[start:end]
+        if start > 0:
+            truncated_line = "..." + truncated_line
+        if end < len(line):
+            truncated_line = truncated_line + "..."
+        return truncated_line
+
+    def _budget(self) -> int | None:
+        """保持する行のコストの上限（目標サイズの場合はバイト数、目標トークン数の場合はトークン数）"""
+        if self.target_size_bytes:
+            return self.target_size_bytes
+        if self.target_tokens:
+            return self.target_tokens
+        return None
 
-        Returns:
-            短縮された行のリスト
+    def _cost(self, text: str) -> int:
+        """テキストのコスト（目標サイズの場合はバイト数、目標トークン数の場合はトークン数）"""
+        if self.target_size_bytes:
+            return _utf8_size(text)
+        return self.token_counter.count(text, self.model)
 
-        """
-        truncated_lines: list[str] = []
-
-        for line in lines:
-            if len(line) > max_length:
-                # 重要な部分（エラーメッセージなど）を保持
-                if any(re.search(pattern, line, re.IGNORECASE) for pattern in self.important_patterns):
-                    # 重要なパターンの周辺を保持
-                    for pattern in self.important_patterns:
-                        match = re.search(pattern, line, re.IGNORECASE)
-                        if match:
-                            start = max(0, match.start() - 100)
-                            end = min(len(line), match.end() + 100)
-                            truncated_line = line[start:end]
-                            if start > 0:
-                                truncated_line = "..." + truncated_line
-                            if end < len(line):
-                                truncated_line = truncated_line + "..."
-                            truncated_lines.append(truncated_line)
-                            break
-                    else:
-                        # パターンが見つからない場合は先頭を保持
-                        truncated_lines.append(line[:max_length] + "...")
-                else:
-                    # 重要でない長い行は先頭のみ保持
-                    truncated_lines.append(line[:max_length] + "...")
-            else:
-                truncated_lines.append(line)
+    def _line_cost(self, line: str) -> int:
+        """行のコスト（行を区切る改行を含む）"""
+        return self._cost(line) + 1
 
-        return truncated_lines
+    def _render(self, entry: _KeptLine) -> str:
+        """出力する行（同じテンプレートの行をまとめた場合は要約）"""
+        if entry.count > 1 and entry.template is not None:
+            return entry.template.summary(entry.count, MAX_LINE_LENGTH)
+        return entry.text
 
-    def _compress_to_target_size(self, lines: list[str]) -> list[str]:
-        """目標サイズに合わせた圧縮
+    def _is_important(self, line: str, lowered: str | None = None) -> bool:
+        """重要なパターンを含む行かどうか
 
         Args:
-            lines: 行のリスト
+            line: 行内容
+            lowered: 小文字に変換した行内容（計算済みの場合）
 
         Returns:
-            目標サイズに圧縮された行のリスト
+            重要なパターンを含むかどうか
 
         """
-        current_content = "\n".join(lines)
-        current_size = len(current_content.encode("utf-8"))
-
-        # 目標サイズを決定
-        target_size = None
-        if self.target_size_bytes:
-            target_size = self.target_size_bytes
-        elif self.target_tokens:
-            # 1トークン ≈ 4文字として概算
-            target_size = self.target_tokens * 4
-
-        if not target_size or current_size <= target_size:
-            return lines
-
-        # 圧縮率を計算
-        compression_ratio = target_size / current_size
-        target_line_count = int(len(lines) * compression_ratio)
-
-        # 重要度でソートして上位を保持
-        scored_lines: list[tuple[float, int, str]] = []
-        for i, line in enumerate(lines):
-            importance_score = self.calculate_line_importance(line)
-            scored_lines.append((importance_score, i, line))
-
-        # 重要度順にソート
-        scored_lines.sort(key=lambda x: x[0], reverse=True)
-
-        # 上位の行を選択（元の順序を保持）
-        selected_indices = sorted([item[1] for item in scored_lines[:target_line_count]])
-        compressed_lines = [lines[i] for i in selected_indices]
-
-        return compressed_lines
+        if _IMPORTANT_KEYWORD_PATTERN.search(lowered if lowered is not None else line.lower()) is None:
+            return False
+        return self._important_re.search(line) is not None
 
     def calculate_line_importance(self, line: str) -> float:
         """行の重要度を計算
@@ -375,20 +480,20 @@ class LogCompressor:
         """
         score = 0.0
 
+        lowered = line.lower()
+
         # 重要なパターンにマッチする場合は高スコア
-        for pattern in self.important_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                score += 0.8
-                break
+        if self._is_important(line, lowered):
+            score += 0.8
 
         # エラーレベルによる重み付け
-        if re.search(r"critical|fatal", line, re.IGNORECASE):
+        if "critical" in lowered or "fatal" in lowered:
             score += 0.9
-        elif re.search(r"error", line, re.IGNORECASE):
+        elif "error" in lowered:
             score += 0.7
-        elif re.search(r"warning", line, re.IGNORECASE):
+        elif "warning" in lowered:
             score += 0.5
-        elif re.search(r"info", line, re.IGNORECASE):
+        elif "info" in lowered:
             score += 0.2
 
         # 行の長さによる重み付け（長い行は詳細情報を含む可能性）
@@ -396,11 +501,11 @@ class LogCompressor:
             score += 0.1
 
         # スタックトレースや詳細情報
-        if re.search(r"traceback|stack trace|at\s+\w+\.\w+", line, re.IGNORECASE):
+        if _TRACEBACK_PATTERN.search(line):
             score += 0.6
 
         # ファイルパスや行番号
-        if re.search(r"\.py:\d+|\.js:\d+|\.java:\d+", line):
+        if _SOURCE_LOCATION_PATTERN.search(line):
             score += 0.4
 
         return min(score, 1.0)
@@ -416,31 +521,64 @@ class LogCompressor:
             圧縮統計情報
 
         """
-        original_size = len(original_content.encode("utf-8"))
-        compressed_size = len(compressed_content.encode("utf-8"))
-        original_lines = len(original_content.splitlines())
-        compressed_lines = len(compressed_content.splitlines())
-
-        return {
-            "size_reduction": {
-                "original_bytes": original_size,
-                "compressed_bytes": compressed_size,
-                "reduction_bytes": original_size - compressed_size,
-                "reduction_percentage": ((original_size - compressed_size) / original_size) * 100
-                if original_size > 0
-                else 0,
-            },
-            "line_reduction": {
-                "original_lines": original_lines,
-                "compressed_lines": compressed_lines,
-                "reduction_lines": original_lines - compressed_lines,
-                "reduction_percentage": ((original_lines - compressed_lines) / original_lines) * 100
-                if original_lines > 0
-                else 0,
-            },
-            "compression_ratio": compressed_size / original_size if original_size > 0 else 0,
-            "estimated_tokens_saved": (original_size - compressed_size) // 4,  # 概算
-        }
+        return _build_statistics(
+            original_size=len(original_content.encode("utf-8")),
+            compressed_size=len(compressed_content.encode("utf-8")),
+            original_lines=len(original_content.splitlines()),
+            compressed_lines=len(compressed_content.splitlines()),
+        )
+
+
+def _compile_alternation(patterns: list[str], flags: int = 0) -> re.Pattern[str]:
+    """複数のパターンを1つの正規表現にまとめてコンパイル"""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags)
+
+
+def _iter_lines(log_content: str) -> Iterator[str]:
+    """行のリストを作らずにログを1行ずつ取り出す（改行コードは除く）"""
+    for match in _LINE_PATTERN.finditer(log_content):
+        yield match.group().rstrip("\r\n")
+
+
+def _utf8_size(text: str) -> int:
+    """UTF-8でのバイト数（ASCIIのみの場合はエンコードしない）"""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _build_statistics(
+    original_size: int, compressed_size: int, original_lines: int, compressed_lines: int
+) -> dict[str, Any]:
+    """圧縮統計情報を作成"""
+    return {
+        "size_reduction": {
+            "original_bytes": original_size,
+            "compressed_bytes": compressed_size,
+            "reduction_bytes": original_size - compressed_size,
+            "reduction_percentage": ((original_size - compressed_size) / original_size) * 100
+            if original_size > 0
+            else 0,
+        },
+        "line_reduction": {
+            "original_lines": original_lines,
+            "compressed_lines": compressed_lines,
+            "reduction_lines": original_lines - compressed_lines,
+            "reduction_percentage": ((original_lines - compressed_lines) / original_lines) * 100
+            if original_lines > 0
+            else 0,
+        },
+        "compression_ratio": compressed_size / original_size if original_size > 0 else 0,
+        "estimated_tokens_saved": (original_size - compressed_size) // 4,  # 概算
+    }
+
+
+def _result_statistics(result: CompressionResult) -> dict[str, Any]:
+    """圧縮結果から統計情報を作成"""
+    return _build_statistics(
+        original_size=result.original_size,
+        compressed_size=result.compressed_size,
+        original_lines=result.lines_kept + result.lines_removed,
+        compressed_lines=result.lines_kept,
+    )
 
 
 def compress_log_for_ai_analysis(log_content: str, max_tokens: int = 8000) -> tuple[str, dict[str, Any]]:
@@ -455,16 +593,33 @@ def compress_log_for_ai_analysis(log_content: str, max_tokens: int = 8000) -> tu
 
     """
     compressor = LogCompressor(target_tokens=max_tokens)
-    compressed_content = compressor.compress_log(log_content)
-    statistics = compressor.get_compression_statistics(log_content, compressed_content)
+    compressed_lines, result = compressor.compress_lines(_iter_lines(log_content))
+
+    return "\n".join(compressed_lines), _result_statistics(result)
+
+
+def compress_log_file_for_ai_analysis(log_path: Path, max_tokens: int = 8000) -> tuple[str, dict[str, Any]]:
+    """AI分析用にログファイルをストリーミングで圧縮
+
+    Args:
+        log_path: ログファイルのパス
+        max_tokens: 最大トークン数
+
+    Returns:
+        (圧縮されたログ, 統計情報)
+
+    """
+    compressor = LogCompressor(target_tokens=max_tokens)
+    compressed_content, result = compressor.compress_file(log_path)
 
-    return compressed_content, statistics
+    return compressed_content, _result_statistics(result)
 
 
 def smart_log_sampling(log_content: str, sample_ratio: float = 0.3) -> str:
     """スマートログサンプリング
 
-    重要な部分を保持しながらログをサンプリングします。
+    行をテンプレートにまとめ、重要度の高いテンプレートから順に1行ずつ選ぶことを繰り返します。
+    同じテンプレートの行ばかりが選ばれず、多くの種類の行が残ります。
 
     Args:
         log_content: 元のログ内容
@@ -475,21 +630,35 @@ def smart_log_sampling(log_content: str, sample_ratio: float = 0.3) -> str:
 
     """
     lines = log_content.splitlines()
-    target_line_count = int(len(lines) * sample_ratio)
+    target_line_count = min(int(len(lines) * sample_ratio), len(lines))
 
     compressor = LogCompressor()
+    miner = LogTemplateMiner()
 
-    # 重要度でソート
-    scored_lines: list[tuple[float, int, str]] = []
+    # テンプレートごとの行番号（最初の出現順）
+    members: dict[int, list[int]] = {}
+    templates: dict[int, LogTemplate] = {}
     for i, line in enumerate(lines):
-        importance_score = compressor.calculate_line_importance(line)
-        scored_lines.append((importance_score, i, line))
-
-    # 重要度順にソート
-    scored_lines.sort(key=lambda x: x[0], reverse=True)
-
-    # 上位の行を選択（元の順序を保持）
-    selected_indices = sorted([item[1] for item in scored_lines[:target_line_count]])
-    sampled_lines = [lines[i] for i in selected_indices]
+        template = miner.add(line)
+        members.setdefault(template.template_id, []).append(i)
+        templates[template.template_id] = template
+
+    # テンプレートを重要度順に並べる（同じ重要度では先に出現したもの）
+    order = sorted(
+        members, key=lambda template_id: -compressor.calculate_line_importance(templates[template_id].template)
+    )
+
+    # テンプレートごとに1行ずつ順番に選択
+    selected_indices: list[int] = []
+    round_index = 0
+    while len(selected_indices) < target_line_count:
+        # 選び終えたテンプレートは以降の周回から外す
+        order = [template_id for template_id in order if round_index < len(members[template_id])]
+        for template_id in order[: target_line_count - len(selected_indices)]:
+            selected_indices.append(members[template_id][round_index])
+        round_index += 1
+
+    # 元の順序を保持
+    sampled_lines = [lines[i] for i in sorted(selected_indices)]
 
     return "\n".join(sampled_lines)
@@ -1,28 +1,130 @@
 """ログ解析と失敗抽出システム
 
 actの実行ログから失敗情報を抽出し、構造化されたデータとして提供します。
+
+失敗の抽出は、各パターンの必須リテラル（キーワード）でログを1回走査して候補行を絞り込み、
+候補行の周辺ウィンドウだけを各パターンで照合する方式で行います。行番号は改行位置の
+インデックスから二分探索で解決するため、ログサイズに対して線形時間で処理できます。
 """
 
 from __future__ import annotations
 
+import logging
 import re
 
 from ..core.exceptions import LogParsingError
+from ..core.log_index import LineIndex
+from ..core.log_view import LogView
 from ..core.models import Failure, FailureType
 
+logger = logging.getLogger(__name__)
+
+# 失敗タイプの判定順（より具体的なものから先に）
+PATTERN_ORDER = [
+    FailureType.ASSERTION,
+    FailureType.TIMEOUT,
+    FailureType.BUILD_FAILURE,
+    FailureType.TEST_FAILURE,
+    FailureType.ERROR,  # 最後に一般的なエラーをチェック
+]
+
+# パターンごとの事前判定（パターン文字列 -> (マッチに必ず含まれる小文字のリテラル, マッチが跨ぎうる空白以外の行数)）
+# 登録のないパターン（^\s*✕ や ^E\s+ のように短いリテラルしか持たないもの）はログ全体を照合する
+PATTERN_PREFILTERS: dict[str, tuple[str, int]] = {
+    # FailureType.ASSERTION
+    r"AssertionError:\s*(.+)": ("assertionerror:", 1),
+    r"assert\s+(.+)\s+failed": ("assert", 2),
+    r"Expected:\s*(.+)": ("expected:", 1),
+    r"Actual:\s*(.+)": ("actual:", 1),
+    r"^\s*FAIL\s+(.+)$": ("fail", 2),
+    r"^>?\s*assert\s+(.+)$": ("assert", 2),
+    # FailureType.TIMEOUT
+    r"timeout": ("timeout", 0),
+    r"timed out": ("timed out", 0),
+    r"exceeded.*timeout": ("exceeded", 0),
+    r"killed.*timeout": ("timeout", 0),
+    # FailureType.BUILD_FAILURE
+    r"^Build failed": ("build failed", 0),
+    r"^Compilation failed": ("compilation failed", 0),
+    r"^.*: compilation terminated": (": compilation terminated", 0),
+    r"^npm ERR!\s*(.+)$": ("npm err!", 1),
+    r"^yarn error\s*(.+)$": ("yarn error", 1),
+    r"^pnpm ERR!\s*(.+)$": ("pnpm err!", 1),
+    r"^SyntaxError:\s*(.+)$": ("syntaxerror:", 1),
+    r"^ImportError:\s*(.+)$": ("importerror:", 1),
+    r"^ModuleNotFoundError:\s*(.+)$": ("modulenotfounderror:", 1),
+    # FailureType.TEST_FAILURE
+    r"^Tests failed": ("tests failed", 0),
+    r"^\d+\s+failing": ("failing", 1),
+    r"^\d+\s+failed": ("failed", 1),
+    r"^FAILED\s+(.+)$": ("failed", 1),
+    r"Coverage threshold not met": ("coverage threshold not met", 0),
+    # FailureType.ERROR
+    r"^Error:\s*(.+)$": ("error:", 1),
+    r"^ERROR:\s*(.+)$": ("error:", 1),
+    r"^\[ERROR\]\s*(.+)$": ("[error]", 1),
+    r"^.*error:\s*(.+)$": ("error:", 1),
+    r"^##\[error\](.+)$": ("##[error]", 0),
+    r"Process completed with exit code (\d+)": ("process completed with exit code ", 0),
+    r"^.*: command not found$": (": command not found", 0),
+    r"^.*: No such file or directory$": (": no such file or directory", 0),
+}
+
+# IGNORECASE で ASCII 文字にマッチするが、str.lower() では ASCII にならない文字
+_CASE_FOLD_EXCEPTIONS = ("\u017f", "\u0131")  # ſ (long s), ı (dotless i)
+
+# ログビューからスタックトレースを検索する際に前後でデコードするバイト数
+_STACK_TRACE_WINDOW_BYTES = 4 * 2000 + 4
+
+
+class _PatternPlan:
+    """単一パターンの照合計画
+
+    Attributes:
+        failure_type: パターンの失敗タイプ
+        pattern: コンパイル済みパターン
+        keyword: マッチに必ず含まれる小文字化したリテラル（Noneの場合はログ全体を照合）
+        line_span: マッチが跨ぎうる空白以外の行数
+
+    """
+
+    __slots__ = ("_bytes_pattern", "failure_type", "keyword", "line_span", "pattern")
+
+    def __init__(self, failure_type: FailureType, pattern: re.Pattern[str]):
+        self.failure_type = failure_type
+        self.pattern = pattern
+        self.keyword: str | None = None
+        self.line_span = 0
+        self._bytes_pattern: re.Pattern[bytes] | None = None
+
+        prefilter = PATTERN_PREFILTERS.get(pattern.pattern)
+        if prefilter is not None and not pattern.flags & re.DOTALL:
+            self.keyword, self.line_span = prefilter
+
+    @property
+    def bytes_pattern(self) -> re.Pattern[bytes]:
+        """バイト列用にコンパイルしたパターン（\\s や大文字小文字の無視は ASCII のみ）"""
+        if self._bytes_pattern is None:
+            self._bytes_pattern = re.compile(self.pattern.pattern.encode("utf-8"), self.pattern.flags & ~re.UNICODE)
+        return self._bytes_pattern
+
 
 class LogExtractor:
     """ログから失敗情報を抽出するクラス"""
 
-    def __init__(self, context_lines: int = 3):
+    def __init__(self, context_lines: int = 3, single_pass: bool = True):
         """ログ抽出器を初期化
 
         Args:
             context_lines: エラー前後に取得するコンテキスト行数
+            single_pass: キーワードによる1回の走査で候補を絞り込む抽出を使用するか
+                （Falseの場合はパターンごとにログ全体を照合する従来の方式）
 
         """
         self.context_lines = context_lines
+        self.single_pass = single_pass
         self._compile_patterns()
+        self._build_pattern_plans()
 
     def _compile_patterns(self) -> None:
         """エラーパターンの正規表現をコンパイル"""
@@ -109,11 +211,23 @@ class LogExtractor:
             re.compile(r"([^\s]+\.py):(\d+): in"),
         ]
 
-    def extract_failures(self, log_content: str) -> list[Failure]:
+    def _build_pattern_plans(self) -> None:
+        """判定順に並べたパターンの照合計画を作成"""
+        self._pattern_plans = [
+            _PatternPlan(failure_type, pattern)
+            for failure_type in PATTERN_ORDER
+            if failure_type in self.error_patterns
+            for pattern in self.error_patterns[failure_type]
+        ]
+        self._keywords = sorted({plan.keyword for plan in self._pattern_plans if plan.keyword})
+        self._window_margin = max((plan.line_span for plan in self._pattern_plans if plan.keyword), default=0)
+
+    def extract_failures(self, log_content: str, log_index: LineIndex | None = None) -> list[Failure]:
         """ログから失敗情報を抽出
 
         Args:
             log_content: ログファイルの内容
+            log_index: 作成済みの行インデックス（Noneまたは別のログのものの場合は新規作成）
 
         Returns:
             抽出された失敗情報のリスト
@@ -126,32 +240,13 @@ class LogExtractor:
             return []
 
         try:
-            failures: list[Failure] = []
-            log_lines = log_content.splitlines()
-
-            # 各失敗タイプのパターンをチェック（より具体的なものから先に）
-            pattern_order = [
-                FailureType.ASSERTION,
-                FailureType.TIMEOUT,
-                FailureType.BUILD_FAILURE,
-                FailureType.TEST_FAILURE,
-                FailureType.ERROR,  # 最後に一般的なエラーをチェック
-            ]
-
-            for failure_type in pattern_order:
-                if failure_type in self.error_patterns:
-                    patterns = self.error_patterns[failure_type]
-                    for pattern in patterns:
-                        matches = pattern.finditer(log_content)
-                        for match in matches:
-                            failure = self._create_failure_from_match(match, failure_type, log_lines, log_content)
-                            if failure:
-                                failures.append(failure)
+            if self.single_pass:
+                failures = self._extract_failures_single_pass(log_content, log_index)
+            else:
+                failures = self._extract_failures_per_pattern(log_content)
 
             # 重複を除去（同じメッセージと位置の失敗）
-            unique_failures = self._deduplicate_failures(failures)
-
-            return unique_failures
+            return self._deduplicate_failures(failures)
 
         except Exception as e:
             raise LogParsingError(
@@ -159,6 +254,301 @@ class LogExtractor:
                 "ログファイルが破損している可能性があります。新しい実行を試してください。",
             ) from e
 
+    def _extract_failures_per_pattern(self, log_content: str) -> list[Failure]:
+        """パターンごとにログ全体を照合して失敗を抽出（従来の方式）
+
+        Args:
+            log_content: ログファイルの内容
+
+        Returns:
+            重複除去前の失敗のリスト
+
+        """
+        failures: list[Failure] = []
+        log_lines = log_content.splitlines()
+
+        for failure_type in PATTERN_ORDER:
+            if failure_type in self.error_patterns:
+                patterns = self.error_patterns[failure_type]
+                for pattern in patterns:
+                    matches = pattern.finditer(log_content)
+                    for match in matches:
+                        failure = self._create_failure_from_match(match, failure_type, log_lines, log_content)
+                        if failure:
+                            failures.append(failure)
+
+        return failures
+
+    def _extract_failures_single_pass(self, log_content: str, log_index: LineIndex | None = None) -> list[Failure]:
+        """キーワード走査で絞り込んだウィンドウ内のみを照合して失敗を抽出
+
+        Args:
+            log_content: ログファイルの内容
+            log_index: 作成済みの行インデックス
+
+        Returns:
+            重複除去前の失敗のリスト（従来の方式と同じ順序）
+
+        """
+        line_index = log_index if log_index is not None and log_index.text == log_content else LineIndex(log_content)
+        windows = self._find_candidate_windows(log_content, line_index)
+        whole_log = [(0, len(log_content))]
+
+        failures: list[Failure] = []
+        for plan in self._pattern_plans:
+            spans = windows if windows is not None and plan.keyword else whole_log
+            for start, end in spans:
+                for match in plan.pattern.finditer(log_content, start, end):
+                    failure = self._create_failure_at(match, plan.failure_type, line_index)
+                    if failure:
+                        failures.append(failure)
+
+        return failures
+
+    def _find_candidate_windows(self, log_content: str, line_index: LineIndex) -> list[tuple[int, int]] | None:
+        """キーワードを含む行の周辺ウィンドウを取得
+
+        Args:
+            log_content: ログファイルの内容
+            line_index: ログの行インデックス
+
+        Returns:
+            昇順に並んだ重複のない (開始位置, 終了位置) のリスト。
+            キーワードで絞り込めない場合はNone
+
+        """
+        lowered = log_content.lower()
+        # 小文字化で文字位置がずれる場合や特殊な大文字小文字の対応がある場合は絞り込まない
+        if len(lowered) != len(log_content) or any(char in lowered for char in _CASE_FOLD_EXCEPTIONS):
+            return None
+
+        line_starts: set[int] = set()
+        for keyword in self._keywords:
+            position = lowered.find(keyword)
+            while position != -1:
+                line_start, line_end = line_index.line_bounds(position)
+                line_starts.add(line_start)
+                # 同じ行の2つ目以降の出現は不要なので次の行から検索を再開
+                position = lowered.find(keyword, line_end + 1)
+
+        return self._merge_windows(line_starts, line_index, len(log_content))
+
+    def _merge_windows(
+        self,
+        line_starts: set[int],
+        source: LineIndex | LogView,
+        size: int,
+    ) -> list[tuple[int, int]]:
+        """候補行を余白付きのウィンドウに広げて結合
+
+        Args:
+            line_starts: 候補行の開始位置
+            source: 行範囲を提供する行インデックスまたはログビュー
+            size: ログ全体の長さ
+
+        Returns:
+            昇順に並んだ重複のない (開始位置, 終了位置) のリスト
+
+        """
+        windows: list[tuple[int, int]] = []
+        for line_start in sorted(line_starts):
+            start, end = source.line_bounds(line_start)
+            start = self._extend_window_start(source, start)
+            end = self._extend_window_end(source, end, size)
+            if windows and start <= windows[-1][1] + 1:
+                windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+            else:
+                windows.append((start, end))
+        return windows
+
+    def _extend_window_start(self, source: LineIndex | LogView, start: int) -> int:
+        """空白行を数えずにウィンドウの余白分だけ開始位置を前の行へ広げる"""
+        remaining = self._window_margin
+        while remaining > 0 and start > 0:
+            start, end = source.line_bounds(start - 1)
+            if not source.span_is_blank(start, end):
+                remaining -= 1
+        return start
+
+    def _extend_window_end(self, source: LineIndex | LogView, end: int, size: int) -> int:
+        """空白行を数えずにウィンドウの余白分だけ終了位置を後の行へ広げる"""
+        remaining = self._window_margin
+        while remaining > 0 and end < size:
+            start, end = source.line_bounds(end + 1)
+            if not source.span_is_blank(start, end):
+                remaining -= 1
+        # 後続の空白行も含める（空白のみの要素が空白行を越えるため）
+        while end < size:
+            start, next_end = source.line_bounds(end + 1)
+            if not source.span_is_blank(start, next_end):
+                break
+            end = next_end
+        return end
+
+    def extract_failures_from_view(self, view: LogView) -> list[Failure]:
+        """ログビューから失敗情報を抽出
+
+        mmapで開かれたログはバイト列のまま走査し、マッチした範囲と前後のコンテキストのみを
+        デコードします。小さなログ（mmapを使用しないもの）は文字列として従来どおり処理します。
+
+        バイト列の走査では ``\\s`` や大文字小文字の無視が ASCII 文字のみに適用されます。
+
+        Args:
+            view: ログビュー
+
+        Returns:
+            抽出された失敗情報のリスト
+
+        Raises:
+            LogParsingError: ログ解析に失敗した場合
+
+        """
+        if not view.is_mapped or not self.single_pass:
+            return self.extract_failures(view.read_text())
+
+        if not view.span_is_blank(0, view.size):
+            try:
+                windows = self._find_candidate_windows_in_view(view)
+                whole_log = [(0, view.size)]
+
+                failures: list[Failure] = []
+                for plan in self._pattern_plans:
+                    spans = windows if plan.keyword else whole_log
+                    for start, end in spans:
+                        for match in plan.bytes_pattern.finditer(view.data, start, end):
+                            failure = self._create_failure_in_view(match, plan.failure_type, view)
+                            if failure:
+                                failures.append(failure)
+
+                return self._deduplicate_failures(failures)
+
+            except Exception as e:
+                raise LogParsingError(
+                    f"ログ解析中にエラーが発生しました: {e}",
+                    "ログファイルが破損している可能性があります。新しい実行を試してください。",
+                ) from e
+
+        return []
+
+    def _find_candidate_windows_in_view(self, view: LogView) -> list[tuple[int, int]]:
+        """ログビュー内でキーワードを含む行の周辺ウィンドウを取得
+
+        Args:
+            view: ログビュー
+
+        Returns:
+            昇順に並んだ重複のない (開始位置, 終了位置) のリスト（バイト位置）
+
+        """
+        keywords = [keyword.encode("utf-8") for keyword in self._keywords]
+        overlap = max((len(keyword) for keyword in keywords), default=1) - 1
+
+        line_starts: set[int] = set()
+        for block_start, owned_end, lowered in view.iter_lowered_blocks(overlap):
+            for keyword in keywords:
+                position = lowered.find(keyword)
+                while position != -1 and block_start + position < owned_end:
+                    line_start, line_end = view.line_bounds(block_start + position)
+                    line_starts.add(line_start)
+                    position = lowered.find(keyword, line_end + 1 - block_start)
+
+        return self._merge_windows(line_starts, view, view.size)
+
+    def _create_failure_in_view(
+        self,
+        match: re.Match[bytes],
+        failure_type: FailureType,
+        view: LogView,
+    ) -> Failure | None:
+        """バイト列のマッチ結果から必要な範囲のみをデコードして失敗オブジェクトを作成
+
+        Args:
+            match: バイト列の正規表現のマッチ結果
+            failure_type: 失敗タイプ
+            view: ログビュー
+
+        Returns:
+            失敗オブジェクト（作成できない場合はNone）
+
+        """
+        try:
+            match_start = match.start()
+
+            raw_message = match.group(1) if match.groups() else match.group(0)
+            message = raw_message.decode(view.encoding, errors="replace").strip()
+
+            file_path, file_line = self.extract_file_info(message)
+
+            context_before, context_after = view.context_lines(match_start, self.context_lines, self.context_lines)
+
+            # スタックトレースの検索範囲（前後2000文字）を含む分だけデコード（UTF-8は1文字最大4バイト）
+            window_start = max(0, match_start - _STACK_TRACE_WINDOW_BYTES)
+            surrounding = view.decode(window_start, match_start + _STACK_TRACE_WINDOW_BYTES)
+            relative_position = len(view.decode(window_start, match_start))
+            stack_trace = self._extract_stack_trace(surrounding, relative_position)
+
+            return Failure(
+                type=failure_type,
+                message=message,
+                file_path=file_path,
+                line_number=file_line,
+                context_before=context_before,
+                context_after=context_after,
+                stack_trace=stack_trace,
+            )
+
+        except Exception:
+            # 個別の失敗作成でエラーが発生した場合はスキップ
+            return None
+
+    def _create_failure_at(
+        self,
+        match: re.Match[str],
+        failure_type: FailureType,
+        line_index: LineIndex,
+    ) -> Failure | None:
+        """マッチした結果から行インデックスを使って失敗オブジェクトを作成
+
+        Args:
+            match: 正規表現のマッチ結果
+            failure_type: 失敗タイプ
+            line_index: ログの行インデックス
+
+        Returns:
+            失敗オブジェクト（作成できない場合はNone）
+
+        """
+        try:
+            match_start = match.start()
+            center_line = line_index.line_number(match_start) - 1
+
+            message = match.group(1) if match.groups() else match.group(0)
+            message = message.strip()
+
+            file_path, file_line = self.extract_file_info(message)
+
+            context_before: list[str] = []
+            context_after: list[str] = []
+            if center_line < line_index.line_count:
+                context_before = line_index.lines(center_line - self.context_lines, center_line)
+                context_after = line_index.lines(center_line + 1, center_line + 1 + self.context_lines)
+
+            stack_trace = self._extract_stack_trace(line_index.text, match_start)
+
+            return Failure(
+                type=failure_type,
+                message=message,
+                file_path=file_path,
+                line_number=file_line,
+                context_before=context_before,
+                context_after=context_after,
+                stack_trace=stack_trace,
+            )
+
+        except Exception:
+            # 個別の失敗作成でエラーが発生した場合はスキップ
+            return None
+
     def _create_failure_from_match(
         self,
         match: re.Match[str],
@@ -188,7 +578,7 @@ class LogExtractor:
             message = message.strip()
 
             # ファイルパスと行番号を抽出
-            file_path, file_line = self._extract_file_info(message)
+            file_path, file_line = self.extract_file_info(message)
 
             # コンテキスト行を取得
             context_before, context_after = self._get_context_lines(log_lines, line_number - 1, self.context_lines)
@@ -210,7 +600,7 @@ class LogExtractor:
             # 個別の失敗作成でエラーが発生した場合はスキップ
             return None
 
-    def _extract_file_info(self, message: str) -> tuple[str | None, int | None]:
+    def extract_file_info(self, message: str) -> tuple[str | None, int | None]:
         """メッセージからファイルパスと行番号を抽出
 
         Args:
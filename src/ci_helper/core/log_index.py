@@ -0,0 +1,489 @@
+"""ログの行位置インデックス
+
+ログ全体に対する文字位置と行番号の対応を改行位置の配列として保持し、
+二分探索で行番号を解決します。マッチごとにログ先頭から改行を数え直す必要がなくなります。
+
+LogIndex はこれに加えてactのワークフロー/ジョブ/ステップのセクション境界を保持し、
+``act_*.log`` の隣に ``.idx`` ファイルとして永続化できます。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .log_storage import read_log_text
+
+logger = logging.getLogger(__name__)
+
+# インデックスファイルの形式バージョン（形式を変更した場合は更新する）
+INDEX_FORMAT_VERSION = 1
+
+# インデックスファイルの拡張子（ログファイル名の末尾に付加）
+INDEX_SUFFIX = ".idx"
+
+# actの出力行の接頭辞（[ワークフロー名/ジョブ名]）
+_ACT_PREFIX_PATTERN = re.compile(r"^\[([^\]\n]+)\]", re.MULTILINE)
+_STEP_START_PATTERN = re.compile(r"^⭐\s*Run (.+)$")
+_STEP_END_PATTERN = re.compile(r"^(✅|❌)\s*(?:Success|Failure) - (.+)$")
+
+
+class LineIndex:
+    """改行位置による行インデックス
+
+    行番号は1ベース、行インデックスは0ベースで扱います。
+    行の区切りは ``\\n`` のみとし、行末の ``\\r`` は行の内容から除去します。
+    """
+
+    def __init__(self, text: str, newlines: Sequence[int] | None = None):
+        """行インデックスを作成
+
+        Args:
+            text: インデックス対象のテキスト
+            newlines: 作成済みの改行位置（Noneの場合はテキストから作成）
+
+        """
+        self.text = text
+        if newlines is not None:
+            self.newlines: Sequence[int] = newlines
+            return
+
+        positions: list[int] = []
+        find = text.find
+        append = positions.append
+        position = find("\n")
+        while position != -1:
+            append(position)
+            position = find("\n", position + 1)
+        self.newlines = positions
+
+    @property
+    def line_count(self) -> int:
+        """行数（``str.splitlines`` と同様に末尾の改行の後ろは数えない）"""
+        if not self.text:
+            return 0
+        count = len(self.newlines) + 1
+        if self.text.endswith("\n"):
+            count -= 1
+        return count
+
+    def line_number(self, position: int) -> int:
+        """文字位置を含む行の行番号を取得
+
+        Args:
+            position: テキスト中の文字位置
+
+        Returns:
+            行番号（1ベース）
+
+        """
+        return bisect_left(self.newlines, position) + 1
+
+    def line_start(self, index: int) -> int:
+        """行の開始位置を取得
+
+        Args:
+            index: 行インデックス（0ベース）
+
+        Returns:
+            行の先頭の文字位置
+
+        """
+        if index <= 0:
+            return 0
+        return self.newlines[index - 1] + 1
+
+    def line_end(self, index: int) -> int:
+        """行の終了位置（改行文字の位置）を取得
+
+        Args:
+            index: 行インデックス（0ベース）
+
+        Returns:
+            行末の文字位置
+
+        """
+        if index < len(self.newlines):
+            return self.newlines[index]
+        return len(self.text)
+
+    def line_bounds(self, position: int) -> tuple[int, int]:
+        """文字位置を含む行の範囲を取得
+
+        Args:
+            position: テキスト中の文字位置
+
+        Returns:
+            (行の開始位置, 行末の文字位置) のタプル
+
+        """
+        index = self.line_number(position) - 1
+        return self.line_start(index), self.line_end(index)
+
+    def span_is_blank(self, start: int, end: int) -> bool:
+        """範囲が空白文字のみかどうかを判定
+
+        Args:
+            start: 開始位置
+            end: 終了位置
+
+        Returns:
+            空または空白のみの場合True
+
+        """
+        return not self.text[start:end].strip()
+
+    def line(self, index: int) -> str:
+        """行の内容を取得
+
+        Args:
+            index: 行インデックス（0ベース）
+
+        Returns:
+            改行を含まない行の内容
+
+        """
+        line = self.text[self.line_start(index) : self.line_end(index)]
+        if line.endswith("\r"):
+            line = line[:-1]
+        return line
+
+    def lines(self, start: int, stop: int) -> list[str]:
+        """範囲内の行を取得
+
+        Args:
+            start: 開始行インデックス（0ベース、含む）
+            stop: 終了行インデックス（0ベース、含まない）
+
+        Returns:
+            行の内容のリスト
+
+        """
+        start = max(0, start)
+        stop = min(self.line_count, stop)
+        return [self.line(index) for index in range(start, stop)]
+
+    def is_blank(self, index: int) -> bool:
+        """行が空白文字のみかどうかを判定
+
+        Args:
+            index: 行インデックス（0ベース）
+
+        Returns:
+            空行または空白のみの行の場合True
+
+        """
+        return not self.text[self.line_start(index) : self.line_end(index)].strip()
+
+
+@dataclass
+class LogSection:
+    """ログ内のワークフロー/ジョブ/ステップの範囲
+
+    Attributes:
+        kind: セクションの種類（"workflow"、"job"、"step"）
+        name: セクション名
+        start_line: 開始行インデックス（0ベース、含む）
+        end_line: 終了行インデックス（0ベース、含まない）
+        workflow: 所属するワークフロー名
+        job: 所属するジョブ名（ワークフローの場合はNone）
+        success: 成否（ログから判定できない場合はNone）
+
+    """
+
+    kind: str
+    name: str
+    start_line: int
+    end_line: int
+    workflow: str
+    job: str | None = None
+    success: bool | None = None
+
+
+class LogIndex(LineIndex):
+    """actログのインデックス
+
+    改行位置に加えてワークフロー/ジョブ/ステップのセクション境界を保持します。
+    1つのログに対して一度だけ作成し、抽出器・解析器・検出器で共有します。
+    """
+
+    def __init__(
+        self,
+        text: str,
+        newlines: Sequence[int] | None = None,
+        sections: list[LogSection] | None = None,
+    ):
+        """ログインデックスを作成
+
+        Args:
+            text: ログの内容
+            newlines: 作成済みの改行位置（Noneの場合はログから作成）
+            sections: 作成済みのセクション（Noneの場合は初回参照時に作成）
+
+        """
+        super().__init__(text, newlines)
+        self._sections = sections
+        self._lines_containing: dict[str, list[int]] = {}
+
+    @property
+    def sections(self) -> list[LogSection]:
+        """ワークフロー/ジョブ/ステップのセクション（開始行順）"""
+        if self._sections is None:
+            self._sections = self._build_sections()
+        return self._sections
+
+    def get_sections(self, kind: str, workflow: str | None = None) -> list[LogSection]:
+        """種類を指定してセクションを取得
+
+        Args:
+            kind: セクションの種類（"workflow"、"job"、"step"）
+            workflow: 絞り込むワークフロー名（Noneの場合はすべて）
+
+        Returns:
+            該当するセクションのリスト
+
+        """
+        return [
+            section
+            for section in self.sections
+            if section.kind == kind and (workflow is None or section.workflow == workflow)
+        ]
+
+    def section_text(self, section: LogSection) -> str:
+        """セクションの内容を取得
+
+        Args:
+            section: セクション
+
+        Returns:
+            改行で連結したセクションの内容
+
+        """
+        return "\n".join(self.lines(section.start_line, section.end_line))
+
+    def lines_containing(self, needle: str) -> list[int]:
+        """文字列を含む行のインデックスを取得（結果はキャッシュされる）
+
+        Args:
+            needle: 検索する文字列
+
+        Returns:
+            昇順に並んだ行インデックスのリスト
+
+        """
+        cached = self._lines_containing.get(needle)
+        if cached is not None:
+            return cached
+
+        found: list[int] = []
+        find = self.text.find
+        position = find(needle)
+        while position != -1:
+            line = self.line_number(position) - 1
+            found.append(line)
+            position = find(needle, self.line_end(line) + 1)
+
+        self._lines_containing[needle] = found
+        return found
+
+    def _build_sections(self) -> list[LogSection]:
+        """actの行接頭辞からセクションを作成"""
+        jobs: dict[str, LogSection] = {}
+        open_steps: dict[str, LogSection] = {}
+        steps: list[LogSection] = []
+
+        for match in _ACT_PREFIX_PATTERN.finditer(self.text):
+            line = self.line_number(match.start()) - 1
+            prefix = match.group(1)
+            workflow, _, job = prefix.rpartition("/")
+            if not workflow:
+                workflow, job = prefix, prefix
+
+            job_section = jobs.get(prefix)
+            if job_section is None:
+                job_section = LogSection("job", job, line, line + 1, workflow, job)
+                jobs[prefix] = job_section
+            job_section.end_line = line + 1
+
+            rest = self.text[match.end() : self.line_end(line)].strip()
+            if not rest:
+                continue
+
+            step_start = _STEP_START_PATTERN.match(rest)
+            if step_start:
+                previous = open_steps.pop(prefix, None)
+                if previous is not None:
+                    previous.end_line = line
+                step = LogSection("step", step_start.group(1).strip(), line, line + 1, workflow, job)
+                open_steps[prefix] = step
+                steps.append(step)
+                continue
+
+            step_end = _STEP_END_PATTERN.match(rest)
+            if step_end:
+                step = open_steps.pop(prefix, None)
+                if step is not None:
+                    step.end_line = line + 1
+                    step.success = step_end.group(1) == "✅"
+                continue
+
+            if "Job succeeded" in rest or "Job failed" in rest:
+                job_section.success = "Job succeeded" in rest
+
+        # 終了行が出力されなかったステップはジョブの終端までとする
+        for prefix, step in open_steps.items():
+            step.end_line = jobs[prefix].end_line
+
+        workflows: dict[str, LogSection] = {}
+        for job_section in jobs.values():
+            workflow_section = workflows.get(job_section.workflow)
+            if workflow_section is None:
+                workflows[job_section.workflow] = LogSection(
+                    "workflow",
+                    job_section.workflow,
+                    job_section.start_line,
+                    job_section.end_line,
+                    job_section.workflow,
+                    success=job_section.success,
+                )
+                continue
+            workflow_section.start_line = min(workflow_section.start_line, job_section.start_line)
+            workflow_section.end_line = max(workflow_section.end_line, job_section.end_line)
+            if job_section.success is False:
+                workflow_section.success = False
+            elif job_section.success is None and workflow_section.success:
+                workflow_section.success = None
+
+        kind_order = {"workflow": 0, "job": 1, "step": 2}
+        sections = [*workflows.values(), *jobs.values(), *steps]
+        sections.sort(key=lambda section: (section.start_line, kind_order[section.kind]))
+        return sections
+
+    @staticmethod
+    def index_path(log_path: Path) -> Path:
+        """ログファイルに対応するインデックスファイルのパスを取得
+
+        Args:
+            log_path: ログファイルのパス
+
+        Returns:
+            インデックスファイルのパス
+
+        """
+        return log_path.with_name(log_path.name + INDEX_SUFFIX)
+
+    def save(self, log_path: Path) -> Path:
+        """インデックスをログファイルの隣に保存
+
+        先頭行にJSONのヘッダー、続けて改行位置を64ビット整数の配列として書き出します。
+
+        Args:
+            log_path: インデックス対象のログファイルのパス
+
+        Returns:
+            保存したインデックスファイルのパス
+
+        """
+        stat = log_path.stat()
+        header = {
+            "version": INDEX_FORMAT_VERSION,
+            "log_size": stat.st_size,
+            "log_mtime_ns": stat.st_mtime_ns,
+            "text_length": len(self.text),
+            "newline_count": len(self.newlines),
+            "byteorder": sys.byteorder,
+            "sections": [asdict(section) for section in self.sections],
+        }
+        offsets = self.newlines if isinstance(self.newlines, array) else array("q", self.newlines)
+
+        index_path = self.index_path(log_path)
+        temp_path = index_path.with_name(f".{index_path.name}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(json.dumps(header, ensure_ascii=False).encode("utf-8"))
+            f.write(b"\n")
+            offsets.tofile(f)
+        os.replace(temp_path, index_path)
+        return index_path
+
+    @classmethod
+    def load(cls, log_path: Path, text: str | None = None) -> LogIndex | None:
+        """保存済みのインデックスを読み込み
+
+        ログファイルのサイズ・更新日時が保存時と異なる場合は古いインデックスとして扱います。
+
+        Args:
+            log_path: ログファイルのパス
+            text: ログの内容（Noneの場合はファイルから読み込み）
+
+        Returns:
+            ログインデックス（存在しない・古い・破損している場合はNone）
+
+        """
+        index_path = cls.index_path(log_path)
+        try:
+            with open(index_path, "rb") as f:
+                header: dict[str, Any] = json.loads(f.readline())
+                stat = log_path.stat()
+                if (
+                    header.get("version") != INDEX_FORMAT_VERSION
+                    or header.get("log_size") != stat.st_size
+                    or header.get("log_mtime_ns") != stat.st_mtime_ns
+                ):
+                    return None
+
+                newlines = array("q")
+                newlines.fromfile(f, header["newline_count"])
+                if header.get("byteorder") != sys.byteorder:
+                    newlines.byteswap()
+
+            if text is None:
+                text = read_log_text(log_path)
+            if len(text) != header["text_length"]:
+                return None
+
+            sections = [LogSection(**section) for section in header["sections"]]
+            return cls(text, newlines=newlines, sections=sections)
+
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, EOFError) as e:
+            logger.debug(f"ログインデックスの読み込みに失敗しました: {index_path} - {e}")
+            return None
+
+    @classmethod
+    def for_log_file(cls, log_path: Path, text: str | None = None, persist: bool = True) -> LogIndex:
+        """ログファイルのインデックスを取得（保存済みでなければ作成）
+
+        Args:
+            log_path: ログファイルのパス
+            text: ログの内容（Noneの場合はファイルから読み込み）
+            persist: 作成したインデックスを保存するか
+
+        Returns:
+            ログインデックス
+
+        """
+        index = cls.load(log_path, text)
+        if index is not None:
+            return index
+
+        if text is None:
+            text = read_log_text(log_path)
+        index = cls(text)
+
+        if persist:
+            try:
+                index.save(log_path)
+            except OSError as e:
+                logger.warning(f"ログインデックスの保存に失敗しました: {log_path} - {e}")
+
+        return index
@@ -6,19 +6,43 @@ CI実行ログの保存、管理、一覧表示機能を提供します。
 from __future__ import annotations
 
 import json
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
 from typing import Any, cast
 
 from ..core.exceptions import ExecutionError
+from ..core.execution_history import HISTORY_DB_FILENAME, ExecutionHistoryStore
+from ..core.log_index import LogIndex
+from ..core.log_storage import (
+    compressed_log_name,
+    is_compressed_log,
+    iter_log_files,
+    open_log_writer,
+    raw_log_size,
+    resolve_compression,
+    written_log_size,
+)
+from ..core.log_view import DEFAULT_MMAP_THRESHOLD_MB, LogView
 from ..core.models import ExecutionResult
 from ..utils.config import Config
 
+logger = logging.getLogger(__name__)
+
+# 旧バージョンのログインデックスのファイル名（初回に実行履歴ストアへ取り込む）
+LEGACY_INDEX_FILENAME = "index.json"
+
 
 class LogManager:
     """ログ管理クラス
 
     実行ログの保存、メタデータ管理、一覧表示を行います。
+    実行履歴ストアをログのインデックスとし、一覧・検索・統計・実行履歴は
+    保存時に解析結果を記録したストアから取得します。
     """
 
     def __init__(self, config: Config):
@@ -30,7 +54,16 @@ class LogManager:
         """
         self.config = config
         self.log_dir = config.get_path("log_dir")
-        self.index_file = self.log_dir / "index.json"
+        self.history_db_path = self.log_dir / HISTORY_DB_FILENAME
+        # ログのインデックス（実行履歴データベース）
+        self.index_file = self.history_db_path
+        # 新しく保存するログの圧縮方式（既存のログは拡張子で判別して読み込む）
+        self.compression = resolve_compression(config.get("log_compression", "none"))
+
+        # 実行履歴ストア（初回使用時に開く）
+        self._history_store: ExecutionHistoryStore | None = None
+        self._history_store_unavailable = False
+        self._history_store_lock = threading.Lock()
 
         # ログディレクトリを作成
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -57,49 +90,105 @@ class LogManager:
         """
         log_path: Path | None = None
         try:
-            # タイムスタンプ付きのログファイル名を生成
-            timestamp = execution_result.timestamp.strftime("%Y%m%d_%H%M%S")
-            log_filename = f"act_{timestamp}.log"
-            log_path = self.log_dir / log_filename
+            log_path = self.create_log_path(execution_result.timestamp)
 
-            # 生ログを保存
-            with open(log_path, "w", encoding="utf-8") as f:
+            # 生ログを保存（圧縮方式が設定されている場合は圧縮しながら書き込む）
+            with open_log_writer(log_path) as f:
                 f.write(raw_output)
 
-            # メタデータを更新
-            self._update_log_index(log_path, execution_result, command_args)
+            return self.register_execution_log(
+                execution_result, log_path, command_args, raw_size=written_log_size(f, log_path)
+            )
+
+        except ExecutionError:
+            raise
+        except Exception as e:
+            path_str = str(log_path) if log_path else "unknown"
+            raise ExecutionError(
+                f"ログの保存に失敗しました: {path_str}",
+                f"ディスク容量やファイル権限を確認してください: {e}",
+            ) from e
+
+    def create_log_path(self, timestamp: datetime) -> Path:
+        """実行ログの保存先パスを生成
+
+        Args:
+            timestamp: 実行のタイムスタンプ
+
+        Returns:
+            タイムスタンプ付きのログファイルパス（圧縮保存する場合は ``.gz`` / ``.xz`` 付き）
+
+        """
+        log_filename = f"act_{timestamp.strftime('%Y%m%d_%H%M%S')}.log"
+        return self.log_dir / compressed_log_name(log_filename, self.compression)
+
+    def register_execution_log(
+        self,
+        execution_result: ExecutionResult,
+        log_path: Path,
+        command_args: dict[str, Any] | None = None,
+        raw_size: int | None = None,
+    ) -> Path:
+        """書き込み済みのログファイルをインデックスに登録
+
+        ストリーミングで直接ディスクへ書き出したログに使用します。
+
+        Args:
+            execution_result: 実行結果
+            log_path: 書き込み済みのログファイルのパス
+            command_args: 実行時のコマンド引数
+            raw_size: 書き込み時に数えた展開後のサイズ（Noneの場合はログファイルから求める）
+
+        Returns:
+            登録されたログファイルのパス
+
+        Raises:
+            ExecutionError: インデックスの更新に失敗した場合
+
+        """
+        try:
+            log_entry = self._create_log_entry(log_path, execution_result, command_args, raw_size)
+
+            # 解析済みの実行結果とともに実行履歴ストアへ追加（旧バージョンのエントリは先に取り込む）
+            history_store = self._get_history_store()
+            if history_store is not None:
+                try:
+                    history_store.add(log_entry, execution_result)
+                except sqlite3.Error as e:
+                    logger.warning(f"実行履歴の記録に失敗しました: {log_path} - {e}")
 
             # ExecutionResultにログパスを設定
             execution_result.log_path = str(log_path)
 
-            return log_path
-
         except Exception as e:
-            path_str = str(log_path) if log_path else "unknown"
             raise ExecutionError(
-                f"ログの保存に失敗しました: {path_str}",
+                f"ログの保存に失敗しました: {log_path}",
                 f"ディスク容量やファイル権限を確認してください: {e}",
             ) from e
 
-    def _update_log_index(
+        # 行・セクションのインデックスは、ログ全体を読み直さないよう初回の参照時（get_log_index）に作成する
+        return log_path
+
+    def _create_log_entry(
         self,
         log_path: Path,
         execution_result: ExecutionResult,
         command_args: dict[str, Any] | None = None,
-    ) -> None:
-        """ログインデックスを更新
+        raw_size: int | None = None,
+    ) -> dict[str, Any]:
+        """ログインデックスに追加するエントリを作成
 
         Args:
             log_path: ログファイルのパス
             execution_result: 実行結果
             command_args: 実行時のコマンド引数
+            raw_size: 展開後のサイズ（Noneの場合はログファイルから求める）
 
-        """
-        # 既存のインデックスを読み込み
-        index_data: dict[str, Any] = self._load_log_index()
+        Returns:
+            ログエントリ
 
-        # 新しいエントリを追加
-        log_entry = {
+        """
+        return {
             "timestamp": execution_result.timestamp.isoformat(),
             "log_file": log_path.name,
             "success": execution_result.success,
@@ -116,49 +205,79 @@ class LogManager:
             ],
             "command_args": command_args or {},
             "file_size": log_path.stat().st_size,
+            "raw_size": raw_size if raw_size is not None else raw_log_size(log_path),
         }
 
-        logs_value = index_data.setdefault("logs", [])
-        if not isinstance(logs_value, list):
-            logs_value = []
-            index_data["logs"] = logs_value
-        logs_list = cast("list[dict[str, Any]]", logs_value)
-        logs_list.append(log_entry)
+    def _get_history_store(self) -> ExecutionHistoryStore | None:
+        """実行履歴ストアを取得
 
-        # 最新の実行情報を更新
-        index_data["last_execution"] = log_entry
+        初回はデータベースを開き、旧バージョンで保存された ``index.json`` のエントリを取り込みます。
+        取り込んだ実行は、初めて実行履歴として参照した時に一度だけ生ログを解析します。
 
-        # インデックスファイルに保存
-        with open(self.index_file, "w", encoding="utf-8") as f:
-            json.dump(index_data, f, indent=2, ensure_ascii=False)
+        Returns:
+            実行履歴ストア（データベースを開けない場合はNoneで、ログディレクトリから一覧を取得する）
 
-    def _load_log_index(self) -> dict[str, Any]:
-        """ログインデックスを読み込み
+        """
+        with self._history_store_lock:
+            if self._history_store is None and not self._history_store_unavailable:
+                try:
+                    store = self._open_history_store()
+                    if not store.is_imported():
+                        imported = store.import_entries(self._load_legacy_index_entries())
+                        if imported:
+                            logger.info(f"旧形式のログインデックスから {imported} 件の実行を実行履歴に取り込みました")
+                    self._history_store = store
+                except (sqlite3.Error, OSError) as e:
+                    logger.warning(f"実行履歴データベースを開けませんでした: {self.history_db_path} - {e}")
+                    self._history_store_unavailable = True
+            return self._history_store
+
+    def _open_history_store(self) -> ExecutionHistoryStore:
+        """実行履歴データベースを開く
+
+        データベースが破損している場合は ``.corrupt`` を付けた名前に退避して作り直します。
 
         Returns:
-            インデックスデータ
+            実行履歴ストア
+
+        Raises:
+            sqlite3.Error: データベースを開けない場合
+            OSError: 破損したデータベースを退避できない場合
 
         """
-        if not self.index_file.exists():
-            return {
-                "version": "1.0",
-                "created": datetime.now().isoformat(),
-                "logs": [],
-                "last_execution": None,
-            }
+        try:
+            return ExecutionHistoryStore(self.history_db_path)
+        except sqlite3.OperationalError:
+            # ロックや権限の問題はデータベースの破損ではない
+            raise
+        except sqlite3.DatabaseError as e:
+            corrupt_path = self.history_db_path.with_name(f"{self.history_db_path.name}.corrupt")
+            logger.warning(f"実行履歴データベースが破損しているため作り直します: {self.history_db_path} - {e}")
+            os.replace(self.history_db_path, corrupt_path)
+            return ExecutionHistoryStore(self.history_db_path)
+
+    def _load_legacy_index_entries(self) -> list[dict[str, Any]]:
+        """旧バージョンの ``index.json`` のログエントリを読み込み
+
+        Returns:
+            ログエントリのリスト（ファイルがない・破損している場合は空）
+
+        """
+        legacy_path = self.log_dir / LEGACY_INDEX_FILENAME
+        if not legacy_path.exists():
+            return []
 
         try:
-            with open(self.index_file, encoding="utf-8") as f:
-                loaded = json.load(f)
-                return cast("dict[str, Any]", loaded)
-        except json.JSONDecodeError, OSError:
-            # 破損したインデックスファイルの場合は新規作成
-            return {
-                "version": "1.0",
-                "created": datetime.now().isoformat(),
-                "logs": [],
-                "last_execution": None,
-            }
+            with open(legacy_path, encoding="utf-8") as f:
+                raw_data = cast(object, json.load(f))
+        except json.JSONDecodeError, OSError, UnicodeDecodeError:
+            logger.warning(f"旧形式のログインデックスを読み込めませんでした: {legacy_path}")
+            return []
+
+        legacy_data = cast("dict[str, Any]", raw_data) if isinstance(raw_data, dict) else {}
+        logs_value = cast(object, legacy_data.get("logs", []))
+        logs_items = cast("list[object]", logs_value) if isinstance(logs_value, list) else []
+        return [cast("dict[str, Any]", entry) for entry in logs_items if isinstance(entry, dict)]
 
     def list_logs(self, limit: int | None = None) -> list[dict[str, Any]]:
         """ログ一覧を取得
@@ -170,16 +289,14 @@ class LogManager:
             ログエントリのリスト（新しい順）
 
         """
-        index_data: dict[str, Any] = self._load_log_index()
-        logs_value = index_data.get("logs", [])
-        logs: list[dict[str, Any]] = []
+        history_store = self._get_history_store()
+        if history_store is not None:
+            logs = history_store.list_entries(limit)
+            if logs:
+                return logs
 
-        if isinstance(logs_value, list):
-            logs = cast("list[dict[str, Any]]", logs_value)
-
-        # インデックスにログがない場合はディレクトリを直接スキャン
-        if not logs:
-            logs = self._load_logs_from_directory()
+        # 登録済みのログがない場合はディレクトリを直接スキャン
+        logs = self._load_logs_from_directory()
 
         # タイムスタンプで降順ソート（新しい順）
         logs.sort(key=lambda x: x["timestamp"], reverse=True)
@@ -201,6 +318,31 @@ class LogManager:
         Raises:
             ExecutionError: ログファイルが見つからない場合
 
+        """
+        with self.open_log_view(log_filename) as view:
+            try:
+                return view.read_text()
+            except Exception as e:
+                raise ExecutionError(
+                    f"ログファイルの読み込みに失敗しました: {log_filename}",
+                    f"ファイル権限を確認してください: {e}",
+                ) from e
+
+    def open_log_view(self, log_filename: str) -> LogView:
+        """ログファイルのビューを開く
+
+        設定 ``log_mmap_threshold_mb`` 以上のログはmmapで開き、全体を読み込まずに走査できます。
+        呼び出し側で ``with`` 文などにより閉じてください。
+
+        Args:
+            log_filename: ログファイル名
+
+        Returns:
+            ログビュー
+
+        Raises:
+            ExecutionError: ログファイルが見つからない・開けない場合
+
         """
         log_path = self.log_dir / log_filename
 
@@ -211,14 +353,35 @@ class LogManager:
             )
 
         try:
-            with open(log_path, encoding="utf-8") as f:
-                return f.read()
+            return LogView.open(log_path, self.config.get("log_mmap_threshold_mb", DEFAULT_MMAP_THRESHOLD_MB))
         except Exception as e:
             raise ExecutionError(
                 f"ログファイルの読み込みに失敗しました: {log_filename}",
                 f"ファイル権限を確認してください: {e}",
             ) from e
 
+    def get_log_index(self, log_filename: str, log_content: str | None = None) -> LogIndex:
+        """ログファイルのインデックスを取得
+
+        保存済みのインデックスが有効であれば読み込み、なければ作成して保存します。
+        ログの保存時にはインデックスを作成しないため、最初の参照時に作成されます。
+
+        Args:
+            log_filename: ログファイル名
+            log_content: 読み込み済みのログ内容（Noneの場合はファイルから読み込み）
+
+        Returns:
+            ログインデックス
+
+        Raises:
+            ExecutionError: ログファイルが見つからない・読み込めない場合
+
+        """
+        if log_content is None:
+            log_content = self.get_log_content(log_filename)
+
+        return LogIndex.for_log_file(self.log_dir / log_filename, log_content)
+
     def get_latest_log(self) -> dict[str, Any] | None:
         """最新のログエントリを取得
 
@@ -226,11 +389,8 @@ class LogManager:
             最新のログエントリ（存在しない場合はNone）
 
         """
-        index_data: dict[str, Any] = self._load_log_index()
-        last_execution = index_data.get("last_execution")
-        if isinstance(last_execution, dict):
-            return cast("dict[str, Any]", last_execution)
-        return None
+        logs = self.list_logs(limit=1)
+        return logs[0] if logs else None
 
     def _load_logs_from_directory(self) -> list[dict[str, Any]]:
         """ログディレクトリからインデックスなしでログを収集"""
@@ -238,7 +398,7 @@ class LogManager:
             return []
 
         log_entries: list[dict[str, Any]] = []
-        for log_path in self.log_dir.glob("*.log"):
+        for log_path in iter_log_files(self.log_dir):
             if not log_path.is_file():
                 continue
 
@@ -258,7 +418,7 @@ class LogManager:
 
     def _extract_timestamp_from_filename(self, log_path: Path) -> str:
         """ログファイル名からタイムスタンプを抽出"""
-        stem = log_path.stem
+        stem = log_path.with_suffix("").stem if is_compressed_log(log_path) else log_path.stem
         if stem.startswith("act_"):
             raw_timestamp = stem[4:]
             for fmt in ("%Y%m%d_%H%M%S", "%Y%m%d%H%M%S"):
@@ -290,6 +450,7 @@ class LogManager:
 
         logs = self.list_logs()
         deleted_count = 0
+        removed_files: set[str] = set()
 
         # 件数制限による削除
         if len(logs) > max_count:
@@ -297,12 +458,12 @@ class LogManager:
             for log_entry in logs_to_delete:
                 log_path = self.log_dir / log_entry["log_file"]
                 if log_path.exists():
-                    log_path.unlink()
+                    self._delete_log_file(log_path)
                     deleted_count += 1
+                removed_files.add(log_entry["log_file"])
 
         # サイズ制限による削除
         total_size = 0
-        remaining_logs: list[dict[str, Any]] = []
 
         for log_entry in logs[:max_count]:
             log_path = self.log_dir / log_entry["log_file"]
@@ -310,49 +471,84 @@ class LogManager:
                 file_size = log_path.stat().st_size
                 if max_size_mb is not None and total_size + file_size > max_size_mb * 1024 * 1024:
                     # サイズ制限を超える場合は削除
-                    log_path.unlink()
+                    self._delete_log_file(log_path)
                     deleted_count += 1
+                    removed_files.add(log_entry["log_file"])
                 else:
                     total_size += file_size
-                    remaining_logs.append(log_entry)
             else:
                 # ファイルが存在しない場合はインデックスから除外
                 deleted_count += 1
+                removed_files.add(log_entry["log_file"])
 
-        # インデックスを更新
-        if deleted_count > 0:
-            index_data = self._load_log_index()
-            index_data["logs"] = remaining_logs
-            if remaining_logs:
-                index_data["last_execution"] = remaining_logs[0]
-            else:
-                index_data["last_execution"] = None
-
-            with open(self.index_file, "w", encoding="utf-8") as f:
-                json.dump(index_data, f, indent=2, ensure_ascii=False)
+        # 実行履歴から削除
+        self.forget_log_files(removed_files)
 
         return deleted_count
 
+    def forget_log_files(self, log_files: Iterable[str]) -> int:
+        """削除されたログファイルの実行を実行履歴から除外
+
+        Args:
+            log_files: ログディレクトリ内のログファイル名
+
+        Returns:
+            除外した実行の件数
+
+        """
+        log_files = list(log_files)
+        if not log_files:
+            return 0
+
+        history_store = self._get_history_store()
+        if history_store is None:
+            return 0
+        return history_store.remove_log_files(log_files)
+
+    def _delete_log_file(self, log_path: Path) -> None:
+        """ログファイルと対応するインデックスファイルを削除"""
+        log_path.unlink()
+        LogIndex.index_path(log_path).unlink(missing_ok=True)
+
     def get_log_statistics(self) -> dict[str, Any]:
         """ログ統計情報を取得
 
+        登録済みの実行は実行履歴ストアで集計し、ログファイルを stat しません。
+        ``total_size_mb`` はディスク上のサイズ、``total_raw_size_mb`` は圧縮保存したログを展開した後のサイズです。
+
         Returns:
             ログ統計情報
 
         """
+        history_store = self._get_history_store()
+        stats = history_store.get_statistics() if history_store is not None else None
+        if stats and stats["count"]:
+            count = stats["count"]
+            return {
+                "total_logs": count,
+                "total_size_mb": round(stats["total_size"] / (1024 * 1024), 2),
+                "total_raw_size_mb": round(stats["total_raw_size"] / (1024 * 1024), 2),
+                "success_rate": round(stats["successes"] / count * 100, 1),
+                "average_duration": round(stats["total_duration"] / count, 2),
+                "latest_execution": stats["latest"],
+            }
+
+        # 登録済みの実行がない場合はディレクトリ内のログから集計
         logs = self.list_logs()
 
         if not logs:
             return {
                 "total_logs": 0,
                 "total_size_mb": 0,
+                "total_raw_size_mb": 0,
                 "success_rate": 0,
                 "average_duration": 0,
             }
 
-        total_size = sum(
-            (self.log_dir / log["log_file"]).stat().st_size for log in logs if (self.log_dir / log["log_file"]).exists()
-        )
+        log_paths = [self.log_dir / log["log_file"] for log in logs]
+        existing_paths = [log_path for log_path in log_paths if log_path.exists()]
+        total_size = sum(log_path.stat().st_size for log_path in existing_paths)
+        total_raw_size = sum(raw_log_size(log_path) for log_path in existing_paths)
 
         successful_logs = [log for log in logs if log["success"]]
         total_duration = sum(log["total_duration"] for log in logs)
@@ -360,6 +556,7 @@ class LogManager:
         return {
             "total_logs": len(logs),
             "total_size_mb": round(total_size / (1024 * 1024), 2),
+            "total_raw_size_mb": round(total_raw_size / (1024 * 1024), 2),
             "success_rate": round(len(successful_logs) / len(logs) * 100, 1) if logs else 0,
             "average_duration": round(total_duration / len(logs), 2) if logs else 0,
             "latest_execution": logs[0]["timestamp"] if logs else None,
@@ -372,18 +569,18 @@ class LogManager:
             workflow_name: ワークフロー名
 
         Returns:
-            該当するログエントリのリスト
+            該当するログエントリのリスト（新しい順）
 
         """
-        logs = self.list_logs()
-        matching_logs: list[dict[str, Any]] = []
+        history_store = self._get_history_store()
+        if history_store is not None:
+            return history_store.find_by_workflow(workflow_name)
 
-        for log in logs:
-            workflows = log.get("workflows", [])
-            if any(w["name"] == workflow_name for w in workflows):
-                matching_logs.append(log)
-
-        return matching_logs
+        return [
+            log
+            for log in self.list_logs()
+            if any(workflow["name"] == workflow_name for workflow in log.get("workflows", []))
+        ]
 
     def get_execution_history(self, limit: int | None = None) -> list[ExecutionResult]:
         """実行履歴をExecutionResultオブジェクトのリストとして取得
@@ -395,18 +592,67 @@ class LogManager:
             ExecutionResultオブジェクトのリスト（新しい順）
 
         """
-        logs = self.list_logs(limit)
-        execution_results: list[ExecutionResult] = []
+        return self._load_execution_results(limit)
 
-        for log_entry in logs:
-            try:
+    def _load_execution_results(
+        self, limit: int | None = None, before: datetime | None = None
+    ) -> list[ExecutionResult]:
+        """実行履歴ストアから実行結果を新しい順に取得
+
+        解析結果が保存されていない実行（index.json から取り込んだ実行）は生ログから復元し、
+        復元した結果をストアに保存します。
+
+        Args:
+            limit: 取得する最大件数（Noneの場合は全て）
+            before: 指定時はこの時刻より前の実行のみ取得
+
+        Returns:
+            ExecutionResultオブジェクトのリスト（新しい順）
+
+        """
+        history_store = self._get_history_store()
+        if history_store is None:
+            return self._restore_execution_results(limit, before)
+
+        execution_results: list[ExecutionResult] = []
+        for execution_id, log_entry, execution_result in history_store.load_executions(limit, before):
+            if execution_result is None:
                 # ログファイルから実行結果を復元
                 execution_result = self._restore_execution_result(log_entry)
-                if execution_result:
-                    execution_results.append(execution_result)
-            except Exception:
-                # 復元に失敗した場合はスキップ
+                if execution_result is None:
+                    # 復元に失敗した場合はスキップ
+                    continue
+                try:
+                    history_store.save_result(execution_id, execution_result)
+                except sqlite3.Error as e:
+                    logger.debug(f"復元した実行結果を保存できませんでした: {log_entry['log_file']} - {e}")
+            execution_results.append(execution_result)
+
+        return execution_results
+
+    def _restore_execution_results(
+        self, limit: int | None = None, before: datetime | None = None
+    ) -> list[ExecutionResult]:
+        """実行履歴ストアを使えない場合に、全ての生ログを解析して実行結果を取得
+
+        Args:
+            limit: 取得する最大件数（Noneの場合は全て）
+            before: 指定時はこの時刻より前の実行のみ取得
+
+        Returns:
+            ExecutionResultオブジェクトのリスト（新しい順）
+
+        """
+        execution_results: list[ExecutionResult] = []
+
+        for log_entry in self.list_logs():
+            # ログファイルから実行結果を復元
+            execution_result = self._restore_execution_result(log_entry)
+            if execution_result is None or (before is not None and not execution_result.timestamp < before):
                 continue
+            execution_results.append(execution_result)
+            if limit is not None and len(execution_results) >= limit:
+                break
 
         return execution_results
 
@@ -426,12 +672,13 @@ class LogManager:
             from ..core.log_analyzer import LogAnalyzer
             from ..core.models import WorkflowResult
 
-            # ログファイルの内容を読み込み
+            # ログファイルの内容とインデックスを読み込み
             log_content = self.get_log_content(log_entry["log_file"])
+            log_index = self.get_log_index(log_entry["log_file"], log_content)
 
             # ログアナライザーで解析
             log_analyzer = LogAnalyzer()
-            execution_result = log_analyzer.analyze_log(log_content)
+            execution_result = log_analyzer.analyze_log(log_content, log_index=log_index)
 
             # メタデータから情報を復元
             execution_result.success = log_entry["success"]
@@ -482,18 +729,8 @@ class LogManager:
             前回のExecutionResult（存在しない場合はNone）
 
         """
-        execution_history = self.get_execution_history()
-
-        if not execution_history:
-            return None
-
-        # 現在のタイムスタンプが指定されている場合は、それより前の実行を検索
-        if current_timestamp:
-            for execution in execution_history:
-                if execution.timestamp < current_timestamp:
-                    return execution
-            return None
-        # 最新の実行を返す
+        # 現在のタイムスタンプが指定されている場合は、それより前の最新の実行を取得
+        execution_history = self._load_execution_results(limit=1, before=current_timestamp)
         return execution_history[0] if execution_history else None
 
     def save_execution_history_metadata(self, execution_result: ExecutionResult) -> None:
@@ -503,15 +740,15 @@ class LogManager:
             execution_result: 実行結果
 
         """
-        # 既存のインデックスを更新（save_execution_logで既に行われているが、追加情報を保存）
-        index_data = self._load_log_index()
-
-        # 最新のエントリを更新
-        if index_data["logs"]:
-            latest_entry = index_data["logs"][-1]
-            if latest_entry["timestamp"] == execution_result.timestamp.isoformat():
-                # 詳細な失敗情報を追加
-                latest_entry["detailed_failures"] = [
+        history_store = self._get_history_store()
+        if history_store is None:
+            return
+
+        # 同じタイムスタンプの最新のエントリに詳細な失敗情報を追加（save_execution_logで登録済みのエントリ）
+        history_store.update_entry(
+            execution_result.timestamp.isoformat(),
+            {
+                "detailed_failures": [
                     {
                         "type": f.type.value,
                         "message": f.message,
@@ -520,10 +757,8 @@ class LogManager:
                     }
                     for f in execution_result.all_failures
                 ]
-
-                # インデックスファイルに保存
-                with open(self.index_file, "w", encoding="utf-8") as f:
-                    json.dump(index_data, f, indent=2, ensure_ascii=False)
+            },
+        )
 
     def compare_with_previous(self, current_result: ExecutionResult) -> dict[str, Any] | None:
         """現在の実行結果を前回と比較
@@ -0,0 +1,263 @@
+"""ログファイルの圧縮保存
+
+設定 ``log_compression`` に応じて実行ログを gzip または lzma で圧縮して保存します。
+圧縮の有無はファイル名の拡張子（``.log.gz`` / ``.log.xz``）で判別するため、
+読み込み側は設定に関係なく、どの形式のログも同じ関数で透過的に読めます。
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import lzma
+import shutil
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+# 指定できる圧縮方式（none: 圧縮しない）
+LOG_COMPRESSIONS = ("none", "gzip", "lzma")
+
+# 圧縮方式ごとのファイル名の拡張子
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "lzma": ".xz"}
+
+# ログディレクトリ内のログファイルのパターン
+LOG_FILE_PATTERNS = ("*.log", "*.log.gz", "*.log.xz")
+
+# gzipの圧縮レベル（既定の9は遅く、ログでは圧縮率の差が小さい）
+_GZIP_COMPRESS_LEVEL = 6
+
+# 展開・コピー時のチャンクサイズ（バイト）
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def resolve_compression(value: Any) -> str:
+    """設定値を圧縮方式に変換
+
+    Args:
+        value: 設定 ``log_compression`` の値
+
+    Returns:
+        圧縮方式（不明な値の場合は ``none``）
+    """
+    if isinstance(value, str) and value.lower() in LOG_COMPRESSIONS:
+        return value.lower()
+    return "none"
+
+
+def compressed_log_name(log_filename: str, compression: str) -> str:
+    """圧縮方式に応じたログファイル名を取得
+
+    Args:
+        log_filename: 圧縮しない場合のログファイル名
+        compression: 圧縮方式
+
+    Returns:
+        ログファイル名
+    """
+    return log_filename + COMPRESSION_SUFFIXES.get(compression, "")
+
+
+def is_compressed_log(path: Path) -> bool:
+    """圧縮されたログファイルかどうか"""
+    return path.suffix in (".gz", ".xz")
+
+
+def open_log_text(path: Path, mode: str = "r", errors: str = "strict") -> IO[str]:
+    """ログファイルをテキストとして開く
+
+    拡張子が ``.gz`` / ``.xz`` の場合は展開・圧縮しながら読み書きします。
+
+    Args:
+        path: ログファイルのパス
+        mode: ``r``（読み込み）、``w``（書き込み）、``a``（追記）のいずれか
+        errors: デコードエラーの扱い
+
+    Returns:
+        テキストストリーム
+    """
+    # gzip.open / lzma.open の文字列のモードでは戻り値の型が定まらないため、圧縮ファイルを直接ラップする
+    if path.suffix == ".gz":
+        binary = gzip.GzipFile(path, mode, compresslevel=_GZIP_COMPRESS_LEVEL)
+        return io.TextIOWrapper(binary, encoding="utf-8", errors=errors)
+    if path.suffix == ".xz":
+        return io.TextIOWrapper(lzma.LZMAFile(path, mode), encoding="utf-8", errors=errors)
+    return open(path, mode, encoding="utf-8", errors=errors)
+
+
+class _ByteCountingStream(io.BufferedIOBase):
+    """書き込んだバイト数を数えながら別のバイナリストリームへ書き込むストリーム"""
+
+    def __init__(self, target: io.BufferedIOBase):
+        self._target = target
+        self.bytes_written = 0
+
+    @property
+    def name(self) -> Any:
+        """書き込み先のファイル名"""
+        return getattr(self._target, "name", None)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any, /) -> int:
+        size = len(memoryview(data).cast("B"))
+        self._target.write(data)
+        self.bytes_written += size
+        return size
+
+    def flush(self) -> None:
+        self._target.flush()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            super().close()
+        finally:
+            self._target.close()
+
+
+class LogTextWriter(io.TextIOWrapper):
+    """展開後のバイト数を数えながら圧縮ログを書き込むテキストストリーム"""
+
+    def __init__(self, counter: _ByteCountingStream):
+        super().__init__(counter, encoding="utf-8")
+        self._counter = counter
+
+    @property
+    def raw_size(self) -> int:
+        """書き込んだ展開後のバイト数（flush・close後に確定）"""
+        return self._counter.bytes_written
+
+
+def open_log_writer(path: Path) -> IO[str]:
+    """ログファイルを書き込み用に開く
+
+    拡張子が ``.gz`` / ``.xz`` の場合は展開後のバイト数を数えながら圧縮して書き込むため、
+    保存後にログを展開し直さずに :func:`written_log_size` で展開後のサイズを取得できます。
+
+    Args:
+        path: ログファイルのパス
+
+    Returns:
+        テキストストリーム
+    """
+    if path.suffix == ".gz":
+        return LogTextWriter(_ByteCountingStream(gzip.GzipFile(path, "wb", compresslevel=_GZIP_COMPRESS_LEVEL)))
+    if path.suffix == ".xz":
+        return LogTextWriter(_ByteCountingStream(lzma.LZMAFile(path, "wb")))
+    return open(path, "w", encoding="utf-8")
+
+
+def written_log_size(stream: IO[str], path: Path) -> int:
+    """:func:`open_log_writer` で書き込み終えたログの展開後のサイズを取得
+
+    Args:
+        stream: 書き込みに使用した（閉じた）ストリーム
+        path: ログファイルのパス
+
+    Returns:
+        展開後のサイズ（バイト、非圧縮のログはファイルサイズ）
+    """
+    if isinstance(stream, LogTextWriter):
+        return stream.raw_size
+    return path.stat().st_size
+
+
+def open_log_binary(path: Path) -> io.BufferedIOBase:
+    """ログファイルを展開後のバイト列として読み込み用に開く
+
+    Args:
+        path: ログファイルのパス
+
+    Returns:
+        バイナリストリーム
+    """
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".xz":
+        return lzma.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_log_text(path: Path) -> str:
+    """ログファイル全体を展開して読み込み
+
+    Args:
+        path: ログファイルのパス
+
+    Returns:
+        ログの内容
+
+    Raises:
+        OSError: ファイルを読み込めない場合
+        UnicodeDecodeError: UTF-8としてデコードできない場合
+    """
+    if not is_compressed_log(path):
+        return path.read_text(encoding="utf-8")
+    with open_log_text(path) as f:
+        return f.read()
+
+
+def raw_log_size(path: Path) -> int:
+    """展開後のログのサイズを取得
+
+    圧縮されたログはストリーミングで展開して数えます。
+    保存したログの展開後のサイズは書き込み時に数えて実行履歴に記録するため、
+    これは記録のないログにのみ使用します。
+
+    Args:
+        path: ログファイルのパス
+
+    Returns:
+        展開後のサイズ（バイト）
+    """
+    if not is_compressed_log(path):
+        return path.stat().st_size
+
+    total = 0
+    with open_log_binary(path) as f:
+        while chunk := f.read(_COPY_CHUNK_SIZE):
+            total += len(chunk)
+    return total
+
+
+def compress_log_file(path: Path, compression: str) -> Path:
+    """既存の非圧縮ログファイルを圧縮して置き換える
+
+    Args:
+        path: 非圧縮のログファイルのパス
+        compression: 圧縮方式
+
+    Returns:
+        圧縮後のログファイルのパス（圧縮しない場合は元のパス）
+    """
+    if compression not in COMPRESSION_SUFFIXES or is_compressed_log(path):
+        return path
+
+    compressed_path = path.with_name(compressed_log_name(path.name, compression))
+    temp_path = compressed_path.with_name(f".{compressed_path.name}.tmp")
+    opener = gzip.open if compression == "gzip" else lzma.open
+    try:
+        with open(path, "rb") as source, opener(temp_path, "wb") as target:
+            shutil.copyfileobj(source, target, _COPY_CHUNK_SIZE)
+        temp_path.replace(compressed_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    path.unlink()
+    return compressed_path
+
+
+def iter_log_files(log_dir: Path) -> Iterator[Path]:
+    """ログディレクトリ内のログファイル（圧縮済みを含む）を列挙
+
+    Args:
+        log_dir: ログディレクトリ
+
+    Yields:
+        ログファイルのパス
+    """
+    for pattern in LOG_FILE_PATTERNS:
+        yield from log_dir.glob(pattern)
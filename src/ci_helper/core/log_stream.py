@@ -0,0 +1,340 @@
+"""act出力のストリーミング取り込み
+
+actの出力を行単位でログファイルへ書き出しながら、同時に失敗検出を行います。
+出力全体をメモリに保持しないため、ログサイズに関わらずメモリ使用量が一定に保たれます。
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import shutil
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import TextIO
+
+from ..core.log_extractor import PATTERN_ORDER, LogExtractor
+from ..core.log_storage import open_log_writer, written_log_size
+from ..core.models import Failure
+
+logger = logging.getLogger(__name__)
+
+_STACK_TRACE_START = re.compile(r"^Traceback \(most recent call last\):")
+_STACK_TRACE_LINE = re.compile(r'^\s*(?:at\s+|File\s+".*", line \d+)')
+
+
+class StreamingFailureDetector:
+    """行単位で失敗を検出するクラス
+
+    LogExtractorと同じエラーパターンを使用し、ログ全体を保持せずに
+    前後のコンテキスト行とスタックトレースを収集します。
+    """
+
+    def __init__(self, extractor: LogExtractor | None = None, max_failures: int = 200):
+        """ストリーミング失敗検出器を初期化
+
+        Args:
+            extractor: パターン定義を提供するログ抽出器（Noneの場合は新規作成）
+            max_failures: 保持する失敗の最大数（メモリ使用量の上限）
+
+        """
+        self.extractor = extractor or LogExtractor()
+        self.context_lines = self.extractor.context_lines
+        self.max_failures = max_failures
+
+        self._ordered_patterns = [
+            (failure_type, self.extractor.error_patterns[failure_type])
+            for failure_type in PATTERN_ORDER
+            if failure_type in self.extractor.error_patterns
+        ]
+        # 全パターンの和集合（大文字小文字を無視するため各パターンの上位集合）で事前判定する
+        self._prefilter = re.compile(
+            "|".join(f"(?:{pattern.pattern})" for _, patterns in self._ordered_patterns for pattern in patterns),
+            re.IGNORECASE,
+        )
+
+        self._before: deque[str] = deque(maxlen=self.context_lines)
+        self._pending: list[tuple[Failure, int]] = []
+        self._stack_lines: list[str] = []
+        self._last_stack_trace: str | None = None
+        self._lines_since_stack = 0
+        self._seen: set[tuple[str, str | None, int | None]] = set()
+        self.failures: list[Failure] = []
+        self.line_count = 0
+
+    def feed(self, line: str) -> None:
+        """1行を処理
+
+        Args:
+            line: 改行を含まないログ行
+
+        """
+        self.line_count += 1
+
+        # 保留中の失敗に後続コンテキストを追加
+        if self._pending:
+            still_pending: list[tuple[Failure, int]] = []
+            for failure, remaining in self._pending:
+                failure.context_after.append(line)
+                if remaining > 1:
+                    still_pending.append((failure, remaining - 1))
+            self._pending = still_pending
+
+        self._track_stack_trace(line)
+
+        if len(self.failures) < self.max_failures and self._prefilter.search(line):
+            self._match_line(line)
+
+        self._before.append(line)
+
+    def close(self) -> list[Failure]:
+        """ストリームの終端を処理して検出結果を返す
+
+        Returns:
+            検出された失敗のリスト
+
+        """
+        self._finish_stack_trace()
+        self._pending = []
+        return self.failures
+
+    def _match_line(self, line: str) -> None:
+        """行をエラーパターンと照合して失敗を記録"""
+        for failure_type, patterns in self._ordered_patterns:
+            for pattern in patterns:
+                match = pattern.search(line)
+                if not match:
+                    continue
+
+                message = (match.group(1) if match.groups() else match.group(0)).strip()
+                file_path, file_line = self.extractor.extract_file_info(message)
+                key = (message, file_path, file_line)
+                if key in self._seen:
+                    continue
+                self._seen.add(key)
+
+                failure = Failure(
+                    type=failure_type,
+                    message=message,
+                    file_path=file_path,
+                    line_number=file_line,
+                    context_before=list(self._before),
+                    context_after=[],
+                    stack_trace=self._current_stack_trace(),
+                )
+                self.failures.append(failure)
+                if self.context_lines > 0:
+                    self._pending.append((failure, self.context_lines))
+                if len(self.failures) >= self.max_failures:
+                    return
+
+    def _track_stack_trace(self, line: str) -> None:
+        """スタックトレースの行を追跡"""
+        if _STACK_TRACE_START.match(line):
+            self._finish_stack_trace()
+            self._stack_lines = [line]
+            return
+
+        if self._stack_lines:
+            if _STACK_TRACE_LINE.match(line) or line.startswith("    "):
+                self._stack_lines.append(line)
+                return
+            self._finish_stack_trace()
+
+        self._lines_since_stack += 1
+
+    def _finish_stack_trace(self) -> None:
+        """収集中のスタックトレースを確定"""
+        if self._stack_lines:
+            self._last_stack_trace = "\n".join(self._stack_lines)
+            self._stack_lines = []
+            self._lines_since_stack = 0
+
+    def _current_stack_trace(self) -> str | None:
+        """直前に出現したスタックトレースを取得（コンテキスト範囲内のもののみ）"""
+        if self._stack_lines:
+            return "\n".join(self._stack_lines)
+        if self._last_stack_trace and self._lines_since_stack <= max(self.context_lines, 1):
+            return self._last_stack_trace
+        return None
+
+
+class ActLogWriter:
+    """単一ワークフローのact出力を受け取るシンク
+
+    受け取った行をファイルへ書き出し、任意でコンソールへ転送し、失敗検出器へ渡します。
+    メモリには末尾の数行のみを保持します。
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        echo: Callable[[str], None] | None = None,
+        detector: StreamingFailureDetector | None = None,
+        tail_lines: int = 100,
+    ):
+        """ログライターを初期化
+
+        Args:
+            stream: 書き出し先のテキストストリーム（Noneの場合は保存しない）
+            echo: 各行を受け取るコールバック（コンソール表示用）
+            detector: 失敗検出器（Noneの場合は新規作成）
+            tail_lines: メモリに保持する末尾の行数
+
+        """
+        self.stream = stream
+        self.echo = echo
+        self.detector = detector or StreamingFailureDetector()
+        self._tail: deque[str] = deque(maxlen=tail_lines)
+        self.line_count = 0
+
+    def write_line(self, line: str) -> None:
+        """1行を書き込み
+
+        Args:
+            line: ログ行（末尾の改行は除去される）
+
+        """
+        line = line.rstrip("\r\n")
+        self.line_count += 1
+
+        if self.stream is not None:
+            self.stream.write(line)
+            self.stream.write("\n")
+
+        if self.echo is not None:
+            try:
+                self.echo(line)
+            except Exception as e:
+                # 表示の失敗でログ取り込みを止めない
+                logger.debug(f"出力の表示に失敗しました: {e}")
+                self.echo = None
+
+        self.detector.feed(line)
+        self._tail.append(line)
+
+    def write(self, text: str) -> None:
+        """複数行のテキストを書き込み
+
+        Args:
+            text: 書き込むテキスト
+
+        """
+        for line in text.splitlines():
+            self.write_line(line)
+
+    @property
+    def tail(self) -> str:
+        """保持している末尾の出力"""
+        return "\n".join(self._tail)
+
+    def finish(self) -> list[Failure]:
+        """出力の終端を処理して検出された失敗を返す
+
+        Returns:
+            検出された失敗のリスト
+
+        """
+        if self.stream is not None and not self.stream.closed:
+            self.stream.flush()
+        return self.detector.close()
+
+    def close(self) -> None:
+        """書き出し先のストリームを閉じる"""
+        if self.stream is not None and not self.stream.closed:
+            self.stream.close()
+
+
+class ActLogCollector:
+    """複数ワークフローの出力を1つのログファイルにまとめるクラス
+
+    各ワークフローの出力は個別の一時ファイルへストリーミングされ、
+    全ワークフローの完了後に実行順に関係なくワークフロー順で結合されます。
+    """
+
+    def __init__(
+        self,
+        log_path: Path | None,
+        echo: Callable[[str], None] | None = None,
+        context_lines: int = 3,
+    ):
+        """ログコレクターを初期化
+
+        Args:
+            log_path: 結合後のログファイルのパス（Noneの場合はログを保存しない）
+            echo: 各行を受け取るコールバック（コンソール表示用）
+            context_lines: 失敗前後に取得するコンテキスト行数
+
+        """
+        self.log_path = log_path
+        self.echo = echo
+        self.context_lines = context_lines
+        self._writers: dict[int, ActLogWriter] = {}
+        self._part_paths: dict[int, Path] = {}
+        # 結合後のログの展開後のサイズ（finalize後に確定）
+        self.raw_size: int | None = None
+        self._extractor = LogExtractor(context_lines=context_lines)
+
+    def open_writer(self, index: int) -> ActLogWriter:
+        """ワークフロー用のログライターを作成
+
+        Args:
+            index: ワークフローの順序（結合時の並び順）
+
+        Returns:
+            ログライター
+
+        """
+        stream: TextIO | None = None
+        if self.log_path is not None:
+            part_path = self.log_path.with_name(f".{self.log_path.name}.{index}.part")
+            # finalize/discard で閉じる
+            stream = open(part_path, "w", encoding="utf-8")
+            self._part_paths[index] = part_path
+
+        writer = ActLogWriter(
+            stream=stream,
+            echo=self.echo,
+            detector=StreamingFailureDetector(self._extractor),
+        )
+        self._writers[index] = writer
+        return writer
+
+    def finalize(self) -> Path | None:
+        """一時ファイルをワークフロー順に結合してログファイルを作成
+
+        Returns:
+            作成されたログファイルのパス（保存しない場合はNone）
+
+        """
+        for writer in self._writers.values():
+            writer.close()
+
+        if self.log_path is None:
+            return None
+
+        # ログファイルの拡張子に応じて圧縮しながら結合する
+        with open_log_writer(self.log_path) as output:
+            for index in sorted(self._part_paths):
+                with open(self._part_paths[index], encoding="utf-8") as part:
+                    shutil.copyfileobj(part, output)
+
+        self.raw_size = written_log_size(output, self.log_path)
+        self._remove_parts()
+        return self.log_path
+
+    def discard(self) -> None:
+        """書き込み途中の一時ファイルを破棄"""
+        for writer in self._writers.values():
+            writer.close()
+        self._remove_parts()
+
+    def _remove_parts(self) -> None:
+        """一時ファイルを削除"""
+        for part_path in self._part_paths.values():
+            try:
+                part_path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"一時ログファイルの削除に失敗しました: {part_path} - {e}")
+        self._part_paths.clear()
@@ -0,0 +1,197 @@
+"""ログテンプレートの抽出（Drain方式のオンラインクラスタリング）
+
+ログの行を、値が変わる部分を ``<*>`` に置き換えたテンプレートにまとめます。
+行はトークン数と先頭のトークンで固定の深さの木を辿ってから、葉のテンプレートと
+トークン単位の類似度で比較するため、1行あたりの処理時間はログ全体の大きさに依存せず、
+ストリーミングで読み込んだ行を線形時間でまとめられます。
+"""
+
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+# テンプレートの可変部分
+WILDCARD = "<*>"
+
+# 数字を含むトークン（値である可能性が高い）
+_DIGIT_PATTERN = re.compile(r"\d")
+
+# 同じテンプレートとみなすトークンの一致率
+DEFAULT_SIMILARITY_THRESHOLD = 0.5
+
+# 解析木の深さ（トークン数の層と葉を含む。先頭の depth - 2 トークンで分岐する）
+DEFAULT_DEPTH = 4
+
+# 解析木の1ノードあたりの子の最大数（超えた分は ``<*>`` の子にまとめる）
+DEFAULT_MAX_CHILDREN = 100
+
+# 保持するテンプレートの最大数（超えた場合は最も長く使われていないものから捨てる）
+DEFAULT_MAX_TEMPLATES = 10_000
+
+# テンプレートごとに保持するサンプル行の数
+MAX_SAMPLES = 3
+
+
+@dataclass
+class LogTemplate:
+    """ログテンプレート"""
+
+    template_id: int
+    tokens: list[str]
+    count: int = 0
+    samples: list[list[str]] = field(default_factory=list)
+    revision: int = 0  # テンプレートまたはサンプルが変わるたびに増える
+
+    @property
+    def template(self) -> str:
+        """テンプレート文字列"""
+        return " ".join(self.tokens)
+
+    def sample_values(self) -> list[str]:
+        """サンプル行の可変部分の値（重複を除く）"""
+        values: list[str] = []
+        for sample in self.samples:
+            value = " ".join(token for token, slot in zip(sample, self.tokens, strict=True) if slot == WILDCARD)
+            if value and value not in values:
+                values.append(value)
+        return values
+
+    def summary(self, count: int | None = None, max_length: int | None = None) -> str:
+        """「テンプレート × 件数 + サンプルの値」の要約
+
+        Args:
+            count: 表示する件数（Noneの場合はテンプレートにまとめた行数）
+            max_length: テンプレート部分の最大長（Noneの場合は短縮しない）
+
+        Returns:
+            要約文字列
+
+        """
+        count = self.count if count is None else count
+        template = self.template
+        if max_length is not None and len(template) > max_length:
+            template = template[:max_length] + "..."
+        summary = f"{template} (repeated {count} times"
+        values = self.sample_values()
+        if values:
+            summary += "; e.g. " + " | ".join(values)
+        return summary + ")"
+
+
+class LogTemplateMiner:
+    """Drain方式のログテンプレート抽出器"""
+
+    def __init__(
+        self,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        depth: int = DEFAULT_DEPTH,
+        max_children: int = DEFAULT_MAX_CHILDREN,
+        max_templates: int = DEFAULT_MAX_TEMPLATES,
+    ):
+        """テンプレート抽出器を初期化
+
+        Args:
+            similarity_threshold: 同じテンプレートとみなすトークンの一致率
+            depth: 解析木の深さ（3以上）
+            max_children: 解析木の1ノードあたりの子の最大数
+            max_templates: 保持するテンプレートの最大数
+
+        """
+        self.similarity_threshold = similarity_threshold
+        self.prefix_tokens = max(depth - 2, 1)
+        self.max_children = max_children
+        self.max_templates = max_templates
+        # 解析木のノードは (トークン数, 先頭トークン...) のタプルで表し、葉にテンプレートのリストを持つ
+        self._nodes: set[tuple[int | str, ...]] = set()
+        self._child_counts: dict[tuple[int | str, ...], int] = {}
+        self._leaf_lists: dict[tuple[int | str, ...], list[LogTemplate]] = {}
+        self._leaves: dict[int, list[LogTemplate]] = {}
+        self._templates: OrderedDict[int, LogTemplate] = OrderedDict()
+        self._next_id = 1
+
+    @property
+    def templates(self) -> list[LogTemplate]:
+        """保持しているテンプレート（まとめた行数の多い順）"""
+        return sorted(self._templates.values(), key=lambda template: template.count, reverse=True)
+
+    def add(self, line: str) -> LogTemplate:
+        """行をテンプレートにまとめる
+
+        Args:
+            line: ログの行
+
+        Returns:
+            行をまとめたテンプレート（必要に応じて可変部分を広げたもの、または新しいテンプレート）
+
+        """
+        tokens = line.split()
+        leaf = self._find_leaf(tokens)
+
+        template = self._best_match(leaf, tokens)
+        if template is None:
+            template = LogTemplate(template_id=self._next_id, tokens=list(tokens))
+            self._next_id += 1
+            leaf.append(template)
+            self._leaves[template.template_id] = leaf
+            self._templates[template.template_id] = template
+            if len(self._templates) > self.max_templates:
+                self._discard_oldest()
+        else:
+            for position, token in enumerate(tokens):
+                if template.tokens[position] not in (token, WILDCARD):
+                    template.tokens[position] = WILDCARD
+                    template.revision += 1
+            self._templates.move_to_end(template.template_id)
+
+        template.count += 1
+        if len(template.samples) < MAX_SAMPLES:
+            template.samples.append(tokens)
+            template.revision += 1
+        return template
+
+    def _find_leaf(self, tokens: list[str]) -> list[LogTemplate]:
+        """解析木を辿ってテンプレートのリスト（葉）を取得（なければ作成）"""
+        path: tuple[int | str, ...] = (len(tokens),)
+        for token in tokens[: self.prefix_tokens]:
+            # 数字を含むトークンは値である可能性が高いため <*> の子にまとめる
+            child = (*path, WILDCARD if _DIGIT_PATTERN.search(token) else token)
+            if child not in self._nodes:
+                # 子が多すぎるノードでは、新しいトークンを <*> の子にまとめる
+                if self._child_counts.get(path, 0) >= self.max_children:
+                    child = (*path, WILDCARD)
+                if child not in self._nodes:
+                    self._nodes.add(child)
+                    self._child_counts[path] = self._child_counts.get(path, 0) + 1
+            path = child
+        return self._leaf_lists.setdefault(path, [])
+
+    def _best_match(self, leaf: list[LogTemplate], tokens: list[str]) -> LogTemplate | None:
+        """葉の中で最も類似度の高いテンプレートを取得（閾値未満の場合はNone）
+
+        可変部分は一致として数えます（可変部分の多いテンプレートが新しい行とまとまらなくなるのを防ぐ）。
+        類似度が同じ場合は可変部分の多いテンプレートを優先します。
+        """
+        best: LogTemplate | None = None
+        best_key = (-1.0, -1)
+        for template in leaf:
+            same = 0
+            wildcards = 0
+            for slot, token in zip(template.tokens, tokens, strict=True):
+                if slot == WILDCARD:
+                    wildcards += 1
+                    same += 1
+                elif slot == token:
+                    same += 1
+            similarity = same / len(tokens) if tokens else 1.0
+            if similarity >= self.similarity_threshold and (similarity, wildcards) > best_key:
+                best = template
+                best_key = (similarity, wildcards)
+        return best
+
+    def _discard_oldest(self) -> None:
+        """最も長く使われていないテンプレートを捨てる"""
+        template_id, template = self._templates.popitem(last=False)
+        leaf = self._leaves.pop(template_id)
+        leaf.remove(template)
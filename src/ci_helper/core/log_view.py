@@ -0,0 +1,277 @@
+"""メモリマップによるログビュー
+
+大きなログファイルをmmapで読み取り専用にマップし、Pythonの ``str`` へ全体を
+デコードせずにバイト列のまま正規表現で走査できるようにします。
+マッチした範囲と前後のコンテキストのみをデコードするため、数百MBのログでも
+メモリ使用量がファイルサイズの数倍に膨らむことがありません。
+
+しきい値未満の小さなファイルは通常どおりメモリへ読み込み、既存の文字列処理を使用します。
+圧縮されたログは一時ファイルへストリーミングで展開してから同じように扱います。
+"""
+
+from __future__ import annotations
+
+import mmap
+import shutil
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+
+from .log_storage import is_compressed_log, open_log_binary
+
+# mmapを使用する最小ファイルサイズ（これ未満は文字列として処理する）
+DEFAULT_MMAP_THRESHOLD_MB = 64
+
+# 行番号計算用のチェックポイント間隔（バイト）
+_CHECKPOINT_INTERVAL = 1024 * 1024
+
+
+class LogView:
+    """ログファイルの読み取り専用ビュー
+
+    位置はすべてバイト単位で扱います。デコードは UTF-8 で行い、
+    部分的なデコードで不正なバイト列が現れた場合は置換文字に置き換えます。
+    """
+
+    def __init__(self, data: bytes | mmap.mmap, path: Path | None = None, encoding: str = "utf-8"):
+        """ログビューを作成
+
+        Args:
+            data: ログのバイト列またはメモリマップ
+            path: ログファイルのパス
+            encoding: ログの文字エンコーディング
+
+        """
+        self.data = data
+        self.path = path
+        self.encoding = encoding
+        self._checkpoints: list[int] | None = None
+
+    @classmethod
+    def open(cls, path: Path, mmap_threshold_mb: float = DEFAULT_MMAP_THRESHOLD_MB) -> LogView:
+        """ログファイルを開く
+
+        Args:
+            path: ログファイルのパス
+            mmap_threshold_mb: mmapを使用する最小ファイルサイズ（MB）
+
+        Returns:
+            ログビュー
+
+        Raises:
+            OSError: ファイルを開けない場合
+
+        """
+        if is_compressed_log(path):
+            return cls._open_compressed(path, mmap_threshold_mb)
+
+        size = path.stat().st_size
+        if size == 0 or size < mmap_threshold_mb * 1024 * 1024:
+            return cls(path.read_bytes(), path)
+
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, path)
+
+    @classmethod
+    def _open_compressed(cls, path: Path, mmap_threshold_mb: float) -> LogView:
+        """圧縮されたログファイルを開く
+
+        展開結果をチャンクごとに一時ファイルへ書き出し、しきい値以上であれば一時ファイルをmmapします。
+        展開後の全体をPythonのバイト列として保持しないため、大きなログでもメモリ使用量は増えません。
+        """
+        with tempfile.TemporaryFile() as temp_file:
+            with open_log_binary(path) as source:
+                shutil.copyfileobj(source, temp_file, _CHECKPOINT_INTERVAL)
+            size = temp_file.tell()
+            temp_file.seek(0)
+            if size == 0 or size < mmap_threshold_mb * 1024 * 1024:
+                return cls(temp_file.read(), path)
+            # マップは一時ファイルを閉じた後も有効（ファイルは閉じた時点で削除される）
+            mapped = mmap.mmap(temp_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, path)
+
+    def __enter__(self) -> LogView:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """マップを解放"""
+        if isinstance(self.data, mmap.mmap) and not self.data.closed:
+            self.data.close()
+
+    @property
+    def is_mapped(self) -> bool:
+        """mmapで開かれているか（Falseの場合は文字列処理へフォールバックする）"""
+        return isinstance(self.data, mmap.mmap)
+
+    @property
+    def size(self) -> int:
+        """ログのサイズ（バイト）"""
+        return len(self.data)
+
+    def read_text(self) -> str:
+        """ログ全体をデコード
+
+        mmapの場合はバイト列のコピーを作らずにデコードするため、
+        ファイル全体の読み込みとデコードで一時的にメモリが倍増することがありません。
+
+        Returns:
+            ログの内容
+
+        Raises:
+            UnicodeDecodeError: ログが指定のエンコーディングでデコードできない場合
+
+        """
+        if not self.is_mapped:
+            return bytes(self.data).decode(self.encoding)
+        with memoryview(self.data) as buffer:
+            return str(buffer, self.encoding)
+
+    def decode(self, start: int, end: int) -> str:
+        """範囲をデコード
+
+        Args:
+            start: 開始位置（バイト）
+            end: 終了位置（バイト）
+
+        Returns:
+            デコードした文字列
+
+        """
+        return self.data[max(0, start) : min(self.size, end)].decode(self.encoding, errors="replace")
+
+    def line_bounds(self, position: int) -> tuple[int, int]:
+        """位置を含む行の範囲を取得
+
+        Args:
+            position: バイト位置
+
+        Returns:
+            (行の開始位置, 行末の改行の位置) のタプル
+
+        """
+        start = self.data.rfind(b"\n", 0, position) + 1
+        end = self.data.find(b"\n", position)
+        if end == -1:
+            end = self.size
+        return start, end
+
+    def span_is_blank(self, start: int, end: int) -> bool:
+        """範囲が空白文字のみかどうかを判定
+
+        Args:
+            start: 開始位置（バイト）
+            end: 終了位置（バイト）
+
+        Returns:
+            空または空白のみの場合True
+
+        """
+        return not self.data[start:end].strip()
+
+    def line_text(self, start: int, end: int) -> str:
+        """行の内容をデコード（行末の ``\\r`` は除去）
+
+        Args:
+            start: 行の開始位置（バイト）
+            end: 行末の位置（バイト）
+
+        Returns:
+            行の内容
+
+        """
+        if end > start and self.data[end - 1 : end] == b"\r":
+            end -= 1
+        return self.decode(start, end)
+
+    def context_lines(self, position: int, before: int, after: int) -> tuple[list[str], list[str]]:
+        """位置を含む行の前後の行を取得
+
+        Args:
+            position: バイト位置
+            before: 前に取得する行数
+            after: 後に取得する行数
+
+        Returns:
+            (前の行のリスト, 後の行のリスト) のタプル
+
+        """
+        line_start, line_end = self.line_bounds(position)
+
+        context_before: list[str] = []
+        start = line_start
+        while len(context_before) < before and start > 0:
+            previous_start, previous_end = self.line_bounds(start - 1)
+            context_before.append(self.line_text(previous_start, previous_end))
+            start = previous_start
+        context_before.reverse()
+
+        context_after: list[str] = []
+        end = line_end
+        # 末尾の改行の後ろは行として数えない（str.splitlines と同じ扱い）
+        while len(context_after) < after and end + 1 < self.size:
+            next_start, next_end = self.line_bounds(end + 1)
+            context_after.append(self.line_text(next_start, next_end))
+            end = next_end
+
+        return context_before, context_after
+
+    def line_number(self, position: int) -> int:
+        """位置を含む行の行番号を取得
+
+        初回呼び出し時に一定間隔ごとの改行数を数えたチェックポイントを作成し、
+        以降はチェックポイントからの差分のみを数えます。
+
+        Args:
+            position: バイト位置
+
+        Returns:
+            行番号（1ベース）
+
+        """
+        if self._checkpoints is None:
+            self._checkpoints = self._build_checkpoints()
+
+        block = min(position // _CHECKPOINT_INTERVAL, len(self._checkpoints) - 1)
+        block_start = block * _CHECKPOINT_INTERVAL
+        return self._checkpoints[block] + self.data[block_start:position].count(b"\n") + 1
+
+    def _build_checkpoints(self) -> list[int]:
+        """各ブロック先頭までの改行数を計算"""
+        checkpoints = [0]
+        newline_count = 0
+        for block_start in range(0, self.size, _CHECKPOINT_INTERVAL):
+            block_end = min(self.size, block_start + _CHECKPOINT_INTERVAL)
+            if block_end >= self.size:
+                break
+            newline_count += self.data[block_start:block_end].count(b"\n")
+            checkpoints.append(newline_count)
+        return checkpoints
+
+    def iter_lowered_blocks(self, overlap: int, block_size: int = 8 * 1024 * 1024) -> Iterator[tuple[int, int, bytes]]:
+        """ASCII小文字化したブロックを順に取得
+
+        キーワード検索用に、ブロック境界をまたぐ出現を見逃さないよう
+        ``overlap`` バイトだけ次のブロックと重ねて返します。
+
+        Args:
+            overlap: 次のブロックと重ねるバイト数
+            block_size: ブロックサイズ（バイト）
+
+        Yields:
+            (ブロックの開始位置, 重複なしで担当する範囲の終了位置, 小文字化したバイト列) のタプル
+
+        """
+        for block_start in range(0, self.size, block_size):
+            owned_end = min(self.size, block_start + block_size)
+            block = self.data[block_start : min(self.size, owned_end + overlap)]
+            yield block_start, owned_end, block.lower()
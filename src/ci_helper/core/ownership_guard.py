@@ -0,0 +1,220 @@
+"""act実行時のファイル所有権ガード
+
+actのコンテナがroot権限でプロジェクトにファイルを書き込むと、ホスト側で
+所有者がrootのファイルが残ります。ここでは実行の前後でプロジェクト全体を
+走査する代わりに、実行中に変更されたディレクトリだけを調べて所有権を戻します。
+
+ファイルの作成・置き換え・削除は親ディレクトリの更新時刻を変えるため、
+更新時刻が実行開始より古いディレクトリ内のファイルは stat せずに済みます。
+``.git`` や ``node_modules`` などの無視対象のディレクトリは、そのディレクトリ自体が
+実行中に更新された場合にだけ中を調べます。
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 常に無視対象とするディレクトリ名
+DEFAULT_IGNORED_NAMES = frozenset(
+    {
+        ".git",
+        "node_modules",
+        ".venv",
+        "venv",
+        "__pycache__",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+    }
+)
+
+# ファイルシステムのタイムスタンプ精度の差を吸収するための余裕（秒）
+_TIMESTAMP_SLACK_SECONDS = 2.0
+
+
+@dataclass
+class OwnershipScanStats:
+    """所有権チェックの統計"""
+
+    directories_scanned: int = 0  # 走査したディレクトリ数
+    directories_pruned: int = 0  # 無視対象のため中を調べなかったディレクトリ数
+    entries_checked: int = 0  # 所有者を確認したファイル・ディレクトリ数
+    paths_restored: int = 0  # 所有権を戻したパス数
+    failures: int = 0  # 所有権を戻せなかったパス数
+    scan_seconds: float = 0.0  # 走査にかかった時間（秒）
+    chown_seconds: float = 0.0  # 所有権の変更にかかった時間（秒）
+
+
+class OwnershipGuard:
+    """act実行中に所有者が変わったファイルを検出して元に戻すガード
+
+    所有者はプロジェクトルートの実行前の所有者に揃えます。実行前から別の所有者だった
+    ファイルは、実行中に更新されない限り変更しません。
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        ignored_names: frozenset[str] = DEFAULT_IGNORED_NAMES,
+        use_gitignore: bool = True,
+    ):
+        """所有権ガードを初期化
+
+        Args:
+            root: プロジェクトルート
+            ignored_names: 無視対象とするディレクトリ名
+            use_gitignore: ルートの ``.gitignore`` のパターンも無視対象に加えるか
+        """
+        self.root = root
+        self.ignored_names = ignored_names
+        self.ignore_patterns = self._load_gitignore_patterns() if use_gitignore else []
+        self.owner: tuple[int, int] | None = None
+        self.started_at = 0.0
+
+    def _load_gitignore_patterns(self) -> list[str]:
+        """ルートの ``.gitignore`` から無視パターンを読み込み
+
+        否定パターン（``!``）は扱わず、無視しすぎないよう読み飛ばします。
+
+        Returns:
+            ルートからの相対パスまたは名前に対する fnmatch パターンのリスト
+        """
+        try:
+            lines = (self.root / ".gitignore").read_text(encoding="utf-8").splitlines()
+        except OSError, UnicodeDecodeError:
+            return []
+
+        patterns: list[str] = []
+        for raw_line in lines:
+            line = raw_line.strip()
+            if not line or line.startswith(("#", "!")):
+                continue
+            patterns.append(line.rstrip("/"))
+        return patterns
+
+    def _is_ignored(self, name: str, relative_path: str) -> bool:
+        """ディレクトリが無視対象かどうかを判定
+
+        Args:
+            name: ディレクトリ名
+            relative_path: ルートからの相対パス（区切りは ``/``）
+
+        Returns:
+            無視対象の場合はTrue
+        """
+        if name in self.ignored_names:
+            return True
+
+        for pattern in self.ignore_patterns:
+            if pattern.startswith("/"):
+                if fnmatch.fnmatch(relative_path, pattern[1:]):
+                    return True
+            elif "/" in pattern:
+                if fnmatch.fnmatch(relative_path, pattern):
+                    return True
+            elif fnmatch.fnmatch(name, pattern):
+                return True
+        return False
+
+    def start(self) -> None:
+        """実行開始時刻とプロジェクトルートの所有者を記録"""
+        self.started_at = time.time() - _TIMESTAMP_SLACK_SECONDS
+        try:
+            root_stat = self.root.stat()
+        except OSError as e:
+            logger.warning("ファイル所有権の記録に失敗しました: %s", e)
+            self.owner = None
+            return
+        self.owner = (root_stat.st_uid, root_stat.st_gid)
+
+    def restore(self) -> OwnershipScanStats:
+        """実行中に所有者が変わったパスの所有権を元に戻す
+
+        Returns:
+            所有権チェックの統計
+        """
+        stats = OwnershipScanStats()
+        if self.owner is None or not hasattr(os, "chown"):
+            return stats
+
+        scan_start = time.perf_counter()
+        changed_paths = self._find_changed_paths(self.owner, stats)
+        stats.scan_seconds = time.perf_counter() - scan_start
+
+        chown_start = time.perf_counter()
+        uid, gid = self.owner
+        for path in changed_paths:
+            try:
+                os.chown(path, uid, gid, follow_symlinks=False)
+                stats.paths_restored += 1
+            except OSError as e:
+                stats.failures += 1
+                logger.debug("所有権の復元に失敗しました: %s - %s", path, e)
+        stats.chown_seconds = time.perf_counter() - chown_start
+
+        return stats
+
+    def _find_changed_paths(self, owner: tuple[int, int], stats: OwnershipScanStats) -> list[str]:
+        """実行中に更新され、所有者が記録と異なるパスを探す
+
+        Args:
+            owner: 実行前のプロジェクトルートの (uid, gid)
+            stats: 走査の件数を記録する統計
+
+        Returns:
+            所有権を戻すべきパスのリスト
+        """
+        changed_paths: list[str] = []
+
+        # (ディレクトリのパス, ルートからの相対パス, 実行中に更新されたか)
+        stack: list[tuple[str, str, bool]] = [(str(self.root), "", self._was_modified(self.root.stat()))]
+
+        while stack:
+            directory, relative_dir, modified = stack.pop()
+            stats.directories_scanned += 1
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                logger.debug("ディレクトリを読み込めませんでした: %s - %s", directory, e)
+                continue
+
+            for entry in entries:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if not (modified or is_dir):
+                    # 更新されていないディレクトリのファイルは stat しない
+                    continue
+
+                try:
+                    entry_stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                entry_modified = self._was_modified(entry_stat)
+                if modified or entry_modified:
+                    stats.entries_checked += 1
+                    if entry_modified and (entry_stat.st_uid, entry_stat.st_gid) != owner:
+                        changed_paths.append(entry.path)
+
+                if not is_dir:
+                    continue
+
+                relative_path = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                if not entry_modified and self._is_ignored(entry.name, relative_path):
+                    stats.directories_pruned += 1
+                    continue
+                stack.append((entry.path, relative_path, entry_modified))
+
+        return changed_paths
+
+    def _was_modified(self, stat_result: os.stat_result) -> bool:
+        """実行開始後に更新されたかどうかを判定"""
+        return stat_result.st_ctime >= self.started_at or stat_result.st_mtime >= self.started_at
@@ -7,9 +7,23 @@ from __future__ import annotations
 
 import os
 import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
 from typing import Any, TypedDict
 
 from ..core.exceptions import SecurityError
+from ..core.log_index import LineIndex
+from ..core.log_storage import open_log_text
+
+# 大文字小文字を区別しないパターンの先頭のキーワード（このキーワードを含まないコンテンツでは照合を省略する）
+_LEADING_KEYWORD_PATTERN = re.compile(r"^\(\?i\)([a-z0-9]+)")
+
+# 行ごとのサニタイズでまとめて処理する文字数の目安
+SANITIZE_BLOCK_CHARS = 1024 * 1024
+
+# 断片のサニタイズで次のまとまりに持ち越して照合し直す文字数
+# パターンには長さの上限がないため、これより長いシークレットは区切りをまたぐと検出できない
+SANITIZE_OVERLAP_CHARS = 4096
 
 
 class SecretStatus(TypedDict):
@@ -157,36 +171,88 @@ class SecretDetector:
             re.compile(r"\*{3,}", re.MULTILINE),
         ]
 
-    def detect_secrets(self, content: str) -> list[dict[str, Any]]:
+        # 大文字小文字を区別しないパターンの先頭のキーワード
+        self._pattern_keywords: dict[re.Pattern[str], str] = {}
+        for patterns in self.secret_patterns.values():
+            for pattern in patterns:
+                keyword = _LEADING_KEYWORD_PATTERN.match(pattern.pattern)
+                if keyword:
+                    self._pattern_keywords[pattern] = keyword.group(1)
+
+    def _find_matches(self, content: str) -> list[tuple[str, re.Match[str]]]:
+        """除外パターンに該当しないシークレットのマッチをパターンの定義順に取得
+
+        大文字小文字を区別しないパターンは、先頭のキーワードがコンテンツに含まれない場合は照合しません。
+
+        Args:
+            content: 検査対象のコンテンツ
+
+        Returns:
+            (シークレットの種類, マッチ) のリスト
+        """
+        folded: str | None = None
+        matches: list[tuple[str, re.Match[str]]] = []
+        for secret_type, patterns in self.secret_patterns.items():
+            for pattern in patterns:
+                keyword = self._pattern_keywords.get(pattern)
+                if keyword is not None:
+                    # casefoldはIGNORECASEで一致する文字（ſ、K など）も小文字に揃える
+                    if folded is None:
+                        folded = content.casefold()
+                    if keyword not in folded:
+                        continue
+                for match in pattern.finditer(content):
+                    if not self._is_excluded(match.group(0)):
+                        matches.append((secret_type, match))
+        return matches
+
+    def detect_secrets(self, content: str, log_index: LineIndex | None = None) -> list[dict[str, Any]]:
         """コンテンツ内のシークレットを検出
 
         Args:
             content: 検査対象のコンテンツ
+            log_index: 作成済みの行インデックス（Noneの場合は最初の検出時に作成）
 
         Returns:
             検出されたシークレット情報のリスト
 
         """
-        detected_secrets: list[dict[str, Any]] = []
+        return self._describe_matches(content, self._find_matches(content), log_index)
 
-        for secret_type, patterns in self.secret_patterns.items():
-            for pattern in patterns:
-                matches = pattern.finditer(content)
-                for match in matches:
-                    # 除外パターンをチェック
-                    if self._is_excluded(match.group(0)):
-                        continue
+    def _describe_matches(
+        self,
+        content: str,
+        matches: list[tuple[str, re.Match[str]]],
+        log_index: LineIndex | None = None,
+    ) -> list[dict[str, Any]]:
+        """マッチからシークレット情報を作成
+
+        Args:
+            content: 検査対象のコンテンツ
+            matches: (シークレットの種類, マッチ) のリスト
+            log_index: 作成済みの行インデックス（Noneの場合は必要になった時点で作成）
 
-                    # シークレット情報を記録
-                    secret_info = {
-                        "type": secret_type,
-                        "value": match.group(1) if match.groups() else match.group(0),
-                        "start": match.start(),
-                        "end": match.end(),
-                        "line_number": content[: match.start()].count("\n") + 1,
-                        "context": self._get_match_context(content, match),
-                    }
-                    detected_secrets.append(secret_info)
+        Returns:
+            検出されたシークレット情報のリスト
+
+        """
+        detected_secrets: list[dict[str, Any]] = []
+        line_index = log_index if log_index is not None and log_index.text == content else None
+
+        for secret_type, match in matches:
+            if line_index is None:
+                line_index = LineIndex(content)
+
+            # シークレット情報を記録
+            secret_info = {
+                "type": secret_type,
+                "value": match.group(1) if match.groups() else match.group(0),
+                "start": match.start(),
+                "end": match.end(),
+                "line_number": line_index.line_number(match.start()),
+                "context": self._get_match_context(content, match, line_index=line_index),
+            }
+            detected_secrets.append(secret_info)
 
         return detected_secrets
 
@@ -205,28 +271,36 @@ class SecretDetector:
                 return True
         return False
 
-    def _get_match_context(self, content: str, match: re.Match[str], context_lines: int = 2) -> str:
+    def _get_match_context(
+        self,
+        content: str,
+        match: re.Match[str],
+        context_lines: int = 2,
+        line_index: LineIndex | None = None,
+    ) -> str:
         """マッチした箇所の前後のコンテキストを取得
 
         Args:
             content: 全体のコンテンツ
             match: マッチオブジェクト
             context_lines: 前後に取得する行数
+            line_index: コンテンツの行インデックス（Noneの場合は新規作成）
 
         Returns:
             コンテキスト文字列
 
         """
-        lines = content.splitlines()
-        match_line = content[: match.start()].count("\n")
+        if line_index is None:
+            line_index = LineIndex(content)
+        match_line = line_index.line_number(match.start()) - 1
 
         start_line = max(0, match_line - context_lines)
-        end_line = min(len(lines), match_line + context_lines + 1)
+        end_line = min(line_index.line_count, match_line + context_lines + 1)
 
         context_lines_list: list[str] = []
         for i in range(start_line, end_line):
             prefix = ">" if i == match_line else " "
-            context_lines_list.append(f"{prefix} {i + 1:3d}: {lines[i]}")
+            context_lines_list.append(f"{prefix} {i + 1:3d}: {line_index.line(i)}")
 
         return "\n".join(context_lines_list)
 
@@ -241,32 +315,204 @@ class SecretDetector:
             サニタイズされたコンテンツ
 
         """
-        sanitized_content = content
+        return self._replace_matches(content, self._find_matches(content), replacement)
 
-        for secret_type, patterns in self.secret_patterns.items():
-            for pattern in patterns:
-                matches = list(pattern.finditer(sanitized_content))
-                # 後ろから置換して位置がずれないようにする
-                for match in reversed(matches):
-                    if not self._is_excluded(match.group(0)):
-                        # シークレット部分のみを置換
-                        if match.groups():
-                            # グループがある場合は最初のグループ（シークレット値）を置換
-                            match.group(1)
-                            sanitized_content = (
-                                sanitized_content[: match.start(1)]
-                                + f"{replacement}_{secret_type.upper()}"
-                                + sanitized_content[match.end(1) :]
-                            )
-                        else:
-                            # グループがない場合は全体を置換
-                            sanitized_content = (
-                                sanitized_content[: match.start()]
-                                + f"{replacement}_{secret_type.upper()}"
-                                + sanitized_content[match.end() :]
-                            )
-
-        return sanitized_content
+    def detect_and_sanitize(
+        self,
+        content: str,
+        replacement: str = "[REDACTED]",
+        log_index: LineIndex | None = None,
+    ) -> tuple[list[dict[str, Any]], str]:
+        """1回の照合でシークレットの検出とサニタイズを行う
+
+        :meth:`detect_secrets` と :meth:`sanitize_content` を続けて呼び出した場合と同じ結果を返します。
+
+        Args:
+            content: 検査対象のコンテンツ
+            replacement: 置換文字列
+            log_index: 作成済みの行インデックス（Noneの場合は最初の検出時に作成）
+
+        Returns:
+            (検出されたシークレット情報のリスト, サニタイズされたコンテンツ) のタプル
+
+        """
+        matches = self._find_matches(content)
+        detected_secrets = self._describe_matches(content, matches, log_index)
+        return detected_secrets, self._replace_matches(content, matches, replacement)
+
+    def sanitize_lines(
+        self,
+        lines: Iterable[str],
+        replacement: str = "[REDACTED]",
+        block_chars: int | None = None,
+    ) -> Iterator[str]:
+        """行ごとにシークレットをサニタイズ
+
+        大きなログをストリーミングで処理するための版です。行は ``block_chars`` 程度ずつ
+        まとめて照合するため、メモリ使用量はログのサイズによらず一定です。
+        まとまりの境界をまたぐシークレット（キーと値の間の改行など）は検出しません。
+
+        Args:
+            lines: サニタイズ対象の行（改行文字を含まない）
+            replacement: 置換文字列
+            block_chars: まとめて照合する文字数の目安（Noneの場合は ``SANITIZE_BLOCK_CHARS``）
+
+        Yields:
+            サニタイズされた行（改行文字を含まない）
+
+        """
+        for block in self._sanitize_blocks(lines, replacement, block_chars):
+            yield from block.split("\n")
+
+    def sanitize_chunks(
+        self,
+        chunks: Iterable[str],
+        replacement: str = "[REDACTED]",
+        block_chars: int | None = None,
+    ) -> Iterator[str]:
+        """任意の位置で区切られたテキストのシークレットをサニタイズ
+
+        フォーマッターが順に生成する出力などを ``block_chars`` 程度ずつ照合します。
+        改行を含まない出力（コンパクトなJSONなど）でもメモリ使用量は一定です。
+        末尾の ``SANITIZE_OVERLAP_CHARS`` 文字は次のまとまりに持ち越して照合し直すため、
+        区切りをまたぐシークレットも全体をまとめてサニタイズした場合と同じように置換されます。
+
+        Args:
+            chunks: サニタイズ対象のテキストの断片
+            replacement: 置換文字列
+            block_chars: まとめて照合する文字数の目安（Noneの場合は ``SANITIZE_BLOCK_CHARS``）
+
+        Yields:
+            サニタイズされたテキストの断片（連結すると全体になる）
+
+        """
+        if block_chars is None:
+            block_chars = SANITIZE_BLOCK_CHARS
+        pending: list[str] = []
+        size = 0
+        for chunk in chunks:
+            pending.append(chunk)
+            size += len(chunk)
+            if size >= block_chars + SANITIZE_OVERLAP_CHARS:
+                content = "".join(pending)
+                sanitized, rest = self._sanitize_prefix(content, len(content) - SANITIZE_OVERLAP_CHARS, replacement)
+                yield sanitized
+                pending = [rest]
+                size = len(rest)
+        yield self.sanitize_content("".join(pending), replacement)
+
+    def _sanitize_prefix(self, content: str, cut: int, replacement: str) -> tuple[str, str]:
+        """コンテンツの先頭部分をサニタイズし、残りを照合前のまま返す
+
+        区切り位置をまたぐマッチがある場合は、区切り位置をマッチの先頭まで戻します。
+
+        Args:
+            content: サニタイズ対象のコンテンツ
+            cut: 区切り位置の目安
+            replacement: 置換文字列
+
+        Returns:
+            (サニタイズされた先頭部分, 照合前の残り) のタプル
+        """
+        matches = self._find_matches(content)
+        while True:
+            straddling = [match.start() for _, match in matches if match.start() < cut < match.end()]
+            if not straddling:
+                break
+            cut = min(straddling)
+        if cut == 0:
+            # まとまり全体にまたがるマッチは区切らずにまとめて置換する
+            cut = len(content)
+
+        head = [(secret_type, match) for secret_type, match in matches if match.end() <= cut]
+        return self._replace_matches(content[:cut], head, replacement), content[cut:]
+
+    def _sanitize_blocks(
+        self,
+        lines: Iterable[str],
+        replacement: str,
+        block_chars: int | None,
+    ) -> Iterator[str]:
+        """行をまとめてサニタイズし、まとまりごとに改行で連結した文字列を生成"""
+        if block_chars is None:
+            block_chars = SANITIZE_BLOCK_CHARS
+        block: list[str] = []
+        size = 0
+        for line in lines:
+            block.append(line)
+            size += len(line) + 1
+            if size >= block_chars:
+                yield self.sanitize_content("\n".join(block), replacement)
+                block = []
+                size = 0
+        if block:
+            yield self.sanitize_content("\n".join(block), replacement)
+
+    def sanitize_file(self, source: Path, destination: Path, replacement: str = "[REDACTED]") -> None:
+        """ファイル内のシークレットをサニタイズして別のファイルに書き込む
+
+        圧縮保存されたログもそのまま読み込めます。
+
+        Args:
+            source: サニタイズ対象のファイル
+            destination: 書き込み先のファイル
+            replacement: 置換文字列
+
+        """
+        with open_log_text(source, errors="replace") as reader, open(destination, "w", encoding="utf-8") as writer:
+            lines = (line.rstrip("\n\r") for line in reader)
+            for line in self.sanitize_lines(lines, replacement):
+                writer.write(line)
+                writer.write("\n")
+
+    def _replace_matches(
+        self,
+        content: str,
+        matches: list[tuple[str, re.Match[str]]],
+        replacement: str,
+    ) -> str:
+        """マッチしたシークレットを置換
+
+        置換範囲（グループがある場合は最初のグループ、ない場合はマッチ全体）が重なる場合は1つにまとめ、
+        先に定義されたパターンの種類で置換します。置換後のコンテンツは1回で組み立てます。
+
+        Args:
+            content: サニタイズ対象のコンテンツ
+            matches: (シークレットの種類, マッチ) のリスト（パターンの定義順）
+            replacement: 置換文字列
+
+        Returns:
+            サニタイズされたコンテンツ
+
+        """
+        if not matches:
+            return content
+
+        spans: list[tuple[int, int, int, str]] = []
+        for priority, (secret_type, match) in enumerate(matches):
+            # グループがある場合は最初のグループ（シークレット値）のみを置換
+            start, end = match.span(1) if match.groups() else match.span()
+            if start >= 0:
+                spans.append((start, end, priority, secret_type))
+        spans.sort()
+
+        parts: list[str] = []
+        position = 0
+        index = 0
+        while index < len(spans):
+            start, end, priority, secret_type = spans[index]
+            index += 1
+            # 重なる範囲をまとめる
+            while index < len(spans) and spans[index][0] < end:
+                end = max(end, spans[index][1])
+                if spans[index][2] < priority:
+                    priority, secret_type = spans[index][2], spans[index][3]
+                index += 1
+            parts.append(content[position:start])
+            parts.append(f"{replacement}_{secret_type.upper()}")
+            position = end
+        parts.append(content[position:])
+        return "".join(parts)
 
     def validate_config_file(self, config_content: str, file_path: str) -> list[ConfigIssue]:
         """設定ファイル内のシークレット記載をチェック
@@ -283,9 +529,10 @@ class SecretDetector:
 
         """
         issues: list[ConfigIssue] = []
+        line_index = LineIndex(config_content)
 
         # シークレットの直接記載をチェック
-        detected_secrets = self.detect_secrets(config_content)
+        detected_secrets = self.detect_secrets(config_content, line_index)
         for secret in detected_secrets:
             issues.append(
                 {
@@ -306,7 +553,7 @@ class SecretDetector:
                 # 環境変数参照の形式（${VAR}や$VAR）でない場合は警告
                 context = config_content[max(0, match.start() - 10) : match.end() + 10]
                 if not re.search(r"[\$\{]", context):
-                    line_number = config_content[: match.start()].count("\n") + 1
+                    line_number = line_index.line_number(match.start())
                     issues.append(
                         {
                             "type": "potential_secret_var",
@@ -314,7 +561,7 @@ class SecretDetector:
                             "message": f"シークレット関連の変数名が設定ファイルに含まれています: {match.group(0)}",
                             "file_path": file_path,
                             "line_number": line_number,
-                            "context": self._get_match_context(config_content, match),
+                            "context": self._get_match_context(config_content, match, line_index=line_index),
                             "recommendation": "環境変数参照の形式（${VAR_NAME}）を使用してください",
                         },
                     )
@@ -558,18 +805,18 @@ class SecurityValidator:
         self.secret_detector = SecretDetector()
         self.secret_manager = EnvironmentSecretManager()
 
-    def validate_log_content(self, log_content: str) -> dict[str, Any]:
+    def validate_log_content(self, log_content: str, log_index: LineIndex | None = None) -> dict[str, Any]:
         """ログコンテンツのセキュリティ検証
 
         Args:
             log_content: ログの内容
+            log_index: 作成済みの行インデックス
 
         Returns:
             検証結果の辞書
 
         """
-        detected_secrets = self.secret_detector.detect_secrets(log_content)
-        sanitized_content = self.secret_detector.sanitize_content(log_content)
+        detected_secrets, sanitized_content = self.secret_detector.detect_and_sanitize(log_content, log_index=log_index)
         log_recommendations = self._get_log_security_recommendations(detected_secrets)
 
         return {
@@ -7,7 +7,7 @@ AI分析に最適化されたMarkdown形式でCI実行結果をフォーマッ
 from __future__ import annotations
 
 import re
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, TypedDict
 
@@ -18,6 +18,9 @@ from ..core.models import FailureType
 from .base_formatter import BaseLogFormatter
 from .streaming_formatter import StreamingFailureInfo, StreamingFormatterMixin
 
+# セクション間の区切り
+SECTION_SEPARATOR = "\n\n---\n\n"
+
 
 class FailureTypeConfigEntry(TypedDict):
     """失敗タイプ設定"""
@@ -82,6 +85,35 @@ class AIContextFormatter(StreamingFormatterMixin, BaseLogFormatter):
             AI消費用に最適化されたMarkdown文字列
 
         """
+        # セクションを結合
+        markdown_content = SECTION_SEPARATOR.join(filter(None, self._iter_sections(execution_result, **options)))
+
+        # シークレットのサニタイズ
+        if self.sanitize_secrets:
+            markdown_content = self._sanitize_content(markdown_content)
+
+        return markdown_content
+
+    def format_chunks(self, execution_result: ExecutionResult, **options: Any) -> Iterator[str]:
+        """AI消費用に最適化されたMarkdownをセクションごとに生成
+
+        Args:
+            execution_result: CI実行結果
+            **options: フォーマットオプション（``format()`` と同じ）
+
+        Yields:
+            Markdown文字列の断片
+
+        """
+        yield from self._sanitize_chunks(self._iter_section_chunks(execution_result, **options))
+
+    def _iter_section_chunks(self, execution_result: ExecutionResult, **options: Any) -> Iterator[str]:
+        """セクションを区切り線付きで順に生成"""
+        for index, section in enumerate(filter(None, self._iter_sections(execution_result, **options))):
+            yield section if index == 0 else SECTION_SEPARATOR + section
+
+    def _iter_sections(self, execution_result: ExecutionResult, **options: Any) -> Iterator[str]:
+        """オプションを処理してセクションを順に生成（空のセクションを含む）"""
         # verbose_level を detail_level にマッピング（後方互換性のため）
         if "verbose_level" in options and "detail_level" not in options:
             options = dict(options)  # コピーを作成
@@ -114,43 +146,30 @@ class AIContextFormatter(StreamingFormatterMixin, BaseLogFormatter):
             include_suggestions = True
             include_related_files = True
 
-        sections: list[str] = []
-
         # クイックサマリー（最重要情報を最初に）
-        sections.append(self._format_quick_summary(execution_result))
+        yield self._format_quick_summary(execution_result)
 
         # クリティカル失敗（優先度順）
         if not execution_result.success:
-            sections.append(
-                self._format_critical_failures(
-                    execution_result,
-                    max_failures=max_failures,
-                    include_context=include_context,
-                ),
+            yield self._format_critical_failures(
+                execution_result,
+                max_failures=max_failures,
+                include_context=include_context,
             )
 
         # 修正提案セクション
         if include_suggestions and not execution_result.success:
-            sections.append(self._format_suggested_fixes(execution_result))
+            yield self._format_suggested_fixes(execution_result)
 
         # 関連ファイル情報
         if include_related_files and not execution_result.success:
-            sections.append(self._format_related_files(execution_result))
+            yield self._format_related_files(execution_result)
 
         # 詳細なコンテキスト分析
-        sections.append(self._format_context_analysis(execution_result))
+        yield self._format_context_analysis(execution_result)
 
         # 完全なログ情報（最後に配置）
-        sections.append(self._format_full_logs(execution_result))
-
-        # セクションを結合
-        markdown_content = "\n\n---\n\n".join(filter(None, sections))
-
-        # シークレットのサニタイズ
-        if self.sanitize_secrets:
-            markdown_content = self._sanitize_content(markdown_content)
-
-        return markdown_content
+        yield self._format_full_logs(execution_result)
 
     def get_format_name(self) -> str:
         """フォーマット名を取得"""
@@ -7,6 +7,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
 from typing import TYPE_CHECKING, Any, TypedDict, cast
 
 if TYPE_CHECKING:
@@ -57,6 +58,21 @@ class BaseLogFormatter(ABC):
         """
         pass
 
+    def format_chunks(self, execution_result: ExecutionResult, **options: Any) -> Iterator[str]:
+        """ログを指定形式でフォーマットし、出力を先頭から順に生成
+
+        出力全体を1つの文字列にせずにファイルへ書き込むための版です。
+        デフォルトでは ``format()`` の結果を1つ生成します。
+
+        Args:
+            execution_result: CI実行結果
+            **options: フォーマット固有のオプション
+
+        Yields:
+            フォーマットされた文字列の断片（連結すると ``format()`` の結果と同じ内容になる）
+        """
+        yield self.format(execution_result, **options)
+
     @abstractmethod
     def get_format_name(self) -> str:
         """フォーマット名を取得
@@ -98,6 +114,20 @@ class BaseLogFormatter(ABC):
                 formatter_name=self.get_format_name(),
             ) from e
 
+    def _sanitize_chunks(self, chunks: Iterable[str]) -> Iterator[str]:
+        """順に生成される出力のサニタイズ（行単位で照合）
+
+        Args:
+            chunks: サニタイズ対象の出力の断片
+
+        Returns:
+            サニタイズされた出力の断片
+        """
+        if not self.sanitize_secrets or not self.security_validator:
+            return iter(chunks)
+
+        return self.security_validator.secret_detector.sanitize_chunks(chunks)
+
     def format_with_optimization(self, execution_result: ExecutionResult, **options: Any) -> str:
         """最適化付きフォーマット（デフォルトは通常フォーマットと同じ挙動）"""
         return self.format(execution_result, **options)
@@ -6,6 +6,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from typing import TYPE_CHECKING, Any
 
 from .base_formatter import BaseLogFormatter
@@ -196,42 +197,91 @@ class FormatterManager:
 
             raise LogFormattingError.formatting_failed(format_name, str(e)) from e
 
+    def format_log_stream(self, execution_result: ExecutionResult, format_name: str, **options: Any) -> Iterator[str]:
+        """ログを指定形式でフォーマットし、出力を先頭から順に生成
+
+        出力全体を1つの文字列にせずに書き込むための版です。フォーマット結果のキャッシュは使用しません。
+
+        Args:
+            execution_result: CI実行結果
+            format_name: フォーマット名
+            **options: フォーマット固有のオプション
+
+        Returns:
+            フォーマットされた文字列の断片のイテレーター
+
+        Raises:
+            LogFormattingError: フォーマット処理が失敗した場合（断片の生成中に発生したものを含む）
+            UserInputError: 無効なオプションが指定された場合
+        """
+        formatter = self.get_formatter(format_name)
+
+        try:
+            validated_options = formatter.validate_options(**options)
+        except (ValueError, TypeError) as e:
+            from ..core.exceptions import UserInputError
+
+            raise UserInputError(
+                f"フォーマットオプションが無効です: {e}",
+                "オプションの値と型を確認してください",
+            ) from e
+
+        return self._guard_stream(formatter.format_chunks(execution_result, **validated_options), format_name)
+
+    @staticmethod
+    def _guard_stream(chunks: Iterator[str], format_name: str) -> Iterator[str]:
+        """断片の生成中に発生したエラーをログ整形のエラーに変換"""
+        from ..core.exceptions import LogFormattingError
+
+        try:
+            yield from chunks
+        except MemoryError as e:
+            raise LogFormattingError.memory_limit_exceeded(format_name, 0) from e
+        except LogFormattingError:
+            raise
+        except Exception as e:
+            raise LogFormattingError.formatting_failed(format_name, str(e)) from e
+
     def format_and_save_log(
         self,
         execution_result: ExecutionResult,
         format_name: str,
         output_file: str | None = None,
         console: Any | None = None,
+        buffer_size: int | None = None,
         **options: Any,
     ) -> tuple[bool, str | None]:
         """ログをフォーマットしてファイルに保存
 
+        フォーマット結果は生成しながら書き込むため、メモリ使用量はバッファサイズで決まります。
+
         Args:
             execution_result: CI実行結果
             format_name: フォーマット名
             output_file: 出力ファイルパス（Noneの場合は標準出力）
             console: Rich Console インスタンス
+            buffer_size: 書き込みまでにためる文字数（Noneの場合はデフォルト）
             **options: フォーマット固有のオプション
 
         Returns:
             (成功フラグ, 保存されたファイルパス) のタプル
 
         Raises:
-            KeyError: 指定されたフォーマッターが存在しない場合
-            ValueError: 無効なオプションが指定された場合
+            LogFormattingError: 指定されたフォーマッターが存在しない場合、またはフォーマット処理が失敗した場合
+            UserInputError: 無効なオプションが指定された場合
         """
-        from ..utils.file_save_utils import FileSaveManager
+        from ..utils.file_save_utils import DEFAULT_STREAM_BUFFER_CHARS, FileSaveManager
 
-        # ログをフォーマット
-        formatted_content = self.format_log(execution_result, format_name, **options)
+        # ログをフォーマットしながら保存
+        chunks = self.format_log_stream(execution_result, format_name, **options)
 
-        # ファイル保存マネージャーを使用して保存
         file_manager = FileSaveManager(console)
-        return file_manager.save_formatted_log(
-            content=formatted_content,
+        return file_manager.save_formatted_log_stream(
+            chunks,
             output_file=output_file,
             format_type=format_name,
             default_dir=file_manager.get_default_output_directory(),
+            buffer_size=buffer_size or DEFAULT_STREAM_BUFFER_CHARS,
         )
 
     def format_log_safe(
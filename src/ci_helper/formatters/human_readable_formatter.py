@@ -6,7 +6,7 @@ Rich ライブラリを使用して色付けされた構造化出力を生成し
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from typing import TYPE_CHECKING, Any
 
 from rich.console import Console
@@ -80,6 +80,29 @@ class HumanReadableFormatter(BaseLogFormatter):
             人間可読形式でフォーマットされた文字列
 
         """
+        output = "".join(self._iter_rendered_sections(execution_result, **options))
+
+        # シークレットのサニタイズ
+        if self.sanitize_secrets:
+            output = self._sanitize_content(output)
+
+        return output
+
+    def format_chunks(self, execution_result: ExecutionResult, **options: Any) -> Iterator[str]:
+        """人間可読形式でフォーマットし、セクションごとに生成
+
+        Args:
+            execution_result: CI実行結果
+            **options: フォーマットオプション（``format()`` と同じ）
+
+        Yields:
+            フォーマットされた文字列の断片
+
+        """
+        yield from self._sanitize_chunks(self._iter_rendered_sections(execution_result, **options))
+
+    def _iter_rendered_sections(self, execution_result: ExecutionResult, **options: Any) -> Iterator[str]:
+        """オプションを処理してセクションを1つずつ文字列に描画"""
         # verbose_level を detail_level にマッピング（後方互換性のため）
         if "verbose_level" in options and "detail_level" not in options:
             options = dict(options)  # コピーを作成
@@ -134,19 +157,12 @@ class HumanReadableFormatter(BaseLogFormatter):
         if not execution_result.success:
             sections.append(self._format_recommended_actions(execution_result))
 
-        # セクションを結合して文字列として出力
-        with self.console.capture() as capture:
-            for section in sections:
+        # セクションごとに文字列として出力
+        for section in sections:
+            with self.console.capture() as capture:
                 self.console.print(section)
                 self.console.print()  # セクション間の空行
-
-        output = capture.get()
-
-        # シークレットのサニタイズ
-        if self.sanitize_secrets:
-            output = self._sanitize_content(output)
-
-        return output
+            yield capture.get()
 
     def get_format_name(self) -> str:
         """フォーマット名を取得"""
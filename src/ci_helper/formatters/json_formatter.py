@@ -7,7 +7,7 @@ CI実行結果を構造化されたJSON形式でフォーマットします。
 from __future__ import annotations
 
 import json
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
@@ -68,6 +68,50 @@ class JSONFormatter(BaseLogFormatter):
         Returns:
             JSON形式の文字列
 
+        """
+        json_data, compact = self._build_json_data(execution_result, **options)
+
+        # JSON文字列に変換
+        json_content = self._json_encoder(compact).encode(json_data)
+
+        # シークレットのサニタイズ
+        if self.sanitize_secrets:
+            json_content = self._sanitize_content(json_content)
+
+        return json_content
+
+    def format_chunks(self, execution_result: ExecutionResult, **options: Any) -> Iterator[str]:
+        """実行結果をJSON形式でフォーマットし、出力を先頭から順に生成
+
+        JSONエンコーダーの逐次出力をそのまま行単位でサニタイズするため、
+        JSON文字列全体を保持しません。
+
+        Args:
+            execution_result: CI実行結果
+            **options: フォーマット固有のオプション（``format()`` と同じ）
+
+        Yields:
+            JSON形式の文字列の断片
+
+        """
+        json_data, compact = self._build_json_data(execution_result, **options)
+        yield from self._sanitize_chunks(self._json_encoder(compact).iterencode(json_data))
+
+    def _json_encoder(self, compact: bool) -> json.JSONEncoder:
+        """出力形式に応じたJSONエンコーダーを作成"""
+        return json.JSONEncoder(
+            indent=None if compact else self.indent,
+            ensure_ascii=self.ensure_ascii,
+            separators=(",", ":") if compact else (",", ": "),
+            sort_keys=True,
+        )
+
+    def _build_json_data(self, execution_result: ExecutionResult, **options: Any) -> tuple[dict[str, Any], bool]:
+        """オプションを処理してJSON構造を構築
+
+        Returns:
+            (JSON構造, 圧縮形式で出力するかどうか) のタプル
+
         """
         # オプションの処理
         validated_options = self.validate_options(**options)
@@ -143,21 +187,7 @@ class JSONFormatter(BaseLogFormatter):
             ],
         }
 
-        # JSON文字列に変換
-        indent = None if compact else self.indent
-        json_content = json.dumps(
-            json_data,
-            indent=indent,
-            ensure_ascii=self.ensure_ascii,
-            separators=(",", ":") if compact else (",", ": "),
-            sort_keys=True,
-        )
-
-        # シークレットのサニタイズ
-        if self.sanitize_secrets:
-            json_content = self._sanitize_content(json_content)
-
-        return json_content
+        return json_data, compact
 
     def get_format_name(self) -> str:
         """フォーマット名を取得
@@ -199,6 +229,8 @@ class JSONFormatter(BaseLogFormatter):
         supported_options = set(self.get_supported_options())
         # verbose_levelは後方互換性のため特別に許可
         supported_options.add("verbose_level")
+        # パフォーマンス最適化のオプションはフォーマッターマネージャーが扱うため許可
+        supported_options.update(("use_optimization", "max_memory_mb"))
         for option_name in options:
             if option_name not in supported_options:
                 raise ValueError(f"未知のオプション: {option_name}")
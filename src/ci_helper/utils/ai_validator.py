@@ -8,7 +8,6 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 
-import aiohttp
 from rich.console import Console
 
 
@@ -165,6 +164,8 @@ class AIProviderValidator:
 
     async def _validate_openai(self, provider_info: ProviderInfo) -> ValidationResult:
         """OpenAI APIを検証"""
+        import aiohttp  # ci-run の起動時に読み込まないよう使用時にインポート
+
         api_key = os.getenv(provider_info.api_key_env)
         endpoint = provider_info.test_endpoint
 
@@ -263,6 +264,8 @@ class AIProviderValidator:
 
     async def _validate_anthropic(self, provider_info: ProviderInfo) -> ValidationResult:
         """Anthropic APIを検証"""
+        import aiohttp
+
         api_key = os.getenv(provider_info.api_key_env)
         endpoint = provider_info.test_endpoint
 
@@ -354,6 +357,8 @@ class AIProviderValidator:
 
     async def _validate_local(self, provider_info: ProviderInfo) -> ValidationResult:
         """ローカルLLM (Ollama) を検証"""
+        import aiohttp
+
         try:
             ollama_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
             test_endpoint = f"{ollama_url}/api/tags"
@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Any, ClassVar
 
 from ..core.exceptions import ConfigurationError, SecurityError
+from ..core.log_storage import LOG_COMPRESSIONS
 
 
 class Config:
@@ -30,9 +31,12 @@ class Config:
         "reports_dir": ".ci-helper/reports",
         "context_lines": 3,
         "max_log_size_mb": 100,
+        "log_mmap_threshold_mb": 64,  # これ以上のログはmmapで走査する
+        "log_compression": "none",  # ログの圧縮保存（none / gzip / lzma）
         "max_cache_size_mb": 500,
         "act_image": "ghcr.io/catthehacker/ubuntu:full-24.04",
         "timeout_seconds": 1800,  # 30分
+        "parallel_workflows": 1,  # ワークフローの同時実行数（0は自動）
         "verbose": False,
         "save_logs": True,
     }
@@ -43,6 +47,7 @@ class Config:
         "cache_enabled": True,
         "cache_ttl_hours": 24,
         "cache_max_size_mb": 100,
+        "cache_key_mode": "exact",
         "interactive_timeout": 300,
         "streaming_enabled": True,
         "security_checks_enabled": True,
@@ -198,6 +203,7 @@ class Config:
                         "cache_enabled",
                         "cache_ttl_hours",
                         "cache_max_size_mb",
+                        "cache_key_mode",
                         "interactive_timeout",
                         "streaming_enabled",
                         "security_checks_enabled",
@@ -378,6 +384,13 @@ class Config:
         if not isinstance(max_log_size, int | float) or max_log_size <= 0:
             raise ConfigurationError(f"最大ログサイズ設定が無効です: {max_log_size}", "正の整数を指定してください")
 
+        log_compression = self.get("log_compression", self.DEFAULT_CONFIG["log_compression"])
+        if not isinstance(log_compression, str) or log_compression.lower() not in LOG_COMPRESSIONS:
+            raise ConfigurationError(
+                f"ログ圧縮設定が無効です: {log_compression}",
+                f"{' / '.join(LOG_COMPRESSIONS)} のいずれかを指定してください",
+            )
+
     def __getitem__(self, key: str) -> Any:
         """辞書風アクセスをサポート"""
         return self.get(key)
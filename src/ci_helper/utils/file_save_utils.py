@@ -8,6 +8,7 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, TypedDict
@@ -18,6 +19,9 @@ from rich.prompt import Confirm, Prompt
 if TYPE_CHECKING:
     from ..core.security import SecurityValidator
 
+# ストリーミング保存で書き込みまでにためる文字数のデフォルト
+DEFAULT_STREAM_BUFFER_CHARS = 1024 * 1024
+
 
 class BaseValidationResult(TypedDict):
     """必須フィールドを持つ検証結果"""
@@ -91,38 +95,10 @@ class FileSaveManager:
             return True, None
 
         try:
-            # パスオブジェクトに変換
-            output_path = Path(output_file)
-
-            # セキュリティ検証を実行
-            security_result = self.validate_output_path_security(output_path)
-            if not security_result["valid"]:
-                self.console.print(f"[red]セキュリティエラー: {security_result['error']}[/red]")
-                if security_result.get("recommendations"):
-                    self.console.print("[yellow]推奨事項:[/yellow]")
-                    for rec in security_result["recommendations"]:
-                        self.console.print(f"  - {rec}")
+            output_path = self._resolve_output_path(output_file, default_dir, confirm_overwrite)
+            if output_path is None:
                 return False, None
 
-            # 相対パスの場合はデフォルトディレクトリを適用
-            if not output_path.is_absolute() and default_dir:
-                output_path = Path(default_dir) / output_path
-
-            # 再度セキュリティ検証（デフォルトディレクトリ適用後）
-            security_result = self.validate_output_path_security(output_path)
-            if not security_result["valid"]:
-                self.console.print(f"[red]セキュリティエラー: {security_result['error']}[/red]")
-                return False, None
-
-            # ディレクトリが存在しない場合は作成
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # ファイル上書き確認
-            if output_path.exists() and confirm_overwrite:
-                if not self._confirm_overwrite(output_path):
-                    self.console.print("[yellow]ファイル保存がキャンセルされました[/yellow]")
-                    return False, None
-
             # コンテンツのセキュリティ検証とサニタイズ
             sanitized_content = self._sanitize_output_content(content)
 
@@ -135,36 +111,179 @@ class FileSaveManager:
 
             return True, str(output_path)
 
-        except PermissionError as e:
-            from ..core.exceptions import FileOperationError
+        except Exception as e:
+            raise self._save_error(output_file, e) from e
 
-            raise FileOperationError.permission_denied(str(output_file), "書き込み") from e
+    def save_formatted_log_stream(
+        self,
+        chunks: Iterable[str],
+        output_file: str | Path | None = None,
+        format_type: str = "markdown",
+        default_dir: str | Path | None = None,
+        confirm_overwrite: bool = True,
+        buffer_size: int = DEFAULT_STREAM_BUFFER_CHARS,
+    ) -> tuple[bool, str | None]:
+        """順に生成される整形結果を書き込みながら保存
 
-        except OSError as e:
-            from ..core.exceptions import FileOperationError
+        整形結果全体を1つの文字列にせず、``buffer_size`` 文字たまるごとに書き込むため、
+        メモリ使用量はログのサイズではなくバッファサイズで決まります。
+        書き込みは一時ファイルに行い、完了してから出力ファイルに置き換えます。
 
-            if "No space left on device" in str(e):
-                # ディスク容量不足の場合
-                raise FileOperationError.disk_space_insufficient(str(output_file), 0, 0) from e
-            elif "File name too long" in str(e):
-                # ファイル名が長すぎる場合
-                raise FileOperationError.path_too_long(str(output_file)) from e
-            else:
-                # その他のOSエラー
-                raise FileOperationError(
-                    f"ファイルの保存に失敗しました: {output_file}",
-                    "ディスク容量やファイルシステムの状態を確認してください",
-                    file_path=str(output_file),
-                    operation="書き込み",
-                ) from e
+        Args:
+            chunks: 整形結果の断片
+            output_file: 出力ファイルパス（Noneの場合は標準出力）
+            format_type: フォーマット種別（ファイル拡張子の決定に使用）
+            default_dir: デフォルト保存ディレクトリ
+            confirm_overwrite: ファイル上書き確認を行うかどうか
+            buffer_size: 書き込みまでにためる文字数
+
+        Returns:
+            (成功フラグ, 保存されたファイルパス) のタプル
+        """
+        # 標準出力の場合
+        if output_file is None:
+            for piece in self._buffer_chunks(self._sanitize_output_chunks(chunks, buffer_size), buffer_size):
+                self.console.print(piece, end="", markup=False, highlight=False)
+            self.console.print()
+            return True, None
+
+        temp_path: Path | None = None
+        try:
+            output_path = self._resolve_output_path(output_file, default_dir, confirm_overwrite)
+            if output_path is None:
+                return False, None
+
+            temp_path = output_path.with_name(f".{output_path.name}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for piece in self._buffer_chunks(self._sanitize_output_chunks(chunks, buffer_size), buffer_size):
+                    f.write(piece)
+            os.replace(temp_path, output_path)
+            temp_path = None
+
+            # 成功メッセージを表示
+            self._show_save_success_message(output_path)
+
+            return True, str(output_path)
 
         except Exception as e:
-            from ..core.exceptions import LogFormattingError
+            from ..core.exceptions import LogFormattingError, UserInputError
+
+            # 整形中のエラーはそのまま伝える
+            if isinstance(e, LogFormattingError | UserInputError):
+                raise
+            raise self._save_error(output_file, e) from e
+
+        finally:
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+
+    def _resolve_output_path(
+        self,
+        output_file: str | Path,
+        default_dir: str | Path | None,
+        confirm_overwrite: bool,
+    ) -> Path | None:
+        """出力ファイルパスを検証して決定
+
+        Args:
+            output_file: 出力ファイルパス
+            default_dir: デフォルト保存ディレクトリ
+            confirm_overwrite: ファイル上書き確認を行うかどうか
+
+        Returns:
+            出力ファイルパス（検証に失敗した場合や上書きがキャンセルされた場合はNone）
+        """
+        # パスオブジェクトに変換
+        output_path = Path(output_file)
+
+        # セキュリティ検証を実行
+        security_result = self.validate_output_path_security(output_path)
+        if not security_result["valid"]:
+            self.console.print(f"[red]セキュリティエラー: {security_result['error']}[/red]")
+            if security_result.get("recommendations"):
+                self.console.print("[yellow]推奨事項:[/yellow]")
+                for rec in security_result["recommendations"]:
+                    self.console.print(f"  - {rec}")
+            return None
+
+        # 相対パスの場合はデフォルトディレクトリを適用
+        if not output_path.is_absolute() and default_dir:
+            output_path = Path(default_dir) / output_path
 
-            raise LogFormattingError(
-                f"ファイル保存中に予期しないエラーが発生しました: {e}",
-                "システム管理者に相談してください",
-            ) from e
+        # 再度セキュリティ検証（デフォルトディレクトリ適用後）
+        security_result = self.validate_output_path_security(output_path)
+        if not security_result["valid"]:
+            self.console.print(f"[red]セキュリティエラー: {security_result['error']}[/red]")
+            return None
+
+        # ディレクトリが存在しない場合は作成
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # ファイル上書き確認
+        if output_path.exists() and confirm_overwrite:
+            if not self._confirm_overwrite(output_path):
+                self.console.print("[yellow]ファイル保存がキャンセルされました[/yellow]")
+                return None
+
+        return output_path
+
+    def _sanitize_output_chunks(self, chunks: Iterable[str], buffer_size: int) -> Iterable[str]:
+        """順に生成される出力コンテンツのサニタイズ（``buffer_size`` 文字程度ずつ照合）"""
+        if not self.enable_security or not self.security_validator:
+            return chunks
+
+        return self.security_validator.secret_detector.sanitize_chunks(chunks, block_chars=buffer_size)
+
+    @staticmethod
+    def _buffer_chunks(chunks: Iterable[str], buffer_size: int) -> Iterator[str]:
+        """断片を ``buffer_size`` 文字程度ずつまとめる"""
+        buffer: list[str] = []
+        buffered = 0
+        for chunk in chunks:
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= buffer_size:
+                yield "".join(buffer)
+                buffer = []
+                buffered = 0
+        if buffer:
+            yield "".join(buffer)
+
+    @staticmethod
+    def _save_error(output_file: str | Path | None, error: Exception) -> Exception:
+        """保存中に発生したエラーをログ整形のエラーに変換
+
+        Args:
+            output_file: 出力ファイルパス
+            error: 発生したエラー
+
+        Returns:
+            呼び出し元に伝えるエラー
+        """
+        from ..core.exceptions import FileOperationError, LogFormattingError
+
+        if isinstance(error, PermissionError):
+            return FileOperationError.permission_denied(str(output_file), "書き込み")
+
+        if isinstance(error, OSError):
+            if "No space left on device" in str(error):
+                # ディスク容量不足の場合
+                return FileOperationError.disk_space_insufficient(str(output_file), 0, 0)
+            if "File name too long" in str(error):
+                # ファイル名が長すぎる場合
+                return FileOperationError.path_too_long(str(output_file))
+            # その他のOSエラー
+            return FileOperationError(
+                f"ファイルの保存に失敗しました: {output_file}",
+                "ディスク容量やファイルシステムの状態を確認してください",
+                file_path=str(output_file),
+                operation="書き込み",
+            )
+
+        return LogFormattingError(
+            f"ファイル保存中に予期しないエラーが発生しました: {error}",
+            "システム管理者に相談してください",
+        )
 
     def generate_default_filename(
         self,
@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, TypedDict, cast
 
+from ..core.log_storage import is_compressed_log, open_log_binary, open_log_text, raw_log_size
+
 
 class CacheEntry(TypedDict, total=False):
     created: str
@@ -102,7 +104,7 @@ class LogFileStreamer:
         chunk_size = self.memory_limiter.get_chunk_size()
 
         try:
-            with open(file_path, encoding="utf-8", errors="replace") as f:
+            with open_log_text(file_path, errors="replace") as f:
                 while True:
                     chunk = f.read(chunk_size)
                     if not chunk:
@@ -125,7 +127,7 @@ class LogFileStreamer:
             raise FileNotFoundError(f"ログファイルが見つかりません: {file_path}")
 
         try:
-            with open(file_path, encoding="utf-8", errors="replace") as f:
+            with open_log_text(file_path, errors="replace") as f:
                 for line in f:
                     yield line.rstrip("\n\r")
         except Exception as e:
@@ -150,7 +152,8 @@ class LogFileStreamer:
             }
 
         stat = file_path.stat()
-        file_size = stat.st_size
+        # 圧縮されたログは展開後のサイズで判定する
+        file_size = raw_log_size(file_path) if is_compressed_log(file_path) else stat.st_size
 
         # 行数を効率的にカウント
         line_count = self._count_lines_efficiently(file_path, file_size)
@@ -177,6 +180,19 @@ class LogFileStreamer:
         if file_size == 0:
             return 0
 
+        # 圧縮されたログはシークできないため、展開しながら改行を数える
+        if is_compressed_log(file_path):
+            try:
+                line_count = 0
+                last_byte = b""
+                with open_log_binary(file_path) as f:
+                    while chunk := f.read(1024 * 1024):
+                        line_count += chunk.count(b"\n")
+                        last_byte = chunk[-1:]
+                return line_count + (1 if last_byte not in (b"", b"\n") else 0)
+            except Exception:
+                return 0
+
         # 小さなファイルは直接カウント
         if file_size < 1024 * 1024:  # 1MB未満
             try:
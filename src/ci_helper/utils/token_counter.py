@@ -0,0 +1,219 @@
+"""トークン数カウントサービス
+
+tiktokenのエンコーダーをモデルごとにキャッシュし、大きなテキストの厳密なカウント結果を
+内容のハッシュでメモ化します。同じプロンプトとログを分析の中で何度数えても、
+エンコーダーの読み込みとエンコードは1回で済みます。
+
+予算判定用には、1トークンあたりのバイト数による高速な推定を提供します。バイト数は
+厳密にカウントした結果からエンコーディングごとに較正し、推定値が制限に近い場合のみ
+厳密なカウントに切り替えます。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# 未知のモデル・モデル未指定時に使用するエンコーディング
+DEFAULT_ENCODING = "cl100k_base"
+
+# 較正前の1トークンあたりのバイト数（英語のテキストでおおよそ4バイト）
+DEFAULT_BYTES_PER_TOKEN = 4.0
+
+# 推定値が制限のこの割合未満であれば厳密なカウントを省略する
+EXACT_COUNT_THRESHOLD = 0.5
+
+# 厳密なカウント結果をメモ化・較正に使用する最小文字数
+# （これ未満はハッシュを計算するより数え直す方が安く、バイト数とトークン数の比もばらつく）
+MEMO_MIN_CHARS = 1024
+
+# メモ化するカウント結果の最大件数
+MEMO_MAX_ENTRIES = 256
+
+# 較正値の更新で新しい測定値に与える重み
+_CALIBRATION_WEIGHT = 0.3
+
+
+class TokenCounter:
+    """エンコーダーとカウント結果をキャッシュするトークンカウンター
+
+    tiktokenが利用できない場合やエンコーダーを読み込めない場合（オフライン環境など）は、
+    厳密なカウントの代わりに推定値を返します。
+    """
+
+    def __init__(self, tiktoken_module: Any | None = None):
+        """トークンカウンターを初期化
+
+        Args:
+            tiktoken_module: 使用するtiktokenモジュール（Noneの場合は初回使用時にインポート）
+        """
+        self._tiktoken = tiktoken_module
+        self._tiktoken_loaded = tiktoken_module is not None
+        self._encodings: dict[str, Any | None] = {}
+        self._encoding_names: dict[str, str] = {}
+        self._bytes_per_token: dict[str, float] = {}
+        self._memo: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count(self, text: str, model: str | None = None) -> int:
+        """トークン数を厳密にカウント
+
+        Args:
+            text: カウント対象のテキスト
+            model: モデル名（Noneの場合は ``cl100k_base``）
+
+        Returns:
+            トークン数（エンコーダーが利用できない場合は推定値）
+        """
+        encoding = self._get_encoding(model)
+        if encoding is None:
+            return self.estimate(text, model)
+
+        # 小さなテキストはメモ化・較正せずにそのまま数える
+        if len(text) < MEMO_MIN_CHARS:
+            return len(encoding.encode(text))
+
+        key = self._encoding_key(model)
+        data = text.encode("utf-8")
+        memo_key = (key, hashlib.blake2b(data, digest_size=16).digest())
+        with self._lock:
+            cached = self._memo.get(memo_key)
+            if cached is not None:
+                self._memo.move_to_end(memo_key)
+                return cached
+
+        token_count = len(encoding.encode(text))
+
+        with self._lock:
+            if token_count > 0:
+                self._calibrate(key, len(data) / token_count)
+            self._memo[memo_key] = token_count
+            if len(self._memo) > MEMO_MAX_ENTRIES:
+                self._memo.popitem(last=False)
+        return token_count
+
+    def estimate(self, text: str, model: str | None = None) -> int:
+        """トークン数を高速に推定
+
+        UTF-8でのバイト数を、エンコーディングごとに較正した1トークンあたりのバイト数で割ります。
+
+        Args:
+            text: 推定対象のテキスト
+            model: モデル名
+
+        Returns:
+            推定トークン数
+        """
+        if not text:
+            return 0
+        bytes_per_token = self._bytes_per_token.get(self._encoding_key(model), DEFAULT_BYTES_PER_TOKEN)
+        return max(1, round(len(text.encode("utf-8")) / bytes_per_token))
+
+    def count_for_limit(self, text: str, limit: float, model: str | None = None) -> int:
+        """制限との比較に使うトークン数を取得
+
+        推定値が制限から十分に離れている場合は推定値を返し、制限に近い場合のみ厳密にカウントします。
+
+        Args:
+            text: カウント対象のテキスト
+            limit: 比較する制限（トークン数）
+            model: モデル名
+
+        Returns:
+            トークン数（推定値または厳密な値）
+        """
+        estimate = self.estimate(text, model)
+        if estimate < limit * EXACT_COUNT_THRESHOLD:
+            return estimate
+        return self.count(text, model)
+
+    def _calibrate(self, key: str, bytes_per_token: float) -> None:
+        """1トークンあたりのバイト数を更新（ロック取得中に呼び出す）"""
+        current = self._bytes_per_token.get(key)
+        if current is None:
+            self._bytes_per_token[key] = bytes_per_token
+        else:
+            self._bytes_per_token[key] = current + (bytes_per_token - current) * _CALIBRATION_WEIGHT
+
+    def _encoding_key(self, model: str | None) -> str:
+        """較正・メモ化に使うキー（エンコーディング名、未解決の場合はモデル名）"""
+        if model is None:
+            return DEFAULT_ENCODING
+        return self._encoding_names.get(model, model)
+
+    def _get_encoding(self, model: str | None) -> Any | None:
+        """モデルのエンコーダーを取得（キャッシュ済みでなければ読み込む）"""
+        cache_key = model or DEFAULT_ENCODING
+        if cache_key in self._encodings:
+            return self._encodings[cache_key]
+
+        with self._lock:
+            if cache_key in self._encodings:
+                return self._encodings[cache_key]
+
+            tiktoken = self._load_tiktoken()
+            encoding: Any | None = None
+            if tiktoken is not None:
+                try:
+                    if model is None:
+                        encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+                    else:
+                        try:
+                            encoding = tiktoken.encoding_for_model(model)
+                        except KeyError:
+                            # 未知のモデルの場合はcl100k_baseエンコーディングを使用
+                            encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+                except Exception as e:
+                    # エンコーディングのダウンロードに失敗した場合など
+                    logger.warning("トークナイザーを読み込めないため推定値を使用します: %s - %s", cache_key, e)
+                    encoding = None
+
+            if encoding is not None:
+                name = getattr(encoding, "name", None)
+                self._encoding_names[cache_key] = name if isinstance(name, str) else cache_key
+            self._encodings[cache_key] = encoding
+            return encoding
+
+    def _load_tiktoken(self) -> Any | None:
+        """tiktokenをインポート（ロック取得中に呼び出す）"""
+        if not self._tiktoken_loaded:
+            self._tiktoken_loaded = True
+            try:
+                import tiktoken
+
+                self._tiktoken = tiktoken
+            except ImportError:
+                self._tiktoken = None
+        return self._tiktoken
+
+
+_default_counter = TokenCounter()
+_module_counters: weakref.WeakKeyDictionary[Any, TokenCounter] = weakref.WeakKeyDictionary()
+_module_counters_lock = threading.Lock()
+
+
+def get_token_counter(tiktoken_module: Any | None = None) -> TokenCounter:
+    """共有のトークンカウンターを取得
+
+    Args:
+        tiktoken_module: 使用するtiktokenモジュール（Noneまたはインポート済みのtiktokenの場合は共有のカウンター）
+
+    Returns:
+        トークンカウンター
+    """
+    if tiktoken_module is None or tiktoken_module is sys.modules.get("tiktoken"):
+        return _default_counter
+
+    with _module_counters_lock:
+        counter = _module_counters.get(tiktoken_module)
+        if counter is None:
+            counter = TokenCounter(tiktoken_module)
+            _module_counters[tiktoken_module] = counter
+        return counter
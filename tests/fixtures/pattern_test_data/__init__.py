@@ -12,12 +12,18 @@ CI-Helperのパターン認識エンジンをテストするための包括的
 """
 
 import json
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from ci_helper.ai.models import Pattern
+
 # テストデータディレクトリのパス
 TEST_DATA_DIR = Path(__file__).parent
 
+# make_pattern で作成するパターンの作成・更新日時
+PATTERN_TIMESTAMP = datetime(2025, 1, 1)
+
 
 def load_comprehensive_patterns() -> dict[str, Any]:
     """包括的なパターンデータを読み込み"""
@@ -82,6 +88,39 @@ def get_performance_dataset(dataset_id: str) -> dict[str, Any]:
     raise ValueError(f"Performance dataset '{dataset_id}' not found")
 
 
+def make_pattern(
+    pattern_id: str,
+    keywords: list[str],
+    regex_patterns: list[str] | None = None,
+    **overrides: Any,
+) -> Pattern:
+    """テスト用のパターンを作成
+
+    Args:
+        pattern_id: パターンID（名前にも使用）
+        keywords: キーワード
+        regex_patterns: 正規表現パターン（省略時はなし）
+        **overrides: 既定値から変更するパターンの項目
+
+    Returns:
+        カテゴリが ``test`` のパターン
+    """
+    fields: dict[str, Any] = {
+        "id": pattern_id,
+        "name": pattern_id,
+        "category": "test",
+        "regex_patterns": regex_patterns or [],
+        "keywords": keywords,
+        "context_requirements": [],
+        "confidence_base": 0.8,
+        "success_rate": 0.9,
+        "created_at": PATTERN_TIMESTAMP,
+        "updated_at": PATTERN_TIMESTAMP,
+    }
+    fields.update(overrides)
+    return Pattern(**fields)
+
+
 # よく使用されるテストデータのショートカット
 def get_basic_patterns() -> list[dict[str, Any]]:
     """基本的なテスト用パターンを取得"""
@@ -130,6 +169,7 @@ def get_test_data_statistics() -> dict[str, Any]:
 
 
 __all__ = [
+    "PATTERN_TIMESTAMP",
     "TEST_DATA_DIR",
     "get_basic_patterns",
     "get_easy_test_cases",
@@ -147,4 +187,5 @@ __all__ = [
     "load_pattern_matching_test_cases",
     "load_performance_test_data",
     "load_test_log_samples",
+    "make_pattern",
 ]
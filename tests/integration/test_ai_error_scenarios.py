@@ -315,8 +315,11 @@ class TestTokenAndCostLimitScenarios:
             mock_client.chat.completions.create = AsyncMock(return_value=Mock())
             mock_openai.return_value = mock_client
 
-            # count_tokensメソッドをモックして制限を超える値を返す
-            with patch("src.ci_helper.ai.providers.openai.OpenAIProvider.count_tokens", return_value=150000):
+            # トークン数の推定とカウントをモックして制限を超える値を返す
+            with (
+                patch("src.ci_helper.ai.providers.openai.OpenAIProvider.estimate_tokens", return_value=150000),
+                patch("src.ci_helper.ai.providers.openai.OpenAIProvider.count_tokens", return_value=150000),
+            ):
                 ai_integration = AIIntegration(cost_limited_config)
                 await ai_integration.initialize()
 
@@ -0,0 +1,86 @@
+"""
+パフォーマンス最適化のテスト
+
+チャンク境界の計算と、チャンク分割した並列パターンマッチングが
+ログ全体での位置を正しく返すことをテストします。
+"""
+
+from itertools import pairwise
+
+import pytest
+
+from ci_helper.ai.performance_optimizer import LogChunker, PerformanceOptimizer
+from tests.fixtures.pattern_test_data import make_pattern
+
+PATTERNS = [
+    make_pattern("permission", ["permission"], [r"permission denied: \S+"]),
+    make_pattern("timeout", ["timed out"], [r"timed out after \d+s"]),
+]
+
+
+def _build_log(repeat: int = 200) -> str:
+    lines: list[str] = []
+    for i in range(repeat):
+        lines.append(f"step {i}: ✅ ok")
+        if i % 7 == 0:
+            lines.append(f"Error: permission denied: /var/run/docker-{i}.sock")
+        if i % 11 == 0:
+            lines.append(f"job {i} timed out after {i}s")
+    return "\n".join(lines) + "\n"
+
+
+class TestLogChunker:
+    """LogChunkerのテスト"""
+
+    def test_chunk_boundaries_cover_log_on_line_starts(self):
+        """チャンクの担当範囲がログ全体を行頭で区切って覆うことのテスト"""
+        log_content = _build_log()
+        chunker = LogChunker(chunk_size_mb=0.001, overlap_lines=3)
+
+        spans = chunker.chunk_boundaries(log_content)
+
+        assert len(spans) > 1
+        assert spans[0].start == 0
+        assert spans[-1].owned_end == len(log_content)
+        for previous, current in pairwise(spans):
+            assert previous.owned_end == current.start
+            assert log_content[current.start - 1] == "\n"
+            assert previous.owned_end <= previous.end
+
+    def test_chunk_boundaries_overlap_lines(self):
+        """オーバーラップが指定行数だけ次の行を含むことのテスト"""
+        log_content = "a\n" * 10
+        chunker = LogChunker(chunk_size_mb=4 / (1024 * 1024), overlap_lines=2)
+
+        spans = chunker.chunk_boundaries(log_content)
+
+        assert log_content[spans[0].start : spans[0].owned_end] == "a\na\n"
+        assert log_content[spans[0].owned_end : spans[0].end] == "a\na\n"
+
+
+class TestPerformanceOptimizer:
+    """PerformanceOptimizerのチャンク処理のテスト"""
+
+    def test_invalid_execution_backend(self):
+        """不明な実行方式がエラーになることのテスト"""
+        with pytest.raises(ValueError):
+            PerformanceOptimizer(execution_backend="gpu")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend", ["thread", "process"])
+    async def test_chunked_matches_use_global_positions(self, backend):
+        """チャンク処理の結果が直接処理と同じ位置・件数になることのテスト"""
+        log_content = _build_log()
+        direct = PerformanceOptimizer(chunk_size_mb=100.0)
+        chunked = PerformanceOptimizer(chunk_size_mb=0.001, max_workers=2, execution_backend=backend)
+
+        expected, _ = await direct.optimize_pattern_matching(log_content, PATTERNS)
+        actual, metrics = await chunked.optimize_pattern_matching(log_content, PATTERNS, force_chunking=True)
+
+        assert "chunk_processing" in metrics.optimization_applied
+        assert len(actual) == len(expected) > 0
+        assert sorted((m.pattern_id, m.start_position, m.end_position) for m in actual) == sorted(
+            (m.pattern_id, m.start_position, m.end_position) for m in expected
+        )
+        for match in actual:
+            assert log_content[match.start_position : match.end_position] == match.matched_text
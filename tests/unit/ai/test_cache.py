@@ -223,6 +223,93 @@ class TestResponseCache:
         stats = small_cache.get_cache_stats()
         assert stats["total_size_mb"] <= small_cache.max_size_mb
 
+    @pytest.mark.asyncio
+    async def test_size_limit_evicts_least_recently_used(self, cache_dir, sample_analysis_result):
+        """サイズ制限を超えると最終アクセスの古いエントリから削除されることのテスト"""
+        from unittest.mock import patch
+
+        cache = ResponseCache(cache_dir=cache_dir)
+
+        with patch("time.time") as mock_time:
+            for offset, key in enumerate(["old", "used", "new"]):
+                mock_time.return_value = 1000.0 + offset
+                await cache.set(key, sample_analysis_result)
+
+            # "old" にアクセスして最終アクセス時刻を更新
+            mock_time.return_value = 1010.0
+            assert await cache.get("old") is not None
+
+            # 2件分のサイズに制限すると、最終アクセスが最も古い "used" が削除される
+            entry_size = cache._total_size() // 3
+            cache.max_size_mb = (entry_size * 2) / (1024 * 1024)
+            await cache._ensure_cache_size()
+
+            assert await cache.get("used") is None
+            assert await cache.get("old") is not None
+            assert await cache.get("new") is not None
+
+    @pytest.mark.asyncio
+    async def test_access_updates_are_batched(self, response_cache, sample_analysis_result):
+        """アクセス回数の更新がまとめて書き込まれることのテスト"""
+        await response_cache.set("batched_key", sample_analysis_result)
+
+        await response_cache.get("batched_key")
+        await response_cache.get("batched_key")
+        assert response_cache._pending_access["batched_key"][1] == 2
+
+        stats = await response_cache.get_stats()
+
+        assert response_cache._pending_access == {}
+        assert stats["average_access_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_shared_between_instances(self, cache_dir, sample_analysis_result):
+        """同じキャッシュディレクトリを開いた別のインスタンスから読み書きできることのテスト"""
+        writer = ResponseCache(cache_dir=cache_dir)
+        reader = ResponseCache(cache_dir=cache_dir)
+
+        await writer.set("shared_key", sample_analysis_result)
+        cached_result = await reader.get("shared_key")
+        reader.close()
+
+        assert cached_result is not None
+        assert cached_result.summary == sample_analysis_result.summary
+        assert await writer.remove_by_provider("openai") == 1
+        assert writer.get_cache_stats()["total_entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_json_cache(self, cache_dir, sample_analysis_result):
+        """旧形式のJSONファイルのキャッシュがデータベースへ移行されることのテスト"""
+        import json
+        import time
+
+        cache_dir.mkdir(parents=True)
+        legacy_data = ResponseCache(cache_dir=cache_dir.parent / "serializer")._serialize_analysis_result(
+            sample_analysis_result
+        )
+        (cache_dir / "legacy_key.json").write_text(json.dumps(legacy_data), encoding="utf-8")
+        (cache_dir / "cache_metadata.json").write_text(
+            json.dumps(
+                {
+                    "entries": {
+                        "legacy_key": {"created": time.time(), "access_count": 3, "provider": "openai"},
+                        "missing_key": {"created": time.time()},
+                    },
+                    "total_size": 0,
+                }
+            ),
+            encoding="utf-8",
+        )
+
+        cache = ResponseCache(cache_dir=cache_dir)
+
+        assert not (cache_dir / "cache_metadata.json").exists()
+        assert not (cache_dir / "legacy_key.json").exists()
+        cached_result = await cache.get("legacy_key")
+        assert cached_result is not None
+        assert cached_result.summary == sample_analysis_result.summary
+        assert (await cache.get_stats())["provider_breakdown"] == {"openai": 1}
+
 
 class TestCacheManager:
     """キャッシュマネージャーのテスト"""
@@ -0,0 +1,94 @@
+"""
+キャッシュキー用ログフィンガープリントのテスト
+
+実行ごとに変わる値だけが異なるログが同じフィンガープリントになることをテストします。
+"""
+
+import pytest
+
+from ci_helper.ai.cache_fingerprint import compute_log_fingerprint, normalize_log_line
+from ci_helper.ai.cache_manager import CacheManager
+from ci_helper.ai.models import AnalysisResult, AnalysisStatus
+
+FLAKY_LOG_TEMPLATE = (
+    "{timestamp} [CI/test] ⭐ Run Main pytest\n"
+    "Container {container_id} started\n"
+    "FAILED tests/test_api.py::test_fetch - TimeoutError: request timed out after {duration}\n"
+    '  File "{workspace}/tests/test_api.py", line 42, in test_fetch\n'
+    "Error: Process completed with exit code 1.\n"
+    "===== 1 failed in {duration} =====\n"
+)
+
+
+def _flaky_log(timestamp: str, container_id: str, duration: str, workspace: str) -> str:
+    return FLAKY_LOG_TEMPLATE.format(
+        timestamp=timestamp, container_id=container_id, duration=duration, workspace=workspace
+    )
+
+
+class TestLogFingerprint:
+    """フィンガープリント計算のテスト"""
+
+    def test_normalize_log_line_removes_volatile_values(self):
+        """所要時間・コンテナIDを正規化することのテスト"""
+        first = normalize_log_line("Container 3f2a9c1b7d4e started in 1.52s")
+        second = normalize_log_line("Container 91ab0cd2ef34 started in 2m30s")
+
+        assert first == second == "Container [ID] started in [DURATION]"
+
+    def test_same_failure_across_runs_has_same_fingerprint(self):
+        """実行ごとの差異だけが異なるログが同じフィンガープリントになることのテスト"""
+        first = _flaky_log("2025-01-01T10:00:00Z", "3f2a9c1b7d4e", "5.01s", "/var/act/run-1234")
+        second = _flaky_log("2025-02-03T23:59:59Z", "91ab0cd2ef34", "30.7s", "/home/runner/work/app")
+
+        assert first != second
+        assert compute_log_fingerprint(first) == compute_log_fingerprint(second)
+
+    def test_different_failure_has_different_fingerprint(self):
+        """別の失敗を含むログは異なるフィンガープリントになることのテスト"""
+        log = _flaky_log("2025-01-01T10:00:00Z", "3f2a9c1b7d4e", "5.01s", "/var/act/run-1234")
+        other = log.replace("TimeoutError: request timed out", "KeyError: 'user_id'")
+
+        assert compute_log_fingerprint(log) != compute_log_fingerprint(other)
+
+    def test_log_without_failures_uses_normalized_lines(self):
+        """失敗を抽出できないログは正規化した全行で比較することのテスト"""
+        first = compute_log_fingerprint("build started at 2025-01-01T10:00:00Z\n\nstep took 12ms\n")
+        second = compute_log_fingerprint("build started at 2025-03-01T08:30:00Z\nstep took 7ms\n")
+
+        assert first == second
+        assert first != compute_log_fingerprint("deploy started at 2025-01-01T10:00:00Z\n")
+
+
+class TestFingerprintCacheManager:
+    """fingerprintモードのキャッシュマネージャーのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_flaky_failure_reuses_cached_result(self, tmp_path):
+        """同じ失敗の別の実行ログでキャッシュがヒットすることのテスト"""
+        manager = CacheManager(cache_dir=tmp_path / "cache", key_mode="fingerprint")
+        result = AnalysisResult(
+            summary="タイムアウト",
+            root_causes=[],
+            fix_suggestions=[],
+            related_errors=[],
+            confidence_score=0.8,
+            analysis_time=1.0,
+            status=AnalysisStatus.COMPLETED,
+            provider="openai",
+            model="gpt-4o",
+        )
+        first = _flaky_log("2025-01-01T10:00:00Z", "3f2a9c1b7d4e", "5.01s", "/var/act/run-1234")
+        second = _flaky_log("2025-02-03T23:59:59Z", "91ab0cd2ef34", "30.7s", "/var/act/run-5678")
+
+        assert await manager.cache_result("default", first, "gpt-4o", "openai", result)
+        cached_result = await manager.get_cached_result("default", second, "gpt-4o", "openai")
+
+        assert cached_result is not None
+        assert cached_result.summary == "タイムアウト"
+        assert await manager.get_cached_result("custom", second, "gpt-4o", "openai") is None
+
+    def test_invalid_key_mode(self, tmp_path):
+        """不正なキー生成方式を指定するとエラーになることのテスト"""
+        with pytest.raises(ValueError, match="key_mode"):
+            CacheManager(cache_dir=tmp_path / "cache", key_mode="semantic")
@@ -1153,3 +1153,123 @@ AssertionError: Expected 200, got 404
         # メモリエラーが適切に処理されることを確認
         with pytest.raises(AIError, match="セッション初期化中にエラーが発生しました"):
             await integration.start_interactive_session("initial log", options)
+
+
+class TestProviderRacing:
+    """複数プロバイダーの同時実行のテスト"""
+
+    @staticmethod
+    def _provider(name, delay, summary="", error=None, tokens_used=None):
+        """指定した時間後に結果を返す（またはエラーを発生させる）モックプロバイダー"""
+        provider = Mock()
+        provider.name = name
+        provider.config = ProviderConfig(name=name, api_key="test-key", default_model=f"{name}-model")
+        provider.cancelled = False
+
+        async def analyze(prompt, context, options):
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                provider.cancelled = True
+                raise
+            if error is not None:
+                raise error
+            return AnalysisResult(summary=summary, status=AnalysisStatus.COMPLETED, tokens_used=tokens_used)
+
+        provider.analyze = AsyncMock(side_effect=analyze)
+        return provider
+
+    @pytest.fixture
+    def race_integration(self, mock_config, mock_ai_config):
+        """同時実行用のAIIntegration"""
+        integration = AIIntegration(mock_config)
+        integration.ai_config = mock_ai_config
+        integration._initialized = True
+        integration.prompt_manager = Mock()
+        integration.prompt_manager.get_analysis_prompt.return_value = "分析してください"
+        integration.cache_manager = None
+        integration.cost_manager = None
+        return integration
+
+    @pytest.mark.asyncio
+    async def test_first_valid_result_wins_and_rest_are_cancelled(self, race_integration):
+        """最初の有効な結果を返し、残りの分析をキャンセルすることのテスト"""
+        openai = self._provider("openai", 1.0, "openaiの結果")
+        anthropic = self._provider("anthropic", 0.01, "anthropicの結果")
+        local = self._provider("local", 0.0, "")
+        race_integration.providers = {"openai": openai, "anthropic": anthropic, "local": local}
+
+        result = await race_integration.analyze_log(
+            "ERROR: build failed", AnalyzeOptions(race_providers=True, force_ai_analysis=True)
+        )
+
+        assert result.summary == "anthropicの結果"
+        assert result.provider == "anthropic"
+        assert result.model == "anthropic-model"
+        assert openai.cancelled
+        assert race_integration.latency_tracker.latency("anthropic", len("ERROR: build failed")) is not None
+        assert race_integration.latency_tracker.latency("openai", len("ERROR: build failed")) is None
+
+    @pytest.mark.asyncio
+    async def test_failed_providers_are_skipped(self, race_integration):
+        """失敗したプロバイダーを除いて結果を返し、全て失敗した場合は先頭のエラーを発生させることのテスト"""
+        race_integration.providers = {
+            "openai": self._provider("openai", 0.0, error=RateLimitError("openai")),
+            "anthropic": self._provider("anthropic", 0.02, "anthropicの結果"),
+        }
+        options = AnalyzeOptions(race_providers=True, model="gpt-4o", force_ai_analysis=True)
+
+        result = await race_integration.analyze_log("ERROR: build failed", options)
+
+        assert result.provider == "anthropic"
+        assert result.model == "anthropic-model"
+        race_integration.providers["anthropic"].analyze.assert_awaited_once()
+        assert race_integration.providers["anthropic"].analyze.await_args.args[2].model is None
+
+        race_integration.providers["anthropic"] = self._provider(
+            "anthropic", 0.0, error=NetworkError("connection refused")
+        )
+        with pytest.raises(RateLimitError):
+            await race_integration.analyze_log("ERROR: build failed", options)
+
+    @pytest.mark.asyncio
+    async def test_usage_of_discarded_results_is_recorded(self, race_integration):
+        """キャンセルまでに結果を返したプロバイダーの使用量も記録することのテスト"""
+        race_integration.providers = {
+            "openai": self._provider("openai", 1.0, "openaiの結果", tokens_used=TokenUsage(10, 10, 20, 0.3)),
+            "anthropic": self._provider(
+                "anthropic", 0.01, "anthropicの結果", tokens_used=TokenUsage(100, 50, 150, 0.2)
+            ),
+            "local": self._provider("local", 0.0, "", tokens_used=TokenUsage(80, 0, 80, 0.1)),
+        }
+        race_integration.cost_manager = Mock()
+        race_integration.cost_manager.check_usage_limits.return_value = {}
+        race_integration.cost_manager.record_ai_usage = AsyncMock()
+
+        result = await race_integration.analyze_log(
+            "ERROR: build failed", AnalyzeOptions(race_providers=True, force_ai_analysis=True)
+        )
+
+        assert result.provider == "anthropic"
+        recorded = {
+            call.kwargs["provider"]: (call.kwargs["cost"], call.kwargs.get("success", True))
+            for call in race_integration.cost_manager.record_ai_usage.await_args_list
+        }
+        assert recorded == {"anthropic": (0.2, True), "local": (0.1, False)}
+
+    def test_selector_prefers_fastest_provider_for_log_size(self, race_integration):
+        """デフォルトプロバイダーが利用できない場合、ログサイズに対して最も速いプロバイダーを選ぶことのテスト"""
+        race_integration.providers = {
+            "openai": self._provider("openai", 0.0),
+            "local": self._provider("local", 0.0),
+        }
+        race_integration.ai_config.default_provider = "anthropic"
+        tracker = race_integration.latency_tracker
+        tracker.record("openai", 100, 2.0)
+        tracker.record("local", 100, 0.5)
+        tracker.record("openai", 1_000_000, 5.0)
+        tracker.record("local", 1_000_000, 30.0)
+
+        assert race_integration._select_provider(log_size=120).name == "local"
+        assert race_integration._select_provider(log_size=900_000).name == "openai"
+        assert race_integration._select_provider().name == "openai"
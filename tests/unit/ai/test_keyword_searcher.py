@@ -0,0 +1,79 @@
+"""
+キーワード検索器のテスト
+
+複数キーワードの最初の出現位置の検索と、パターンデータベースでの検索器の再利用をテストします。
+"""
+
+from ci_helper.ai.keyword_searcher import KeywordSearcher
+from ci_helper.ai.pattern_database import PatternDatabase
+from tests.fixtures.pattern_test_data import make_pattern
+
+
+class TestKeywordSearcher:
+    """KeywordSearcherのテスト"""
+
+    def test_case_insensitive(self):
+        """大文字小文字を区別せず、元のテキストの位置を返すことのテスト"""
+        searcher = KeywordSearcher(["Permission Denied", "npm ERR"])
+
+        positions = searcher.first_positions("Error: PERMISSION denied\nnpm err! code 1")
+
+        assert positions == {"permission denied": 7, "npm err": 25}
+
+    def test_first_positions_matches_str_find(self):
+        """最初の出現位置が str.find と一致することのテスト"""
+        keywords = ["error", "rror", "エラー", "timeout", "missing"]
+        text = "x error; timeout. エラー発生 error again timeout"
+        searcher = KeywordSearcher(keywords)
+
+        expected = {keyword: text.find(keyword) for keyword in keywords if keyword in text}
+        assert searcher.first_positions(text) == expected
+        assert searcher.find_keywords(text) == set(expected)
+
+    def test_positions_when_lowercasing_changes_length(self):
+        """小文字化で文字数が変わる文字があっても元のテキストの位置を返すことのテスト"""
+        # İ は小文字化すると2文字になる
+        text = "İstanbul build: TIMEOUT reached"
+        searcher = KeywordSearcher(["timeout"])
+
+        assert searcher.first_positions(text) == {"timeout": text.index("TIMEOUT")}
+
+    def test_restrict_to_given_keywords(self):
+        """検索するキーワードを指定できることのテスト"""
+        searcher = KeywordSearcher(["docker", "daemon"])
+
+        assert searcher.find_keywords("Docker daemon is not running", ["DAEMON", "npm"]) == {"daemon"}
+
+    def test_round_trip_dict(self):
+        """辞書への変換と復元で同じキーワードになることのテスト"""
+        searcher = KeywordSearcher(["Docker", "docker", "npm ERR!"])
+
+        restored = KeywordSearcher.from_dict(searcher.to_dict())
+
+        assert restored.keywords == searcher.keywords == ("docker", "npm err!")
+
+    def test_empty_searcher(self):
+        """キーワードがない場合は何も見つからないことのテスト"""
+        searcher = KeywordSearcher(["", ""])
+
+        assert not searcher
+        assert searcher.find_keywords("anything") == set()
+
+
+class TestPatternDatabaseKeywordSearcher:
+    """パターンデータベースのキーワード検索器のテスト"""
+
+    def test_searcher_is_reused_until_patterns_change(self, tmp_path):
+        """検索器がパターン変更まで再利用されることのテスト"""
+        database = PatternDatabase(tmp_path)
+        database.add_pattern(make_pattern("docker", ["docker", "daemon"]))
+
+        searcher = database.get_keyword_searcher()
+        assert database.get_keyword_searcher() is searcher
+        assert searcher.find_keywords("Docker daemon is not running") == {"docker", "daemon"}
+
+        database.add_pattern(make_pattern("npm", ["npm ERR!"]))
+        rebuilt = database.get_keyword_searcher()
+
+        assert rebuilt is not searcher
+        assert rebuilt.find_keywords("npm ERR! code ENOENT") == {"npm err!"}
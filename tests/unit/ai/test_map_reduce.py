@@ -0,0 +1,165 @@
+"""
+大きなログの分割分析のテスト
+
+ジョブのセクションによるチャンク分割、分析結果の統合、コンテキストウィンドウを超えたログの
+並列分析をテストします。
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from ci_helper.ai.exceptions import TokenLimitError
+from ci_helper.ai.integration import AIIntegration
+from ci_helper.ai.map_reduce import MAP_REDUCE_CONCURRENCY, LogChunk, merge_results, split_log
+from ci_helper.ai.models import AnalysisResult, AnalyzeOptions, FixSuggestion, ProviderConfig, RootCause, TokenUsage
+from ci_helper.core.log_analyzer import LogAnalyzer
+
+
+def _job_log(jobs: int, lines_per_job: int = 20) -> str:
+    lines = ['time="2026-01-01T00:00:00Z" level=info msg="Using docker host"']
+    for job in range(jobs):
+        lines.append(f"[CI/job{job}] 🚀 Starting job: job{job}")
+        lines.extend(f"[CI/job{job}]   | step output {line}" for line in range(lines_per_job))
+        lines.append(f"[CI/job{job}]   | ERROR: job{job} failed")
+    return "\n".join(lines) + "\n"
+
+
+def _result(summary: str, cause: str, cost: float = 0.01) -> AnalysisResult:
+    return AnalysisResult(
+        summary=summary,
+        root_causes=[RootCause(category="test", description=cause)],
+        fix_suggestions=[FixSuggestion(title="再実行", description="テストを再実行する")],
+        related_errors=[cause],
+        confidence_score=0.8,
+        tokens_used=TokenUsage(input_tokens=100, output_tokens=50, total_tokens=150, estimated_cost=cost),
+    )
+
+
+class TestLogSplitting:
+    """チャンク分割のテスト"""
+
+    def test_sections_follow_jobs(self):
+        """最初のジョブより前の行とジョブごとの行がセクションになることのテスト"""
+        sections = LogAnalyzer().split_sections(_job_log(3))
+
+        assert [name for name, _ in sections] == ["default", "job0", "job1", "job2"]
+        assert "".join(section for _, section in sections) == _job_log(3)
+
+    def test_sections_follow_act_job_prefixes(self):
+        """ジョブの開始マーカーがなくても act の行接頭辞ごとのジョブがセクションになることのテスト"""
+        log = (
+            "[CI/build] 🚀  Start image=catthehacker/ubuntu:act-latest\n"
+            "[CI/build]   ✅  Success - Main build\n"
+            "[CI/test] 🚀  Start image=catthehacker/ubuntu:act-latest\n"
+            "[CI/test]   | FAILED tests/test_app.py::test_add\n"
+        )
+
+        sections = LogAnalyzer().split_sections(log)
+
+        assert [name for name, _ in sections] == ["build", "test"]
+        assert "FAILED" in sections[1][1]
+
+    def test_small_sections_are_packed_and_large_ones_split(self):
+        """小さなセクションはまとめ、最大サイズを超えるセクションは行の境界で分割することのテスト"""
+        log = _job_log(4) + _job_log(1, lines_per_job=200).replace("job0", "big")
+        max_chars = 2000
+
+        chunks = split_log(log, max_chars)
+
+        assert "".join(chunk.text for chunk in chunks) == log
+        assert all(len(chunk.text) <= max_chars for chunk in chunks)
+        assert chunks[0].sections[:3] == ["default", "job0", "job1"]
+        assert any(section.startswith("big (1/") for chunk in chunks for section in chunk.sections)
+
+    def test_merge_deduplicates_and_sums_usage(self):
+        """統合した結果は重複を除き、トークン使用量とコストを合計することのテスト"""
+        parts = [
+            (LogChunk(text="a", sections=["job0"]), _result("job0が失敗", "依存関係の不足")),
+            (LogChunk(text="b", sections=["job1"]), _result("job1が失敗", "依存関係の不足", cost=0.02)),
+            (LogChunk(text="c", sections=["job2"]), _result("job2が失敗", "タイムアウト")),
+        ]
+
+        merged = merge_results(parts)
+
+        assert merged.summary.index("### job0") < merged.summary.index("### job2")
+        assert [cause.description for cause in merged.root_causes] == ["依存関係の不足", "タイムアウト"]
+        assert len(merged.fix_suggestions) == 1
+        assert merged.related_errors == ["依存関係の不足", "タイムアウト"]
+        assert merged.tokens_used.total_tokens == 450
+        assert merged.tokens_used.estimated_cost == pytest.approx(0.04)
+
+
+class TestMapReduceAnalysis:
+    """コンテキストウィンドウを超えたログの分割分析のテスト"""
+
+    @pytest.fixture
+    def integration(self, mock_config, mock_ai_config):
+        integration = AIIntegration(mock_config)
+        integration.ai_config = mock_ai_config
+        integration._initialized = True
+        integration.prompt_manager = Mock()
+        integration.prompt_manager.get_analysis_prompt.return_value = "分析してください"
+        integration.cache_manager = None
+        integration.cost_manager = None
+        return integration
+
+    @staticmethod
+    def _provider(max_context_chars: int, reported_ratio: float = 1.0) -> Mock:
+        """コンテキストが一定の文字数を超えるとトークン制限エラーを発生させるモックプロバイダー
+
+        エラーで報告するトークン数は文字数に ``reported_ratio`` を掛けた値にします。
+        """
+        provider = Mock()
+        provider.name = "local"
+        provider.config = ProviderConfig(name="local", api_key="", default_model="llama3.2")
+        provider.active = 0
+        provider.max_active = 0
+
+        async def analyze(prompt, context, options):
+            if len(context) > max_context_chars:
+                raise TokenLimitError(int(len(context) * reported_ratio), max_context_chars, "llama3.2")
+            provider.active += 1
+            provider.max_active = max(provider.max_active, provider.active)
+            await asyncio.sleep(0.01)
+            provider.active -= 1
+            job = context.split("ERROR: ")[-1].split()[0]
+            return _result(f"{job}の分析", f"{job}の原因")
+
+        provider.analyze = AsyncMock(side_effect=analyze)
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_large_log_is_analyzed_in_parallel_chunks(self, integration):
+        """制限を超えたログをチャンクに分割して並列に分析し、結果を統合することのテスト"""
+        provider = self._provider(max_context_chars=1500)
+        integration.providers = {"local": provider}
+        log = _job_log(12)
+
+        result = await integration.analyze_log(log, AnalyzeOptions(force_ai_analysis=True))
+
+        causes = [cause.description for cause in result.root_causes]
+        assert all(f"job{job}の原因" in causes for job in range(12))
+        assert result.log_info["chunks"] > 1
+        assert 1 < provider.max_active <= MAP_REDUCE_CONCURRENCY
+        assert result.tokens_used.total_tokens == 150 * result.log_info["chunks"]
+        assert result.provider == "local"
+
+    @pytest.mark.asyncio
+    async def test_chunk_over_limit_is_split_again(self, integration):
+        """推定より大きなチャンクはさらに分割して分析し、分割できない場合はエラーを発生させることのテスト"""
+        # 報告されるトークン数が実際より少ないため、最初のチャンクは制限を超える
+        provider = self._provider(max_context_chars=600, reported_ratio=0.25)
+        integration.providers = {"local": provider}
+        log = _job_log(2)
+
+        result = await integration.analyze_log(log, AnalyzeOptions(force_ai_analysis=True))
+
+        assert "job1の原因" in [cause.description for cause in result.root_causes]
+        # ログ全体・分割前のチャンクの分析が制限を超えた分だけ、呼び出し回数がチャンク数より多い
+        assert provider.analyze.await_count > 1 + result.log_info["chunks"]
+
+        integration.providers = {"local": self._provider(max_context_chars=5)}
+        with pytest.raises(TokenLimitError):
+            await integration.analyze_log(log, AnalyzeOptions(force_ai_analysis=True))
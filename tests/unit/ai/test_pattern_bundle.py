@@ -0,0 +1,146 @@
+"""
+パターンバンドルのテスト
+
+検証済みパターンのバンドルの保存・読み込みと、パターンファイル変更時の無効化をテストします。
+"""
+
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from ci_helper.ai.keyword_searcher import KeywordSearcher
+from ci_helper.ai.models import Pattern
+from ci_helper.ai.pattern_bundle import BUNDLE_FILENAME, PatternBundle, hash_pattern_sources, pattern_to_dict
+from ci_helper.ai.pattern_database import PatternDatabase
+from tests.fixtures.pattern_test_data import make_pattern
+
+
+def _write_patterns(data_dir, filename: str, patterns: list[Pattern]) -> None:
+    data = {"patterns": [pattern_to_dict(pattern) for pattern in patterns]}
+    (data_dir / filename).write_text(json.dumps(data), encoding="utf-8")
+
+
+def _database(data_dir) -> PatternDatabase:
+    """カレントディレクトリのlegacyファイルを読み込まないパターンデータベース"""
+    database = PatternDatabase(data_dir)
+    database.legacy_pattern_file = data_dir / "legacy" / "failure_patterns.json"
+    return database
+
+
+class TestPatternBundle:
+    """PatternBundleのテスト"""
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """保存したバンドルが同じ内容で読み込めることのテスト"""
+        pattern = Pattern(
+            id="docker",
+            name="Docker",
+            category="ci",
+            regex_patterns=[r"docker.*denied"],
+            keywords=["Docker", "denied"],
+            context_requirements=["daemon"],
+            confidence_base=0.9,
+            success_rate=0.8,
+            created_at=datetime(2025, 1, 1, 9, 30),
+            updated_at=datetime(2025, 2, 1, 10, 0),
+            user_defined=True,
+            occurrence_count=3,
+        )
+        bundle_path = tmp_path / BUNDLE_FILENAME
+        PatternBundle("hash", {"docker": pattern}, KeywordSearcher(pattern.keywords)).save(bundle_path)
+
+        loaded = PatternBundle.load(bundle_path, "hash")
+
+        assert loaded is not None
+        assert loaded.patterns == {"docker": pattern}
+        assert loaded.keyword_searcher.first_positions("DOCKER: permission denied") == {"docker": 0, "denied": 19}
+
+    def test_load_rejects_stale_or_corrupted_bundle(self, tmp_path):
+        """ハッシュが異なる・破損したバンドルを読み込まないことのテスト"""
+        bundle_path = tmp_path / BUNDLE_FILENAME
+        PatternBundle("old", {}, KeywordSearcher([])).save(bundle_path)
+
+        assert PatternBundle.load(bundle_path, "new") is None
+
+        bundle_path.write_text("{broken", encoding="utf-8")
+        assert PatternBundle.load(bundle_path, "old") is None
+        assert PatternBundle.load(tmp_path / "missing.json", "old") is None
+
+    def test_hash_changes_with_content_and_presence(self, tmp_path):
+        """ファイルの内容や有無が変わるとハッシュが変わることのテスト"""
+        path = tmp_path / "ci_patterns.json"
+        missing_hash = hash_pattern_sources([path])
+
+        path.write_text("{}", encoding="utf-8")
+        first_hash = hash_pattern_sources([path])
+        path.write_text('{"patterns": []}', encoding="utf-8")
+
+        assert len({missing_hash, first_hash, hash_pattern_sources([path])}) == 3
+
+
+class TestPatternDatabaseBundle:
+    """パターンデータベースでのバンドル利用のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_files_load_from_bundle(self, tmp_path):
+        """パターンファイルが変わらなければJSONの解析と検証を省略することのテスト"""
+        _write_patterns(tmp_path, "ci_patterns.json", [make_pattern("docker", ["docker"])])
+
+        first = _database(tmp_path)
+        await first.load_patterns()
+        assert (tmp_path / BUNDLE_FILENAME).exists()
+
+        second = _database(tmp_path)
+        with (
+            patch.object(PatternDatabase, "_load_new_pattern_files") as load_files,
+            patch.object(PatternDatabase, "_validate_pattern") as validate,
+        ):
+            await second.load_patterns()
+
+        load_files.assert_not_called()
+        validate.assert_not_called()
+        assert second.patterns == first.patterns
+        assert second.get_keyword_searcher().find_keywords("Docker failed") == {"docker"}
+
+    @pytest.mark.asyncio
+    async def test_changed_files_invalidate_bundle(self, tmp_path):
+        """パターンファイルが変更されるとバンドルを作り直すことのテスト"""
+        _write_patterns(tmp_path, "ci_patterns.json", [make_pattern("docker", ["docker"])])
+        await _database(tmp_path).load_patterns()
+
+        _write_patterns(
+            tmp_path,
+            "ci_patterns.json",
+            [make_pattern("docker", ["docker"]), make_pattern("npm", ["npm"])],
+        )
+        database = _database(tmp_path)
+        await database.load_patterns()
+
+        assert set(database.patterns) == {"docker", "npm"}
+        assert database.get_keyword_searcher().find_keywords("npm failed") == {"npm"}
+
+    @pytest.mark.asyncio
+    async def test_legacy_file_is_not_bundled(self, tmp_path):
+        """legacyファイルのパターンはバンドルに含めず、読み込むたびに追加することのテスト"""
+        _write_patterns(tmp_path, "ci_patterns.json", [make_pattern("docker", ["docker"])])
+        with_legacy = _database(tmp_path)
+        with_legacy.legacy_pattern_file.parent.mkdir()
+        with_legacy.legacy_pattern_file.write_text(
+            json.dumps(
+                {"mock_mismatch": {"error_signature": "assert_called.*with", "examples": ["assert_called_with"]}}
+            ),
+            encoding="utf-8",
+        )
+        await with_legacy.load_patterns()
+        assert set(with_legacy.patterns) == {"docker", "mock_mismatch"}
+
+        bundle = PatternBundle.load(with_legacy.bundle_path, hash_pattern_sources(with_legacy._pattern_source_paths()))
+        assert bundle is not None
+        assert set(bundle.patterns) == {"docker"}
+
+        from_bundle = _database(tmp_path)
+        await from_bundle.load_patterns()
+        assert set(from_bundle.patterns) == {"docker", "mock_mismatch"}
+        assert from_bundle.get_keyword_searcher().find_keywords("assert_called_with") == {"assert_called_with"}
@@ -8,8 +8,10 @@ from datetime import datetime
 
 import pytest
 
+from src.ci_helper.ai.keyword_searcher import KeywordSearcher
 from src.ci_helper.ai.models import Pattern
 from src.ci_helper.ai.pattern_matcher import Match, PatternMatcher
+from src.ci_helper.core.log_index import LineIndex
 
 
 class TestPatternMatcher:
@@ -139,6 +141,24 @@ SyntaxError: EOL while scanning string literal
         combined_context = context_before + context_after
         assert "docker" in combined_context.lower() or "permission" in combined_context.lower()
 
+    def test_extract_error_context_with_log_index(self, pattern_matcher):
+        """行インデックス指定時にコンテキストが行単位で区切られることのテスト"""
+        text = "\n".join(
+            [
+                "first line is long enough to be cut by the window",
+                "docker run step",
+                "Error: permission denied while writing",
+                "cleanup step",
+                "last line is long enough to be cut by the window",
+            ]
+        )
+        position = text.find("permission denied")
+
+        context_before, context_after = pattern_matcher.extract_error_context(text, position, LineIndex(text))
+
+        assert context_before.startswith("docker run step")
+        assert context_after.endswith("cleanup step")
+
     def test_calculate_match_strength(self, pattern_matcher, sample_patterns):
         """マッチ強度計算のテスト"""
         # テスト用のマッチオブジェクトを作成
@@ -456,3 +476,16 @@ SyntaxError: EOL while scanning string literal
 
         assert "エラー" in regex_matched_texts or "失敗" in regex_matched_texts
         assert any(keyword in keyword_matched_texts for keyword in ["エラー", "失敗", "例外"])
+
+    def test_match_keyword_patterns_with_shared_searcher(self, pattern_matcher, sample_patterns, sample_log_text):
+        """共有の検索器を渡した場合も同じ結果になることのテスト"""
+        searcher = KeywordSearcher(
+            [keyword for pattern in sample_patterns for keyword in pattern.keywords] + ["unrelated keyword"],
+        )
+
+        expected = pattern_matcher.match_keyword_patterns(sample_log_text, sample_patterns)
+        actual = pattern_matcher.match_keyword_patterns(sample_log_text, sample_patterns, keyword_searcher=searcher)
+
+        assert actual == expected
+        for match in actual:
+            assert sample_log_text[match.start_position : match.end_position].lower() == match.matched_text.lower()
@@ -0,0 +1,53 @@
+"""
+プロバイダーの応答時間の記録のテスト
+
+ログサイズの区分ごとの記録、最も近い区分による推定、速い順の並べ替え、保存と読み込みをテストします。
+"""
+
+from ci_helper.ai.provider_latency import LATENCY_SMOOTHING, ProviderLatencyTracker, size_bucket
+
+
+class TestProviderLatencyTracker:
+    """ProviderLatencyTrackerのテスト"""
+
+    def test_latency_is_smoothed_per_size_bucket(self):
+        """同じ区分の応答時間を指数移動平均で更新することのテスト"""
+        tracker = ProviderLatencyTracker()
+
+        tracker.record("openai", 1000, 2.0)
+        tracker.record("openai", 1010, 4.0)
+        tracker.record("openai", 100_000, 10.0)
+
+        assert size_bucket(1000) == size_bucket(1010)
+        assert tracker.latency("openai", 1000) == 2.0 + (4.0 - 2.0) * LATENCY_SMOOTHING
+        assert tracker.latency("openai", 100_000) == 10.0
+
+    def test_nearest_bucket_is_used_without_exact_record(self):
+        """同じ区分の記録がない場合は最も近い区分の記録を使用することのテスト"""
+        tracker = ProviderLatencyTracker()
+        tracker.record("local", 1000, 1.0)
+        tracker.record("local", 1_000_000, 20.0)
+
+        assert tracker.latency("local", 2000) == 1.0
+        assert tracker.latency("local", 500_000) == 20.0
+        assert tracker.latency("anthropic", 2000) is None
+
+    def test_rank_orders_known_providers_before_unknown(self):
+        """記録のあるプロバイダーを速い順に並べ、記録のないプロバイダーを後ろに置くことのテスト"""
+        tracker = ProviderLatencyTracker()
+        tracker.record("openai", 5000, 3.0)
+        tracker.record("local", 5000, 1.0)
+
+        assert tracker.rank(["anthropic", "openai", "local"], 5000) == ["local", "openai", "anthropic"]
+        assert tracker.fastest(["anthropic", "openai"], 5000) == "openai"
+        assert tracker.fastest(["anthropic"], 5000) is None
+
+    def test_records_are_persisted(self, tmp_path):
+        """記録を保存し、次回の初期化時に読み込むことのテスト"""
+        storage_path = tmp_path / "ai" / "latency.json"
+        ProviderLatencyTracker(storage_path).record("openai", 5000, 3.0)
+
+        assert ProviderLatencyTracker(storage_path).latency("openai", 5000) == 3.0
+
+        storage_path.write_text("{broken", encoding="utf-8")
+        assert ProviderLatencyTracker(storage_path).latency("openai", 5000) is None
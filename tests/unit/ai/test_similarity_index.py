@@ -0,0 +1,167 @@
+"""
+キーワード集合の類似度検索のテスト
+
+類似度インデックスの検索結果が全件比較と一致すること、正規表現の必須リテラルの抽出、
+学習エンジンの未知エラー処理での利用をテストします。
+"""
+
+import json
+import random
+import re
+
+import pytest
+
+from ci_helper.ai.learning_engine import LearningEngine
+from ci_helper.ai.pattern_database import PatternDatabase
+from ci_helper.ai.similarity_index import PatternSimilarityIndex, SetSimilarityIndex, required_literal
+from tests.fixtures.pattern_test_data import make_pattern
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b)
+
+
+class TestSetSimilarityIndex:
+    """類似度インデックスのテスト"""
+
+    def test_matches_brute_force(self):
+        """検索結果が全件比較と一致する"""
+        rng = random.Random(42)  # noqa: S311 - 再現可能なテストデータの生成
+        vocabulary = [f"word{i}" for i in range(30)]
+        sets = [set(rng.sample(vocabulary, rng.randint(1, 8))) for _ in range(300)]
+        groups = [rng.choice(["build", "test"]) for _ in sets]
+        index = SetSimilarityIndex.build(
+            (key, tokens, group) for key, (tokens, group) in enumerate(zip(sets, groups, strict=True))
+        )
+
+        for tokens in sets[:100]:
+            # 登録済みの集合に近い集合で検索する
+            query = set(tokens)
+            query.symmetric_difference_update(rng.sample(vocabulary, rng.randint(0, 2)))
+            if not query:
+                continue
+            expected = [
+                key for key, stored in enumerate(sets) if groups[key] == "build" and _jaccard(stored, query) > 0.7
+            ]
+            assert index.find_similar(query, "build") == expected
+
+    def test_added_sets_are_searchable(self):
+        """構築後に追加した集合も検索できる"""
+        index = SetSimilarityIndex.build([(0, ["a", "b", "c"], None)])
+        index.add(1, ["x", "y", "z", "w"])
+
+        assert index.find_similar(["x", "y", "z", "w"]) == [1]
+        assert index.find_similar(["a", "b", "c"]) == [0]
+        assert index.find_similar([]) == []
+        assert len(index) == 2
+
+
+class TestRequiredLiteral:
+    """正規表現の必須リテラルの抽出のテスト"""
+
+    @pytest.mark.parametrize(
+        ("pattern", "expected"),
+        [
+            (r"ModuleNotFoundError: No module named", "modulenotfounderror: no module named"),
+            (r"(?i)permission\s+denied", "permission"),
+            (r"colou?r mismatch", "r mismatch"),
+            (r"fo+bar", "bar"),
+            (r"x\.y\.z", "x.y.z"),
+            (r"[abc]defg{2,3}", "def"),
+            (r"error|failure", None),
+            (r"\x41BC", None),
+            (r".*", None),
+        ],
+    )
+    def test_required_literal(self, pattern, expected):
+        assert required_literal(re.compile(pattern, re.IGNORECASE)) == expected
+
+    def test_literal_is_in_every_match(self):
+        """抽出したリテラルはマッチしたテキストに必ず含まれる"""
+        rng = random.Random(7)  # noqa: S311 - 再現可能なテストデータの生成
+        alphabet = "ab.*+?()[]{}\\^$12 xy-"
+        for _ in range(20000):
+            pattern = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 10)))
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error:
+                continue
+            literal = required_literal(compiled)
+            if not literal:
+                continue
+            for _ in range(5):
+                text = "".join(rng.choice("abxyAB12 -.") for _ in range(rng.randint(0, 12)))
+                if compiled.search(text):
+                    assert literal in text.lower()
+
+
+class TestPatternSimilarityIndex:
+    """パターンの重複チェックのテスト"""
+
+    def test_duplicate_by_regex_and_keywords(self):
+        """正規表現のマッチまたはキーワードの類似度で重複と判定する"""
+        index = PatternSimilarityIndex(
+            [
+                make_pattern("module", ["module"], [r"ModuleNotFoundError: No module named '\w+'", "[unclosed"]),
+                make_pattern("docker", ["docker permission denied"], [r"(denied|forbidden)"]),
+            ]
+        )
+
+        assert index.is_duplicate("ModuleNotFoundError: No module named 'requests'")
+        assert index.is_duplicate("Access FORBIDDEN")
+        assert index.is_duplicate("docker permission denied")
+        assert not index.is_duplicate("Segmentation fault in worker process")
+
+    def test_pattern_database_rebuilds_index_on_change(self, temp_dir):
+        """パターンの追加でインデックスが作り直される"""
+        database = PatternDatabase(temp_dir)
+        assert not database.get_similarity_index().is_duplicate("CustomFrameworkError: init failed")
+
+        database.add_pattern(make_pattern("custom", ["custom", "framework"], [r"CustomFrameworkError"]))
+
+        assert database.get_similarity_index().is_duplicate("CustomFrameworkError: init failed")
+
+
+class TestLearningEngineUnknownErrors:
+    """学習エンジンの未知エラー処理のテスト"""
+
+    @pytest.fixture
+    async def learning_engine(self, temp_dir):
+        engine = LearningEngine(PatternDatabase(temp_dir / "patterns"), learning_data_dir=temp_dir / "learning")
+        await engine.initialize()
+        return engine
+
+    @staticmethod
+    def _unknown_error(keywords: list[str], category: str = "build") -> dict:
+        return {"error_category": category, "error_features": {"error_keywords": keywords}}
+
+    @pytest.mark.asyncio
+    async def test_similar_errors_are_merged(self, learning_engine):
+        """類似の未知エラーは発生回数を更新する"""
+        first = await learning_engine.process_unknown_error(self._unknown_error(["gcc", "linker", "undefined", "ref"]))
+        second = await learning_engine.process_unknown_error(self._unknown_error(["gcc", "linker", "undefined", "ref"]))
+        other = await learning_engine.process_unknown_error(
+            self._unknown_error(["gcc", "linker", "undefined", "ref"], "test")
+        )
+
+        assert first["is_new"] is True
+        assert second["is_new"] is False
+        assert second["occurrence_count"] == 2
+        assert other["is_new"] is True
+
+        stored = json.loads(learning_engine.unknown_errors_file.read_text(encoding="utf-8"))
+        assert [error["occurrence_count"] for error in stored] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_external_changes_are_reloaded(self, learning_engine):
+        """他の処理がファイルを書き換えた場合は読み込み直す"""
+        await learning_engine.process_unknown_error(self._unknown_error(["npm", "install", "failed"]))
+
+        learning_engine.unknown_errors_file.write_text(
+            json.dumps([self._unknown_error(["pip", "resolver", "conflict"]) | {"occurrence_count": 4}]),
+            encoding="utf-8",
+        )
+        result = await learning_engine.process_unknown_error(self._unknown_error(["pip", "resolver", "conflict"]))
+
+        assert result["is_new"] is False
+        assert result["occurrence_count"] == 5
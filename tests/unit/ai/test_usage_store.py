@@ -0,0 +1,155 @@
+"""
+使用量ストアのテスト
+
+日別・月別の集計、旧形式のJSONファイルの取り込み、古いデータの削除をテストします。
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from ci_helper.ai.cost_tracker import CostTracker
+from ci_helper.ai.usage_store import UsageRecord, UsageStore
+
+
+def _record(timestamp: str, provider: str = "openai", cost: float = 0.01, success: bool = True) -> UsageRecord:
+    return UsageRecord(
+        timestamp=timestamp,
+        provider=provider,
+        model="gpt-4o",
+        input_tokens=100,
+        output_tokens=50,
+        total_tokens=150,
+        cost=cost,
+        analysis_type="analysis",
+        success=success,
+    )
+
+
+class TestUsageStore:
+    """使用量ストアのテスト"""
+
+    @pytest.fixture
+    def store(self, temp_dir):
+        store = UsageStore(temp_dir / "usage.db")
+        yield store
+        store.close()
+
+    def test_add_updates_rollups(self, store):
+        """レコードの追加で日別・月別の集計が更新される"""
+        store.add(_record("2026-03-01T10:00:00", cost=0.01))
+        store.add(_record("2026-03-01T11:00:00", cost=0.02, success=False))
+        store.add(_record("2026-03-02T09:00:00", cost=0.04))
+        store.add(_record("2026-04-01T09:00:00", provider="anthropic", cost=0.08))
+
+        (first_day,) = store.daily_rollups("2026-03-01", "2026-03-02")
+        assert first_day["requests"] == 2
+        assert first_day["successful_requests"] == 1
+        assert first_day["total_tokens"] == 300
+        assert first_day["cost"] == pytest.approx(0.03)
+
+        assert store.monthly_cost("2026-03", "openai") == pytest.approx(0.07)
+        assert store.monthly_cost("2026-04", "openai") == 0.0
+        assert store.providers() == ["anthropic", "openai"]
+        assert len(store.daily_rollups(provider="anthropic")) == 1
+
+    def test_record_rollups_by_time_range(self, store):
+        """時刻の範囲で絞り込んだレコードを集計できる"""
+        store.add(_record("2026-03-01T10:00:00", cost=0.01))
+        store.add(_record("2026-03-01T18:00:00", cost=0.02))
+
+        (rollup,) = store.record_rollups("2026-03-01T12:00:00", "2026-03-02")
+        assert rollup["requests"] == 1
+        assert rollup["cost"] == pytest.approx(0.02)
+
+    def test_delete_before_adjusts_rollups(self, store):
+        """削除したレコードの分が集計から差し引かれる"""
+        store.add(_record("2026-02-28T10:00:00", cost=0.01))
+        store.add(_record("2026-03-01T10:00:00", cost=0.02))
+        store.add(_record("2026-03-01T18:00:00", cost=0.04))
+
+        assert store.delete_before("2026-03-01T12:00:00") == 2
+
+        assert store.days() == {"2026-03-01"}
+        (rollup,) = store.daily_rollups()
+        assert rollup["requests"] == 1
+        assert rollup["cost"] == pytest.approx(0.04)
+        assert store.monthly_cost("2026-02", "openai") == 0.0
+        assert store.monthly_cost("2026-03", "openai") == pytest.approx(0.04)
+        assert [record["timestamp"] for record in store.iter_records()] == ["2026-03-01T18:00:00"]
+
+    def test_in_memory_store_writes_on_flush(self, temp_dir):
+        """メモリ上のストアは flush() でファイルに書き込む"""
+        db_path = temp_dir / "usage.db"
+        store = UsageStore(db_path, in_memory=True)
+        store.add(_record("2026-03-01T10:00:00"))
+        assert not db_path.exists()
+
+        store.flush()
+        store.close()
+
+        reopened = UsageStore(db_path)
+        assert reopened.monthly_cost("2026-03", "openai") == pytest.approx(0.01)
+        reopened.close()
+
+
+class TestCostTrackerUsageStore:
+    """使用量ストアを使ったコストトラッカーのテスト"""
+
+    def test_legacy_json_is_imported_once(self, temp_dir):
+        """旧形式のJSONファイルは1回だけ取り込まれる"""
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
+        earlier = (now - timedelta(days=1)).strftime("%Y-%m-%d")
+        storage_path = temp_dir / "usage.json"
+        storage_path.write_text(
+            json.dumps(
+                {
+                    "records": [_record(now.isoformat(), cost=0.01)],
+                    today: {
+                        "openai": {"gpt-4o": {"input_tokens": 100, "output_tokens": 50, "cost": 0.01, "requests": 1}}
+                    },
+                    earlier: {
+                        "openai": {"gpt-4o": {"input_tokens": 10, "output_tokens": 5, "cost": 0.5, "requests": 3}}
+                    },
+                }
+            ),
+            encoding="utf-8",
+        )
+
+        CostTracker(storage_path).store.close()
+        tracker = CostTracker(storage_path)
+
+        # レコードのある日はレコードから、レコードのない日は日別の使用量から取り込む
+        assert tracker.get_provider_usage("openai").total_requests == 4
+        assert tracker.get_provider_usage("openai").total_cost == pytest.approx(0.51)
+        assert tracker.usage_data[today]["openai"]["gpt-4o"]["requests"] == 1
+        assert tracker.usage_data[earlier]["openai"]["gpt-4o"]["requests"] == 3
+        assert tracker.get_providers() == ["openai"]
+
+    def test_check_limits_uses_monthly_rollup(self, temp_dir):
+        """使用制限のチェックは当月の集計を使用する"""
+        tracker = CostTracker(temp_dir / "usage.json", cost_limits={"monthly_usd": 1.0})
+        now = datetime.now()
+        tracker.record_usage("openai", "gpt-4o", 100, 50, 0.25, timestamp=now)
+        tracker.record_usage("openai", "gpt-4o", 100, 50, 5.0, timestamp=now - timedelta(days=40))
+
+        status = tracker.check_limits("openai")
+
+        assert status.current_usage == pytest.approx(0.25)
+        assert status.remaining == pytest.approx(0.75)
+
+    def test_usage_stats_excludes_records_before_cutoff(self, temp_dir):
+        """期間の最初の日は時刻で絞り込む"""
+        tracker = CostTracker(temp_dir / "usage.json")
+        now = datetime.now()
+        tracker.record_usage("openai", "gpt-4o", 100, 50, 0.1, timestamp=now - timedelta(days=7, hours=1))
+        tracker.record_usage("openai", "gpt-4o", 100, 50, 0.2, timestamp=now - timedelta(days=6))
+        tracker.record_usage("openai", "gpt-4o", 100, 50, 0.4, timestamp=now)
+
+        stats = tracker.get_usage_stats(days=7)
+
+        assert stats.total_requests == 2
+        assert stats.total_cost == pytest.approx(0.6)
+        assert tracker.get_cost_breakdown(days=7)["record_count"] == 2
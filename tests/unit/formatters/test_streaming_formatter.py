@@ -454,6 +454,60 @@ class TestProgressTrackingFormatter:
         assert time_unknown == 1.0
 
 
+class TestFormatChunks:
+    """出力を順に生成するフォーマットのテスト"""
+
+    @pytest.mark.parametrize("format_name", ["ai", "human", "markdown"])
+    def test_chunks_match_format(self, format_name, sample_execution_result):
+        """断片を連結した結果が通常のフォーマット結果と一致することのテスト"""
+        from ci_helper.formatters.formatter_manager import FormatterManager
+
+        manager = FormatterManager()
+
+        chunks = list(manager.format_log_stream(sample_execution_result, format_name))
+
+        assert "".join(chunks) == manager.format_log(sample_execution_result, format_name, use_optimization=False)
+
+    def test_json_chunks_are_incremental(self, monkeypatch, sample_execution_result):
+        """JSONは逐次エンコードされ、連結すると同じ構造になることのテスト"""
+        import json
+
+        from ci_helper.formatters.formatter_manager import FormatterManager
+
+        monkeypatch.setattr("ci_helper.core.security.SANITIZE_BLOCK_CHARS", 64)
+        monkeypatch.setattr("ci_helper.core.security.SANITIZE_OVERLAP_CHARS", 16)
+        manager = FormatterManager()
+
+        chunks = list(manager.format_log_stream(sample_execution_result, "json", use_optimization=True))
+        streamed = json.loads("".join(chunks))
+        formatted = json.loads(manager.format_log(sample_execution_result, "json"))
+
+        assert len(chunks) > 1
+        streamed["format_info"].pop("generated_at")
+        formatted["format_info"].pop("generated_at")
+        assert streamed == formatted
+
+    def test_chunks_are_sanitized(self, monkeypatch, sample_execution_result):
+        """シークレットは断片の境界によらずサニタイズされることのテスト"""
+        from ci_helper.formatters.ai_context_formatter import AIContextFormatter
+
+        monkeypatch.setattr("ci_helper.core.security.SANITIZE_BLOCK_CHARS", 16)
+        sample_execution_result.workflows[0].jobs[0].failures[0].message = 'password = "hunter2secret"'
+
+        output = "".join(AIContextFormatter().format_chunks(sample_execution_result))
+
+        assert "hunter2secret" not in output
+        assert "[REDACTED]_PASSWORD" in output
+
+    def test_invalid_options_raise_before_streaming(self, sample_execution_result):
+        """無効なオプションは断片の生成前に検出されることのテスト"""
+        from ci_helper.core.exceptions import UserInputError
+        from ci_helper.formatters.formatter_manager import FormatterManager
+
+        with pytest.raises(UserInputError):
+            FormatterManager().format_log_stream(sample_execution_result, "json", compact="yes")
+
+
 @pytest.fixture
 def sample_execution_result():
     """テスト用のExecutionResultフィクスチャ"""
@@ -13,6 +13,8 @@ import pytest
 
 from ci_helper.core.cache_manager import CacheManager
 from ci_helper.core.exceptions import ExecutionError
+from ci_helper.core.log_manager import LogManager
+from ci_helper.core.models import ExecutionResult
 from ci_helper.utils.config import Config
 
 
@@ -241,6 +243,31 @@ class TestLogsOnlyCleanup:
         assert len(result["errors"]) == 0
         assert new_log.exists()
 
+    @pytest.mark.parametrize("remove_all", [False, True])
+    def test_cleanup_logs_removes_history_entries(self, temp_dir: Path, remove_all: bool):
+        """削除したログが統計と実行履歴からも消えることのテスト"""
+        config = Config(project_root=temp_dir, validate_security=False)
+        config._config["max_log_files"] = 1
+        log_manager = LogManager(config)
+        now = datetime.now()
+        for i in range(3):
+            timestamp = now - timedelta(hours=3 - i)
+            execution = ExecutionResult(success=True, workflows=[], total_duration=1.0, timestamp=timestamp)
+            log_path = log_manager.save_execution_log(execution, f"log content {i}")
+            os.utime(log_path, (timestamp.timestamp(), timestamp.timestamp()))
+
+        result = CacheManager(config).cleanup_logs_only(dry_run=False, remove_all=remove_all)
+
+        remaining = 0 if remove_all else 1
+        assert result["deleted_files"] == 3 - remaining
+        assert len(result["errors"]) == 0
+
+        log_manager = LogManager(config)
+        assert log_manager.get_log_statistics()["total_logs"] == remaining
+        assert len(log_manager.get_execution_history()) == remaining
+        previous = log_manager.get_previous_execution(now)
+        assert (previous.timestamp if previous else None) == (now - timedelta(hours=1) if remaining else None)
+
 
 class TestCacheOnlyCleanup:
     """キャッシュファイルのみのクリーンアップテスト"""
@@ -4,14 +4,16 @@ CI実行エンジンのユニットテスト
 CIRunnerクラスの各機能をテストします。
 """
 
+import io
 import subprocess
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
 import pytest
 
 from ci_helper.core.ci_runner import CIRunner
 from ci_helper.core.exceptions import ExecutionError, SecurityError
+from ci_helper.core.log_stream import ActLogWriter
 from ci_helper.core.models import ExecutionResult, WorkflowResult
 from ci_helper.utils.config import Config
 
@@ -101,51 +103,41 @@ class TestWorkflowDiscovery:
 class TestActExecution:
     """act実行のテスト"""
 
-    @patch("subprocess.run")
-    def test_execute_act_success(self, mock_run, sample_workflow_dir: Path, sample_config: Config):
+    @pytest.fixture
+    def mock_popen(self):
+        """actプロセスのモック（出力を1行返して正常終了する）"""
+        with patch("subprocess.Popen") as mock_popen:
+            process = Mock()
+            process.stdout = io.StringIO("Workflow completed successfully\n")
+            process.wait.return_value = 0
+            mock_popen.return_value = process
+            yield mock_popen
+
+    def test_stream_act_success(self, mock_popen, sample_workflow_dir: Path, sample_config: Config):
         """act実行成功のテスト"""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Workflow completed successfully"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
-
+        log_writer = ActLogWriter()
         runner = CIRunner(sample_config)
         workflow_file = sample_workflow_dir / "test.yml"
 
-        result = runner._execute_act(workflow_file, verbose=False)
+        returncode = runner._stream_act(workflow_file, False, log_writer)
 
-        assert result.returncode == 0
-        assert "successfully" in result.stdout
-        mock_run.assert_called_once()
+        assert returncode == 0
+        assert "successfully" in log_writer.tail
+        mock_popen.assert_called_once()
 
-    @patch("subprocess.run")
-    def test_execute_act_with_verbose(self, mock_run, sample_workflow_dir: Path, sample_config: Config):
+    def test_stream_act_with_verbose(self, mock_popen, sample_workflow_dir: Path, sample_config: Config):
         """詳細モードでのact実行テスト"""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Verbose output"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
-
         runner = CIRunner(sample_config)
         workflow_file = sample_workflow_dir / "test.yml"
 
-        runner._execute_act(workflow_file, verbose=True)
+        runner._stream_act(workflow_file, True, ActLogWriter())
 
         # -v オプションが含まれることを確認
-        call_args = mock_run.call_args[0][0]
+        call_args = mock_popen.call_args[0][0]
         assert "-v" in call_args
 
-    @patch("subprocess.run")
-    def test_execute_act_with_custom_image(self, mock_run, sample_workflow_dir: Path, temp_dir: Path):
+    def test_stream_act_with_custom_image(self, mock_popen, sample_workflow_dir: Path, temp_dir: Path):
         """カスタムDockerイメージでのact実行テスト"""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Custom image output"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
-
         # カスタムイメージ設定を含む設定を作成
         config = Config(project_root=temp_dir)
         with patch.object(config, "get") as mock_get:
@@ -159,22 +151,15 @@ class TestActExecution:
             runner = CIRunner(config)
             workflow_file = sample_workflow_dir / "test.yml"
 
-            runner._execute_act(workflow_file, verbose=False)
+            runner._stream_act(workflow_file, False, ActLogWriter())
 
             # カスタムイメージオプションが含まれることを確認
-            call_args = mock_run.call_args[0][0]
+            call_args = mock_popen.call_args[0][0]
             assert "-P" in call_args
             assert "ubuntu-latest=custom-ubuntu:latest" in call_args
 
-    @patch("subprocess.run")
-    def test_execute_act_with_env_file(self, mock_run, sample_workflow_dir: Path, temp_dir: Path):
+    def test_stream_act_with_env_file(self, mock_popen, sample_workflow_dir: Path, temp_dir: Path):
         """環境変数ファイル付きのact実行テスト"""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Env file output"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
-
         # 環境変数ファイルを作成
         env_file = temp_dir / ".env"
         env_file.write_text("TEST_VAR=test_value")
@@ -191,116 +176,87 @@ class TestActExecution:
             runner = CIRunner(config)
             workflow_file = sample_workflow_dir / "test.yml"
 
-            runner._execute_act(workflow_file, verbose=False)
+            runner._stream_act(workflow_file, False, ActLogWriter())
 
             # 環境変数ファイルオプションが含まれることを確認
-            call_args = mock_run.call_args[0][0]
+            call_args = mock_popen.call_args[0][0]
             assert "--env-file" in call_args
             assert str(env_file) in call_args
 
-    @patch("subprocess.run")
-    def test_execute_act_command_not_found(self, mock_run, sample_workflow_dir: Path, sample_config: Config):
-        """actコマンドが見つからない場合のテスト"""
-        mock_run.side_effect = FileNotFoundError("act command not found")
-
-        runner = CIRunner(sample_config)
-        workflow_file = sample_workflow_dir / "test.yml"
-
-        with pytest.raises(ExecutionError) as exc_info:
-            runner._execute_act(workflow_file, verbose=False)
-
-        assert "actコマンドが見つかりません" in str(exc_info.value)
-
-    @patch("subprocess.run")
-    def test_execute_act_timeout(self, mock_run, sample_workflow_dir: Path, sample_config: Config):
-        """act実行タイムアウトのテスト"""
-        mock_run.side_effect = subprocess.TimeoutExpired("act", 1800)
-
-        runner = CIRunner(sample_config)
-        workflow_file = sample_workflow_dir / "test.yml"
-
-        with pytest.raises(ExecutionError) as exc_info:
-            runner._execute_act(workflow_file, verbose=False)
-
-        assert "タイムアウト" in str(exc_info.value)
-
     @patch("ci_helper.core.ci_runner.CIRunner._prepare_secure_environment")
-    @patch("subprocess.run")
-    def test_execute_act_with_secure_environment(
-        self, mock_run, mock_prepare_env, sample_workflow_dir: Path, sample_config: Config
+    def test_stream_act_with_secure_environment(
+        self, mock_prepare_env, mock_popen, sample_workflow_dir: Path, sample_config: Config
     ):
         """安全な環境変数でのact実行テスト"""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Secure execution"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
-
         mock_secure_env = {"PATH": "/usr/bin", "SAFE_VAR": "safe_value"}
         mock_prepare_env.return_value = mock_secure_env
 
         runner = CIRunner(sample_config)
         workflow_file = sample_workflow_dir / "test.yml"
 
-        runner._execute_act(workflow_file, verbose=False)
+        runner._stream_act(workflow_file, False, ActLogWriter())
 
         # 安全な環境変数が使用されることを確認
-        mock_run.assert_called_once()
-        call_kwargs = mock_run.call_args[1]
+        mock_popen.assert_called_once()
+        call_kwargs = mock_popen.call_args[1]
         assert call_kwargs["env"] == mock_secure_env
 
 
 class TestSingleWorkflowExecution:
     """単一ワークフロー実行のテスト"""
 
-    @patch("ci_helper.core.ci_runner.CIRunner._execute_act")
-    def test_run_single_workflow_success(self, mock_execute_act, sample_workflow_dir: Path, sample_config: Config):
+    @staticmethod
+    def _fake_stream(output: str, returncode: int):
+        """出力をログライターへ書き込んで終了コードを返す _stream_act の代わり"""
+
+        def stream(workflow_file: Path, verbose: bool, log_writer: ActLogWriter) -> int:
+            log_writer.write(output)
+            return returncode
+
+        return stream
+
+    @patch("ci_helper.core.ci_runner.CIRunner._stream_act")
+    def test_run_single_workflow_success(self, mock_stream_act, sample_workflow_dir: Path, sample_config: Config):
         """単一ワークフロー実行成功のテスト"""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "Workflow output"
-        mock_result.stderr = ""
-        mock_execute_act.return_value = mock_result
+        mock_stream_act.side_effect = self._fake_stream("Workflow output", 0)
 
         runner = CIRunner(sample_config)
         workflow_file = sample_workflow_dir / "test.yml"
 
-        workflow_result, output = runner._run_single_workflow(workflow_file, verbose=False)
+        workflow_result = runner._run_single_workflow(workflow_file, verbose=False)
 
         assert workflow_result.success is True
         assert workflow_result.name == "test.yml"
         assert len(workflow_result.jobs) == 1
         assert workflow_result.jobs[0].name == "default"
         assert workflow_result.jobs[0].success is True
-        assert output == "Workflow output"
+        assert workflow_result.jobs[0].steps[0].output == "Workflow output"
 
-    @patch("ci_helper.core.ci_runner.CIRunner._execute_act")
-    def test_run_single_workflow_failure(self, mock_execute_act, sample_workflow_dir: Path, sample_config: Config):
+    @patch("ci_helper.core.ci_runner.CIRunner._stream_act")
+    def test_run_single_workflow_failure(self, mock_stream_act, sample_workflow_dir: Path, sample_config: Config):
         """単一ワークフロー実行失敗のテスト"""
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_result.stdout = "Workflow failed"
-        mock_result.stderr = "Error occurred"
-        mock_execute_act.return_value = mock_result
+        mock_stream_act.side_effect = self._fake_stream("Workflow failed\nError: Error occurred", 1)
 
         runner = CIRunner(sample_config)
         workflow_file = sample_workflow_dir / "test.yml"
 
-        workflow_result, output = runner._run_single_workflow(workflow_file, verbose=False)
+        workflow_result = runner._run_single_workflow(workflow_file, verbose=False)
 
         assert workflow_result.success is False
         assert workflow_result.name == "test.yml"
         assert len(workflow_result.jobs) == 1
         assert workflow_result.jobs[0].success is False
-        assert "Workflow failed" in output
-        assert "Error occurred" in output
+        step_output = workflow_result.jobs[0].steps[0].output
+        assert "Workflow failed" in step_output
+        assert "Error occurred" in step_output
+        assert [failure.message for failure in workflow_result.jobs[0].failures] == ["Error occurred"]
 
-    @patch("ci_helper.core.ci_runner.CIRunner._execute_act")
+    @patch("ci_helper.core.ci_runner.CIRunner._stream_act")
     def test_run_single_workflow_timeout_exception(
-        self, mock_execute_act, sample_workflow_dir: Path, sample_config: Config
+        self, mock_stream_act, sample_workflow_dir: Path, sample_config: Config
     ):
         """単一ワークフロー実行でタイムアウト例外のテスト"""
-        mock_execute_act.side_effect = subprocess.TimeoutExpired("act", 1800)
+        mock_stream_act.side_effect = subprocess.TimeoutExpired("act", 1800)
 
         runner = CIRunner(sample_config)
         workflow_file = sample_workflow_dir / "test.yml"
@@ -311,12 +267,12 @@ class TestSingleWorkflowExecution:
         assert "タイムアウト" in str(exc_info.value)
         assert "test.yml" in str(exc_info.value)
 
-    @patch("ci_helper.core.ci_runner.CIRunner._execute_act")
+    @patch("ci_helper.core.ci_runner.CIRunner._stream_act")
     def test_run_single_workflow_general_exception(
-        self, mock_execute_act, sample_workflow_dir: Path, sample_config: Config
+        self, mock_stream_act, sample_workflow_dir: Path, sample_config: Config
     ):
         """単一ワークフロー実行で一般的な例外のテスト"""
-        mock_execute_act.side_effect = Exception("Unexpected error")
+        mock_stream_act.side_effect = Exception("Unexpected error")
 
         runner = CIRunner(sample_config)
         workflow_file = sample_workflow_dir / "test.yml"
@@ -328,6 +284,92 @@ class TestSingleWorkflowExecution:
         assert "test.yml" in str(exc_info.value)
 
 
+class TestStreamingExecution:
+    """actの出力ストリーミングのテスト"""
+
+    @staticmethod
+    def _fake_act(script: str) -> list[str]:
+        import sys
+
+        return [sys.executable, "-c", script]
+
+    def test_run_single_workflow_streams_output(self, sample_workflow_dir: Path, sample_config: Config):
+        """出力が行単位でログファイルに書き出され、失敗が検出されることのテスト"""
+        from ci_helper.core.log_stream import ActLogCollector
+
+        script = (
+            "import sys\n"
+            "print('[Test/build] step 1')\n"
+            "print('Error: Build step failed', file=sys.stderr)\n"
+            "print('[Test/build] done')\n"
+            "sys.exit(1)\n"
+        )
+        log_path = sample_config.project_root / "act_stream.log"
+        collector = ActLogCollector(log_path)
+        log_writer = collector.open_writer(0)
+
+        runner = CIRunner(sample_config)
+        with patch.object(CIRunner, "_build_act_command", return_value=self._fake_act(script)):
+            workflow_result = runner._run_single_workflow(
+                sample_workflow_dir / "test.yml", verbose=False, log_writer=log_writer
+            )
+        collector.finalize()
+
+        assert workflow_result.success is False
+        failures = workflow_result.jobs[0].failures
+        assert any(f.message == "Build step failed" for f in failures)
+        assert "[Test/build] done" in workflow_result.jobs[0].steps[0].output
+        assert log_path.read_text(encoding="utf-8").splitlines() == [
+            "[Test/build] step 1",
+            "Error: Build step failed",
+            "[Test/build] done",
+        ]
+
+    def test_stream_act_echo(self, sample_workflow_dir: Path, sample_config: Config):
+        """出力がコンソール用コールバックにも転送されることのテスト"""
+        from ci_helper.core.log_stream import ActLogWriter
+
+        echoed: list[str] = []
+        log_writer = ActLogWriter(echo=echoed.append)
+
+        runner = CIRunner(sample_config)
+        with patch.object(CIRunner, "_build_act_command", return_value=self._fake_act("print('hello')")):
+            returncode = runner._stream_act(sample_workflow_dir / "test.yml", False, log_writer)
+
+        assert returncode == 0
+        assert echoed == ["hello"]
+
+    def test_stream_act_timeout(self, sample_workflow_dir: Path, temp_dir: Path):
+        """ストリーミング実行のタイムアウトテスト"""
+        from ci_helper.core.log_stream import ActLogWriter
+
+        config = Config(project_root=temp_dir)
+        runner = CIRunner(config)
+        with (
+            patch.object(
+                config, "get", side_effect=lambda key, default=None: 1 if key == "timeout_seconds" else default
+            ),
+            patch.object(CIRunner, "_build_act_command", return_value=self._fake_act("import time; time.sleep(30)")),
+            pytest.raises(ExecutionError) as exc_info,
+        ):
+            runner._stream_act(sample_workflow_dir / "test.yml", False, ActLogWriter())
+
+        assert "タイムアウト" in str(exc_info.value)
+
+    def test_stream_act_command_not_found(self, sample_workflow_dir: Path, sample_config: Config):
+        """actコマンドが見つからない場合のテスト"""
+        from ci_helper.core.log_stream import ActLogWriter
+
+        runner = CIRunner(sample_config)
+        with (
+            patch("subprocess.Popen", side_effect=FileNotFoundError("act")),
+            pytest.raises(ExecutionError) as exc_info,
+        ):
+            runner._stream_act(sample_workflow_dir / "test.yml", False, ActLogWriter())
+
+        assert "actコマンドが見つかりません" in str(exc_info.value)
+
+
 class TestWorkflowsExecution:
     """複数ワークフロー実行のテスト"""
 
@@ -343,7 +385,7 @@ class TestWorkflowsExecution:
         mock_workflow_result1 = WorkflowResult(name="test.yml", success=True, jobs=[], duration=5.0)
         mock_workflow_result2 = WorkflowResult(name="build.yml", success=True, jobs=[], duration=3.0)
 
-        mock_run_single.side_effect = [(mock_workflow_result1, "Test output"), (mock_workflow_result2, "Build output")]
+        mock_run_single.side_effect = [mock_workflow_result1, mock_workflow_result2]
 
         runner = CIRunner(sample_config)
         result = runner.run_workflows(workflows=None, verbose=False, dry_run=False, save_logs=False)
@@ -364,7 +406,7 @@ class TestWorkflowsExecution:
         mock_workflow_result1 = WorkflowResult(name="test.yml", success=True, jobs=[], duration=5.0)
         mock_workflow_result2 = WorkflowResult(name="build.yml", success=False, jobs=[], duration=3.0)
 
-        mock_run_single.side_effect = [(mock_workflow_result1, "Test output"), (mock_workflow_result2, "Build failed")]
+        mock_run_single.side_effect = [mock_workflow_result1, mock_workflow_result2]
 
         runner = CIRunner(sample_config)
         result = runner.run_workflows(workflows=None, verbose=False, dry_run=False, save_logs=False)
@@ -411,16 +453,17 @@ class TestWorkflowsExecution:
         mock_discover.return_value = mock_workflow_files
 
         mock_workflow_result = WorkflowResult(name="test.yml", success=True, jobs=[], duration=5.0)
-        mock_run_single.return_value = (mock_workflow_result, "Test output")
+        mock_run_single.return_value = mock_workflow_result
 
         mock_log_manager_instance = Mock()
+        mock_log_manager_instance.create_log_path.return_value = sample_config.project_root / "act_test.log"
         mock_log_manager.return_value = mock_log_manager_instance
 
         runner = CIRunner(sample_config)
         runner.run_workflows(workflows=None, verbose=False, dry_run=False, save_logs=True)
 
-        # ログ保存メソッドが呼ばれることを確認
-        mock_log_manager_instance.save_execution_log.assert_called_once()
+        # ログ登録メソッドが呼ばれることを確認
+        mock_log_manager_instance.register_execution_log.assert_called_once()
         mock_log_manager_instance.save_execution_history_metadata.assert_called_once()
 
     @patch("ci_helper.core.ci_runner.CIRunner._run_single_workflow")
@@ -431,7 +474,7 @@ class TestWorkflowsExecution:
         mock_discover.return_value = mock_workflow_files
 
         mock_workflow_result = WorkflowResult(name="test.yml", success=True, jobs=[], duration=5.0)
-        mock_run_single.return_value = (mock_workflow_result, "Test output")
+        mock_run_single.return_value = mock_workflow_result
 
         runner = CIRunner(sample_config)
         result = runner.run_workflows(workflows=["test"], verbose=False, dry_run=False, save_logs=False)
@@ -441,6 +484,78 @@ class TestWorkflowsExecution:
         assert result.success is True
 
 
+class TestParallelWorkflowsExecution:
+    """ワークフロー並列実行のテスト"""
+
+    @patch("ci_helper.core.log_manager.LogManager")
+    @patch("ci_helper.core.ci_runner.CIRunner._discover_workflows")
+    def test_parallel_execution_preserves_order(self, mock_discover, mock_log_manager, sample_config: Config):
+        """並列実行でも結果と結合ログがワークフロー順に並ぶことのテスト"""
+        import threading
+        import time
+
+        workflow_files = [Path("a.yml"), Path("b.yml"), Path("c.yml")]
+        mock_discover.return_value = workflow_files
+        log_path = sample_config.project_root / "act_parallel.log"
+        mock_log_manager_instance = Mock()
+        mock_log_manager_instance.create_log_path.return_value = log_path
+        mock_log_manager.return_value = mock_log_manager_instance
+
+        delays = {"a.yml": 0.2, "b.yml": 0.1, "c.yml": 0.0}
+        thread_names: set[str] = set()
+
+        def run_single(workflow_file: Path, verbose: bool, log_writer):
+            thread_names.add(threading.current_thread().name)
+            time.sleep(delays[workflow_file.name])
+            log_writer.write(f"{workflow_file.name} output")
+            return WorkflowResult(name=workflow_file.name, success=workflow_file.name != "b.yml", jobs=[], duration=1.0)
+
+        runner = CIRunner(sample_config)
+        with patch.object(CIRunner, "_run_single_workflow", side_effect=run_single):
+            result = runner.run_workflows(workflows=None, verbose=False, dry_run=False, save_logs=True, parallel=3)
+
+        assert [w.name for w in result.workflows] == ["a.yml", "b.yml", "c.yml"]
+        assert result.success is False
+        assert len(thread_names) > 1
+
+        assert log_path.read_text(encoding="utf-8") == "a.yml output\nb.yml output\nc.yml output\n"
+        assert not list(log_path.parent.glob("*.part"))
+        call_args = mock_log_manager_instance.register_execution_log.call_args
+        assert call_args[0][2]["parallel"] == 3
+
+    @patch("ci_helper.core.ci_runner.CIRunner._run_single_workflow")
+    @patch("ci_helper.core.ci_runner.CIRunner._discover_workflows")
+    def test_parallel_execution_propagates_error(self, mock_discover, mock_run_single, sample_config: Config):
+        """並列実行中のエラーが呼び出し元に伝播することのテスト"""
+        mock_discover.return_value = [Path("test.yml"), Path("build.yml")]
+        mock_run_single.side_effect = ExecutionError("ワークフロー 'build.yml' の実行に失敗しました")
+
+        runner = CIRunner(sample_config)
+
+        with pytest.raises(ExecutionError):
+            runner.run_workflows(workflows=None, verbose=False, dry_run=False, save_logs=False, parallel=2)
+
+    def test_resolve_parallelism(self, sample_config: Config):
+        """同時実行数の決定テスト"""
+        runner = CIRunner(sample_config)
+
+        # 設定のデフォルトは逐次実行
+        assert runner._resolve_parallelism(None, 5) == 1
+        # ワークフロー数を上限とする
+        assert runner._resolve_parallelism(8, 3) == 3
+        # 0はCPU数から自動決定
+        with patch("ci_helper.core.ci_runner.os.cpu_count", return_value=4):
+            assert runner._resolve_parallelism(0, 10) == 4
+            assert runner._resolve_parallelism(0, 2) == 2
+
+    def test_resolve_parallelism_from_config(self, sample_config: Config):
+        """設定値からの同時実行数決定テスト"""
+        runner = CIRunner(sample_config)
+
+        with patch.object(sample_config, "get", return_value=2):
+            assert runner._resolve_parallelism(None, 5) == 2
+
+
 class TestDependencyChecking:
     """依存関係チェックのテスト"""
 
@@ -638,13 +753,13 @@ class TestOptionProcessing:
         mock_discover.return_value = mock_workflow_files
 
         mock_workflow_result = WorkflowResult(name="test.yml", success=True, jobs=[], duration=5.0)
-        mock_run_single.return_value = (mock_workflow_result, "Verbose output")
+        mock_run_single.return_value = mock_workflow_result
 
         runner = CIRunner(sample_config)
         result = runner.run_workflows(workflows=None, verbose=True, dry_run=False, save_logs=False)
 
         # 詳細モードで実行されることを確認
-        mock_run_single.assert_called_once_with(mock_workflow_files[0], True)
+        mock_run_single.assert_called_once_with(mock_workflow_files[0], True, ANY)
         assert result.success is True
 
     @patch("ci_helper.core.ci_runner.CIRunner._discover_workflows")
@@ -655,22 +770,23 @@ class TestOptionProcessing:
 
         with patch("ci_helper.core.log_manager.LogManager") as mock_log_manager:
             mock_log_manager_instance = Mock()
+            mock_log_manager_instance.create_log_path.return_value = sample_config.project_root / "act_test.log"
             mock_log_manager.return_value = mock_log_manager_instance
 
             with patch.object(CIRunner, "_run_single_workflow") as mock_run_single:
                 mock_workflow_result = WorkflowResult(name="test.yml", success=True, jobs=[], duration=5.0)
-                mock_run_single.return_value = (mock_workflow_result, "Test output")
+                mock_run_single.return_value = mock_workflow_result
 
                 runner = CIRunner(sample_config)
 
                 # save_logs=True の場合
                 runner.run_workflows(workflows=None, verbose=False, dry_run=False, save_logs=True)
-                mock_log_manager_instance.save_execution_log.assert_called_once()
+                mock_log_manager_instance.register_execution_log.assert_called_once()
 
                 # save_logs=False の場合
                 mock_log_manager_instance.reset_mock()
                 runner.run_workflows(workflows=None, verbose=False, dry_run=False, save_logs=False)
-                mock_log_manager_instance.save_execution_log.assert_not_called()
+                mock_log_manager_instance.register_execution_log.assert_not_called()
 
     @patch("ci_helper.core.ci_runner.CIRunner._discover_workflows")
     def test_dry_run_option_processing(self, mock_discover, sample_config: Config):
@@ -696,7 +812,7 @@ class TestOptionProcessing:
         mock_discover.return_value = mock_workflow_files
 
         mock_workflow_result = WorkflowResult(name="test.yml", success=True, jobs=[], duration=5.0)
-        mock_run_single.return_value = (mock_workflow_result, "Test output")
+        mock_run_single.return_value = mock_workflow_result
 
         runner = CIRunner(sample_config)
         result = runner.run_workflows(workflows=["test", "build"], verbose=False, dry_run=False, save_logs=False)
@@ -718,22 +834,30 @@ class TestLogSaving:
         mock_discover.return_value = mock_workflow_files
 
         mock_workflow_result = WorkflowResult(name="test.yml", success=True, jobs=[], duration=5.0)
-        mock_run_single.return_value = (mock_workflow_result, "Test output")
 
+        def run_single(workflow_file, verbose, log_writer):
+            log_writer.write("Test output")
+            return mock_workflow_result
+
+        mock_run_single.side_effect = run_single
+
+        log_path = sample_config.project_root / "act_test.log"
         mock_log_manager_instance = Mock()
+        mock_log_manager_instance.create_log_path.return_value = log_path
         mock_log_manager.return_value = mock_log_manager_instance
 
         runner = CIRunner(sample_config)
         runner.run_workflows(workflows=["test"], verbose=True, dry_run=False, save_logs=True)
 
-        # ログ保存が適切な引数で呼ばれることを確認
-        mock_log_manager_instance.save_execution_log.assert_called_once()
-        call_args = mock_log_manager_instance.save_execution_log.call_args
+        # ログ登録が適切な引数で呼ばれることを確認
+        mock_log_manager_instance.register_execution_log.assert_called_once()
+        call_args = mock_log_manager_instance.register_execution_log.call_args
 
         # ExecutionResult が渡されることを確認
         assert isinstance(call_args[0][0], ExecutionResult)
-        # 出力が渡されることを確認
-        assert call_args[0][1] == "Test output"
+        # 出力がストリーミングでログファイルに書き込まれることを確認
+        assert call_args[0][1] == log_path
+        assert log_path.read_text(encoding="utf-8") == "Test output\n"
         # コマンド引数が渡されることを確認
         command_args = call_args[0][2]
         assert command_args["workflows"] == ["test"]
@@ -0,0 +1,93 @@
+"""
+CLI起動時間のテスト
+
+``python -X importtime`` でCLIと非AIコマンドのインポートを計測し、
+AIプロバイダーのSDKを読み込まないこと・読み込むモジュール数と起動時間が予算内であることをテストします。
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from ci_helper.cli import SUBCOMMANDS, cli
+
+# 非AIコマンドが読み込んでよいモジュール数（SDK読み込み時は3000を超えていた）
+STARTUP_MODULE_BUDGET = 500
+
+# 非AIコマンドのインポートにかけてよい時間（マイクロ秒、SDK読み込み時は2秒前後かかっていた）
+STARTUP_BUDGET_US = 1_000_000
+
+# AIプロバイダーのSDK（プロバイダーの使用時にのみ読み込む）
+SDK_MODULES = {"openai", "anthropic", "aiohttp"}
+
+# 非AIコマンドの起動時に読み込んではいけないモジュール
+HEAVY_MODULES = {*SDK_MODULES, "ci_helper.ai.integration"}
+
+NON_AI_MODULES = [
+    "ci_helper.cli",
+    "ci_helper.commands.init",
+    "ci_helper.commands.doctor",
+    "ci_helper.commands.test",
+    "ci_helper.commands.logs",
+    "ci_helper.commands.format_logs",
+    "ci_helper.commands.secrets",
+    "ci_helper.commands.clean",
+    "ci_helper.commands.cache",
+]
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """新しいプロセスでモジュールをインポートし、モジュールごとの累積インポート時間を取得"""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(path for path in sys.path if path)}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    times: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("module", NON_AI_MODULES)
+def test_non_ai_command_startup(module):
+    """非AIコマンドの起動時にSDKを読み込まず、予算内でインポートできることのテスト"""
+    times = _import_times(module)
+
+    assert HEAVY_MODULES.isdisjoint(times), sorted(HEAVY_MODULES & times.keys())
+    assert len(times) < STARTUP_MODULE_BUDGET, f"{module}: {len(times)} modules"
+    # 並列実行中は他のワーカーの負荷で時間が伸びるため、時間は直列実行時のみ検証する
+    if "PYTEST_XDIST_WORKER" not in os.environ:
+        assert times[module] < STARTUP_BUDGET_US, f"{module}: {times[module] / 1000:.0f}ms"
+
+
+def test_provider_modules_defer_sdk_import():
+    """プロバイダーモジュールのインポートだけではSDKを読み込まないことのテスト"""
+    times = _import_times("ci_helper.ai.providers")
+
+    assert SDK_MODULES.isdisjoint(times), sorted(SDK_MODULES & times.keys())
+
+
+def test_lazy_group_lists_all_subcommands():
+    """遅延読み込みするサブコマンドがヘルプに表示され、実行できることのテスト"""
+    runner = CliRunner()
+
+    help_result = runner.invoke(cli, ["--help"])
+    version_result = runner.invoke(cli, ["--version"])
+
+    assert help_result.exit_code == 0
+    for name in SUBCOMMANDS:
+        assert name in help_result.output
+    assert version_result.exit_code == 0
+    assert "ci-run" in version_result.output
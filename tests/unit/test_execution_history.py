@@ -0,0 +1,180 @@
+"""
+実行履歴ストアのテスト
+
+保存時に記録した解析結果から、生ログを再解析せずに履歴を取得できることをテストします。
+"""
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ci_helper.core.execution_history import (
+    HISTORY_DB_FILENAME,
+    deserialize_execution_result,
+    serialize_execution_result,
+)
+from ci_helper.core.log_manager import LogManager
+from ci_helper.core.models import ExecutionResult, Failure, FailureType, JobResult, StepResult, WorkflowResult
+from ci_helper.utils.config import Config
+
+
+@pytest.fixture
+def log_manager(tmp_path):
+    config = Mock(spec=Config)
+    config.get_path.return_value = tmp_path / "logs"
+    config.get.return_value = 100
+    return LogManager(config)
+
+
+def _execution(workflow_name: str, timestamp: datetime, failures: list[Failure] | None = None) -> ExecutionResult:
+    job = JobResult(
+        name="build",
+        success=not failures,
+        failures=failures or [],
+        steps=[StepResult(name="Run tests", success=not failures, duration=1.5, output="pytest output")],
+        duration=2.0,
+    )
+    workflow = WorkflowResult(name=workflow_name, success=not failures, jobs=[job], duration=2.0)
+    return ExecutionResult(success=not failures, workflows=[workflow], total_duration=3.0, timestamp=timestamp)
+
+
+def _save_executions(log_dir: str, start: int, count: int) -> None:
+    config = Mock(spec=Config)
+    config.get_path.return_value = Path(log_dir)
+    config.get.return_value = 100
+    manager = LogManager(config)
+    for index in range(start, start + count):
+        manager.save_execution_log(_execution("ci.yml", datetime(2025, 1, 1) + timedelta(seconds=index)), "log")
+
+
+class TestExecutionHistorySerialization:
+    """実行結果の変換のテスト"""
+
+    def test_roundtrip_omits_step_output(self):
+        """ステップの出力以外が元の実行結果と一致することのテスト"""
+        failure = Failure(
+            type=FailureType.ASSERTION,
+            message="assert 1 == 2",
+            file_path="tests/test_app.py",
+            line_number=12,
+            context_before=["def test_app():"],
+            stack_trace="Traceback ...",
+        )
+        original = _execution("ci.yml", datetime(2025, 1, 1, 10, 0), [failure])
+
+        data = json.loads(json.dumps(serialize_execution_result(original)))
+        restored = deserialize_execution_result(data, original.timestamp, "/logs/act.log")
+
+        assert restored.all_failures == [failure]
+        assert restored.workflows[0].jobs[0].steps[0].output == ""
+        assert restored.workflows[0].jobs[0].steps[0].duration == 1.5
+        assert restored.timestamp == original.timestamp
+        assert restored.log_path == "/logs/act.log"
+
+
+class TestLogManagerHistoryStore:
+    """実行履歴ストアを使ったLogManagerのテスト"""
+
+    def test_history_is_served_without_reparsing(self, log_manager):
+        """保存済みの実行は生ログを再解析せずに取得できることのテスト"""
+        failure = Failure(type=FailureType.ERROR, message="boom", file_path="app.py", line_number=3)
+        now = datetime.now()
+        log_manager.save_execution_log(_execution("ci.yml", now - timedelta(hours=1), [failure]), "old log")
+        log_manager.save_execution_log(_execution("ci.yml", now), "new log")
+
+        with patch.object(LogManager, "_restore_execution_result") as restore:
+            history = log_manager.get_execution_history()
+            previous = log_manager.get_previous_execution(now)
+
+        restore.assert_not_called()
+        assert [execution.success for execution in history] == [True, False]
+        assert previous is not None
+        assert previous.all_failures == [failure]
+        assert previous.log_path == str(log_manager.log_dir / f"act_{(now - timedelta(hours=1)):%Y%m%d_%H%M%S}.log")
+
+    def test_workflow_search_and_statistics(self, log_manager):
+        """ワークフロー別の検索と統計がストアから取得できることのテスト"""
+        now = datetime.now()
+        log_manager.save_execution_log(_execution("ci.yml", now - timedelta(hours=2)), "a" * 1024)
+        log_manager.save_execution_log(
+            _execution("deploy.yml", now - timedelta(hours=1), [Failure(type=FailureType.ERROR, message="x")]), "b"
+        )
+        log_manager.save_execution_log(_execution("ci.yml", now), "c")
+
+        matches = log_manager.find_logs_by_workflow("ci.yml")
+        assert [entry["timestamp"] for entry in matches] == [
+            now.isoformat(),
+            (now - timedelta(hours=2)).isoformat(),
+        ]
+
+        stats = log_manager.get_log_statistics()
+        assert stats["total_logs"] == 3
+        assert stats["success_rate"] == 66.7
+        assert stats["average_duration"] == 3.0
+        assert stats["latest_execution"] == now.isoformat()
+
+    def test_cleanup_removes_history_rows(self, log_manager):
+        """クリーンアップで削除したログが履歴からも消えることのテスト"""
+        now = datetime.now()
+        for hours in range(3):
+            log_manager.save_execution_log(_execution("ci.yml", now - timedelta(hours=hours)), "log")
+
+        assert log_manager.cleanup_old_logs(max_count=1) == 2
+
+        assert len(log_manager.get_execution_history()) == 1
+        assert len(log_manager.find_logs_by_workflow("ci.yml")) == 1
+        assert log_manager.get_log_statistics()["total_logs"] == 1
+
+    def test_legacy_index_is_imported_and_parsed_once(self, tmp_path):
+        """旧バージョンの index.json を取り込み、解析結果を一度だけ生ログから復元することのテスト"""
+        log_dir = tmp_path / "logs"
+        log_dir.mkdir()
+        (log_dir / "act_20250101_100000.log").write_text("legacy log", encoding="utf-8")
+        entry = {
+            "timestamp": "2025-01-01T10:00:00",
+            "log_file": "act_20250101_100000.log",
+            "success": False,
+            "total_duration": 4.0,
+            "total_failures": 1,
+            "workflows": [{"name": "ci.yml", "success": False, "duration": 4.0, "job_count": 1}],
+            "command_args": {},
+            "file_size": 10,
+        }
+        (log_dir / "index.json").write_text(json.dumps({"logs": [entry], "last_execution": entry}), encoding="utf-8")
+
+        config = Mock(spec=Config)
+        config.get_path.return_value = log_dir
+        config.get.return_value = 100
+        manager = LogManager(config)
+
+        assert manager.list_logs() == [entry]
+        assert (log_dir / HISTORY_DB_FILENAME).exists()
+
+        parsed = _execution("ci.yml", datetime(2025, 1, 1, 10, 0), [Failure(type=FailureType.ERROR, message="x")])
+        with patch.object(LogManager, "_restore_execution_result", return_value=parsed) as restore:
+            first = manager.get_execution_history()
+            second = LogManager(config).get_execution_history()
+
+        restore.assert_called_once()
+        assert len(first) == len(second) == 1
+        assert second[0].all_failures == parsed.all_failures
+
+    def test_concurrent_processes_do_not_lose_entries(self, tmp_path):
+        """複数プロセスから同時に保存してもエントリが失われないことのテスト"""
+        log_dir = tmp_path / "logs"
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(_save_executions, str(log_dir), worker * 25, 25) for worker in range(4)]
+            for future in futures:
+                future.result()
+
+        config = Mock(spec=Config)
+        config.get_path.return_value = log_dir
+        config.get.return_value = 100
+        logs = LogManager(config).list_logs()
+
+        assert len(logs) == 100
+        assert len({entry["log_file"] for entry in logs}) == 100
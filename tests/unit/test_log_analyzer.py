@@ -170,6 +170,11 @@ More log output"""
         assert "job1" in section
         # Workflow1関連の内容が含まれることを確認（実装では完全な分離はされていない）
         assert len(section) > 0
+        # ログインデックスのセクションの開始行から抽出されることを確認
+        assert self.analyzer._extract_workflow_section(log_content, "Workflow2").startswith(
+            "[Workflow2/job2] Starting job2"
+        )
+        assert self.analyzer._extract_workflow_section(log_content, "Unknown") == ""
 
     def test_analyze_jobs_with_explicit_job_markers(self):
         """明示的なジョブマーカーがある場合のジョブ解析テスト"""
@@ -4,12 +4,20 @@
 圧縮アルゴリズム、ファイル処理、圧縮率検証をテスト
 """
 
+import gzip
+import tracemalloc
+from unittest.mock import Mock
+
 from ci_helper.core.log_compressor import (
+    MAX_LINE_LENGTH,
     CompressionResult,
     LogCompressor,
+    compress_log_file_for_ai_analysis,
     compress_log_for_ai_analysis,
+    normalize_line_for_deduplication,
     smart_log_sampling,
 )
+from ci_helper.utils.token_counter import TokenCounter
 
 
 class TestCompressionResult:
@@ -104,14 +112,14 @@ class TestLogCompressor:
             "WARNING: Important warning",
         ]
 
-        filtered_lines, removed_count = compressor._remove_low_priority_lines(lines)
+        filtered_lines, result = compressor.compress_lines(lines)
 
         # 重要な行は保持される
         assert "ERROR: Critical failure" in filtered_lines
         assert "WARNING: Important warning" in filtered_lines
 
         # 低優先度行は除去される
-        assert removed_count > 0
+        assert "low_priority_removal(4)" in result.techniques_applied
         assert "" not in filtered_lines  # 空行は除去
         assert "# Comment line" not in filtered_lines  # コメント行は除去
 
@@ -122,26 +130,24 @@ class TestLogCompressor:
             "2024-01-01 10:00:00 ERROR: Connection failed",
             "2024-01-01 10:00:01 ERROR: Connection failed",
             "2024-01-01 10:00:02 ERROR: Connection failed",
-            "INFO: Different message",
+            "WARNING: Different message",
         ]
 
-        deduplicated_lines, duplicate_count = compressor._remove_duplicates(lines)
+        deduplicated_lines, result = compressor.compress_lines(lines)
 
         # 重複が除去され、集約マークが追加される
-        assert duplicate_count == 2  # 2つの重複が除去された
+        assert "duplicate_removal(2)" in result.techniques_applied  # 2つの重複が除去された
         assert len(deduplicated_lines) == 2  # 2つのユニークな行
         assert any("repeated 3 times" in line for line in deduplicated_lines)
 
     def test_normalize_line_for_deduplication(self):
         """重複除去用行正規化テスト"""
-        compressor = LogCompressor()
-
         # タイムスタンプの正規化
         line1 = "2024-01-01 10:00:00 ERROR: Connection failed"
         line2 = "2024-01-01 10:00:01 ERROR: Connection failed"
 
-        normalized1 = compressor._normalize_line_for_deduplication(line1)
-        normalized2 = compressor._normalize_line_for_deduplication(line2)
+        normalized1 = normalize_line_for_deduplication(line1)
+        normalized2 = normalize_line_for_deduplication(line2)
 
         assert normalized1 == normalized2
         assert "[TIMESTAMP]" in normalized1
@@ -158,11 +164,12 @@ class TestLogCompressor:
             "Process completed",
         ]
 
-        important_lines = compressor._preserve_important_lines(lines)
+        important_lines, _ = compressor.compress_lines(lines)
 
         # エラー行とその前後のコンテキストが保持される
-        assert "ERROR: Database connection failed" in important_lines
-        assert len(important_lines) > 1  # コンテキストも含まれる
+        assert important_lines[:3] == lines[:3]
+        assert any(line.startswith("Stack trace line") for line in important_lines[3:])
+        assert "Process completed" not in important_lines
 
     def test_truncate_long_lines(self):
         """長い行の短縮テスト"""
@@ -170,46 +177,47 @@ class TestLogCompressor:
         long_line = "x" * 1000  # 1000文字の長い行
         short_line = "short line"
 
-        lines = [long_line, short_line]
-        truncated_lines = compressor._truncate_long_lines(lines, max_length=100)
+        # 重要な行のコンテキストとして保持される行も短縮される
+        truncated_lines, result = compressor.compress_lines(["ERROR: failed", long_line, short_line])
 
         # 長い行は短縮される
-        assert len(truncated_lines[0]) <= 103  # "..." を含めて
-        assert "..." in truncated_lines[0]
+        assert len(truncated_lines[1]) <= MAX_LINE_LENGTH + 3  # "..." を含めて
+        assert truncated_lines[1].endswith("...")
+        assert "line_truncation(1)" in result.techniques_applied
 
         # 短い行はそのまま
-        assert truncated_lines[1] == short_line
+        assert truncated_lines[2] == short_line
 
     def test_truncate_long_lines_with_important_pattern(self):
         """重要パターンを含む長い行の短縮テスト"""
         compressor = LogCompressor()
-        long_line_with_error = "x" * 200 + "ERROR: Critical failure" + "y" * 200
+        long_line_with_error = "x" * 600 + "ERROR: Critical failure" + "y" * 600
 
-        lines = [long_line_with_error]
-        truncated_lines = compressor._truncate_long_lines(lines, max_length=100)
+        truncated_lines, _ = compressor.compress_lines([long_line_with_error])
 
         # 重要パターン周辺が保持される
+        assert len(truncated_lines[0]) < len(long_line_with_error)
         assert "ERROR: Critical failure" in truncated_lines[0]
 
     def test_compress_to_target_size(self):
         """目標サイズ圧縮テスト"""
         compressor = LogCompressor(target_size_mb=0.001)  # 1KB
         lines = [
-            "ERROR: Critical error",
-            "WARNING: Warning message",
-            "INFO: Info message",
-            "DEBUG: Debug message",
-        ] * 100  # 大量の行を作成
+            f"ERROR: Critical error in module_{index}.py:{index}\nWARNING: Warning message {index}"
+            for index in range(100)
+        ]
+        log_content = "\n".join(lines)
 
-        compressed_lines = compressor._compress_to_target_size(lines)
+        compressed_lines = compressor.compress_log(log_content).split("\n")
 
-        # 行数が削減される
-        assert len(compressed_lines) < len(lines)
+        # 行数が削減され、目標サイズに収まる
+        assert len(compressed_lines) < len(log_content.split("\n"))
+        assert len("\n".join(compressed_lines).encode("utf-8")) <= 1024
 
         # 重要な行が優先的に保持される
         error_lines = [line for line in compressed_lines if "ERROR" in line]
-        debug_lines = [line for line in compressed_lines if "DEBUG" in line]
-        assert len(error_lines) >= len(debug_lines)
+        warning_lines = [line for line in compressed_lines if "WARNING" in line]
+        assert len(error_lines) >= len(warning_lines)
 
     def test_calculate_line_importance(self):
         """行重要度計算テスト"""
@@ -539,8 +547,6 @@ class TestLogCompressorEdgeCases:
 
     def test_normalize_line_various_timestamp_formats(self):
         """様々なタイムスタンプ形式の正規化テスト"""
-        compressor = LogCompressor()
-
         timestamps = [
             "2024-01-01 10:00:00 Message",
             "2024-01-01T10:00:00Z Message",
@@ -548,9 +554,142 @@ class TestLogCompressorEdgeCases:
             "2024-01-01T10:00:00.123456Z Message",
         ]
 
-        normalized_lines = [compressor._normalize_line_for_deduplication(ts) for ts in timestamps]
+        normalized_lines = [normalize_line_for_deduplication(ts) for ts in timestamps]
 
         # 全て同じように正規化される
         for normalized in normalized_lines:
             assert "[TIMESTAMP]" in normalized
             assert "Message" in normalized
+
+
+class CharEncoding:
+    """1文字を1トークンとして数えるエンコーダー"""
+
+    name = "char_base"
+
+    def encode(self, text):
+        return list(text)
+
+
+def _char_counter() -> TokenCounter:
+    tiktoken = Mock()
+    tiktoken.encoding_for_model.return_value = CharEncoding()
+    tiktoken.get_encoding.return_value = CharEncoding()
+    return TokenCounter(tiktoken)
+
+
+def _ci_log(failures: int) -> str:
+    lines = []
+    for index in range(failures):
+        lines.extend(
+            [
+                f"Step {index}: running tests",
+                f"collected {index} items",
+                f"ERROR: test_case_{index} failed with code {index}",
+                f"  File app.py:{index} in handler",
+                f"Step {index}: done",
+                "building wheel for package",
+                "building wheel for package",
+            ]
+        )
+    return "\n".join(lines)
+
+
+class TestTokenBudgetedCompression:
+    """目標トークン数に合わせた1パスの圧縮のテスト"""
+
+    def test_output_stays_within_token_budget(self):
+        """出力のトークン数が目標トークン数を超えないことのテスト"""
+        counter = _char_counter()
+        compressor = LogCompressor(target_tokens=1000, token_counter=counter)
+
+        # テンプレートにまとまらない（値以外の部分が一致しない）失敗行
+        log_content = "\n".join(f"ERROR: alpha{i} beta{i} gamma{i}" for i in range(200))
+
+        compressed = compressor.compress_log(log_content)
+
+        assert 950 < counter.count(compressed) <= 1000
+        # 同じ重要度の行は先に出現した行を優先する
+        assert "ERROR: alpha0 beta0 gamma0" in compressed
+        assert "alpha199" not in compressed
+
+    def test_failure_context_window_is_kept(self):
+        """失敗行の前後のコンテキストだけが保持されることのテスト"""
+        context = [
+            "checkout repository",
+            "install dependencies",
+            "FAILED: test_x",
+            "cleanup workspace",
+            "upload artifacts",
+        ]
+        log_content = "\n".join(
+            [*(f"unrelated line {i}" for i in range(10)), *context, *(f"tail line {i}" for i in range(10))]
+        )
+
+        compressed_lines, result = LogCompressor().compress_lines(log_content.splitlines())
+
+        assert compressed_lines == context
+        assert result.lines_kept == 5
+        assert result.lines_removed == 20
+
+    def test_duplicates_are_aggregated_in_single_pass(self):
+        """値だけが異なる行がテンプレートの要約1行に集約されることのテスト"""
+        log_content = "\n".join(f"2024-01-01 10:00:0{i} ERROR: Connection failed" for i in range(3))
+
+        compressed_lines, result = LogCompressor().compress_lines(log_content.splitlines())
+
+        assert compressed_lines == [
+            "2024-01-01 <*> ERROR: Connection failed (repeated 3 times; e.g. 10:00:00 | 10:00:01 | 10:00:02)"
+        ]
+        assert "duplicate_removal(2)" in result.techniques_applied
+
+    def test_failure_blocks_collapse_into_templates(self):
+        """値だけが異なる失敗ブロックがテンプレートごとの要約にまとまることのテスト"""
+        counter = _char_counter()
+
+        compressed = LogCompressor(target_tokens=8000, token_counter=counter).compress_log(_ci_log(200))
+
+        assert "ERROR: <*> failed with code <*> (repeated 200 times; e.g. test_case_0 0 |" in compressed
+        assert len(compressed.splitlines()) < 10
+        assert counter.count(compressed) <= 8000
+
+    def test_smart_sampling_covers_every_template(self):
+        """サンプリングで多い種類の行ばかりが選ばれず、全てのテンプレートが残ることのテスト"""
+        lines = [f"Downloading package {i} of 100" for i in range(100)]
+        lines[50:50] = ["ERROR: build failed", "Compiling module core", "Linking binary app"]
+
+        sampled = smart_log_sampling("\n".join(lines), sample_ratio=0.1)
+
+        sampled_lines = sampled.splitlines()
+        assert len(sampled_lines) == 10
+        assert sampled_lines[0] == "Downloading package 0 of 100"
+        assert {"ERROR: build failed", "Compiling module core", "Linking binary app"} <= set(sampled_lines)
+
+    def test_compressed_file_is_streamed(self, tmp_path):
+        """圧縮保存されたログファイルをストリーミングで圧縮できることのテスト"""
+        log_content = _ci_log(50)
+        log_path = tmp_path / "act_20250101_100000.log.gz"
+        with gzip.open(log_path, "wt", encoding="utf-8") as f:
+            f.write(log_content)
+
+        compressed, statistics = compress_log_file_for_ai_analysis(log_path, max_tokens=500)
+        expected, _ = compress_log_for_ai_analysis(log_content, max_tokens=500)
+
+        assert compressed == expected
+        assert statistics["line_reduction"]["original_lines"] == len(log_content.splitlines())
+
+    def test_memory_is_bounded_by_budget(self, tmp_path):
+        """大きなログでもメモリ使用量が目標トークン数の大きさに収まることのテスト"""
+        log_path = tmp_path / "large.log"
+        log_path.write_text(_ci_log(6000), encoding="utf-8")
+        compressor = LogCompressor(target_tokens=2000, token_counter=_char_counter())
+
+        tracemalloc.start()
+        try:
+            _, result = compressor.compress_file(log_path)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert result.original_size > 1024 * 1024
+        assert peak < result.original_size / 4
@@ -5,10 +5,12 @@ LogExtractorクラスの各種エラーパターン抽出、コンテキスト
 スタックトレース抽出機能をテストします。
 """
 
+from pathlib import Path
+
 import pytest
 
 from ci_helper.core.exceptions import LogParsingError
-from ci_helper.core.log_extractor import LogExtractor
+from ci_helper.core.log_extractor import PATTERN_PREFILTERS, LogExtractor
 from ci_helper.core.models import FailureType
 
 
@@ -133,7 +135,7 @@ class TestLogExtractor:
         ]
 
         for message, expected_file, expected_line in test_cases:
-            file_path, line_number = self.extractor._extract_file_info(message)
+            file_path, line_number = self.extractor.extract_file_info(message)
             assert file_path == expected_file
             assert line_number == expected_line
 
@@ -341,3 +343,96 @@ Line 7"""
             assert len(failures_1[0].context_after) <= 1
             assert len(failures_3[0].context_before) <= 3
             assert len(failures_3[0].context_after) <= 3
+
+
+def _failure_keys(failures):
+    """比較用に失敗の内容をタプル化"""
+    return [
+        (
+            f.type,
+            f.message,
+            f.file_path,
+            f.line_number,
+            tuple(f.context_before),
+            tuple(f.context_after),
+            f.stack_trace,
+        )
+        for f in failures
+    ]
+
+
+class TestSinglePassExtraction:
+    """1パス抽出のテスト"""
+
+    SAMPLE_LOGS_DIR = Path(__file__).parent.parent / "fixtures" / "sample_logs"
+
+    @pytest.mark.parametrize("context_lines", [0, 2, 3])
+    @pytest.mark.parametrize(
+        "log_name",
+        ["failed_run.log", "complex_failure.log", "python_error.log", "ai_analysis_test.log", "successful_run.log"],
+    )
+    def test_matches_per_pattern_extraction(self, log_name, context_lines):
+        """サンプルログで従来の抽出と同じ結果になることのテスト"""
+        log_content = (self.SAMPLE_LOGS_DIR / log_name).read_text(encoding="utf-8")
+
+        single_pass = LogExtractor(context_lines=context_lines).extract_failures(log_content)
+        per_pattern = LogExtractor(context_lines=context_lines, single_pass=False).extract_failures(log_content)
+
+        assert _failure_keys(single_pass) == _failure_keys(per_pattern)
+
+    @pytest.mark.parametrize(
+        "log_content",
+        [
+            # 空白行を挟んで複数行にまたがるマッチ
+            "prefix\n5\n\n  failing\nsuffix",
+            "assert value\n\nmore\n  failed",
+            "Error:\n\n\n  detail on a later line",
+            "  \n FAIL\n\n  suite name\n",
+            # キーワードを持たないパターン
+            "E       assert 1 == 2\n  ✕ renders",
+            # CRLF 改行
+            "line 1\r\nError: crlf error\r\nline 3\r\n",
+        ],
+    )
+    def test_multiline_matches(self, log_content):
+        """複数行にまたがるマッチでも従来の抽出と同じ結果になることのテスト"""
+        single_pass = LogExtractor(context_lines=2).extract_failures(log_content)
+        per_pattern = LogExtractor(context_lines=2, single_pass=False).extract_failures(log_content)
+
+        assert _failure_keys(single_pass) == _failure_keys(per_pattern)
+
+    def test_case_folding_falls_back_to_full_scan(self):
+        """小文字化でキーワード検索できない文字を含む場合もマッチすることのテスト"""
+        # ſ (long s) は IGNORECASE で "s" にマッチするが、小文字化しても "s" にならない
+        log_content = "TE\u017fTS FAILED\nconnection TIMEOUT"
+        extractor = LogExtractor()
+
+        single_pass = extractor.extract_failures(log_content)
+        per_pattern = LogExtractor(single_pass=False).extract_failures(log_content)
+
+        assert _failure_keys(single_pass) == _failure_keys(per_pattern)
+        assert any(f.type == FailureType.TIMEOUT for f in single_pass)
+
+    def test_keywords_come_from_prefilter_table(self):
+        """事前判定の表に登録したリテラルがキーワードとして使用されることのテスト"""
+        extractor = LogExtractor()
+        plans = {plan.pattern.pattern: plan for plan in extractor._pattern_plans}
+
+        # 表のすべての項目が実際のパターンに対応している
+        assert set(PATTERN_PREFILTERS) <= set(plans)
+        assert plans[r"^npm ERR!\s*(.+)$"].keyword == "npm err!"
+        assert plans[r"Coverage threshold not met"].keyword == "coverage threshold not met"
+        # 1文字のリテラルしか持たないパターンはログ全体を照合する
+        assert plans[r"^E\s+(.+)$"].keyword is None
+
+    def test_line_numbers_in_large_log(self):
+        """大きなログでもコンテキストが正しい行から取得されることのテスト"""
+        lines = [f"[CI/test]   | step output {i}" for i in range(5000)]
+        lines[4321] = "Error: deep failure"
+        log_content = "\n".join(lines)
+
+        failures = LogExtractor(context_lines=1).extract_failures(log_content)
+
+        assert len(failures) == 1
+        assert failures[0].context_before == ["[CI/test]   | step output 4320"]
+        assert failures[0].context_after == ["[CI/test]   | step output 4322"]
@@ -12,6 +12,7 @@ from unittest.mock import Mock, patch
 import pytest
 
 from ci_helper.core.exceptions import ExecutionError
+from ci_helper.core.log_index import LogIndex
 from ci_helper.core.log_manager import LogManager
 from ci_helper.core.models import ExecutionResult, Failure, FailureType, JobResult, WorkflowResult
 from ci_helper.utils.config import Config
@@ -67,9 +68,8 @@ class TestLogHistoryManagement:
         assert self.log_manager.index_file.exists()
 
         # インデックス内容を確認
-        index_data = self.log_manager._load_log_index()
-        assert len(index_data["logs"]) == 1
-        assert index_data["last_execution"] is not None
+        assert len(self.log_manager.list_logs()) == 1
+        assert self.log_manager.get_latest_log() is not None
 
     def test_save_multiple_execution_logs(self):
         """複数の実行ログ保存テスト"""
@@ -215,8 +215,8 @@ class TestLogHistoryManagement:
         self.log_manager.save_execution_history_metadata(execution_result)
 
         # インデックスから詳細な失敗情報を確認
-        index_data = self.log_manager._load_log_index()
-        latest_entry = index_data["logs"][-1]
+        latest_entry = self.log_manager.get_latest_log()
+        assert latest_entry is not None
 
         assert "detailed_failures" in latest_entry
         assert len(latest_entry["detailed_failures"]) == 2
@@ -311,6 +311,24 @@ class TestLogHistoryManagement:
         remaining_logs = self.log_manager.list_logs()
         assert len(remaining_logs) == 3
 
+    def test_get_log_index_persists_log_index(self):
+        """行インデックスが初回の取得時に作成され、ログの隣に保存されることのテスト"""
+        execution_result = self._create_sample_execution_result()
+        log_path = self.log_manager.save_execution_log(execution_result, "line 1\nError: failure\n")
+
+        # 保存時にはログ全体を読み直してインデックスを作成しない
+        index_path = LogIndex.index_path(log_path)
+        assert not index_path.exists()
+
+        log_index = self.log_manager.get_log_index(log_path.name)
+        assert log_index.line_number(log_index.text.index("Error")) == 2
+        assert index_path.exists()
+
+        # クリーンアップ時にインデックスも削除される
+        self.log_manager.cleanup_old_logs(max_count=0)
+        assert not log_path.exists()
+        assert not index_path.exists()
+
     def test_cleanup_old_logs_by_size(self):
         """サイズ制限によるログクリーンアップテスト"""
         # 大きなログファイルを作成
@@ -372,12 +390,13 @@ class TestLogHistoryManagement:
         self.log_manager.index_file.write_text("invalid json content")
 
         # インデックスを読み込み（新規作成されるはず）
-        index_data = self.log_manager._load_log_index()
+        assert self.log_manager.list_logs() == []
+        assert self.log_manager.get_latest_log() is None
 
-        # 新規インデックスが作成されることを確認
-        assert index_data["version"] == "1.0"
-        assert index_data["logs"] == []
-        assert index_data["last_execution"] is None
+        # 新規インデックスに保存でき、破損したファイルは退避されることを確認
+        self.log_manager.save_execution_log(self._create_sample_execution_result(), "Recovered log")
+        assert len(self.log_manager.list_logs()) == 1
+        assert self.log_manager.index_file.with_name(f"{self.log_manager.index_file.name}.corrupt").exists()
 
     def test_save_execution_log_disk_error(self):
         """ディスクエラー時のログ保存テスト"""
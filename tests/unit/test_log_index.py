@@ -0,0 +1,140 @@
+"""
+ログ行インデックスのユニットテスト
+
+LineIndexクラスの行番号解決と行の取得、LogIndexクラスのセクション検出と
+永続化をテストします。
+"""
+
+import os
+from pathlib import Path
+
+from ci_helper.core.log_index import LineIndex, LogIndex
+
+ACT_LOG = """[CI/build] 🚀  Start image=catthehacker/ubuntu:act-latest
+[CI/build] ⭐ Run Main actions/checkout@v4
+[CI/build]   ✅  Success - Main actions/checkout@v4
+[CI/test] 🚀  Start image=catthehacker/ubuntu:act-latest
+[CI/test] ⭐ Run Main pytest
+[CI/test]   | FAILED tests/test_app.py::test_add
+[CI/test]   ❌  Failure - Main pytest
+[CI/test] 🏁  Job failed
+[Lint/ruff] ⭐ Run Main ruff check
+[Lint/ruff]   ✅  Success - Main ruff check
+[Lint/ruff] 🏁  Job succeeded
+"""
+
+
+class TestLineIndex:
+    """LineIndexクラスのテスト"""
+
+    def test_line_number(self):
+        """文字位置から行番号が解決されることのテスト"""
+        text = "first\nsecond\nthird"
+        index = LineIndex(text)
+
+        assert index.line_number(0) == 1
+        assert index.line_number(text.index("\n")) == 1
+        assert index.line_number(text.index("second")) == 2
+        assert index.line_number(len(text) - 1) == 3
+
+    def test_line_count_matches_splitlines(self):
+        """行数がsplitlinesと一致することのテスト"""
+        for text in ["", "a", "a\n", "a\nb", "a\n\nb\n", "\n"]:
+            assert LineIndex(text).line_count == len(text.splitlines())
+
+    def test_lines(self):
+        """範囲内の行の取得のテスト"""
+        index = LineIndex("one\r\ntwo\nthree\n")
+
+        assert index.line(0) == "one"
+        assert index.lines(0, 10) == ["one", "two", "three"]
+        assert index.lines(-2, 1) == ["one"]
+        assert index.line_start(1) == 5
+        assert index.line_end(1) == 8
+
+    def test_is_blank(self):
+        """空白行の判定のテスト"""
+        index = LineIndex("text\n   \n\nmore")
+
+        assert not index.is_blank(0)
+        assert index.is_blank(1)
+        assert index.is_blank(2)
+        assert not index.is_blank(3)
+
+
+class TestLogIndex:
+    """LogIndexクラスのテスト"""
+
+    def test_sections(self):
+        """ワークフロー/ジョブ/ステップのセクション検出のテスト"""
+        index = LogIndex(ACT_LOG)
+
+        workflows = index.get_sections("workflow")
+        assert [(w.name, w.start_line, w.end_line, w.success) for w in workflows] == [
+            ("CI", 0, 8, False),
+            ("Lint", 8, 11, True),
+        ]
+
+        jobs = index.get_sections("job", workflow="CI")
+        assert [(j.name, j.start_line, j.end_line) for j in jobs] == [("build", 0, 3), ("test", 3, 8)]
+
+        steps = index.get_sections("step", workflow="CI")
+        assert [(s.name, s.success) for s in steps] == [
+            ("Main actions/checkout@v4", True),
+            ("Main pytest", False),
+        ]
+        assert "FAILED tests/test_app.py" in index.section_text(steps[1])
+
+    def test_lines_containing(self):
+        """文字列を含む行の検索のテスト"""
+        index = LogIndex(ACT_LOG)
+
+        assert index.lines_containing("Start") == [0, 3]
+        assert index.lines_containing("Start") is index.lines_containing("Start")
+        assert index.lines_containing("not present") == []
+
+    def test_save_and_load(self, temp_dir: Path):
+        """インデックスの保存と読み込みのテスト"""
+        log_path = temp_dir / "act_20240101_120000.log"
+        log_path.write_text(ACT_LOG, encoding="utf-8")
+
+        index_path = LogIndex(ACT_LOG).save(log_path)
+        assert index_path == temp_dir / "act_20240101_120000.log.idx"
+
+        loaded = LogIndex.load(log_path)
+        assert loaded is not None
+        assert list(loaded.newlines) == list(LogIndex(ACT_LOG).newlines)
+        assert loaded.line_number(ACT_LOG.index("FAILED")) == 6
+        assert loaded.sections == LogIndex(ACT_LOG).sections
+
+    def test_load_rejects_stale_index(self, temp_dir: Path):
+        """ログが更新された場合に古いインデックスを使用しないことのテスト"""
+        log_path = temp_dir / "act_test.log"
+        log_path.write_text(ACT_LOG, encoding="utf-8")
+        LogIndex(ACT_LOG).save(log_path)
+
+        log_path.write_text(ACT_LOG + "extra line\n", encoding="utf-8")
+
+        assert LogIndex.load(log_path) is None
+
+    def test_load_rejects_corrupted_index(self, temp_dir: Path):
+        """破損したインデックスファイルを無視することのテスト"""
+        log_path = temp_dir / "act_test.log"
+        log_path.write_text(ACT_LOG, encoding="utf-8")
+        LogIndex.index_path(log_path).write_bytes(b"not json")
+
+        assert LogIndex.load(log_path) is None
+
+    def test_for_log_file_persists_index(self, temp_dir: Path):
+        """インデックスが作成・保存され、次回は読み込まれることのテスト"""
+        log_path = temp_dir / "act_test.log"
+        log_path.write_text(ACT_LOG, encoding="utf-8")
+
+        created = LogIndex.for_log_file(log_path)
+        index_path = LogIndex.index_path(log_path)
+        assert index_path.exists()
+        saved_mtime = os.stat(index_path).st_mtime_ns
+
+        loaded = LogIndex.for_log_file(log_path, ACT_LOG)
+        assert os.stat(index_path).st_mtime_ns == saved_mtime
+        assert loaded.line_count == created.line_count
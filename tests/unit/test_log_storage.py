@@ -0,0 +1,133 @@
+"""
+ログの圧縮保存のテスト
+
+圧縮して保存したログを、ログマネージャー・ログビュー・ストリーミング読み込みが透過的に読めることをテストします。
+"""
+
+import gzip
+import sqlite3
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ci_helper.core.execution_history import ExecutionHistoryStore
+from ci_helper.core.log_manager import LogManager
+from ci_helper.core.log_storage import compress_log_file, iter_log_files, raw_log_size, read_log_text
+from ci_helper.core.log_stream import ActLogCollector
+from ci_helper.core.log_view import LogView
+from ci_helper.core.models import ExecutionResult, WorkflowResult
+from ci_helper.utils.config import Config
+from ci_helper.utils.performance_optimizer import LogFileStreamer
+
+LOG_TEXT = "".join(f"[CI/test] line {index} ✓ ok\n" for index in range(2000))
+
+
+def _log_manager(tmp_path, compression) -> LogManager:
+    config = Mock(spec=Config)
+    config.get_path.return_value = tmp_path / "logs"
+    config.get.side_effect = lambda key, default=None: compression if key == "log_compression" else 100
+    return LogManager(config)
+
+
+def _execution(timestamp: datetime) -> ExecutionResult:
+    workflow = WorkflowResult(name="ci.yml", success=True, jobs=[], duration=1.0)
+    return ExecutionResult(success=True, workflows=[workflow], total_duration=1.0, timestamp=timestamp)
+
+
+class TestLogStorage:
+    """圧縮保存の読み書きのテスト"""
+
+    @pytest.mark.parametrize(("compression", "suffix"), [("gzip", ".log.gz"), ("lzma", ".log.xz"), ("none", ".log")])
+    def test_saved_log_is_read_transparently(self, tmp_path, compression, suffix):
+        """圧縮方式によらず保存したログを同じ内容で読めることのテスト"""
+        manager = _log_manager(tmp_path, compression)
+
+        log_path = manager.save_execution_log(_execution(datetime(2025, 1, 1, 10, 0)), LOG_TEXT)
+
+        assert log_path.name.endswith(suffix)
+        assert manager.get_log_content(log_path.name) == LOG_TEXT
+        assert raw_log_size(log_path) == len(LOG_TEXT.encode("utf-8"))
+        assert list(LogFileStreamer().stream_lines(log_path)) == LOG_TEXT.splitlines()
+        assert LogFileStreamer().get_file_info(log_path)["lines"] == 2000
+        assert [path.name for path in iter_log_files(manager.log_dir)] == [log_path.name]
+
+    def test_large_compressed_log_is_mapped(self, tmp_path):
+        """しきい値以上の圧縮ログは展開した一時ファイルをmmapで開くことのテスト"""
+        log_path = tmp_path / "act_20250101_100000.log.gz"
+        with gzip.open(log_path, "wt", encoding="utf-8") as f:
+            f.write(LOG_TEXT)
+
+        with LogView.open(log_path, mmap_threshold_mb=0.01) as view:
+            assert view.is_mapped
+            assert view.read_text() == LOG_TEXT
+            assert view.line_number(view.data.find(b"line 1999")) == 2000
+
+    def test_statistics_report_stored_and_raw_sizes(self, tmp_path):
+        """統計に保存時のサイズと展開後のサイズが含まれることのテスト"""
+        manager = _log_manager(tmp_path, "gzip")
+        now = datetime.now()
+        for hours in range(2):
+            manager.save_execution_log(_execution(now - timedelta(hours=hours)), LOG_TEXT * 100)
+
+        stats = manager.get_log_statistics()
+
+        assert stats["total_raw_size_mb"] == round(2 * len(LOG_TEXT.encode("utf-8")) * 100 / (1024 * 1024), 2)
+        assert stats["total_size_mb"] < stats["total_raw_size_mb"]
+
+    @pytest.mark.parametrize("compression", ["gzip", "lzma", "none"])
+    def test_raw_size_is_counted_while_writing(self, tmp_path, compression):
+        """展開後のサイズを書き込み時に数え、保存後にログを読み直さないことのテスト"""
+        manager = _log_manager(tmp_path, compression)
+        raw_size = len(LOG_TEXT.encode("utf-8")) * 3
+
+        with patch("ci_helper.core.log_manager.raw_log_size", side_effect=AssertionError("re-read")):
+            manager.save_execution_log(_execution(datetime(2025, 1, 1, 10, 0)), LOG_TEXT * 3)
+
+            collector = ActLogCollector(manager.create_log_path(datetime(2025, 1, 1, 11, 0)))
+            writer = collector.open_writer(0)
+            writer.write(LOG_TEXT * 3)
+            log_path = collector.finalize()
+            assert log_path is not None
+            manager.register_execution_log(
+                _execution(datetime(2025, 1, 1, 11, 0)), log_path, raw_size=collector.raw_size
+            )
+
+        assert [entry["raw_size"] for entry in manager.list_logs()] == [raw_size, raw_size]
+
+    def test_existing_log_can_be_compressed(self, tmp_path):
+        """既存の非圧縮ログを圧縮して置き換えられることのテスト"""
+        log_path = tmp_path / "act_20250101_100000.log"
+        log_path.write_text(LOG_TEXT, encoding="utf-8")
+
+        compressed_path = compress_log_file(log_path, "lzma")
+
+        assert compressed_path.name == "act_20250101_100000.log.xz"
+        assert not log_path.exists()
+        assert read_log_text(compressed_path) == LOG_TEXT
+
+    def test_version1_history_database_is_migrated(self, tmp_path):
+        """旧スキーマの実行履歴に展開後のサイズの列が追加されることのテスト"""
+        db_path = tmp_path / "history.db"
+        connection = sqlite3.connect(db_path)
+        connection.executescript(
+            """
+            CREATE TABLE executions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, log_file TEXT NOT NULL,
+                success INTEGER NOT NULL, total_duration REAL NOT NULL, total_failures INTEGER NOT NULL,
+                file_size INTEGER NOT NULL, entry TEXT NOT NULL, result TEXT
+            );
+            INSERT INTO executions (timestamp, log_file, success, total_duration, total_failures, file_size, entry)
+            VALUES ('2025-01-01T10:00:00', 'act_20250101_100000.log', 1, 1.0, 0, 2048, '{}');
+            PRAGMA user_version = 1;
+            """
+        )
+        connection.close()
+
+        store = ExecutionHistoryStore(db_path)
+        try:
+            stats = store.get_statistics()
+        finally:
+            store.close()
+
+        assert stats["total_size"] == stats["total_raw_size"] == 2048
@@ -0,0 +1,166 @@
+"""
+act出力ストリーミングのユニットテスト
+
+StreamingFailureDetector、ActLogWriter、ActLogCollectorの機能をテストします。
+"""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from ci_helper.core.log_extractor import LogExtractor
+from ci_helper.core.log_storage import open_log_binary
+from ci_helper.core.log_stream import ActLogCollector, ActLogWriter, StreamingFailureDetector
+from ci_helper.core.models import FailureType
+
+
+class TestStreamingFailureDetector:
+    """ストリーミング失敗検出のテスト"""
+
+    def test_detects_failures_with_context(self):
+        """失敗と前後のコンテキストが検出されることのテスト"""
+        detector = StreamingFailureDetector(LogExtractor(context_lines=2))
+        for line in ["line 1", "line 2", "Error: something broke", "line 4", "line 5", "line 6"]:
+            detector.feed(line)
+        failures = detector.close()
+
+        assert len(failures) == 1
+        failure = failures[0]
+        assert failure.type == FailureType.ERROR
+        assert failure.message == "something broke"
+        assert failure.context_before == ["line 1", "line 2"]
+        assert failure.context_after == ["line 4", "line 5"]
+
+    def test_matches_batch_extractor_messages(self):
+        """一括抽出と同じメッセージが検出されることのテスト"""
+        log = "\n".join(
+            [
+                "[CI/test] Run pytest",
+                "FAILED tests/test_app.py::test_add - assert 1 == 2",
+                "AssertionError: expected 2",
+                "npm ERR! missing script: build",
+                "Process completed with exit code 1",
+            ]
+        )
+        extractor = LogExtractor()
+        detector = StreamingFailureDetector(extractor)
+        for line in log.splitlines():
+            detector.feed(line)
+
+        streamed = {(f.type, f.message) for f in detector.close()}
+        batch = {(f.type, f.message) for f in extractor.extract_failures(log)}
+
+        assert streamed == batch
+
+    def test_attaches_preceding_stack_trace(self):
+        """直前のスタックトレースが失敗に付与されることのテスト"""
+        detector = StreamingFailureDetector()
+        for line in [
+            "Traceback (most recent call last):",
+            '  File "app.py", line 3, in <module>',
+            "    main()",
+            "ValueError: bad value",
+            "Error: job failed",
+        ]:
+            detector.feed(line)
+        failures = detector.close()
+
+        assert failures
+        assert failures[0].stack_trace is not None
+        assert 'File "app.py", line 3' in failures[0].stack_trace
+
+    def test_max_failures_limit(self):
+        """保持する失敗数に上限があることのテスト"""
+        detector = StreamingFailureDetector(max_failures=5)
+        for i in range(50):
+            detector.feed(f"Error: failure {i}")
+
+        assert len(detector.close()) == 5
+
+
+class TestActLogWriter:
+    """ログライターのテスト"""
+
+    def test_writes_lines_and_keeps_tail(self):
+        """行の書き出しと末尾の保持のテスト"""
+        stream = io.StringIO()
+        writer = ActLogWriter(stream=stream, tail_lines=2)
+
+        writer.write_line("first\n")
+        writer.write("second\nthird")
+
+        assert stream.getvalue() == "first\nsecond\nthird\n"
+        assert writer.tail == "second\nthird"
+        assert writer.line_count == 3
+
+    def test_echo_failure_does_not_stop_capture(self):
+        """表示コールバックの失敗で取り込みが止まらないことのテスト"""
+
+        def broken_echo(line: str) -> None:
+            raise OSError("console closed")
+
+        stream = io.StringIO()
+        writer = ActLogWriter(stream=stream, echo=broken_echo)
+        writer.write("a\nb")
+
+        assert stream.getvalue() == "a\nb\n"
+
+
+class TestActLogCollector:
+    """ログコレクターのテスト"""
+
+    def test_finalize_concatenates_in_index_order(self, temp_dir: Path):
+        """書き込み順に関係なくワークフロー順で結合されることのテスト"""
+        log_path = temp_dir / "act_test.log"
+        collector = ActLogCollector(log_path)
+        first = collector.open_writer(0)
+        second = collector.open_writer(1)
+
+        second.write("second output")
+        first.write("first output")
+
+        assert collector.finalize() == log_path
+        assert log_path.read_text(encoding="utf-8") == "first output\nsecond output\n"
+        assert not list(temp_dir.glob("*.part"))
+
+    @pytest.mark.parametrize("log_name", ["act_test.log", "act_test.log.gz"])
+    def test_finalize_matches_act_output_bytes(self, temp_dir: Path, log_name: str):
+        """保存されたログがワークフロー順に連結したactの出力とバイト単位で一致することのテスト"""
+        outputs = [
+            "[CI/test] ⭐ Run Main pytest\n[CI/test]   | collected 2 items\n[CI/test] ✅  Success - Main pytest\n",
+            "",
+            "[CI/build] Error: Process completed with exit code 1.\n\n[CI/build] 🏁  Job failed\n",
+        ]
+        log_path = temp_dir / log_name
+        collector = ActLogCollector(log_path)
+        writers = [collector.open_writer(index) for index in range(len(outputs))]
+
+        for writer, output in reversed(list(zip(writers, outputs, strict=True))):
+            for line in io.StringIO(output):
+                writer.write_line(line)
+
+        collector.finalize()
+
+        with open_log_binary(log_path) as f:
+            assert f.read() == "".join(outputs).encode("utf-8")
+
+    def test_discard_removes_parts(self, temp_dir: Path):
+        """破棄時に一時ファイルが削除されることのテスト"""
+        log_path = temp_dir / "act_test.log"
+        collector = ActLogCollector(log_path)
+        collector.open_writer(0).write("partial")
+
+        collector.discard()
+
+        assert not log_path.exists()
+        assert not list(temp_dir.glob("*.part"))
+
+    def test_without_log_path(self):
+        """ログを保存しない場合のテスト"""
+        collector = ActLogCollector(None)
+        writer = collector.open_writer(0)
+        writer.write("Error: not saved")
+
+        assert collector.finalize() is None
+        assert writer.finish()[0].message == "not saved"
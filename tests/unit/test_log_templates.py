@@ -0,0 +1,68 @@
+"""
+ログテンプレート抽出のテスト
+
+Drain方式で値だけが異なる行をテンプレートにまとめ、件数と値のサンプルを要約できることをテストします。
+"""
+
+from ci_helper.core.log_templates import MAX_SAMPLES, WILDCARD, LogTemplateMiner
+
+
+class TestLogTemplateMiner:
+    """LogTemplateMinerのテスト"""
+
+    def test_lines_differing_in_values_share_template(self):
+        """値だけが異なる行が同じテンプレートにまとまることのテスト"""
+        miner = LogTemplateMiner()
+
+        first = miner.add("Connected to db-1 in 15 ms")
+        second = miner.add("Connected to db-2 in 230 ms")
+
+        assert first is second
+        assert second.template == f"Connected to {WILDCARD} in {WILDCARD} ms"
+        assert second.count == 2
+        assert second.sample_values() == ["db-1 15", "db-2 230"]
+
+    def test_different_messages_get_separate_templates(self):
+        """トークン数や内容が異なる行は別のテンプレートになることのテスト"""
+        miner = LogTemplateMiner()
+
+        miner.add("Step 1: checkout repository")
+        miner.add("Step 2: install dependencies now")
+        miner.add("ERROR: permission denied while writing cache")
+
+        assert len(miner.templates) == 3
+
+    def test_summary_includes_count_and_samples(self):
+        """要約にテンプレート・件数・値のサンプルが含まれることのテスト"""
+        miner = LogTemplateMiner()
+        for index in range(10):
+            template = miner.add(f"Retry {index} of 10 for job build")
+
+        assert template.summary() == "Retry <*> of 10 for job build (repeated 10 times; e.g. 0 | 1 | 2)"
+        assert len(template.samples) == MAX_SAMPLES
+        assert template.summary(count=3, max_length=10) == "Retry <*> ... (repeated 3 times; e.g. 0 | 1 | 2)"
+
+    def test_templates_are_bounded(self):
+        """テンプレート数が上限を超えると最も長く使われていないものから捨てることのテスト"""
+        miner = LogTemplateMiner(max_templates=2)
+
+        first = miner.add("alpha beta gamma")
+        miner.add("one two three four")
+        miner.add("alpha beta gamma")
+        miner.add("x")
+
+        assert [template.template for template in miner.templates] == ["alpha beta gamma", "x"]
+        assert miner.add("alpha beta gamma") is first
+
+    def test_many_distinct_prefixes_share_wildcard_node(self):
+        """解析木の子が上限に達した場合も行をまとめられることのテスト"""
+        miner = LogTemplateMiner(max_children=2)
+
+        for word in ["apple", "banana", "cherry", "durian"]:
+            miner.add(f"{word} task finished")
+
+        assert {template.template for template in miner.templates} == {
+            "apple task finished",
+            "banana task finished",
+            f"{WILDCARD} task finished",
+        }
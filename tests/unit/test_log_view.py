@@ -0,0 +1,93 @@
+"""
+ログビューのユニットテスト
+
+LogViewクラスのmmapによる読み取りと部分デコード、およびログビューを
+走査する抽出器が文字列処理と同じ結果を返すことをテストします。
+"""
+
+from pathlib import Path
+
+from ci_helper.core.log_extractor import LogExtractor
+from ci_helper.core.log_view import LogView
+
+FAILING_LOG = (
+    "[CI/test] ⭐ Run Main pytest\n"
+    "\n"
+    "collected 2 items\n"
+    "FAILED tests/test_app.py::test_add - AssertionError: 1 != 2\n"
+    '  File "tests/test_app.py", line 12, in test_add\n'
+    "Error: Process completed with exit code 1.\n"
+    "api_key=sk-abcdefghijklmnopqrstuvwxyz0123456789abcdefghij\n"
+    "[CI/test] 🏁  Job failed\n"
+)
+
+
+def _write_log(tmp_path: Path, content: str) -> Path:
+    log_path = tmp_path / "act.log"
+    log_path.write_text(content, encoding="utf-8")
+    return log_path
+
+
+class TestLogView:
+    """LogViewクラスのテスト"""
+
+    def test_small_file_is_not_mapped(self, tmp_path):
+        """しきい値未満のファイルはmmapを使用しないことのテスト"""
+        with LogView.open(_write_log(tmp_path, FAILING_LOG)) as view:
+            assert not view.is_mapped
+            assert view.read_text() == FAILING_LOG
+
+    def test_large_file_is_mapped(self, tmp_path):
+        """しきい値以上のファイルはmmapで開かれることのテスト"""
+        with LogView.open(_write_log(tmp_path, FAILING_LOG), mmap_threshold_mb=0) as view:
+            assert view.is_mapped
+            assert view.read_text() == FAILING_LOG
+
+        assert view.data.closed
+
+    def test_line_navigation(self, tmp_path):
+        """バイト位置からの行範囲・行番号・コンテキストの取得のテスト"""
+        content = "first\r\nsecond ✅\nthird\nfourth"
+        with LogView.open(_write_log(tmp_path, content), mmap_threshold_mb=0) as view:
+            position = content.encode("utf-8").index(b"third")
+
+            start, end = view.line_bounds(position)
+            assert view.line_text(start, end) == "third"
+            assert view.line_number(position) == 3
+            assert view.context_lines(position, 2, 2) == (["first", "second ✅"], ["fourth"])
+
+    def test_decode_replaces_split_characters(self):
+        """マルチバイト文字の途中で区切ってもデコードできることのテスト"""
+        view = LogView("✅ ok".encode())
+
+        assert view.decode(1, view.size) == "�� ok"
+
+    def test_lowered_blocks_overlap(self):
+        """ブロック境界をまたぐキーワードが重複部分で見つかることのテスト"""
+        view = LogView(b"xxxxERROR yyyy")
+
+        blocks = list(view.iter_lowered_blocks(overlap=4, block_size=6))
+
+        assert blocks[0] == (0, 6, b"xxxxerror ")
+        assert blocks[-1][1] == view.size
+
+
+class TestLogViewConsumers:
+    """ログビューを走査する処理のテスト"""
+
+    def test_extract_failures_from_view_matches_string_path(self, tmp_path):
+        """mmapで走査した結果が文字列処理と一致することのテスト"""
+        content = ("noise line\n" * 40 + FAILING_LOG) * 3
+        extractor = LogExtractor()
+        expected = extractor.extract_failures(content)
+
+        with LogView.open(_write_log(tmp_path, content), mmap_threshold_mb=0) as view:
+            actual = extractor.extract_failures_from_view(view)
+
+        assert expected
+        assert [(f.type, f.message, f.file_path, f.line_number) for f in actual] == [
+            (f.type, f.message, f.file_path, f.line_number) for f in expected
+        ]
+        assert [(f.context_before, f.context_after, f.stack_trace) for f in actual] == [
+            (f.context_before, f.context_after, f.stack_trace) for f in expected
+        ]
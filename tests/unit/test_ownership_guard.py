@@ -0,0 +1,81 @@
+"""
+ファイル所有権ガードのユニットテスト
+
+act実行中に更新されたディレクトリだけを走査して所有権を戻すことをテストします。
+"""
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from ci_helper.core.ownership_guard import OwnershipGuard
+
+
+def _start_guard(root: Path, **kwargs) -> OwnershipGuard:
+    """既存ファイルより後の時刻で開始し、作成されたファイルが別の所有者に見えるガードを作成"""
+    guard = OwnershipGuard(root, **kwargs)
+    time.sleep(0.05)
+    guard.start()
+    guard.started_at = time.time()
+    guard.owner = (os.getuid() + 1, os.getgid())
+    time.sleep(0.05)
+    return guard
+
+
+class TestOwnershipGuard:
+    """OwnershipGuardクラスのテスト"""
+
+    def test_restores_only_paths_created_during_run(self, tmp_path):
+        """実行中に作成されたパスだけ所有権を戻し、更新のないディレクトリは stat しないことのテスト"""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("print()")
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "index.md").write_text("# docs")
+
+        guard = _start_guard(tmp_path)
+        (tmp_path / "src" / "generated.txt").write_text("created by act")
+
+        with patch("ci_helper.core.ownership_guard.os.chown") as chown:
+            stats = guard.restore()
+
+        # ファイルの作成で更新された src 自体も対象になる
+        assert [call.args for call in chown.call_args_list] == [
+            (str(tmp_path / "src"), *guard.owner),
+            (str(tmp_path / "src" / "generated.txt"), *guard.owner),
+        ]
+        assert stats.paths_restored == 2
+        assert stats.directories_scanned == 3
+        # src とその中の2ファイルのみ確認し、docs 内のファイルは確認しない
+        assert stats.entries_checked == 3
+
+    def test_ignored_directory_is_pruned_unless_modified(self, tmp_path):
+        """無視対象のディレクトリは更新された場合だけ中を調べることのテスト"""
+        (tmp_path / ".gitignore").write_text("# build output\nbuild/\n!keep/\n")
+        for name in ("node_modules", "build"):
+            (tmp_path / name / "pkg").mkdir(parents=True)
+            (tmp_path / name / "pkg" / "index.js").write_text("")
+
+        guard = _start_guard(tmp_path)
+        (tmp_path / "node_modules" / "new-pkg").mkdir()
+
+        with patch("ci_helper.core.ownership_guard.os.chown") as chown:
+            stats = guard.restore()
+
+        assert stats.directories_pruned == 1
+        assert [call.args[0] for call in chown.call_args_list] == [
+            str(tmp_path / "node_modules"),
+            str(tmp_path / "node_modules" / "new-pkg"),
+        ]
+
+    def test_chown_failures_are_counted(self, tmp_path):
+        """所有権を戻せなかったパスが統計に記録されることのテスト"""
+        guard = _start_guard(tmp_path, use_gitignore=False)
+        (tmp_path / "root-owned.txt").write_text("")
+
+        with patch("ci_helper.core.ownership_guard.os.chown", side_effect=PermissionError("denied")):
+            stats = guard.restore()
+
+        assert stats.paths_restored == 0
+        assert stats.failures == 1
+        assert stats.scan_seconds >= 0.0
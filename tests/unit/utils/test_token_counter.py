@@ -0,0 +1,117 @@
+"""
+トークンカウンターのテスト
+
+エンコーダーのキャッシュ、カウント結果のメモ化、推定値の較正、制限に近い場合のみの厳密なカウントをテストします。
+"""
+
+from unittest.mock import Mock
+
+from ci_helper.ai.models import ProviderConfig
+from ci_helper.ai.providers.openai import OpenAIProvider
+from ci_helper.utils.token_counter import MEMO_MIN_CHARS, TokenCounter
+
+LARGE_TEXT = "error: build failed\n" * 200
+
+
+class FakeEncoding:
+    """1文字を1トークンとして数えるエンコーダー"""
+
+    name = "fake_base"
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text):
+        self.calls += 1
+        return list(text)
+
+
+def _fake_tiktoken(encoding=None):
+    tiktoken = Mock()
+    tiktoken.encoding_for_model.return_value = encoding or FakeEncoding()
+    tiktoken.get_encoding.return_value = encoding or FakeEncoding()
+    return tiktoken
+
+
+class TestTokenCounter:
+    """TokenCounterのテスト"""
+
+    def test_encoder_is_cached_per_model(self):
+        """モデルごとのエンコーダーは1回だけ読み込むことのテスト"""
+        tiktoken = _fake_tiktoken()
+        counter = TokenCounter(tiktoken)
+
+        counter.count("a", "gpt-4")
+        counter.count("b", "gpt-4")
+        counter.count("c", "gpt-4o")
+
+        assert tiktoken.encoding_for_model.call_count == 2
+
+    def test_unknown_model_uses_default_encoding(self):
+        """未知のモデルではcl100k_baseを使用することのテスト"""
+        tiktoken = _fake_tiktoken()
+        tiktoken.encoding_for_model.side_effect = KeyError("unknown")
+        counter = TokenCounter(tiktoken)
+
+        assert counter.count("abc", "unknown-model") == 3
+        tiktoken.get_encoding.assert_called_once_with("cl100k_base")
+
+    def test_large_text_count_is_memoized(self):
+        """大きなテキストのカウント結果を内容のハッシュでメモ化することのテスト"""
+        encoding = FakeEncoding()
+        counter = TokenCounter(_fake_tiktoken(encoding))
+
+        first = counter.count(LARGE_TEXT, "gpt-4")
+        second = counter.count(LARGE_TEXT, "gpt-4")
+        counter.count("small", "gpt-4")
+        counter.count("small", "gpt-4")
+
+        assert first == second == len(LARGE_TEXT)
+        assert len(LARGE_TEXT) >= MEMO_MIN_CHARS
+        assert encoding.calls == 3
+
+    def test_estimate_is_calibrated_by_exact_counts(self):
+        """厳密なカウント結果から推定値を較正することのテスト"""
+        counter = TokenCounter(_fake_tiktoken())
+
+        before = counter.estimate(LARGE_TEXT, "gpt-4")
+        counter.count(LARGE_TEXT, "gpt-4")
+        after = counter.estimate(LARGE_TEXT, "gpt-4")
+
+        assert before == len(LARGE_TEXT) // 4
+        assert after == len(LARGE_TEXT)
+
+    def test_count_for_limit_counts_exactly_only_near_limit(self):
+        """推定値が制限に近い場合のみ厳密にカウントすることのテスト"""
+        encoding = FakeEncoding()
+        counter = TokenCounter(_fake_tiktoken(encoding))
+
+        far = counter.count_for_limit(LARGE_TEXT, limit=100_000, model="gpt-4")
+        near = counter.count_for_limit(LARGE_TEXT, limit=len(LARGE_TEXT) // 2, model="gpt-4")
+
+        assert far == len(LARGE_TEXT) // 4
+        assert near == len(LARGE_TEXT)
+        assert encoding.calls == 1
+
+    def test_unavailable_encoder_falls_back_to_estimate(self):
+        """エンコーダーを読み込めない場合は推定値を返すことのテスト"""
+        tiktoken = _fake_tiktoken()
+        tiktoken.encoding_for_model.side_effect = OSError("network unreachable")
+        counter = TokenCounter(tiktoken)
+
+        assert counter.count(LARGE_TEXT, "gpt-4") == len(LARGE_TEXT) // 4
+        assert counter.count(LARGE_TEXT, "gpt-4") == len(LARGE_TEXT) // 4
+        assert tiktoken.encoding_for_model.call_count == 1
+
+
+class TestProviderTokenLimit:
+    """プロバイダーの制限チェックのテスト"""
+
+    def test_provider_counts_exactly_only_near_limit(self):
+        """プロバイダーは推定値が制限に近い場合のみcount_tokensを呼び出すことのテスト"""
+        provider = OpenAIProvider(ProviderConfig(name="openai", api_key="sk-test", default_model="gpt-4"))
+        provider.count_tokens = Mock(return_value=7000)
+
+        assert provider.count_tokens_for_limit("short prompt", 6553.6, "gpt-4") < 10
+        assert provider.count_tokens_for_limit(LARGE_TEXT * 8, 6553.6, "gpt-4") == 7000
+        provider.count_tokens.assert_called_once()